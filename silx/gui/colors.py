@@ -29,7 +29,7 @@ from __future__ import absolute_import
 
 __authors__ = ["T. Vincent", "H.Payno"]
 __license__ = "MIT"
-__date__ = "19/11/2018"
+__date__ = "19/10/2026"
 
 import numpy
 import logging
@@ -561,6 +561,11 @@ class Colormap(qt.QObject):
     def getColormapRange(self, data=None):
         """Return (vmin, vmax)
 
+        :param data: The data or the item for which to compute the range
+            in case of autoscale.
+            With an item, the range of its data is computed only once
+            per data change.
+        :type data: Union[numpy.ndarray,~silx.gui.plot.items.ColormapMixIn]
         :return: the tuple vmin, vmax fitting vmin, vmax, normalization and
             data if any given
         :rtype: tuple
@@ -582,25 +587,28 @@ class Colormap(qt.QObject):
 
         if vmin is None or vmax is None:  # Handle autoscale
             # Get min/max from data
-            if data is not None:
+            from .plot.items.core import ColormapMixIn  # avoid cyclic import
+            if isinstance(data, ColormapMixIn):
+                # Use item cache to avoid scanning data again
+                min_, max_ = data._getColormapAutoscaleRange(self)
+            elif data is not None:
                 data = numpy.array(data, copy=False)
                 if data.size == 0:  # Fallback an array but no data
-                    min_, max_ = self._getDefaultMin(), self._getDefaultMax()
+                    min_, max_ = None, None
+                elif self.getNormalization() == self.LOGARITHM:
+                    result = min_max(data, min_positive=True, finite=True)
+                    min_ = result.min_positive  # >0 or None
+                    max_ = result.maximum  # can be <= 0
                 else:
-                    if self.getNormalization() == self.LOGARITHM:
-                        result = min_max(data, min_positive=True, finite=True)
-                        min_ = result.min_positive  # >0 or None
-                        max_ = result.maximum  # can be <= 0
-                    else:
-                        min_, max_ = min_max(data, min_positive=False, finite=True)
-
-                    # Handle fallback
-                    if min_ is None or not numpy.isfinite(min_):
-                        min_ = self._getDefaultMin()
-                    if max_ is None or not numpy.isfinite(max_):
-                        max_ = self._getDefaultMax()
+                    min_, max_ = min_max(data, min_positive=False, finite=True)
             else:  # Fallback if no data is provided
-                min_, max_ = self._getDefaultMin(), self._getDefaultMax()
+                min_, max_ = None, None
+
+            # Handle fallback
+            if min_ is None or not numpy.isfinite(min_):
+                min_ = self._getDefaultMin()
+            if max_ is None or not numpy.isfinite(max_):
+                max_ = self._getDefaultMax()
 
             if vmin is None:  # Set vmin respecting provided vmax
                 vmin = min_ if vmax is None else min(min_, vmax)
@@ -728,12 +736,16 @@ class Colormap(qt.QObject):
                         vmax=self._vmax,
                         normalization=self._normalization)
 
-    def applyToData(self, data):
+    def applyToData(self, data, reference=None):
         """Apply the colormap to the data
 
         :param numpy.ndarray data: The data to convert.
+        :param reference: The data or item to use for autoscale,
+            default: data. See :meth:`getColormapRange`.
         """
-        vmin, vmax = self.getColormapRange(data)
+        if reference is None:
+            reference = data
+        vmin, vmax = self.getColormapRange(reference)
         normalization = self.getNormalization()
         return _cmap(data, self._colors, vmin, vmax, normalization)
 
@@ -27,6 +27,7 @@ This module defines a data model for displaying and editing arrays of any
 number of dimensions in a table view.
 """
 from __future__ import division
+import collections
 import numpy
 import logging
 from silx.gui import qt
@@ -93,6 +94,13 @@ class ArrayTableModel(qt.QAbstractTableModel):
         self._formatter = None
         """Formatter for text representation of data"""
 
+        self._tileShape = None
+        """Shape (rows, columns) of the tiles read and formatted at once, or
+        None if the data is directly indexed"""
+
+        self._tiles = collections.OrderedDict()
+        """LRU cache of tiles: (tile row, tile column) -> [data, texts]"""
+
         formatter = TextFormatter(self)
         formatter.setUseQuoteForText(False)
         self.setFormatter(formatter)
@@ -145,6 +153,87 @@ class ArrayTableModel(qt.QAbstractTableModel):
         assert (len(frame_axes) == 2) if n_dimensions > 1 else (len(frame_axes) == 1)
         return max(frame_axes)
 
+    TILE_SHAPE = 128, 32
+    """Minimal number of (rows, columns) read and formatted at once"""
+
+    MAX_TILES = 16
+    """Maximum number of tiles kept in cache"""
+
+    def _updateTileShape(self):
+        """Update the shape of the tiles and clear the cache.
+
+        Arrays are read and formatted by tiles. For lazy datasets (e.g.,
+        h5py datasets), tiles are aligned on the chunks when possible.
+        """
+        self._tiles.clear()
+        if len(self._array.shape) == 0:
+            self._tileShape = None
+            return
+
+        chunks = getattr(self._array, "chunks", None)
+        tileShape = []
+        for dim, size in zip((self._getRowDim(), self._getColumnDim()),
+                             self.TILE_SHAPE):
+            if dim is None:
+                size = 1
+            elif chunks is not None and chunks[dim] <= size:
+                # Read a whole number of chunks
+                size = ((size + chunks[dim] - 1) // chunks[dim]) * chunks[dim]
+            tileShape.append(size)
+        self._tileShape = tuple(tileShape)
+
+    def _clearTiles(self):
+        """Clear the cache of tiles"""
+        self._tiles.clear()
+
+    def _clearTileTexts(self):
+        """Clear the formatted texts of the cached tiles, but keep the data"""
+        for tile in self._tiles.values():
+            tile[1] = None
+
+    def _getTile(self, table_row, table_col):
+        """Returns the tile containing a cell of the table.
+
+        :param table_row: Row index (0-based) of a table cell
+        :param table_col: Column index (0-based) of a table cell
+        :return: (row, column) of the tile origin, and the [data, texts]
+            list of the tile. texts is None until the tile is formatted.
+        """
+        tileRows, tileCols = self._tileShape
+        key = table_row // tileRows, table_col // tileCols
+        row0, col0 = key[0] * tileRows, key[1] * tileCols
+
+        tile = self._tiles.pop(key, None)
+        if tile is None:
+            selection = self._getIndexTuple(
+                slice(row0, row0 + tileRows), slice(col0, col0 + tileCols))
+            data = numpy.asarray(self._array[selection])
+            if self._getRowDim() is None:
+                data = data.reshape(1, -1)
+            tile = [data, None]
+            while len(self._tiles) >= self.MAX_TILES:
+                self._tiles.popitem(last=False)
+        self._tiles[key] = tile
+        return row0, col0, tile
+
+    def _getDisplayText(self, table_row, table_col):
+        """Returns the text displayed in a cell of the table
+
+        :param table_row: Row index (0-based) of a table cell
+        :param table_col: Column index (0-based) of a table cell
+        :rtype: str
+        """
+        if self._tileShape is None:
+            selection = self._getIndexTuple(table_row, table_col)
+            return self._formatter.toString(self._array[selection],
+                                            self._array.dtype)
+
+        row0, col0, tile = self._getTile(table_row, table_col)
+        if tile[1] is None:
+            # Format the whole tile at once
+            tile[1] = self._formatter.toStrings(tile[0], self._array.dtype)
+        return tile[1][table_row - row0, table_col - col0]
+
     def _getIndexTuple(self, table_row, table_col):
         """Return the n-dimensional index of a value in the original array,
         based on its row and column indices in the table view
@@ -191,7 +280,7 @@ class ArrayTableModel(qt.QAbstractTableModel):
             selection = self._getIndexTuple(index.row(),
                                             index.column())
             if role == qt.Qt.DisplayRole:
-                return self._formatter.toString(self._array[selection], self._array.dtype)
+                return self._getDisplayText(index.row(), index.column())
 
             if role == qt.Qt.BackgroundRole and self._bgcolors is not None:
                 r, g, b = self._bgcolors[selection][0:3]
@@ -253,6 +342,7 @@ class ArrayTableModel(qt.QAbstractTableModel):
             selection = self._getIndexTuple(index.row(),
                                             index.column())
             self._array[selection] = v
+            self._clearTiles()
             self.dataChanged.emit(index, index)
             return True
         else:
@@ -328,6 +418,7 @@ class ArrayTableModel(qt.QAbstractTableModel):
         self._index = [0 for _i in range((len(self._array.shape) - 2))]
         self._perspective = tuple(perspective) if perspective is not None else\
             tuple(range(0, len(self._array.shape) - 2))
+        self._updateTileShape()
 
         if qt.qVersion() > "4.6":
             self.endResetModel()
@@ -450,6 +541,7 @@ class ArrayTableModel(qt.QAbstractTableModel):
                     raise IndexError("Invalid index %d " % idx +
                                      "not in range 0-%d" % (shape[i_] - 1))
             self._index = index
+        self._clearTiles()
 
         if qt.qVersion() > "4.6":
             self.endResetModel()
@@ -469,6 +561,7 @@ class ArrayTableModel(qt.QAbstractTableModel):
             self._formatter.formatChanged.disconnect(self.__formatChanged)
 
         self._formatter = formatter
+        self._clearTiles()
         if self._formatter is not None:
             self._formatter.formatChanged.connect(self.__formatChanged)
 
@@ -487,6 +580,7 @@ class ArrayTableModel(qt.QAbstractTableModel):
     def __formatChanged(self):
         """Called when the format changed.
         """
+        self._clearTileTexts()
         self.reset()
 
     def setPerspective(self, perspective):
@@ -549,6 +643,7 @@ class ArrayTableModel(qt.QAbstractTableModel):
 
         # reset index
         self._index = [0 for _i in range(n_dimensions - 2)]
+        self._updateTileShape()
 
         if qt.qVersion() > "4.6":
             self.endResetModel()
@@ -594,6 +689,7 @@ class ArrayTableModel(qt.QAbstractTableModel):
         self._perspective = perspective
         # reset index
         self._index = [0 for _i in range(n_dimensions - 2)]
+        self._updateTileShape()
 
         if qt.qVersion() > "4.6":
             self.endResetModel()
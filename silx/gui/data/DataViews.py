@@ -35,7 +35,7 @@ from silx.gui import qt, icons
 from silx.gui.data.TextFormatter import TextFormatter
 from silx.io import nxdata
 from silx.gui.hdf5 import H5Node
-from silx.io.nxdata import get_attr_as_unicode
+from silx.io.nxdata import get_attr_as_unicode, attr_as_unicode
 from silx.gui.colors import Colormap
 from silx.gui.dialog.ColormapDialog import ColormapDialog
 
@@ -96,105 +96,184 @@ def _normalizeComplex(data):
     return data
 
 
+class _cachedProperty(object):
+    """Decorator for a read-only property computed on first access.
+
+    The computed value is stored in the instance, which then hides this
+    descriptor.
+    """
+
+    def __init__(self, method):
+        self.__method = method
+        self.__name = method.__name__
+        self.__doc__ = method.__doc__
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value = self.__method(instance)
+        instance.__dict__[self.__name] = value
+        return value
+
+
 class DataInfo(object):
-    """Store extracted information from a data"""
+    """Store extracted information from a data
+
+    Each information is computed on first access and then cached, so that
+    the priority checks of all the views share a single inspection of the
+    data.
+    """
 
     def __init__(self, data):
-        data = self.normalizeData(data)
-        self.isArray = False
-        self.interpretation = None
-        self.isNumeric = False
-        self.isVoid = False
-        self.isComplex = False
-        self.isBoolean = False
-        self.isRecord = False
-        self.hasNXdata = False
-        self.isInvalidNXdata = False
-        self.shape = tuple()
-        self.dim = 0
-        self.size = 0
+        self.__data = self.normalizeData(data)
+
+    @_cachedProperty
+    def attrs(self):
+        """Attributes of the data, read at once (empty if none)"""
+        data = self.__data
+        if data is None or not hasattr(data, "attrs"):
+            return {}
+        return dict(data.attrs.items())
+
+    @_cachedProperty
+    def nxClass(self):
+        """@NX_class attribute of the data as unicode, else None"""
+        return attr_as_unicode(self.attrs.get("NX_class"))
+
+    @_cachedProperty
+    def nxdata(self):
+        """Parsed default :class:`silx.io.nxdata.NXdata` of a group, else
+        None"""
+        if not silx.io.is_group(self.__data):
+            return None
+        return nxdata.get_default(self.__data)
 
-        if data is None:
-            return
+    @_cachedProperty
+    def hasNXdata(self):
+        """True if the data is a group providing a valid default NXdata"""
+        return self.nxdata is not None
 
-        if silx.io.is_group(data):
-            nxd = nxdata.get_default(data)
-            nx_class = get_attr_as_unicode(data, "NX_class")
-            if nxd is not None:
-                self.hasNXdata = True
-                # can we plot it?
-                is_scalar = nxd.signal_is_0d or nxd.interpretation in ["scalar", "scaler"]
-                if not (is_scalar or nxd.is_curve or nxd.is_x_y_value_scatter or
-                        nxd.is_image or nxd.is_stack):
-                    # invalid: cannot be plotted by any widget
-                    self.isInvalidNXdata = True
-            elif nx_class == "NXdata":
-                # group claiming to be NXdata could not be parsed
-                self.isInvalidNXdata = True
-            elif nx_class == "NXroot" or silx.io.is_file(data):
-                # root claiming to have a default entry
-                if "default" in data.attrs:
-                    def_entry = data.attrs["default"]
-                    if def_entry in data and "default" in data[def_entry].attrs:
-                        # and entry claims to have default NXdata
-                        self.isInvalidNXdata = True
-            elif "default" in data.attrs:
-                # group claiming to have a default NXdata could not be parsed
-                self.isInvalidNXdata = True
+    @_cachedProperty
+    def defaultPath(self):
+        """Name of the default NXdata group, else None"""
+        if self.nxdata is None:
+            return None
+        return self.nxdata.group.name
+
+    @_cachedProperty
+    def isInvalidNXdata(self):
+        """True if the data is a group which claims to provide a NXdata
+        which can't be displayed"""
+        data = self.__data
+        if not silx.io.is_group(data):
+            return False
 
+        nxd = self.nxdata
+        if nxd is not None:
+            # can we plot it?
+            is_scalar = nxd.signal_is_0d or nxd.interpretation in ["scalar", "scaler"]
+            # invalid: cannot be plotted by any widget
+            return not (is_scalar or nxd.is_curve or nxd.is_x_y_value_scatter or
+                        nxd.is_image or nxd.is_stack)
+        elif self.nxClass == "NXdata":
+            # group claiming to be NXdata could not be parsed
+            return True
+        elif self.nxClass == "NXroot" or silx.io.is_file(data):
+            # root claiming to have a default entry
+            if "default" in self.attrs:
+                def_entry = self.attrs["default"]
+                if def_entry in data and "default" in data[def_entry].attrs:
+                    # and entry claims to have default NXdata
+                    return True
+        elif "default" in self.attrs:
+            # group claiming to have a default NXdata could not be parsed
+            return True
+        return False
+
+    @_cachedProperty
+    def isArray(self):
+        data = self.__data
         if isinstance(data, numpy.ndarray):
-            self.isArray = True
-        elif silx.io.is_dataset(data) and data.shape != tuple():
-            self.isArray = True
-        else:
-            self.isArray = False
+            return True
+        return silx.io.is_dataset(data) and data.shape != tuple()
 
-        if silx.io.is_dataset(data):
-            if "interpretation" in data.attrs:
-                self.interpretation = get_attr_as_unicode(data, "interpretation")
-            else:
-                self.interpretation = None
+    @_cachedProperty
+    def interpretation(self):
+        if silx.io.is_dataset(self.__data):
+            return attr_as_unicode(self.attrs.get("interpretation"))
         elif self.hasNXdata:
-            self.interpretation = nxd.interpretation
-        else:
-            self.interpretation = None
+            return self.nxdata.interpretation
+        return None
 
+    @_cachedProperty
+    def dtype(self):
+        """Data type of the data or of the NXdata signal, else None"""
+        data = self.__data
         if hasattr(data, "dtype"):
-            if numpy.issubdtype(data.dtype, numpy.void):
-                # That's a real opaque type, else it is a structured type
-                self.isVoid = data.dtype.fields is None
-            self.isNumeric = numpy.issubdtype(data.dtype, numpy.number)
-            self.isRecord = data.dtype.fields is not None
-            self.isComplex = numpy.issubdtype(data.dtype, numpy.complexfloating)
-            self.isBoolean = numpy.issubdtype(data.dtype, numpy.bool_)
+            return data.dtype
         elif self.hasNXdata:
-            self.isNumeric = numpy.issubdtype(nxd.signal.dtype,
-                                              numpy.number)
-            self.isComplex = numpy.issubdtype(nxd.signal.dtype, numpy.complexfloating)
-            self.isBoolean = numpy.issubdtype(nxd.signal.dtype, numpy.bool_)
-        else:
-            self.isNumeric = isinstance(data, numbers.Number)
-            self.isComplex = isinstance(data, numbers.Complex)
-            self.isBoolean = isinstance(data, bool)
-            self.isRecord = False
+            return self.nxdata.signal.dtype
+        return None
 
+    @_cachedProperty
+    def isVoid(self):
+        if not hasattr(self.__data, "dtype"):
+            return False
+        # That's a real opaque type, else it is a structured type
+        dtype = self.dtype
+        return numpy.issubdtype(dtype, numpy.void) and dtype.fields is None
+
+    @_cachedProperty
+    def isNumeric(self):
+        if self.dtype is None:
+            return isinstance(self.__data, numbers.Number)
+        return numpy.issubdtype(self.dtype, numpy.number)
+
+    @_cachedProperty
+    def isRecord(self):
+        if not hasattr(self.__data, "dtype"):
+            return False
+        return self.dtype.fields is not None
+
+    @_cachedProperty
+    def isComplex(self):
+        if self.dtype is None:
+            return isinstance(self.__data, numbers.Complex)
+        return numpy.issubdtype(self.dtype, numpy.complexfloating)
+
+    @_cachedProperty
+    def isBoolean(self):
+        if self.dtype is None:
+            return isinstance(self.__data, bool)
+        return numpy.issubdtype(self.dtype, numpy.bool_)
+
+    @_cachedProperty
+    def shape(self):
+        data = self.__data
         if hasattr(data, "shape"):
-            self.shape = data.shape
+            return data.shape
         elif self.hasNXdata:
-            self.shape = nxd.signal.shape
-        else:
-            self.shape = tuple()
-        if self.shape is not None:
-            self.dim = len(self.shape)
-
+            return self.nxdata.signal.shape
+        return tuple()
+
+    @_cachedProperty
+    def dim(self):
+        if self.shape is None:
+            return 0
+        return len(self.shape)
+
+    @_cachedProperty
+    def size(self):
+        data = self.__data
+        if data is None:
+            return 0
         if hasattr(data, "shape") and data.shape is None:
             # This test is expected to avoid to fall done on the h5py issue
             # https://github.com/h5py/h5py/issues/1044
-            self.size = 0
+            return 0
         elif hasattr(data, "size"):
-            self.size = int(data.size)
-        else:
-            self.size = 1
+            return int(data.size)
+        return 1
 
     def normalizeData(self, data):
         """Returns a normalized data if the embed a numpy or a dataset.
@@ -1091,7 +1170,7 @@ class _InvalidNXdataView(DataView):
             self._msg = "NXdata seems valid, but cannot be displayed "
             self._msg += "by any existing plot widget."
         else:
-            nx_class = get_attr_as_unicode(data, "NX_class")
+            nx_class = info.nxClass
             if nx_class == "NXdata":
                 # invalid: could not even be parsed by NXdata
                 self._msg = "Group has @NX_class = NXdata, but could not be interpreted"
@@ -1154,10 +1233,8 @@ class _NXdataScalarView(DataView):
                                       labels=True)
 
     def getDataPriority(self, data, info):
-        data = self.normalizeData(data)
-
         if info.hasNXdata and not info.isInvalidNXdata:
-            nxd = nxdata.get_default(data, validate=False)
+            nxd = info.nxdata
             if nxd.signal_is_0d or nxd.interpretation in ["scalar", "scaler"]:
                 return 100
         return DataView.UNSUPPORTED
@@ -1213,9 +1290,8 @@ class _NXdataCurveView(DataView):
                                        title=nxd.title or signals_names[0])
 
     def getDataPriority(self, data, info):
-        data = self.normalizeData(data)
         if info.hasNXdata and not info.isInvalidNXdata:
-            if nxdata.get_default(data, validate=False).is_curve:
+            if info.nxdata.is_curve:
                 return 100
         return DataView.UNSUPPORTED
 
@@ -1267,9 +1343,8 @@ class _NXdataXYVScatterView(DataView):
                                          scatter_titles=[nxd.signal_name] + nxd.auxiliary_signals_names)
 
     def getDataPriority(self, data, info):
-        data = self.normalizeData(data)
         if info.hasNXdata and not info.isInvalidNXdata:
-            if nxdata.get_default(data, validate=False).is_x_y_value_scatter:
+            if info.nxdata.is_x_y_value_scatter:
                 return 100
 
         return DataView.UNSUPPORTED
@@ -1314,10 +1389,8 @@ class _NXdataImageView(DataView):
             title=nxd.title, isRgba=isRgba)
 
     def getDataPriority(self, data, info):
-        data = self.normalizeData(data)
-
         if info.hasNXdata and not info.isInvalidNXdata:
-            if nxdata.get_default(data, validate=False).is_image:
+            if info.nxdata.is_image:
                 return 100
 
         return DataView.UNSUPPORTED
@@ -1360,9 +1433,8 @@ class _NXdataStackView(DataView):
         widget.getStackView().setColormap(self.defaultColormap())
 
     def getDataPriority(self, data, info):
-        data = self.normalizeData(data)
         if info.hasNXdata and not info.isInvalidNXdata:
-            if nxdata.get_default(data, validate=False).is_stack:
+            if info.nxdata.is_stack:
                 return 100
 
         return DataView.UNSUPPORTED
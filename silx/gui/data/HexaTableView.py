@@ -50,6 +50,7 @@ class _VoidConnector(object):
 
     def __init__(self, data):
         self.__cache = collections.OrderedDict()
+        self.__textCache = collections.OrderedDict()
         self.__len = data.itemsize
         self.__data = data
 
@@ -85,6 +86,32 @@ class _VoidConnector(object):
         else:
             return value
 
+    def getRowTexts(self, row):
+        """Returns the texts displaying a row of 16 bytes.
+
+        The texts of a whole buffer of 1KB are computed at once.
+
+        :param int row: Index of the row
+        :return: List of the hexadecimal texts of the bytes of the row,
+            followed by the ASCII text of the row
+        :rtype: List[str]
+        """
+        bufferId = row >> 6
+        texts = self.__textCache.get(bufferId)
+        if texts is None:
+            data = numpy.frombuffer(self.__getBuffer(bufferId), dtype=numpy.uint8)
+            hexa = numpy.char.mod("%02X", data).tolist()
+            printable = numpy.logical_and(data > 0x20, data < 0x7F)
+            chars = numpy.where(printable, data, ord(".")).astype(numpy.uint8)
+            chars = chars.tobytes().decode("ascii")
+            texts = []
+            for pos in range(0, len(data), 0x10):
+                texts.append(hexa[pos:pos + 0x10] + [chars[pos:pos + 0x10]])
+            self.__textCache[bufferId] = texts
+            if len(self.__textCache) > 32:
+                self.__textCache.popitem(last=False)
+        return texts[row & 0b111111]
+
     def __len__(self):
         """
         Returns the number of available bytes.
@@ -142,26 +169,13 @@ class HexaTableModel(qt.QAbstractTableModel):
         column = index.column()
 
         if role == qt.Qt.DisplayRole:
+            texts = self.__connector.getRowTexts(row)
             if column == 0x10:
-                start = (row << 4)
-                text = ""
-                for i in range(0x10):
-                    pos = start + i
-                    if pos >= len(self.__connector):
-                        break
-                    value = self.__connector[pos]
-                    if value > 0x20 and value < 0x7F:
-                        text += chr(value)
-                    else:
-                        text += "."
-                return text
+                return texts[-1]
+            elif column < len(texts) - 1:
+                return texts[column]
             else:
-                pos = (row << 4) + column
-                if pos < len(self.__connector):
-                    value = self.__connector[pos]
-                    return "%02X" % value
-                else:
-                    return ""
+                return ""
         elif role == qt.Qt.FontRole:
             return self.__font
 
@@ -31,13 +31,49 @@ __authors__ = ["V. Valls"]
 __license__ = "MIT"
 __date__ = "29/01/2018"
 
-import numpy
+import collections
+from concurrent.futures import Future, ThreadPoolExecutor
 import functools
+import logging
+
+import numpy
+
 from silx.gui.widgets.FrameBrowser import HorizontalSliderWithBrowser
 from silx.gui import qt
+from silx.gui.utils.concurrent import submitToQtMainThread
 import silx.utils.weakref
 
 
+_logger = logging.getLogger(__name__)
+
+
+_executor = None
+"""Worker thread used to read slices of datasets"""
+
+
+def _getExecutor():
+    """Returns the executor used to read slices of datasets.
+
+    A single worker is used as reading from the same file can't be done in
+    parallel.
+
+    :rtype: concurrent.futures.ThreadPoolExecutor
+    """
+    global _executor
+    if _executor is None:  # Lazy-loading
+        _executor = ThreadPoolExecutor(max_workers=1)
+    return _executor
+
+
+def _selectionKey(selection):
+    """Returns a hashable key from a selection tuple.
+
+    :param tuple selection: Tuple of int and `slice(None)`
+    :rtype: tuple
+    """
+    return tuple(None if isinstance(s, slice) else s for s in selection)
+
+
 class _Axis(qt.QWidget):
     """Widget displaying an axis.
 
@@ -213,8 +249,15 @@ class NumpyAxesSelector(qt.QWidget):
 
     If the input data is a HDF5 Dataset, the selected output data will be a
     new numpy array.
+    In this case, the slices selected by moving the sliders are read in a
+    worker thread: only the newest request is displayed, the recently viewed
+    slices are cached and the adjacent slices are prefetched.
+    Use :meth:`selectedDataFuture` to get the data once it is available.
     """
 
+    SLICE_CACHE_SIZE = 8
+    """Number of slices of a dataset kept in cache"""
+
     dataChanged = qt.Signal()
     """Emitted when the input data change"""
 
@@ -237,6 +280,14 @@ class NumpyAxesSelector(qt.QWidget):
         self.__data = None
         self.__selectedData = None
         self.__selection = tuple()
+        self.__selectedDataFuture = Future()
+        self.__selectedDataFuture.set_result(None)
+        self.__requestFutures = []
+        """Futures of the pending reads of the current request"""
+        self.__requestId = 0
+        self.__pendingOrder = None
+        self.__pendingMovedAxis = None
+        self.__sliceCache = collections.OrderedDict()
         self.__axis = []
         self.__axisNames = []
         self.__customAxisNames = set([])
@@ -299,6 +350,8 @@ class NumpyAxesSelector(qt.QWidget):
             self.__axis = []
 
         self.__data = data
+        self.__cancelRequests()
+        self.__sliceCache.clear()
 
         if data is not None:
             # create expected axes
@@ -340,7 +393,7 @@ class NumpyAxesSelector(qt.QWidget):
         if name in self.__customAxisNames:
             self.customAxisChanged.emit(name, value)
         else:
-            self.__updateSelectedData()
+            self.__updateSelectedData(movedAxis=axis.axisNumber())
 
     def __axisNameChanged(self, axis, name):
         """Called when an axis name change.
@@ -397,16 +450,21 @@ class NumpyAxesSelector(qt.QWidget):
             self.selectedAxisChanged.emit()
         self.__updateSelectedData()
 
-    def __updateSelectedData(self):
+    def __updateSelectedData(self, movedAxis=None):
         """Update the selected data according to the state of the widget.
 
-        It fires a `selectionChanged` event.
+        It fires a `selectionChanged` event once the selected data is
+        available.
+
+        :param Union[int,None] movedAxis: Number of the axis which was moved
+            by the user. If set and the data is not a numpy array, the slice
+            is read asynchronously.
         """
+        self.__cancelRequests()
+
         if self.__data is None:
             if self.__selectedData is not None:
-                self.__selectedData = None
-                self.__selection = tuple()
-                self.selectionChanged.emit()
+                self.__setSelectedData(None, tuple())
             return
 
         selection = []
@@ -418,18 +476,14 @@ class NumpyAxesSelector(qt.QWidget):
             else:
                 selection.append(slice(None))
                 axisNames.append(name)
-        self.__selection = tuple(selection)
-        # get a view with few fixed dimensions
-        # with a h5py dataset, it create a copy
-        # TODO we can reuse the same memory in case of a copy
-        view = self.__data[self.__selection]
+        selection = tuple(selection)
 
         if set(self.__axisNames) - set(axisNames) != set([]):
             # Not all the expected axis are there
             if self.__selectedData is not None:
-                self.__selectedData = None
-                self.__selection = tuple()
-                self.selectionChanged.emit()
+                self.__setSelectedData(None, tuple())
+            else:
+                self.__selection = selection
             return
 
         # order axis as expected
@@ -441,11 +495,125 @@ class NumpyAxesSelector(qt.QWidget):
             source.append(axisNames.index(name))
         for _, s in sorted(zip(destination, source)):
             order.append(s)
-        view = numpy.transpose(view, order)
 
-        self.__selectedData = view
+        key = _selectionKey(selection)
+        if isinstance(self.__data, numpy.ndarray):
+            # get a view with few fixed dimensions
+            view = self.__data[selection]
+        elif key in self.__sliceCache:
+            view = self.__sliceCache.pop(key)
+            self.__sliceCache[key] = view
+        elif movedAxis is None:
+            # with a h5py dataset, it create a copy
+            view = self.__data[selection]
+            self.__storeSlice(self.__data, key, view)
+        else:
+            self.__requestSlice(selection, order, movedAxis)
+            return
+
+        self.__setSelectedData(numpy.transpose(view, order), selection)
+        if movedAxis is not None and not isinstance(self.__data, numpy.ndarray):
+            self.__prefetchSlices(selection, movedAxis)
+
+    def __setSelectedData(self, data, selection):
+        """Set the selected data and fire a `selectionChanged` event."""
+        self.__selectedData = data
+        self.__selection = selection
+        if self.__selectedDataFuture.done():
+            self.__selectedDataFuture = Future()
+        self.__selectedDataFuture.set_result(data)
         self.selectionChanged.emit()
 
+    def __cancelRequests(self):
+        """Cancel pending reads, their result will be ignored"""
+        self.__requestId += 1
+        for future in self.__requestFutures:
+            future.cancel()
+        self.__requestFutures = []
+
+    def __storeSlice(self, data, key, view):
+        """Store a slice read from `data` in the cache"""
+        if data is not self.__data:
+            return  # Outdated
+        self.__sliceCache.pop(key, None)
+        self.__sliceCache[key] = view
+        while len(self.__sliceCache) > self.SLICE_CACHE_SIZE:
+            self.__sliceCache.popitem(last=False)
+
+    def __submitRead(self, selection, callback, errback=None):
+        """Read a selection in the worker thread.
+
+        :param tuple selection: The selection to read
+        :param callable callback: Called in the Qt main thread with the
+            request id, the data and the read slice.
+        :param Union[callable,None] errback: Called in the Qt main thread
+            with the request id and the exception if the read fails.
+        """
+        data = self.__data
+        future = _getExecutor().submit(data.__getitem__, selection)
+        requestId = self.__requestId
+        callback = silx.utils.weakref.WeakMethodProxy(callback)
+        if errback is not None:
+            errback = silx.utils.weakref.WeakMethodProxy(errback)
+
+        def done(future):
+            if future.cancelled():
+                return
+            try:
+                view = future.result()
+            except Exception as e:
+                _logger.error("Error while reading data", exc_info=True)
+                if errback is not None:
+                    submitToQtMainThread(errback, requestId, e)
+                return
+            submitToQtMainThread(callback, requestId, data, selection, view)
+
+        future.add_done_callback(done)
+        self.__requestFutures.append(future)
+
+    def __requestSlice(self, selection, order, movedAxis):
+        """Read a slice asynchronously and set it as the selected data."""
+        if self.__selectedDataFuture.done():
+            self.__selectedDataFuture = Future()
+        self.__pendingOrder = order
+        self.__pendingMovedAxis = movedAxis
+        self.__submitRead(selection, self.__sliceRead, self.__sliceReadFailed)
+
+    def __sliceRead(self, requestId, data, selection, view):
+        """Called in the Qt main thread when the requested slice was read"""
+        self.__storeSlice(data, _selectionKey(selection), view)
+        if requestId != self.__requestId:
+            return  # Outdated request
+        self.__setSelectedData(numpy.transpose(view, self.__pendingOrder),
+                               selection)
+        self.__prefetchSlices(selection, self.__pendingMovedAxis)
+
+    def __sliceReadFailed(self, requestId, error):
+        """Called in the Qt main thread when the requested slice read failed
+        """
+        if requestId != self.__requestId:
+            return  # Outdated request
+        if self.__selectedDataFuture.done():
+            self.__selectedDataFuture = Future()
+        self.__selectedDataFuture.set_exception(error)
+
+    def __prefetchSlices(self, selection, movedAxis):
+        """Read the slices adjacent to the selection along the moved axis"""
+        size = self.__data.shape[movedAxis]
+        for delta in (1, -1):
+            index = selection[movedAxis] + delta
+            if not 0 <= index < size:
+                continue
+            adjacent = list(selection)
+            adjacent[movedAxis] = index
+            adjacent = tuple(adjacent)
+            if _selectionKey(adjacent) not in self.__sliceCache:
+                self.__submitRead(adjacent, self.__slicePrefetched)
+
+    def __slicePrefetched(self, requestId, data, selection, view):
+        """Called in the Qt main thread when a slice was prefetched"""
+        self.__storeSlice(data, _selectionKey(selection), view)
+
     def data(self):
         """Returns the input data.
 
@@ -460,6 +628,19 @@ class NumpyAxesSelector(qt.QWidget):
         """
         return self.__selectedData
 
+    def selectedDataFuture(self):
+        """Returns a future of the output data.
+
+        The future is done once the data of the current selection is
+        available. Its callbacks are called in the Qt main thread.
+        If the selection changes before, it provides the data of the newest
+        selection.
+        If reading the data fails, the future holds the raised exception.
+
+        :rtype: concurrent.futures.Future
+        """
+        return self.__selectedDataFuture
+
     def selection(self):
         """Returns the selection tuple used to slice the data.
 
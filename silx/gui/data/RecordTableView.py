@@ -28,6 +28,7 @@ array using compound data types or hdf5 databases.
 """
 from __future__ import division
 
+import collections
 import itertools
 import numpy
 from silx.gui import qt
@@ -149,12 +150,20 @@ class RecordTableModel(qt.QAbstractTableModel):
     :param qt.QObject parent: Parent object
     :param numpy.ndarray data: A numpy array or a h5py dataset
     """
+
+    TILE_ROWS = 128
+    """Number of rows read and formatted at once"""
+
+    MAX_TILES = 16
+    """Maximum number of tiles kept in cache"""
+
     def __init__(self, parent=None, data=None):
         qt.QAbstractTableModel.__init__(self, parent)
 
         self.__data = None
         self.__is_array = False
         self.__fields = None
+        self.__tiles = collections.OrderedDict()
         self.__formatter = None
         self.__editFormatter = None
         self.setFormatter(TextFormatter(self))
@@ -191,7 +200,15 @@ class RecordTableModel(qt.QAbstractTableModel):
         if self.__is_array:
             if index.row() >= len(self.__data):
                 return None
-            data = self.__data[index.row()]
+            if self.__fields is not None and index.column() >= len(self.__fields):
+                return None
+            if role == qt.Qt.DisplayRole:
+                return self.__getText(index.row(), index.column(),
+                                      role, self.__formatter)
+            elif role == qt.Qt.EditRole:
+                return self.__getText(index.row(), index.column(),
+                                      role, self.__editFormatter)
+            return None
         else:
             if index.row() > 0:
                 return None
@@ -214,6 +231,58 @@ class RecordTableModel(qt.QAbstractTableModel):
             return self.__editFormatter.toString(data, dtype=dtype)
         return None
 
+    def __getText(self, row, column, role, formatter):
+        """Returns the text of a cell, formatting a tile of the column
+        at once.
+
+        :param int row: Row of the cell
+        :param int column: Column of the cell
+        :param role: Role of the text, used to cache it
+        :param TextFormatter formatter: Formatter used for the text
+        :rtype: str
+        """
+        tileId = row // self.TILE_ROWS
+        tile = self.__tiles.pop(tileId, None)
+        if tile is None:
+            start = tileId * self.TILE_ROWS
+            data = numpy.asarray(self.__data[start:start + self.TILE_ROWS])
+            tile = data, {}
+            while len(self.__tiles) >= self.MAX_TILES:
+                self.__tiles.popitem(last=False)
+        self.__tiles[tileId] = tile
+
+        data, texts = tile
+        texts = texts.setdefault(role, {})
+        columnTexts = texts.get(column)
+        if columnTexts is None:
+            columnTexts = self.__formatColumn(data, column, formatter)
+            texts[column] = columnTexts
+        return columnTexts[row - tileId * self.TILE_ROWS]
+
+    def __formatColumn(self, data, column, formatter):
+        """Format the values of a column of a tile
+
+        :param numpy.ndarray data: Rows of the tile
+        :param int column: Column to format
+        :param TextFormatter formatter: Formatter to use
+        :rtype: Union[numpy.ndarray,List[str]]
+        """
+        dtype = self.__data.dtype
+        if self.__fields is not None:
+            key = self.__fields[column][1]
+            # use the dtype of the dataset, which keeps h5py special dtypes
+            dtype = dtype.fields[key[0]][0]
+            data = data[key[0]]
+            if len(key) > 1:
+                data = data[(slice(None),) + key[1]]
+                dtype = dtype.base
+
+        if dtype.kind == "O":
+            # no dtype in case of 1D array of unicode objects (#2093)
+            return [formatter.toString(d, dtype=getattr(d, "dtype", None))
+                    for d in data]
+        return formatter.toStrings(data, dtype)
+
     def headerData(self, section, orientation, role=qt.Qt.DisplayRole):
         """Returns the 0-based row or column index, for display in the
         horizontal and vertical headers"""
@@ -266,6 +335,7 @@ class RecordTableModel(qt.QAbstractTableModel):
             self.beginResetModel()
 
         self.__data = data
+        self.__tiles.clear()
         if isinstance(data, numpy.ndarray):
             self.__is_array = True
         elif silx.io.is_dataset(data) and data.shape != tuple():
@@ -317,6 +387,8 @@ class RecordTableModel(qt.QAbstractTableModel):
 
         self.__formatter = formatter
         self.__editFormatter = TextFormatter(formatter)
+        for _data, texts in self.__tiles.values():
+            texts.clear()
         self.__editFormatter.setUseQuoteForText(False)
 
         if self.__formatter is not None:
@@ -339,6 +411,8 @@ class RecordTableModel(qt.QAbstractTableModel):
         """
         self.__editFormatter = TextFormatter(self, self.getFormatter())
         self.__editFormatter.setUseQuoteForText(False)
+        for _data, texts in self.__tiles.values():
+            texts.clear()
         self.reset()
 
 
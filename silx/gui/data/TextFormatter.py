@@ -393,3 +393,68 @@ class TextFormatter(qt.QObject):
             # That's a numpy object
             return str(data)
         return str(data)
+
+    def toStrings(self, data, dtype=None):
+        """Format all the values of an array into strings using formatter
+        options
+
+        Integer, floating-point and boolean values are formatted with
+        vectorized numpy operations, and compound data types are formatted
+        field by field. Other values are formatted one by one with
+        :meth:`toString`.
+
+        :param numpy.ndarray data: Array of values to render
+        :param dtype: enforce a dtype (mostly used to remember the h5py dtype,
+             special h5py dtypes are not propagated from array to items)
+        :return: Array of str with the same shape as data
+        :rtype: numpy.ndarray
+        """
+        data = numpy.asarray(data)
+        if dtype is None:
+            dtype = data.dtype
+        texts = self.__formatArray(data, dtype)
+        if texts is None:
+            texts = numpy.empty(data.shape, dtype=object)
+            for index in numpy.ndindex(data.shape):
+                texts[index] = self.toString(data[index], dtype)
+        return texts
+
+    def __formatArray(self, data, dtype):
+        """Format an array of values using numpy vectorized operations.
+
+        :rtype: Union[numpy.ndarray,None]
+        :return: Array of str, or None if the data type is not supported
+        """
+        if dtype.kind in "iu":
+            if h5py is not None and h5py.check_dtype(enum=dtype) is not None:
+                return None
+            return numpy.char.mod(self.__integerFormat, data).astype(object)
+        elif dtype.kind == "f":
+            return numpy.char.mod(self.__floatFormat, data).astype(object)
+        elif dtype.kind == "b":
+            texts = numpy.empty(data.shape, dtype=object)
+            texts[...] = "False"
+            texts[data.astype(bool)] = "True"
+            return texts
+        elif dtype.kind == "V" and dtype.fields is not None:
+            texts = None
+            for name, field in dtype.fields.items():
+                field_dtype = field[0]
+                if field_dtype.shape != ():
+                    # Sub-arrays are formatted item by item
+                    field_data = data[name]
+                    field_texts = numpy.empty(data.shape, dtype=object)
+                    for index in numpy.ndindex(data.shape):
+                        field_texts[index] = self.toString(field_data[index],
+                                                           field_dtype)
+                else:
+                    field_texts = self.toStrings(data[name], field_dtype)
+                field_texts = name + ":" + field_texts
+                if texts is None:
+                    texts = field_texts
+                else:
+                    texts = texts + " " + field_texts
+            if texts is None:
+                return None
+            return "(" + texts + ")"
+        return None
@@ -282,6 +282,44 @@ class TestH5pyArrayWidget(TestCaseQt):
 
         h5f.close()
 
+    def testTiledRead(self):
+        """Check cells of a dataset are read by tiles aligned on chunks"""
+        h5f = h5py.File(self.h5_fname, "r+")
+        data = numpy.arange(300 * 100).reshape(300, 100)
+        dataset = h5f.create_dataset("chunked", data=data, chunks=(50, 20),
+                                     compression="gzip")
+
+        class _CountingDataset(object):
+            def __init__(self, dataset):
+                self.shape = dataset.shape
+                self.dtype = dataset.dtype
+                self.chunks = dataset.chunks
+                self.dataset = dataset
+                self.nbReads = 0
+
+            def __getitem__(self, item):
+                self.nbReads += 1
+                return self.dataset[item]
+
+        counting = _CountingDataset(dataset)
+        model = self.aw.model
+        model.setArrayData(counting, copy=False)
+        self.assertEqual(model._tileShape, (150, 40))
+
+        formatter = model.getFormatter()
+        for row in range(0, 300, 7):
+            for column in range(0, 100, 3):
+                index = model.index(row, column)
+                self.assertEqual(
+                    model.data(index),
+                    formatter.toString(data[row, column], data.dtype))
+        self.assertEqual(counting.nbReads, 2 * 3)
+
+        # Browse again: cells are served from the cache
+        model.data(model.index(0, 0))
+        self.assertEqual(counting.nbReads, 2 * 3)
+        h5f.close()
+
     def testReferenceReturned(self):
         """when setting the data with copy=False and
         retrieving it with getData(copy=False), we should recover
@@ -37,6 +37,7 @@ from ..DataViews import DataView
 from .. import DataViews
 
 from silx.gui import qt
+from silx.io import commonh5
 
 from silx.gui.data.DataViewerFrame import DataViewerFrame
 from silx.gui.utils.testutils import SignalListener
@@ -305,12 +306,86 @@ class TestDataView(TestCaseQt):
         self.qWaitForWindowExposed(widget)
 
 
+class TestDataInfo(unittest.TestCase):
+
+    def testNumpy(self):
+        info = DataViews.DataInfo(numpy.arange(6).reshape(2, 3))
+        self.assertTrue(info.isArray)
+        self.assertTrue(info.isNumeric)
+        self.assertFalse(info.isComplex)
+        self.assertEqual(info.shape, (2, 3))
+        self.assertEqual(info.dim, 2)
+        self.assertEqual(info.size, 6)
+        self.assertFalse(info.hasNXdata)
+        self.assertIsNone(info.nxdata)
+
+    def testNone(self):
+        info = DataViews.DataInfo(None)
+        self.assertFalse(info.isArray)
+        self.assertEqual(info.size, 0)
+        self.assertEqual(info.shape, tuple())
+        self.assertFalse(info.isInvalidNXdata)
+        self.assertIsNone(info.nxClass)
+
+    def testBytesAttributes(self):
+        group = commonh5.Group("group", attrs={"NX_class": b"NXentry"})
+        info = DataViews.DataInfo(group)
+        self.assertEqual(info.nxClass, u"NXentry")
+
+        dataset = commonh5.Dataset("dataset", data=numpy.ones((4, 5)),
+                                   attrs={"interpretation": numpy.bytes_(b"image")})
+        info = DataViews.DataInfo(dataset)
+        self.assertIsNone(info.nxClass)
+        self.assertEqual(info.interpretation, u"image")
+
+    @unittest.skipIf(h5py is None, "Could not import h5py")
+    def testNXdata(self):
+        tmpdir = tempfile.mkdtemp()
+        filename = os.path.join(tmpdir, "nxdata.h5")
+        try:
+            with h5py.File(filename, "w") as h5:
+                h5.attrs["default"] = "entry"
+                entry = h5.create_group("entry")
+                entry.attrs["NX_class"] = "NXentry"
+                entry.attrs["default"] = "data"
+                data = entry.create_group("data")
+                data.attrs["NX_class"] = "NXdata"
+                data.attrs["signal"] = "image"
+                dataset = data.create_dataset("image", data=numpy.ones((4, 5)))
+                dataset.attrs["interpretation"] = "image"
+
+                info = DataViews.DataInfo(h5)
+                self.assertTrue(info.hasNXdata)
+                self.assertFalse(info.isInvalidNXdata)
+                self.assertEqual(info.defaultPath, "/entry/data")
+                self.assertEqual(info.shape, (4, 5))
+                self.assertTrue(info.isNumeric)
+                self.assertFalse(info.isArray)
+                self.assertEqual(info.interpretation, "image")
+                self.assertTrue(info.nxdata.is_image)
+                # Computed once and shared
+                self.assertIs(info.nxdata, info.nxdata)
+
+                info = DataViews.DataInfo(entry)
+                self.assertEqual(info.nxClass, "NXentry")
+                self.assertEqual(info.defaultPath, "/entry/data")
+
+                info = DataViews.DataInfo(dataset)
+                self.assertTrue(info.isArray)
+                self.assertEqual(info.interpretation, "image")
+                self.assertIsNone(info.nxdata)
+        finally:
+            os.unlink(filename)
+            os.rmdir(tmpdir)
+
+
 def suite():
     test_suite = unittest.TestSuite()
     loadTestsFromTestCase = unittest.defaultTestLoader.loadTestsFromTestCase
     test_suite.addTest(loadTestsFromTestCase(TestDataViewer))
     test_suite.addTest(loadTestsFromTestCase(TestDataViewerFrame))
     test_suite.addTest(loadTestsFromTestCase(TestDataView))
+    test_suite.addTest(loadTestsFromTestCase(TestDataInfo))
     return test_suite
 
 
@@ -133,6 +133,76 @@ class TestNumpyAxesSelector(TestCaseQt):
             result = widget.selectedData()
             self.assertTrue(numpy.array_equal(result, expectedResult))
 
+    def test_h5py_dataset_async(self):
+        if h5py is None:
+            self.skipTest("h5py library is not available")
+        with self.h5_temporary_file() as h5file:
+            dataset = h5file["data"]
+
+            widget = NumpyAxesSelector()
+            widget.setAxisNames(["y", "x"])
+            widget.setData(dataset)
+            listener = SignalListener()
+            widget.selectionChanged.connect(listener)
+
+            # Move the slider twice: the last selection is displayed
+            slider = widget._NumpyAxesSelector__axis[0].slider()
+            slider.setValue(1)
+            slider.setValue(2)
+            future = widget.selectedDataFuture()
+            for _ in range(100):
+                if future.done():
+                    break
+                self.qWait(10)
+            self.assertTrue(numpy.array_equal(future.result(), dataset[2]))
+            self.assertTrue(numpy.array_equal(widget.selectedData(), dataset[2]))
+            self.assertEqual(widget.selection(), (2, slice(None), slice(None)))
+            self.qWait(100)
+            self.assertTrue(numpy.array_equal(widget.selectedData(), dataset[2]))
+
+            # The adjacent slice was prefetched
+            listener.clear()
+            slider.setValue(1)
+            self.assertEqual(listener.callCount(), 1)
+            self.assertTrue(numpy.array_equal(widget.selectedData(), dataset[1]))
+
+    def test_h5py_dataset_async_error(self):
+        if h5py is None:
+            self.skipTest("h5py library is not available")
+        with self.h5_temporary_file() as h5file:
+            dataset = h5file["data"]
+
+            class FailingDataset(object):
+                """Dataset-like object failing to read slices other than 0"""
+                shape = dataset.shape
+                dtype = dataset.dtype
+                ndim = dataset.ndim
+
+                def __getitem__(self, selection):
+                    if selection[0] != 0:
+                        raise IOError("Failing read")
+                    return dataset[selection]
+
+            widget = NumpyAxesSelector()
+            widget.setAxisNames(["y", "x"])
+            widget.setData(FailingDataset())
+
+            slider = widget._NumpyAxesSelector__axis[0].slider()
+            slider.setValue(1)
+            future = widget.selectedDataFuture()
+            for _ in range(100):
+                if future.done():
+                    break
+                self.qWait(10)
+            self.assertTrue(future.done())
+            self.assertIsInstance(future.exception(), IOError)
+
+            # Next successful request provides a new future
+            slider.setValue(0)
+            future = widget.selectedDataFuture()
+            self.assertTrue(future.done())
+            self.assertTrue(numpy.array_equal(future.result(), dataset[0]))
+
     def test_data_event(self):
         data = numpy.arange(3 * 3 * 3)
         widget = NumpyAxesSelector()
@@ -103,6 +103,35 @@ class TestTextFormatter(TestCaseQt):
         result = formatter.toString(numpy.bytes_(b"\xB0"))
         self.assertEqual(result, u'"\u00B0"')
 
+    def test_to_strings(self):
+        formatter = TextFormatter()
+        formatter.setFloatFormat("%.2f")
+        formatter.setIntegerFormat("%03i")
+        arrays = [numpy.arange(6).reshape(2, 3),
+                  numpy.linspace(0, 1, 6).reshape(3, 2),
+                  numpy.array([True, False]),
+                  numpy.array([1 + 2j, -3j]),
+                  numpy.array([b"abc", b"\xB0"])]
+        for array in arrays:
+            result = formatter.toStrings(array)
+            self.assertEqual(result.shape, array.shape)
+            for index in numpy.ndindex(array.shape):
+                self.assertEqual(result[index],
+                                 formatter.toString(array[index], array.dtype))
+
+    def test_to_strings_compound(self):
+        formatter = TextFormatter()
+        dtype = numpy.dtype([("a", numpy.int32),
+                             ("b", numpy.float64),
+                             ("c", numpy.uint8, (2,)),
+                             ("d", "S3")])
+        array = numpy.array([(1, 0.5, (1, 2), b"x"),
+                             (2, -1.5, (3, 4), b"yz")], dtype=dtype)
+        result = formatter.toStrings(array)
+        self.assertEqual(result[0], '(a:1 b:0.5 c:[1 2] d:"x")')
+        for index in range(len(array)):
+            self.assertEqual(result[index], formatter.toString(array[index]))
+
 
 class TestTextFormatterWithH5py(TestCaseQt):
 
@@ -192,6 +221,8 @@ class TestTextFormatterWithH5py(TestCaseQt):
         d = self.create_dataset(data=d)
         result = self.formatter.toString(d[()], dtype=d.dtype)
         self.assertEqual(result, '[BLUE(42) GREEN(1) 100]')
+        result = self.formatter.toStrings(d[()], dtype=d.dtype)
+        self.assertEqual(list(result), ['BLUE(42)', 'GREEN(1)', '100'])
 
     def testArrayRef(self):
         dtype = h5py.special_dtype(ref=h5py.Reference)
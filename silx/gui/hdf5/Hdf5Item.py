@@ -52,6 +52,9 @@ class Hdf5Item(Hdf5Node):
     tree structure.
     """
 
+    INCREMENTAL_POPULATION_THRESHOLD = 1000
+    """Number of children above which a group is populated by batches"""
+
     def __init__(self, text, obj, parent, key=None, h5Class=None, linkClass=None, populateAll=False):
         """
         :param str text: text displayed
@@ -65,6 +68,10 @@ class Hdf5Item(Hdf5Node):
         self.__text = text
         self.__linkClass = linkClass
         self.__nx_class = None
+        self.__incremental = None
+        self.__listingStarted = False
+        self.__listingFinished = False
+        self.__listedChildren = []
         Hdf5Node.__init__(self, parent, populateAll=populateAll)
 
     def _getCanonicalName(self):
@@ -150,6 +157,8 @@ class Hdf5Item(Hdf5Node):
 
     def _expectedChildCount(self):
         if self.isGroupObj():
+            if self.isPopulatedIncrementally():
+                return 0
             return len(self.obj)
         return 0
 
@@ -218,49 +227,85 @@ class Hdf5Item(Hdf5Node):
         self.__key = None
 
     def _populateChild(self, populateAll=False):
-        if self.isGroupObj():
-            keys = []
-            try:
-                for name in self.obj:
-                    keys.append(name)
-            except Exception:
-                lib_name = self.obj.__class__.__module__.split(".")[0]
-                _logger.error("Internal %s error. The file is corrupted.", lib_name)
-                _logger.debug("Backtrace", exc_info=True)
-                if keys == []:
-                    # If the file was open in READ_ONLY we still can reach something
-                    # https://github.com/silx-kit/silx/issues/2262
-                    try:
-                        for name in self.obj:
-                            keys.append(name)
-                    except Exception:
-                        lib_name = self.obj.__class__.__module__.split(".")[0]
-                        _logger.error("Internal %s error (second time). The file is corrupted.", lib_name)
-                        _logger.debug("Backtrace", exc_info=True)
-            for name in keys:
+        if not self.isGroupObj():
+            return
+        if self.isPopulatedIncrementally():
+            # Children are provided by batches through `_appendListedChildren`
+            return
+        for name, h5class, link in _utils.iterChildren(self.obj):
+            self.appendChild(self._createChild(name, h5class, link))
+
+    def _createChild(self, name, h5Class, linkClass):
+        """Create a lazy loaded child node.
+
+        :param str name: Name of the child in this group
+        :param H5Type h5Class: Class of the child, if known
+        :param H5Type linkClass: Class of the link to the child
+        :rtype: Hdf5Item
+        """
+        return Hdf5Item(text=name, obj=None, parent=self, key=name,
+                        h5Class=h5Class, linkClass=linkClass)
+
+    def isPopulatedIncrementally(self):
+        """Returns true if the children of this node are populated by batches.
+
+        This is the case for groups containing more than
+        :attr:`INCREMENTAL_POPULATION_THRESHOLD` children. The children of
+        such a node are listed in a worker thread and inserted to the model
+        through `canFetchMore`/`fetchMore`.
+
+        :rtype: bool
+        """
+        if self.__incremental is None:
+            self.__incremental = False
+            if self.isGroupObj():
                 try:
-                    class_ = self.obj.get(name, getclass=True)
-                    link = self.obj.get(name, getclass=True, getlink=True)
-                    link = silx.io.utils.get_h5_class(class_=link)
+                    count = len(self.obj)
                 except Exception:
-                    lib_name = self.obj.__class__.__module__.split(".")[0]
-                    _logger.error("Internal %s error", lib_name)
                     _logger.debug("Backtrace", exc_info=True)
-                    class_ = None
-                    try:
-                        link = self.obj.get(name, getclass=True, getlink=True)
-                        link = silx.io.utils.get_h5_class(class_=link)
-                    except Exception:
-                        _logger.debug("Backtrace", exc_info=True)
-                        link = silx.io.utils.H5Type.HARD_LINK
-
-                h5class = None
-                if class_ is not None:
-                    h5class = silx.io.utils.get_h5_class(class_=class_)
-                    if h5class is None:
-                        _logger.error("Class %s unsupported", class_)
-                item = Hdf5Item(text=name, obj=None, parent=self, key=name, h5Class=h5class, linkClass=link)
-                self.appendChild(item)
+                else:
+                    self.__incremental = count > self.INCREMENTAL_POPULATION_THRESHOLD
+        return self.__incremental
+
+    def canFetchMore(self):
+        if not self.isPopulatedIncrementally():
+            return False
+        return not self.__listingFinished or len(self.__listedChildren) > 0
+
+    def _isListingStarted(self):
+        """Returns true if the listing of the children was started.
+
+        :rtype: bool
+        """
+        return self.__listingStarted
+
+    def _setListingStarted(self):
+        """Flag the listing of the children as started"""
+        self.__listingStarted = True
+
+    def _addListedChildren(self, children, finished):
+        """Store children listed by a worker, until they are inserted.
+
+        :param List[Tuple] children: List of `(name, h5Class, linkClass)`
+            as returned by :func:`_utils.iterChildren`
+        :param bool finished: True if the listing is over
+        """
+        self.__listedChildren.extend(children)
+        if finished:
+            self.__listingFinished = True
+
+    def _takeListedChildren(self, count=None):
+        """Create and returns the next children to be inserted.
+
+        :param Union[int,None] count: Max number of children to returns,
+            all available ones if None
+        :rtype: List[Hdf5Item]
+        """
+        if count is None:
+            count = len(self.__listedChildren)
+        entries = self.__listedChildren[:count]
+        del self.__listedChildren[:count]
+        return [self._createChild(*entry) for entry in entries]
 
     def hasChildren(self):
         """Retuens true of this node have chrild.
@@ -269,6 +314,8 @@ class Hdf5Item(Hdf5Node):
         """
         if not self.isGroupObj():
             return False
+        if self.isPopulatedIncrementally():
+            return True
         return Hdf5Node.hasChildren(self)
 
     def _getDefaultIcon(self):
@@ -159,6 +159,15 @@ class Hdf5Node(object):
             self.__child = []
             self._populateChild()
 
+    def canFetchMore(self):
+        """Returns true if more children can be fetched.
+
+        Overwrite it for nodes which are populated by batches.
+
+        :rtype: bool
+        """
+        return False
+
     def _expectedChildCount(self):
         """Returns the expected count of children
 
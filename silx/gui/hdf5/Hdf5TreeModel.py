@@ -157,6 +157,53 @@ class LoadingItemRunnable(qt.QRunnable):
         return True
 
 
+class ListingChildrenRunnable(qt.QRunnable):
+    """Runner listing the children of a large group by batches"""
+
+    class __Signals(qt.QObject):
+        """Signal holder"""
+        childrenListed = qt.Signal(object, object, bool)
+        runnerFinished = qt.Signal(object)
+
+    def __init__(self, item, batchSize):
+        """Constructor
+
+        :param Hdf5Item item: Item of the group to list
+        :param int batchSize: Number of children sent per batch
+        """
+        super(ListingChildrenRunnable, self).__init__()
+        self.item = item
+        self.batchSize = batchSize
+        self.signals = self.__Signals()
+
+    @property
+    def childrenListed(self):
+        return self.signals.childrenListed
+
+    @property
+    def runnerFinished(self):
+        return self.signals.runnerFinished
+
+    def run(self):
+        """List the children and send them by batches as a signal."""
+        batch = []
+        try:
+            for child in _utils.iterChildren(self.item.obj):
+                batch.append(child)
+                if len(batch) >= self.batchSize:
+                    self.childrenListed.emit(self.item, batch, False)
+                    batch = []
+        except Exception:
+            _logger.error("Error while listing children of %s",
+                          self.item.basename)
+            _logger.debug("Backtrace", exc_info=True)
+        self.childrenListed.emit(self.item, batch, True)
+        self.runnerFinished.emit(self)
+
+    def autoDelete(self):
+        return True
+
+
 class Hdf5TreeModel(qt.QAbstractItemModel):
     """Tree model storing a list of :class:`h5py.File` like objects.
 
@@ -205,6 +252,9 @@ class Hdf5TreeModel(qt.QAbstractItemModel):
     ]
     """List of logical columns available"""
 
+    CHILDREN_BATCH_SIZE = 500
+    """Number of rows inserted at once for groups populated by batches"""
+
     sigH5pyObjectLoaded = qt.Signal(object)
     """Emitted when a new root item was loaded and inserted to the model."""
 
@@ -541,6 +591,68 @@ class Hdf5TreeModel(qt.QAbstractItemModel):
             return 0
         return node.childCount()
 
+    def canFetchMore(self, parent):
+        node = self.nodeFromIndex(parent)
+        if node is None:
+            return False
+        return node.canFetchMore()
+
+    def fetchMore(self, parent):
+        """Insert the next children of a group populated by batches.
+
+        The children are listed in a worker thread, they are inserted by
+        batches as soon as they are available.
+        """
+        node = self.nodeFromIndex(parent)
+        if node is None or not node.canFetchMore():
+            return
+        if not node._isListingStarted():
+            node._setListingStarted()
+            runnable = ListingChildrenRunnable(node, self.CHILDREN_BATCH_SIZE)
+            runnable.childrenListed.connect(self.__childrenListed)
+            runnable.runnerFinished.connect(self.__releaseRunner)
+            self.__runnerSet.add(runnable)
+            qt.silxGlobalThreadPool().start(runnable)
+        else:
+            self.__insertListedChildren(parent, node)
+
+    def __indexFromNode(self, node):
+        """Returns the index of a node, or None if it is not part of the
+        model anymore."""
+        parent = node.parent
+        if parent is None:
+            return None
+        try:
+            row = parent.indexOfChild(node)
+        except ValueError:
+            return None
+        if parent is not self.__root and self.__indexFromNode(parent) is None:
+            return None
+        return self.createIndex(row, 0, node)
+
+    def __childrenListed(self, node, children, finished):
+        """Called in the main thread when a batch of children was listed
+
+        :param Hdf5Item node: The group which is populated
+        :param List children: Batch of children description
+        :param bool finished: True if it is the last batch
+        """
+        node._addListedChildren(children, finished)
+        index = self.__indexFromNode(node)
+        if index is not None:
+            self.__insertListedChildren(index, node)
+
+    def __insertListedChildren(self, index, node):
+        """Insert the children already listed by the worker"""
+        children = node._takeListedChildren()
+        if len(children) == 0:
+            return
+        first = node.childCount()
+        self.beginInsertRows(index, first, first + len(children) - 1)
+        for child in children:
+            node.appendChild(child)
+        self.endInsertRows()
+
     def parent(self, child):
         if not child.isValid():
             return qt.QModelIndex()
@@ -86,7 +86,11 @@ class NexusSortFilterProxyModel(qt.QSortFilterProxyModel):
         left = self.sourceModel().data(sourceLeft, Hdf5TreeModel.H5PY_ITEM_ROLE)
         right = self.sourceModel().data(sourceRight, Hdf5TreeModel.H5PY_ITEM_ROLE)
 
-        if self.__isNXentry(left) and self.__isNXentry(right):
+        # Large groups are sorted by name only, to avoid loading each child
+        parent = left.parent
+        isLargeGroup = parent is not None and parent.isPopulatedIncrementally()
+
+        if not isLargeGroup and self.__isNXentry(left) and self.__isNXentry(right):
             less = self.childDatasetLessThan(left, right, "start_time")
             if less is not None:
                 return less
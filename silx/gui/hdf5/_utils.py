@@ -36,6 +36,12 @@ from .. import qt
 import silx.io.utils
 from silx.utils.html import escape
 
+try:
+    import h5py
+    from h5py import h5l, h5o
+except ImportError:
+    h5py = None
+
 _logger = logging.getLogger(__name__)
 
 
@@ -102,6 +108,138 @@ def htmlFromDict(dictionary, title=None):
     return result
 
 
+def _getLibName(group):
+    """Returns the name of the library providing the group"""
+    return group.__class__.__module__.split(".")[0]
+
+
+def _listKeys(group):
+    """Returns the names of the children of a group.
+
+    If the file is corrupted, returns what can be read.
+    """
+    keys = []
+    try:
+        for name in group:
+            keys.append(name)
+    except Exception:
+        _logger.error("Internal %s error. The file is corrupted.",
+                      _getLibName(group))
+        _logger.debug("Backtrace", exc_info=True)
+        if keys == []:
+            # If the file was open in READ_ONLY we still can reach something
+            # https://github.com/silx-kit/silx/issues/2262
+            try:
+                for name in group:
+                    keys.append(name)
+            except Exception:
+                _logger.error("Internal %s error (second time). The file is corrupted.",
+                              _getLibName(group))
+                _logger.debug("Backtrace", exc_info=True)
+    return keys
+
+
+def _iterChildrenFromGet(group):
+    """Iterate children of an h5py-like group using its `get` method"""
+    for name in _listKeys(group):
+        try:
+            class_ = group.get(name, getclass=True)
+            link = group.get(name, getclass=True, getlink=True)
+            link = silx.io.utils.get_h5_class(class_=link)
+        except Exception:
+            _logger.error("Internal %s error", _getLibName(group))
+            _logger.debug("Backtrace", exc_info=True)
+            class_ = None
+            try:
+                link = group.get(name, getclass=True, getlink=True)
+                link = silx.io.utils.get_h5_class(class_=link)
+            except Exception:
+                _logger.debug("Backtrace", exc_info=True)
+                link = silx.io.utils.H5Type.HARD_LINK
+
+        h5class = None
+        if class_ is not None:
+            h5class = silx.io.utils.get_h5_class(class_=class_)
+            if h5class is None:
+                _logger.error("Class %s unsupported", class_)
+        yield name, h5class, link
+
+
+if h5py is not None:
+    _H5L_TYPES = {
+        h5l.TYPE_HARD: silx.io.utils.H5Type.HARD_LINK,
+        h5l.TYPE_SOFT: silx.io.utils.H5Type.SOFT_LINK,
+        h5l.TYPE_EXTERNAL: silx.io.utils.H5Type.EXTERNAL_LINK,
+    }
+    """Mapping from h5py link types to H5Type"""
+
+    _H5O_TYPES = {
+        h5o.TYPE_GROUP: silx.io.utils.H5Type.GROUP,
+        h5o.TYPE_DATASET: silx.io.utils.H5Type.DATASET,
+    }
+    """Mapping from h5py object types to H5Type"""
+
+
+def _iterH5pyChildren(group):
+    """Iterate children of an h5py group using the low-level API.
+
+    The names and the link types are read in a single iteration over the
+    links of the group, without creating any h5py object.
+    """
+    links = []
+
+    def visitor(name, info):
+        links.append((name, info.type))
+
+    group.id.links.iterate(visitor, info=True)
+
+    for bname, linkType in links:
+        name = bname.decode("utf-8")
+        link = _H5L_TYPES.get(linkType, None)
+        try:
+            objType = h5o.get_info(group.id, bname).type
+        except Exception:
+            # Broken link
+            _logger.debug("Backtrace", exc_info=True)
+            h5class = None
+        else:
+            h5class = _H5O_TYPES.get(objType, None)
+            if h5class is None:
+                _logger.error("Object type %s unsupported", objType)
+        yield name, h5class, link
+
+
+def iterChildren(group):
+    """Iterate over the children of an h5py-like group.
+
+    It yields tuples `(name, h5Class, linkClass)` without loading the
+    children objects. `h5Class` is None if the link is broken.
+
+    For h5py groups the link and object types are read in a single pass using
+    the low-level API.
+    This function does not use Qt, so it can be used from any thread.
+
+    :param group: h5py-like group
+    :rtype: Iterator[Tuple[str,Union[H5Type,None],H5Type]]
+    """
+    if h5py is not None and isinstance(group, h5py.Group):
+        try:
+            # Check that the low-level iteration is working before yielding
+            iterator = _iterH5pyChildren(group)
+            first = next(iterator, None)
+        except Exception:
+            _logger.debug("Backtrace", exc_info=True)
+        else:
+            if first is not None:
+                yield first
+                for child in iterator:
+                    yield child
+            return
+
+    for child in _iterChildrenFromGet(group):
+        yield child
+
+
 class Hdf5DatasetMimeData(qt.QMimeData):
     """Mimedata class to identify an internal drag and drop of a Hdf5Node."""
 
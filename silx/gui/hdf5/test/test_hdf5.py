@@ -41,6 +41,7 @@ from silx.gui.utils.testutils import TestCaseQt
 from silx.gui import hdf5
 from silx.gui.utils.testutils import SignalListener
 from silx.io import commonh5
+import silx.io.utils
 import weakref
 
 try:
@@ -325,6 +326,42 @@ class TestHdf5TreeModel(TestCaseQt):
         self.assertEqual(displayed[hdf5.Hdf5TreeModel.DESCRIPTION_COLUMN, qt.Qt.DisplayRole], "")
         self.assertEqual(displayed[hdf5.Hdf5TreeModel.NODE_COLUMN, qt.Qt.DisplayRole], "Dataset")
 
+    def testIncrementalPopulation(self):
+        """Test that large groups are populated by batches"""
+        filename = _tmpDirectory + "/large.h5"
+        with h5py.File(filename, "w") as h5:
+            g = h5.create_group("large")
+            for i in range(30):
+                g.create_group("g%02d" % i)
+            g["soft"] = h5py.SoftLink("/large/g00")
+            g["broken"] = h5py.SoftLink("/nothing")
+
+        model = hdf5.Hdf5TreeModel()
+        with h5py.File(filename, "r") as h5:
+            model.insertH5pyObject(h5["large"])
+            index = model.index(0, 0, qt.QModelIndex())
+            node = model.nodeFromIndex(index)
+            node.INCREMENTAL_POPULATION_THRESHOLD = 10
+            model.CHILDREN_BATCH_SIZE = 7
+            self.assertTrue(model.hasChildren(index))
+            self.assertEqual(model.rowCount(index), 0)
+            self.assertTrue(model.canFetchMore(index))
+
+            model.fetchMore(index)
+            self.waitForPendingOperations(model)
+            self.assertFalse(model.canFetchMore(index))
+            self.assertEqual(model.rowCount(index), 32)
+
+            names = [model.data(model.index(row, 0, index))
+                     for row in range(32)]
+            self.assertEqual(names, sorted(h5["large"].keys()))
+            soft = model.nodeFromIndex(model.index(names.index("soft"), 0, index))
+            self.assertEqual(soft.h5Class, silx.io.utils.H5Type.GROUP)
+            self.assertEqual(soft.linkClass, silx.io.utils.H5Type.SOFT_LINK)
+            broken = model.nodeFromIndex(model.index(names.index("broken"), 0, index))
+            self.assertTrue(broken.isBrokenObj())
+            model.clear()
+
     def testDropLastAsFirst(self):
         model = hdf5.Hdf5TreeModel()
         h5_1 = commonh5.File("/foo/bar/1.mock", "w")
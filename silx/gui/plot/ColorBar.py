@@ -27,7 +27,7 @@
 
 __authors__ = ["H. Payno", "T. Vincent"]
 __license__ = "MIT"
-__date__ = "24/04/2018"
+__date__ = "19/10/2026"
 
 
 import logging
@@ -166,8 +166,9 @@ class ColorBarWidget(qt.QWidget):
 
         :param ~silx.gui.colors.Colormap colormap:
             The colormap to apply on the ColorBarWidget
-        :param numpy.ndarray data: the data to display, needed if the colormap
+        :param data: the data or item to display, needed if the colormap
             require an autoscale
+        :type data: Union[numpy.ndarray,~silx.gui.plot.items.ColormapMixIn]
         """
         self._data = data
         self.getColorScaleBar().setColormap(colormap=colormap,
@@ -223,7 +224,7 @@ class ColorBarWidget(qt.QWidget):
         activeScatter = plot._getActiveItem(kind='scatter')
 
         self.setColormap(colormap=activeScatter.getColormap(),
-                         data=activeScatter.getValueData(copy=False))
+                         data=activeScatter)
 
     def _activeImageChanged(self, previous, legend):
         """Handle plot active image changed"""
@@ -236,18 +237,16 @@ class ColorBarWidget(qt.QWidget):
             self._activeScatterChanged(None, activeScatterLegend)
         else:
             # Sync with active image
-            image = plot.getActiveImage().getData(copy=False)
+            image = plot.getActiveImage()
 
             # RGB(A) image, display default colormap
-            if image.ndim != 2:
+            if image.getData(copy=False).ndim != 2:
                 self.setColormap(colormap=None)
                 return
 
             # data image, sync with image colormap
-            # do we need the copy here : used in the case we are changing
-            # vmin and vmax but should have already be done by the plot
-            self.setColormap(colormap=plot.getActiveImage().getColormap(),
-                             data=image)
+            # The item is provided as data to use its autoscale range cache
+            self.setColormap(colormap=image.getColormap(), data=image)
 
     def _defaultColormapChanged(self, event):
         """Handle plot default colormap changed"""
@@ -405,8 +404,9 @@ class ColorScaleBar(qt.QWidget):
         """Set the new colormap to be displayed
 
         :param Colormap colormap: the colormap to set
-        :param numpy.ndarray data: the data to display, needed if the colormap
+        :param data: the data or item to display, needed if the colormap
             require an autoscale
+        :type data: Union[numpy.ndarray,~silx.gui.plot.items.ColormapMixIn]
         """
         self.colorScale.setColormap(colormap, data)
 
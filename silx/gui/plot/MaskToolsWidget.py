@@ -35,7 +35,7 @@ from __future__ import division
 
 __authors__ = ["T. Vincent", "P. Knobel"]
 __license__ = "MIT"
-__date__ = "29/08/2018"
+__date__ = "19/10/2026"
 
 
 import os
@@ -207,12 +207,8 @@ class ImageMask(BaseMask):
         :param vertices: Nx2 array of polygon corners as (row, col)
         :param bool mask: True to mask (default), False to unmask.
         """
-        fill = shapes.polygon_fill_mask(vertices, self._mask.shape)
-        if mask:
-            self._mask[fill != 0] = level
-        else:
-            self._mask[numpy.logical_and(fill != 0,
-                                         self._mask == level)] = 0
+        shapes.update_polygon(self._mask, vertices, level,
+                              mode='set' if mask else 'unset')
         self._notify()
 
     def updatePoints(self, level, rows, cols, mask=True):
@@ -247,8 +243,9 @@ class ImageMask(BaseMask):
         :param float radius: Radius of the disk in mask array unit
         :param bool mask: True to mask (default), False to unmask.
         """
-        rows, cols = shapes.circle_fill(crow, ccol, radius)
-        self.updatePoints(level, rows, cols, mask)
+        shapes.update_disk(self._mask, crow, ccol, radius, level,
+                           mode='set' if mask else 'unset')
+        self._notify()
 
     def updateLine(self, level, row0, col0, row1, col1, width, mask=True):
         """Mask/Unmask a line of the given mask level.
@@ -261,8 +258,21 @@ class ImageMask(BaseMask):
         :param int width: Width of the line in mask array unit.
         :param bool mask: True to mask (default), False to unmask.
         """
-        rows, cols = shapes.draw_line(row0, col0, row1, col1, width)
-        self.updatePoints(level, rows, cols, mask)
+        shapes.update_line(self._mask, row0, col0, row1, col1, width, level,
+                           mode='set' if mask else 'unset')
+        self._notify()
+
+    def updatePolyline(self, level, vertices, width, mask=True):
+        """Mask/Unmask a thick polyline with rounded joins (e.g., a stroke).
+
+        :param int level: Mask level to update.
+        :param vertices: Nx2 array of polyline points as (row, col)
+        :param int width: Width of the line in mask array unit.
+        :param bool mask: True to mask (default), False to unmask.
+        """
+        shapes.update_polyline(self._mask, vertices, width, level,
+                               mode='set' if mask else 'unset')
+        self._notify()
 
 
 class MaskToolsWidget(BaseMaskToolsWidget):
@@ -726,17 +736,11 @@ class MaskToolsWidget(BaseMaskToolsWidget):
             brushSize = self._getPencilWidth()
 
             if self._lastPencilPos != (row, col):
-                if self._lastPencilPos is not None:
-                    # Draw the line
-                    self._mask.updateLine(
-                        level,
-                        self._lastPencilPos[0], self._lastPencilPos[1],
-                        row, col,
-                        brushSize,
-                        doMask)
-
-                # Draw the very first, or last point
-                self._mask.updateDisk(level, row, col, brushSize / 2., doMask)
+                if self._lastPencilPos is None:  # Draw the very first point
+                    vertices = [(row, col)]
+                else:  # Draw the line and its end point at once
+                    vertices = [self._lastPencilPos, (row, col)]
+                self._mask.updatePolyline(level, vertices, brushSize, doMask)
 
             if event['event'] == 'drawingFinished':
                 self._mask.commit()
@@ -31,14 +31,18 @@ __license__ = "MIT"
 __date__ = "24/07/2018"
 
 
+from concurrent.futures import ThreadPoolExecutor
 import functools
 import logging
+import multiprocessing
 import numpy
+import weakref
 from collections import OrderedDict
 
 import silx.utils.weakref
 from silx.gui import qt
 from silx.gui import icons
+from silx.gui.utils.concurrent import submitToQtMainThread
 from silx.gui.plot.items.curve import Curve as CurveItem
 from silx.gui.plot.items.histogram import Histogram as HistogramItem
 from silx.gui.plot.items.image import ImageBase as ImageItem
@@ -50,6 +54,22 @@ from silx.gui.plot.stats.statshandler import StatsHandler, StatFormatter
 logger = logging.getLogger(__name__)
 
 
+_statsExecutor = None
+"""Pool of worker threads shared by all the :class:`StatsTable`"""
+
+
+def _getStatsExecutor():
+    """Returns the pool of threads used to compute the statistics.
+
+    :rtype: concurrent.futures.ThreadPoolExecutor
+    """
+    global _statsExecutor
+    if _statsExecutor is None:  # Lazy-loading
+        _statsExecutor = ThreadPoolExecutor(
+            max_workers=max(1, min(4, multiprocessing.cpu_count())))
+    return _statsExecutor
+
+
 class StatsWidget(qt.QWidget):
     """
     Widget displaying a set of :class:`Stat` to be displayed on a
@@ -229,6 +249,11 @@ class StatsTable(TableWidget):
         self._statsHandler = None
         self._legendsSet = []
         """list of legends actually displayed"""
+        self._statsFutures = {}
+        """Associate to a tuple(legend, kind) the pending stats computation"""
+        # Do not keep a reference on self in the slot
+        self.destroyed.connect(
+            functools.partial(self._cancelStats, self._statsFutures))
         self._resetColumns()
 
         self.setColumnCount(len(self._columns))
@@ -368,6 +393,7 @@ class StatsTable(TableWidget):
         """
         Clear all existing items
         """
+        self._cancelStats(self._statsFutures)
         lgdsAndKinds = list(self._lgdAndKindToItems.keys())
         for lgdAndKind in lgdsAndKinds:
             self._removeItem(legend=lgdAndKind[0], kind=lgdAndKind[1])
@@ -459,6 +485,10 @@ class StatsTable(TableWidget):
         if (legend, kind) not in self._lgdAndKindToItems or not self.plot:
             return
 
+        future = self._statsFutures.pop((legend, kind), None)
+        if future is not None:
+            future.cancel()
+
         self.firstItem = self._lgdAndKindToItems[(legend, kind)]['legend']
         del self._lgdAndKindToItems[(legend, kind)]
         self.removeRow(self.firstItem.row())
@@ -491,19 +521,93 @@ class StatsTable(TableWidget):
 
         assert isinstance(item, self.COMPATIBLE_ITEMS)
 
-        statsValDict = self._statsHandler.calculate(item, self.plot,
-                                                    self._statsOnVisibleData)
+        # The statistics are computed in a worker thread: cancel the
+        # outdated request for this item if it did not start yet, a running
+        # one is simply ignored once done.
+        key = item.getLegend(), kind
+        previous = self._statsFutures.pop(key, None)
+        if previous is not None:
+            previous.cancel()
+
+        if self._statsOnVisibleData:
+            limits = statsmdl.Stats.getLimits(self.plot)
+        else:
+            limits = None
+
+        future = _getStatsExecutor().submit(
+            self._statsHandler.calculate,
+            item, self.plot, self._statsOnVisibleData, limits)
+        self._statsFutures[key] = future
+        future.add_done_callback(functools.partial(
+            self._statsDone, weakref.ref(self), key))
+
+    @staticmethod
+    def _cancelStats(futures, *args):
+        """Cancel pending computations and forget running ones.
+
+        Also called when the widget is destroyed.
+
+        :param dict futures: The futures to cancel, emptied
+        """
+        for future in futures.values():
+            future.cancel()
+        futures.clear()
+
+    @staticmethod
+    def _statsDone(widgetRef, key, future):
+        """Called from the worker thread once a computation is over"""
+        if not future.cancelled():
+            submitToQtMainThread(
+                StatsTable._notifyStatsComputed, widgetRef, key, future)
+
+    @staticmethod
+    def _notifyStatsComputed(widgetRef, key, future):
+        """Forward a computation result to the widget if it still exists.
+
+        Run in the Qt main thread.
+        """
+        widget = widgetRef()
+        if widget is not None:
+            widget._statsComputed(key, future)
+
+    def _statsComputed(self, key, future):
+        """Display the result of a computation, run in the Qt main thread.
 
-        lgdItem = self._lgdAndKindToItems[(item.getLegend(), kind)]['legend']
+        :param tuple key: (legend, kind) of the item
+        :param concurrent.futures.Future future: the finished computation
+        """
+        if self._statsFutures.get(key) is not future:
+            return  # Outdated result
+        del self._statsFutures[key]
+
+        try:
+            statsValDict = future.result()
+        except Exception:
+            logger.error("Error while computing statistics of %s %s",
+                         key[1], key[0], exc_info=True)
+            return
+
+        if key not in self._lgdAndKindToItems:
+            return
+
+        legend, kind = key
+        lgdItem = self._lgdAndKindToItems[key]['legend']
         assert lgdItem
         rowStat = lgdItem.row()
 
         for statName, statVal in list(statsValDict.items()):
-            assert statName in self._lgdAndKindToItems[(item.getLegend(), kind)]
-            tableItem = self._getItem(name=statName, legend=item.getLegend(),
+            assert statName in self._lgdAndKindToItems[key]
+            tableItem = self._getItem(name=statName, legend=legend,
                                       kind=kind, indexTable=rowStat)
             tableItem.setText(str(statVal))
 
+    def isUpdating(self):
+        """Returns True if some statistics are still being computed.
+
+        :rtype: bool
+        """
+        return len(self._statsFutures) > 0
+
     def currentChanged(self, current, previous):
         if current.row() >= 0:
             legendItem = self.item(current.row(), self._columns_index['legend'])
@@ -29,10 +29,11 @@ from __future__ import division
 
 __authors__ = ["T. Vincent", "P. Knobel"]
 __license__ = "MIT"
-__date__ = "26/11/2018"
+__date__ = "19/10/2026"
 
 import os
 import weakref
+import zlib
 
 import numpy
 
@@ -43,6 +44,92 @@ from silx.gui.colors import rgba
 from .actions.mode import PanModeAction
 
 
+class _MaskDelta(object):
+    """Compressed difference between two states of a mask.
+
+    Only the bounding box of the changed values is stored,
+    before and after the change, compressed with zlib.
+
+    :param numpy.ndarray before: The mask before the change
+    :param numpy.ndarray after: The mask after the change
+    """
+
+    def __init__(self, before, after):
+        if before.shape != after.shape:  # Store whole masks
+            self._slices = None
+            self._before = self._compress(before)
+            self._after = self._compress(after)
+            return
+
+        changed = numpy.not_equal(before, after)
+        slices = []
+        for axis in range(changed.ndim):
+            otherAxes = tuple(i for i in range(changed.ndim) if i != axis)
+            indices = numpy.nonzero(numpy.any(changed, axis=otherAxes))[0]
+            if len(indices) == 0:  # No change
+                slices = [slice(0, 0)] * changed.ndim
+                break
+            slices.append(slice(indices[0], indices[-1] + 1))
+        self._slices = tuple(slices)
+        self._before = self._compress(before[self._slices])
+        self._after = self._compress(after[self._slices])
+
+    @staticmethod
+    def _compress(array):
+        """Returns a compressed representation of an array.
+
+        :param numpy.ndarray array:
+        :rtype: tuple
+        """
+        array = numpy.ascontiguousarray(array)
+        return array.shape, array.dtype, zlib.compress(array.tobytes(), 1)
+
+    @staticmethod
+    def _decompress(compressed):
+        """Returns the array from its compressed representation.
+
+        :param tuple compressed:
+        :rtype: numpy.ndarray
+        """
+        shape, dtype, data = compressed
+        array = numpy.frombuffer(zlib.decompress(data), dtype=dtype)
+        return array.reshape(shape).copy()
+
+    def isEmpty(self):
+        """Returns True if both states are the same (bool)"""
+        return (self._slices is not None and
+                any(s.start == s.stop for s in self._slices))
+
+    def nbytes(self):
+        """Returns the memory used to store the difference (int)"""
+        return len(self._before[2]) + len(self._after[2])
+
+    def _apply(self, compressed, mask):
+        if self._slices is None:
+            return self._decompress(compressed)
+        else:
+            mask[self._slices] = self._decompress(compressed)
+            return mask
+
+    def undo(self, mask):
+        """Apply the reverse difference to the mask.
+
+        :param numpy.ndarray mask: The mask after the change, updated in place
+        :return: The mask before the change, a new array if shape differs
+        :rtype: numpy.ndarray
+        """
+        return self._apply(self._before, mask)
+
+    def redo(self, mask):
+        """Apply the difference to the mask.
+
+        :param numpy.ndarray mask: The mask before the change, updated in place
+        :return: The mask after the change, a new array if shape differs
+        :rtype: numpy.ndarray
+        """
+        return self._apply(self._after, mask)
+
+
 class BaseMask(qt.QObject):
     """Base class for :class:`ImageMask` and :class:`ScatterMask`
 
@@ -69,9 +156,11 @@ class BaseMask(qt.QObject):
     def __init__(self, dataItem=None):
         self.historyDepth = 10
         """Maximum number of operation stored in history list for undo"""
-        # Init lists for undo/redo
+        # Init lists for undo/redo: they store differences between masks
         self._history = []
         self._redo = []
+        self._committed = None
+        """Copy of the mask as it was when last committed"""
 
         # Store the mask
         self._mask = numpy.array((), dtype=numpy.uint8)
@@ -133,48 +222,75 @@ class BaseMask(qt.QObject):
     # History control
     def resetHistory(self):
         """Reset history"""
-        self._history = [numpy.array(self._mask, copy=True)]
+        self._committed = numpy.array(self._mask, copy=True)
+        self._history = []
         self._redo = []
         self.sigUndoable.emit(False)
         self.sigRedoable.emit(False)
 
     def commit(self):
-        """Append the current mask to history if changed"""
-        if (not self._history or self._redo or
-                not numpy.array_equal(self._mask, self._history[-1])):
-            if self._redo:
-                self._redo = []  # Reset redo as a new action as been performed
-                self.sigRedoable[bool].emit(False)
+        """Append the current mask to history if changed
 
+        Only the difference with the previously committed mask is stored.
+        """
+        if self._committed is None:
+            self.resetHistory()
+            return
+
+        delta = _MaskDelta(self._committed, self._mask)
+        if self._redo:
+            self._redo = []  # Reset redo as a new action as been performed
+            self.sigRedoable[bool].emit(False)
+
+        if not delta.isEmpty():
+            if self._committed.shape == self._mask.shape:
+                numpy.copyto(self._committed, self._mask)
+            else:
+                self._committed = numpy.array(self._mask, copy=True)
+
+            # historyDepth counts mask states, including the current one
+            self._history.append(delta)
             while len(self._history) >= self.historyDepth:
                 self._history.pop(0)
-            self._history.append(numpy.array(self._mask, copy=True))
 
-            if len(self._history) == 2:
+            if len(self._history) == 1:
                 self.sigUndoable.emit(True)
 
+    def _restoreCommitted(self):
+        """Discard uncommitted changes of the mask"""
+        if self._mask.shape == self._committed.shape:
+            numpy.copyto(self._mask, self._committed)
+        else:
+            self._mask = numpy.array(self._committed, copy=True)
+
     def undo(self):
         """Restore previous mask if any"""
-        if len(self._history) > 1:
-            self._redo.append(self._history.pop())
-            self._mask = numpy.array(self._history[-1], copy=True)
+        if self._history:
+            delta = self._history.pop()
+            self._redo.append(delta)
+            self._restoreCommitted()
+            self._mask = delta.undo(self._mask)
+            self._committed = delta.undo(self._committed)
             self._notify()  # Do not store this change in history
 
             if len(self._redo) == 1:  # First redo
                 self.sigRedoable.emit(True)
-            if len(self._history) == 1:  # Last value in history
+            if not self._history:  # Last value in history
                 self.sigUndoable.emit(False)
 
     def redo(self):
         """Restore previously undone modification if any"""
         if self._redo:
-            self._mask = self._redo.pop()
-            self._history.append(numpy.array(self._mask, copy=True))
+            delta = self._redo.pop()
+            self._history.append(delta)
+            self._restoreCommitted()
+            self._mask = delta.redo(self._mask)
+            self._committed = delta.redo(self._committed)
             self._notify()
 
             if not self._redo:  # No more redo
                 self.sigRedoable.emit(False)
-            if len(self._history) == 2:  # Something to undo
+            if len(self._history) == 1:  # Something to undo
                 self.sigUndoable.emit(True)
 
                 # Whole mask operations
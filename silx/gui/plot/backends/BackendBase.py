@@ -170,6 +170,16 @@ class BackendBase(object):
         """
         return legend
 
+    def isColormapOnGPU(self):
+        """Returns whether the colormap of images is applied on the GPU.
+
+        If False, the backend colormaps images on the CPU and items can
+        provide it with a cached RGBA image instead.
+
+        :rtype: bool
+        """
+        return False
+
     def addItem(self, x, y, legend, shape, color, fill, overlay, z):
         """Add an item (i.e. a shape) to the plot.
 
@@ -1057,6 +1057,9 @@ class BackendOpenGL(BackendBase.BackendBase, glu.OpenGLWidget):
 
         return legend, 'curve'
 
+    def isColormapOnGPU(self):
+        return True
+
     def addImage(self, data, legend,
                  origin, scale, z,
                  selectable, draggable,
@@ -0,0 +1,259 @@
+# coding: utf-8
+# /*##########################################################################
+#
+# Copyright (c) 2026 European Synchrotron Radiation Facility
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# ###########################################################################*/
+"""This module provides :class:`ImagePyramid`, a multi-resolution tiled
+representation of an image used by :class:`ImageData` to only render the
+part of large images which is visible on screen.
+"""
+
+__authors__ = ["T. Vincent"]
+__license__ = "MIT"
+__date__ = "19/10/2026"
+
+
+import collections
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import math
+import multiprocessing
+
+import numpy
+
+from ....math.colormap import cmap
+
+
+_logger = logging.getLogger(__name__)
+
+
+def _binRows(data, binning):
+    """Bin 2x2 blocks of a 2D array.
+
+    Last row and column are binned alone if the shape is odd.
+
+    :param numpy.ndarray data: 2D array
+    :param str binning: 'mean' or 'max'
+    :rtype: numpy.ndarray
+    """
+    height, width = data.shape
+    rows = numpy.arange(0, height, 2)
+    columns = numpy.arange(0, width, 2)
+
+    if binning == 'max':
+        binned = numpy.fmax.reduceat(data, rows, axis=0)
+        return numpy.fmax.reduceat(binned, columns, axis=1)
+
+    else:  # mean
+        if data.dtype.kind != 'f':
+            data = data.astype(numpy.float32)
+        binned = numpy.add.reduceat(data, rows, axis=0)
+        binned = numpy.add.reduceat(binned, columns, axis=1)
+        rowCounts = numpy.diff(numpy.append(rows, height))
+        columnCounts = numpy.diff(numpy.append(columns, width))
+        binned /= (rowCounts[:, numpy.newaxis] *
+                   columnCounts[numpy.newaxis, :]).astype(binned.dtype)
+        return binned
+
+
+class ImagePyramid(object):
+    """Multi-resolution and tiled representation of a 2D image.
+
+    Level 0 is the full resolution image, each following level is binned
+    by 2 along both dimensions until the image fits in a single tile.
+    Levels are computed lazily, the first time they are requested.
+
+    Colormapped RGBA tiles are kept in a least recently used cache.
+
+    :param numpy.ndarray data: 2D full resolution image
+    :param str binning: Binning to use to compute levels: 'mean' or 'max'
+    :param int tileSize: Width and height of tiles in pixels
+    :param int cacheSize: Maximum number of RGBA tiles to keep in cache
+    """
+
+    SUPPORTED_BINNINGS = 'mean', 'max'
+    """Supported binning methods to compute lower resolution levels"""
+
+    _CHUNK_HEIGHT = 256
+    """Number of rows per chunk processed in parallel when binning"""
+
+    def __init__(self, data, binning='mean', tileSize=256, cacheSize=256):
+        assert data.ndim == 2
+        assert binning in self.SUPPORTED_BINNINGS
+        self._levels = [data]
+        self._binning = binning
+        self._tileSize = int(tileSize)
+        self._cacheSize = int(cacheSize)
+        self._tileCache = collections.OrderedDict()
+        self._colormap = None
+
+        height, width = data.shape
+        nbLevels = 1
+        while max(height, width) > self._tileSize:
+            height, width = (height + 1) // 2, (width + 1) // 2
+            nbLevels += 1
+        self._nbLevels = nbLevels
+
+    def getBinning(self):
+        """Returns the binning method used to compute levels (str)"""
+        return self._binning
+
+    def getTileSize(self):
+        """Returns the size of the tiles in pixels (int)"""
+        return self._tileSize
+
+    def getLevelCount(self):
+        """Returns the number of levels of the pyramid (int)"""
+        return self._nbLevels
+
+    def getLevelShape(self, level):
+        """Returns the shape of the image at a given level.
+
+        This does not compute the level.
+
+        :param int level:
+        :rtype: 2-tuple of int
+        """
+        height, width = self._levels[0].shape
+        factor = 2 ** level
+        return -(-height // factor), -(-width // factor)
+
+    def getLevel(self, level):
+        """Returns the image at a given level, computing it if needed.
+
+        :param int level: 0 for full resolution
+        :rtype: numpy.ndarray
+        """
+        assert 0 <= level < self._nbLevels
+        while len(self._levels) <= level:
+            self._levels.append(self._binLevel(self._levels[-1]))
+        return self._levels[level]
+
+    def _binLevel(self, data):
+        """Bin data by 2 along both dimensions, processing rows in parallel.
+
+        :param numpy.ndarray data: 2D array
+        :rtype: numpy.ndarray
+        """
+        height = data.shape[0]
+        if height <= self._CHUNK_HEIGHT:
+            return _binRows(data, self._binning)
+
+        # Chunks start on even rows, so they can be binned independently
+        starts = range(0, height, self._CHUNK_HEIGHT)
+        with ThreadPoolExecutor(multiprocessing.cpu_count()) as executor:
+            chunks = executor.map(
+                lambda start: _binRows(
+                    data[start:start + self._CHUNK_HEIGHT], self._binning),
+                starts)
+            return numpy.concatenate(list(chunks), axis=0)
+
+    def getLevelForRatio(self, ratio):
+        """Returns the level best matching a ratio of image pixels per screen pixel.
+
+        :param float ratio: Number of full resolution pixels per screen pixel
+        :rtype: int
+        """
+        if not ratio > 1.:  # Also handles NaN
+            return 0
+        level = int(math.floor(math.log(ratio, 2)))
+        return min(level, self._nbLevels - 1)
+
+    def getTileIndices(self, level, xMin, xMax, yMin, yMax):
+        """Returns the tiles of a level covering an area of the image.
+
+        :param int level: The level of the pyramid
+        :param float xMin: Area left bound in full resolution pixels
+        :param float xMax: Area right bound in full resolution pixels
+        :param float yMin: Area lower bound in full resolution pixels
+        :param float yMax: Area upper bound in full resolution pixels
+        :return: (row, column) indices of the tiles
+        :rtype: List[List[int]]
+        """
+        height, width = self.getLevelShape(level)
+        tileSize = self._tileSize * 2 ** level  # In full resolution pixels
+        nbRows = -(-height // self._tileSize)
+        nbColumns = -(-width // self._tileSize)
+
+        rowMin = max(0, int(math.floor(yMin / tileSize)))
+        rowMax = min(nbRows - 1, int(math.floor(yMax / tileSize)))
+        columnMin = max(0, int(math.floor(xMin / tileSize)))
+        columnMax = min(nbColumns - 1, int(math.floor(xMax / tileSize)))
+
+        return [(row, column)
+                for row in range(rowMin, rowMax + 1)
+                for column in range(columnMin, columnMax + 1)]
+
+    def getTileData(self, level, row, column):
+        """Returns the data of a tile.
+
+        :param int level: The level of the pyramid
+        :param int row: Row index of the tile
+        :param int column: Column index of the tile
+        :return: A view on the level data
+        :rtype: numpy.ndarray
+        """
+        data = self.getLevel(level)
+        size = self._tileSize
+        return data[row * size:(row + 1) * size,
+                    column * size:(column + 1) * size]
+
+    def setColormap(self, colors, vmin, vmax, normalization):
+        """Set the colormap to use for RGBA tiles.
+
+        Cached tiles are discarded if the colormap has changed.
+
+        :param numpy.ndarray colors: Colormap LUT
+        :param float vmin: Value mapped to the first color
+        :param float vmax: Value mapped to the last color
+        :param str normalization: Colormap normalization
+        """
+        colors = numpy.array(colors, copy=False)
+        colormap = colors, float(vmin), float(vmax), normalization
+        if (self._colormap is None or
+                self._colormap[1:] != colormap[1:] or
+                not numpy.array_equal(self._colormap[0], colors)):
+            self._colormap = colormap
+            self._tileCache.clear()
+
+    def getTileRgba(self, level, row, column):
+        """Returns the colormapped RGBA image of a tile.
+
+        :meth:`setColormap` MUST have been called before.
+
+        :param int level: The level of the pyramid
+        :param int row: Row index of the tile
+        :param int column: Column index of the tile
+        :return: Array of uint8 of shape (height, width, 4)
+        :rtype: numpy.ndarray
+        """
+        assert self._colormap is not None
+        key = level, row, column
+        rgba = self._tileCache.pop(key, None)
+        if rgba is None:
+            colors, vmin, vmax, normalization = self._colormap
+            rgba = cmap(self.getTileData(level, row, column),
+                        colors, vmin, vmax, normalization)
+            while len(self._tileCache) >= self._cacheSize:
+                self._tileCache.popitem(last=False)
+        self._tileCache[key] = rgba  # Most recently used at the end
+        return rgba
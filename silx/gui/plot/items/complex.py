@@ -29,7 +29,7 @@ from __future__ import absolute_import
 
 __authors__ = ["Vincent Favre-Nicolin", "T. Vincent"]
 __license__ = "MIT"
-__date__ = "14/06/2018"
+__date__ = "19/10/2026"
 
 
 import logging
@@ -191,6 +191,7 @@ class ImageComplexData(ImageBase, ColormapMixIn):
 
         if mode != self._mode:
             self._mode = mode
+            self._colormappedDataChanged()
 
             self._updated(ItemChangedType.VISUALIZATION_MODE)
 
@@ -272,6 +273,7 @@ class ImageComplexData(ImageBase, ColormapMixIn):
 
         self._data = data
         self._dataByModesCache = {}
+        self._colormappedDataChanged()
 
         # TODO hackish data range implementation
         if self.isVisible():
@@ -281,6 +283,9 @@ class ImageComplexData(ImageBase, ColormapMixIn):
 
         self._updated(ItemChangedType.DATA)
 
+    def _getColormappedData(self):
+        return self.getData(copy=False)
+
     def getComplexData(self, copy=True):
         """Returns the image complex data
 
@@ -353,4 +358,7 @@ class ImageComplexData(ImageBase, ColormapMixIn):
             return _complex2rgbalog(colormap, data, dlogs=delta, smax=max_)
         else:
             data = self.getData(copy=False, mode=mode)
+            if mode == self.getVisualizationMode():
+                # Use cached autoscale range of current mode data
+                return colormap.applyToData(data, reference=self)
             return colormap.applyToData(data)
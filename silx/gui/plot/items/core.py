@@ -27,7 +27,7 @@
 
 __authors__ = ["T. Vincent"]
 __license__ = "MIT"
-__date__ = "14/06/2018"
+__date__ = "19/10/2026"
 
 import collections
 from copy import deepcopy
@@ -39,6 +39,7 @@ import weakref
 import numpy
 import six
 
+from ....math.combo import min_max
 from ... import qt
 from ... import colors
 from ...colors import Colormap
@@ -407,6 +408,7 @@ class ColormapMixIn(ItemMixInBase):
     def __init__(self):
         self._colormap = Colormap()
         self._colormap.sigChanged.connect(self._colormapChanged)
+        self.__dataRange = None
 
     def getColormap(self):
         """Return the used colormap"""
@@ -431,6 +433,53 @@ class ColormapMixIn(ItemMixInBase):
         """Handle updates of the colormap"""
         self._updated(ItemChangedType.COLORMAP)
 
+    def _getColormappedData(self):
+        """Returns the data this item applies the colormap to.
+
+        Override in subclass.
+
+        :rtype: Union[numpy.ndarray,None]
+        """
+        return None
+
+    def _colormappedDataChanged(self):
+        """Reset cached information about the colormapped data.
+
+        This MUST be called by subclass when the array returned by
+        :meth:`_getColormappedData` has changed.
+        """
+        self.__dataRange = None
+
+    def _getColormapAutoscaleRange(self, colormap=None):
+        """Returns the autoscale range of the colormapped data.
+
+        The data is scanned only once per data change.
+
+        :param Union[None,~silx.gui.colors.Colormap] colormap:
+            The colormap for which to get the range (used for normalization),
+            default: the colormap of the item
+        :return: (min, max) of the data, with min > 0 for log normalization.
+            min and max are None if they cannot be computed.
+        :rtype: 2-tuple
+        """
+        if colormap is None:
+            colormap = self.getColormap()
+
+        if self.__dataRange is None:
+            data = self._getColormappedData()
+            if data is None or data.size == 0:
+                self.__dataRange = None, None, None
+            else:
+                result = min_max(data, min_positive=True, finite=True)
+                self.__dataRange = (result.minimum,
+                                    result.min_positive,
+                                    result.maximum)
+
+        min_, minPositive, max_ = self.__dataRange
+        if colormap.getNormalization() == Colormap.LOGARITHM:
+            min_ = minPositive
+        return min_, max_
+
 
 class SymbolMixIn(ItemMixInBase):
     """Mix-in class for items with symbol type"""
@@ -28,7 +28,7 @@ of the :class:`Plot`.
 
 __authors__ = ["T. Vincent"]
 __license__ = "MIT"
-__date__ = "20/10/2017"
+__date__ = "19/10/2026"
 
 
 from collections import Sequence
@@ -38,6 +38,7 @@ import numpy
 
 from .core import (Item, LabelsMixIn, DraggableMixIn, ColormapMixIn,
                    AlphaMixIn, ItemChangedType)
+from ._pyramid import ImagePyramid
 
 
 _logger = logging.getLogger(__name__)
@@ -252,6 +253,35 @@ class ImageData(ImageBase, ColormapMixIn):
         ColormapMixIn.__init__(self)
         self._data = numpy.zeros((0, 0), dtype=numpy.float32)
         self._alternativeImage = None
+        self.__pyramidMode = None
+        self.__rgbaCache = None
+        self.__pyramid = None
+        self.__pyramidTiles = None
+
+    def _setPlot(self, plot):
+        if self.__pyramidMode is not None:
+            self.__connectPlotLimits(self.getPlot(), False)
+
+        super(ImageData, self)._setPlot(plot)
+
+        if self.__pyramidMode is not None:
+            self.__connectPlotLimits(plot, True)
+
+    def __connectPlotLimits(self, plot, connect):
+        """Connect/disconnect plot axes limits changes to tiles update.
+
+        Only used when the pyramid mode is enabled.
+
+        :param Union[PlotWidget,None] plot: The plot, nothing done if None
+        :param bool connect: True to connect, False to disconnect
+        """
+        if plot is None:
+            return
+        for axis in (plot.getXAxis(), plot.getYAxis()):
+            if connect:
+                axis.sigLimitsChanged.connect(self.__plotLimitsChanged)
+            else:
+                axis.sigLimitsChanged.disconnect(self.__plotLimitsChanged)
 
     def _addBackendRenderer(self, backend):
         """Update backend renderer"""
@@ -269,6 +299,24 @@ class ImageData(ImageBase, ColormapMixIn):
         if dataToUse.size == 0:
             return None  # No data to display
 
+        pyramid = self.__getPyramid()
+        if pyramid is not None:
+            return self.__addPyramidTiles(backend, pyramid)
+
+        colormap = self.getColormap()
+        if dataToUse.ndim == 2 and not backend.isColormapOnGPU():
+            # Provide the cached colormapped image so that the backend
+            # does not colormap the data again
+            dataToUse = self.getRgbaImageData(copy=False)
+            colormap = None
+        elif dataToUse.ndim == 2 and (colormap.getVMin() is None or
+                                      colormap.getVMax() is None):
+            # Provide the cached autoscale range so that the backend
+            # does not scan the data again
+            vmin, vmax = colormap.getColormapRange(self)
+            colormap = colormap.copy()
+            colormap.setVRange(vmin, vmax)
+
         return backend.addImage(dataToUse,
                                 legend=self.getLegend(),
                                 origin=self.getOrigin(),
@@ -276,9 +324,128 @@ class ImageData(ImageBase, ColormapMixIn):
                                 z=self.getZValue(),
                                 selectable=self.isSelectable(),
                                 draggable=self.isDraggable(),
-                                colormap=self.getColormap(),
+                                colormap=colormap,
                                 alpha=self.getAlpha())
 
+    def _removeBackendRenderer(self, backend):
+        if isinstance(self._backendRenderer, list):  # Pyramid tiles
+            for renderer in self._backendRenderer:
+                backend.remove(renderer)
+            self._backendRenderer = None
+        else:
+            super(ImageData, self)._removeBackendRenderer(backend)
+        self.__pyramidTiles = None
+
+    def __getPyramid(self):
+        """Returns the image pyramid to use for rendering or None.
+
+        :rtype: Union[ImagePyramid,None]
+        """
+        if (self.__pyramidMode is None or
+                self.getAlternativeImageData(copy=False) is not None):
+            return None
+        if self.__pyramid is None:
+            self.__pyramid = ImagePyramid(self.getData(copy=False),
+                                          binning=self.__pyramidMode)
+        return self.__pyramid
+
+    def __getVisibleTiles(self, pyramid):
+        """Returns the pyramid level and tiles covering the plot area.
+
+        :param ImagePyramid pyramid:
+        :return: (level, list of (row, column) tile indices)
+        """
+        plot = self.getPlot()
+        ox, oy = self.getOrigin()
+        sx, sy = self.getScale()
+
+        # Convert plot area to full resolution image pixel coordinates
+        xMin, xMax = sorted((v - ox) / sx for v in plot.getXAxis().getLimits())
+        yMin, yMax = sorted((v - oy) / sy for v in plot.getYAxis().getLimits())
+
+        width, height = plot.getPlotBoundsInPixels()[2:]
+        ratio = min((xMax - xMin) / max(width, 1),
+                    (yMax - yMin) / max(height, 1))
+        level = pyramid.getLevelForRatio(ratio)
+        return level, pyramid.getTileIndices(level, xMin, xMax, yMin, yMax)
+
+    def __addPyramidTiles(self, backend, pyramid):
+        """Add the visible tiles of the pyramid to the backend
+
+        :param BackendBase backend:
+        :param ImagePyramid pyramid:
+        :return: List of renderer handles
+        """
+        colormap = self.getColormap()
+        vmin, vmax = colormap.getColormapRange(self)
+        pyramid.setColormap(colormap.getNColors(),
+                            vmin, vmax, colormap.getNormalization())
+
+        level, tiles = self.__getVisibleTiles(pyramid)
+        self.__pyramidTiles = level, tiles
+
+        ox, oy = self.getOrigin()
+        sx, sy = self.getScale()
+        factor = 2 ** level
+        offset = pyramid.getTileSize() * factor  # Tile size in image pixels
+
+        renderers = []
+        for row, column in tiles:
+            renderer = backend.addImage(
+                pyramid.getTileRgba(level, row, column),
+                legend=self.getLegend(),
+                origin=(ox + column * offset * sx, oy + row * offset * sy),
+                scale=(sx * factor, sy * factor),
+                z=self.getZValue(),
+                selectable=self.isSelectable(),
+                draggable=self.isDraggable(),
+                colormap=None,
+                alpha=self.getAlpha())
+            if renderer is not None:
+                renderers.append(renderer)
+        return renderers
+
+    def __plotLimitsChanged(self, *args):
+        """Handle plot limits changes to update displayed pyramid tiles"""
+        if self.__pyramidTiles is None or self.getPlot() is None:
+            return  # Not displayed with a pyramid
+
+        pyramid = self.__getPyramid()
+        if pyramid is not None and (
+                self.__getVisibleTiles(pyramid) != self.__pyramidTiles):
+            self._updated()
+
+    def getPyramidMode(self):
+        """Returns the multi-resolution rendering mode.
+
+        See :meth:`setPyramidMode`.
+
+        :rtype: Union[str,None]
+        """
+        return self.__pyramidMode
+
+    def setPyramidMode(self, mode):
+        """Set the multi-resolution rendering mode of the image.
+
+        When enabled, downsampled versions of the image are computed
+        on demand and only the tiles covering the visible area are
+        rendered, at the resolution matching the screen.
+        This is useful for very large images.
+
+        :param Union[str,None] mode:
+            None to display the full resolution image (default),
+            'mean' or 'max' to select the binning used to compute the
+            lower resolution images.
+        """
+        assert mode is None or mode in ImagePyramid.SUPPORTED_BINNINGS
+        if mode != self.__pyramidMode:
+            if (self.__pyramidMode is None) != (mode is None):
+                # Only listen to plot limits changes with pyramid enabled
+                self.__connectPlotLimits(self.getPlot(), mode is not None)
+            self.__pyramidMode = mode
+            self.__pyramid = None
+            self._updated()
+
     def __getitem__(self, item):
         """Compatibility with PyMca and silx <= 0.4.0"""
         if item == 3:
@@ -290,19 +457,36 @@ class ImageData(ImageBase, ColormapMixIn):
 
         return params
 
+    def _getColormappedData(self):
+        return self.getData(copy=False)
+
     def getRgbaImageData(self, copy=True):
         """Get the displayed RGB(A) image
 
+        The colormapped image is cached until either the data or
+        the colormap changes.
+
+        :param bool copy: True (Default) to get a copy,
+                          False to use internal cache (do not modify!)
         :returns: numpy.ndarray of uint8 of shape (height, width, 4)
         """
         if self._alternativeImage is not None:
             return _convertImageToRgba32(
                 self.getAlternativeImageData(copy=False), copy=copy)
         else:
-            # Apply colormap, in this case an new array is always returned
             colormap = self.getColormap()
-            image = colormap.applyToData(self.getData(copy=False))
-            return image
+            vmin, vmax = colormap.getColormapRange(self)
+            colors = colormap.getNColors()
+            key = colormap.getNormalization(), vmin, vmax
+
+            if (self.__rgbaCache is None or
+                    self.__rgbaCache[0] != key or
+                    not numpy.array_equal(self.__rgbaCache[1], colors)):
+                image = colormap.applyToData(self.getData(copy=False),
+                                             reference=self)
+                self.__rgbaCache = key, colors, image
+
+            return numpy.array(self.__rgbaCache[2], copy=copy)
 
     def getAlternativeImageData(self, copy=True):
         """Get the optional RGBA image that is displayed instead of the data
@@ -338,6 +522,9 @@ class ImageData(ImageBase, ColormapMixIn):
                 'Converting complex image to absolute value to plot it.')
             data = numpy.absolute(data)
         self._data = data
+        self._colormappedDataChanged()
+        self.__rgbaCache = None
+        self.__pyramid = None
 
         if alternative is not None:
             alternative = numpy.array(alternative, copy=copy)
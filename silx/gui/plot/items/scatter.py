@@ -27,7 +27,7 @@
 
 __authors__ = ["T. Vincent", "P. Knobel"]
 __license__ = "MIT"
-__date__ = "29/03/2017"
+__date__ = "19/10/2026"
 
 
 import logging
@@ -65,7 +65,7 @@ class Scatter(Points, ColormapMixIn):
             return None  # No data to display, do not add renderer to backend
 
         cmap = self.getColormap()
-        rgbacolors = cmap.applyToData(self._value)
+        rgbacolors = cmap.applyToData(self._value, reference=self)
 
         if self.__alpha is not None:
             rgbacolors[:, -1] = (rgbacolors[:, -1] * self.__alpha).astype(numpy.uint8)
@@ -107,6 +107,9 @@ class Scatter(Points, ColormapMixIn):
 
         return x, y, value, xerror, yerror
 
+    def _getColormappedData(self):
+        return self.getValueData(copy=False)
+
     def getValueData(self, copy=True):
         """Returns the value assigned to the scatter data points.
 
@@ -175,6 +178,7 @@ class Scatter(Points, ColormapMixIn):
         assert len(x) == len(value)
 
         self._value = value
+        self._colormappedDataChanged()
 
         if alpha is not None:
             # Make sure alpha is an array of float in [0, 1]
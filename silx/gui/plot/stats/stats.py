@@ -72,17 +72,61 @@ class Stats(OrderedDict):
         :return dict: dictionary with :class:`Stat` name as ket and result
                       of the calculation as value
         """
-        res = {}
+        context = self.createContext(item, plot, onlimits)
+        return self.calculateContext(context)
+
+    @staticmethod
+    def getLimits(plot):
+        """Returns the current limits of the plot axes.
+
+        This is meant to be called from the Qt main thread, the result can
+        then be given to :meth:`createContext` from any thread.
+
+        :param plot: the plot containing the item
+        :return: ((xmin, xmax), (ymin, ymax))
+        :rtype: tuple
+        """
+        return plot.getXAxis().getLimits(), plot.getYAxis().getLimits()
+
+    def createContext(self, item, plot, onlimits, limits=None):
+        """
+        Create the context shared by all the :class:`Stat` of this set.
+
+        The context is prepared once per item: the (possibly filtered) data
+        as well as its min and max are computed only once and reused by all
+        the statistics.
+
+        :param item: the item for which we want statistics
+        :param plot: plot containing the item
+        :param bool onlimits: True if we want to apply statistic only on
+                              visible data.
+        :param limits: ((xmin, xmax), (ymin, ymax)) to use when `onlimits`
+                       is True. If None, the current limits of the plot are
+                       used. See :meth:`getLimits`.
+        :rtype: :class:`_StatsContext`
+        """
         if isinstance(item, CurveItem):
-            context = _CurveContext(item, plot, onlimits)
+            context = _CurveContext(item, plot, onlimits, limits)
         elif isinstance(item, ImageItem):
-            context = _ImageContext(item, plot, onlimits)
+            context = _ImageContext(item, plot, onlimits, limits)
         elif isinstance(item, ScatterItem):
-            context = _ScatterContext(item, plot, onlimits)
+            context = _ScatterContext(item, plot, onlimits, limits)
         elif isinstance(item, HistogramItem):
-            context = _HistogramContext(item, plot, onlimits)
+            context = _HistogramContext(item, plot, onlimits, limits)
         else:
             raise ValueError('Item type not managed')
+        return context
+
+    def calculateContext(self, context):
+        """
+        Call all :class:`Stat` object registred on an already prepared
+        context.
+
+        :param context: context returned by :meth:`createContext`
+        :return dict: dictionary with :class:`Stat` name as ket and result
+                      of the calculation as value
+        """
+        res = {}
         for statName, stat in list(self.items()):
             if context.kind not in stat.compatibleKinds:
                 logger.debug('kind %s not managed by statistic %s'
@@ -115,8 +159,10 @@ class _StatsContext(object):
     :param plot: the plot containing the item
     :param bool onlimits: True if we want to apply statistic only on
                           visible data.
+    :param limits: ((xmin, xmax), (ymin, ymax)) of the visible area.
+                   If None, the limits are read from the plot.
     """
-    def __init__(self, item, kind, plot, onlimits):
+    def __init__(self, item, kind, plot, onlimits, limits=None):
         assert item
         assert plot
         assert type(onlimits) is bool
@@ -125,6 +171,9 @@ class _StatsContext(object):
         self.max = None
         self.data = None
         self.values = None
+        if onlimits and limits is None:
+            limits = Stats.getLimits(plot)
+        self.limits = limits
         self.createContext(item, plot, onlimits)
 
     def createContext(self, item, plot, onlimits):
@@ -139,16 +188,18 @@ class _CurveContext(_StatsContext):
     :param plot: the plot containing the item
     :param bool onlimits: True if we want to apply statistic only on
                           visible data.
+    :param limits: ((xmin, xmax), (ymin, ymax)) of the visible area.
     """
-    def __init__(self, item, plot, onlimits):
+    def __init__(self, item, plot, onlimits, limits=None):
         _StatsContext.__init__(self, kind='curve', item=item,
-                               plot=plot, onlimits=onlimits)
+                               plot=plot, onlimits=onlimits,
+                               limits=limits)
 
     def createContext(self, item, plot, onlimits):
         xData, yData = item.getData(copy=True)[0:2]
 
         if onlimits:
-            minX, maxX = plot.getXAxis().getLimits()
+            minX, maxX = self.limits[0]
             yData = yData[(minX <= xData) & (xData <= maxX)]
             xData = xData[(minX <= xData) & (xData <= maxX)]
 
@@ -170,16 +221,18 @@ class _HistogramContext(_StatsContext):
     :param plot: the plot containing the item
     :param bool onlimits: True if we want to apply statistic only on
                           visible data.
+    :param limits: ((xmin, xmax), (ymin, ymax)) of the visible area.
     """
-    def __init__(self, item, plot, onlimits):
+    def __init__(self, item, plot, onlimits, limits=None):
         _StatsContext.__init__(self, kind='histogram', item=item,
-                               plot=plot, onlimits=onlimits)
+                               plot=plot, onlimits=onlimits,
+                               limits=limits)
 
     def createContext(self, item, plot, onlimits):
         xData, edges = item.getData(copy=True)[0:2]
         yData = item._revertComputeEdges(x=edges, histogramType=item.getAlignment())
         if onlimits:
-            minX, maxX = plot.getXAxis().getLimits()
+            minX, maxX = self.limits[0]
             yData = yData[(minX <= xData) & (xData <= maxX)]
             xData = xData[(minX <= xData) & (xData <= maxX)]
 
@@ -201,17 +254,17 @@ class _ScatterContext(_StatsContext):
     :param plot: the plot containing the item
     :param bool onlimits: True if we want to apply statistic only on
                           visible data.
+    :param limits: ((xmin, xmax), (ymin, ymax)) of the visible area.
     """
-    def __init__(self, item, plot, onlimits):
+    def __init__(self, item, plot, onlimits, limits=None):
         _StatsContext.__init__(self, kind='scatter', item=item, plot=plot,
-                               onlimits=onlimits)
+                               onlimits=onlimits, limits=limits)
 
     def createContext(self, item, plot, onlimits):
         xData, yData, valueData, xerror, yerror = item.getData(copy=True)
         assert plot
         if onlimits:
-            minX, maxX = plot.getXAxis().getLimits()
-            minY, maxY = plot.getYAxis().getLimits()
+            (minX, maxX), (minY, maxY) = self.limits
             # filter on X axis
             valueData = valueData[(minX <= xData) & (xData <= maxX)]
             yData = yData[(minX <= xData) & (xData <= maxX)]
@@ -236,10 +289,12 @@ class _ImageContext(_StatsContext):
     :param plot: the plot containing the item
     :param bool onlimits: True if we want to apply statistic only on
                           visible data.
+    :param limits: ((xmin, xmax), (ymin, ymax)) of the visible area.
     """
-    def __init__(self, item, plot, onlimits):
+    def __init__(self, item, plot, onlimits, limits=None):
         _StatsContext.__init__(self, kind='image', item=item,
-                               plot=plot, onlimits=onlimits)
+                               plot=plot, onlimits=onlimits,
+                               limits=limits)
 
     def createContext(self, item, plot, onlimits):
         self.origin = item.getOrigin()
@@ -247,8 +302,7 @@ class _ImageContext(_StatsContext):
         self.data = item.getData()
 
         if onlimits:
-            minX, maxX = plot.getXAxis().getLimits()
-            minY, maxY = plot.getYAxis().getLimits()
+            (minX, maxX), (minY, maxY) = self.limits
 
             XMinBound = int((minX - self.origin[0]) / self.scale[0])
             YMinBound = int((minY - self.origin[1]) / self.scale[1])
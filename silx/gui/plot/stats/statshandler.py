@@ -121,19 +121,27 @@ class StatsHandler(object):
                 else:
                     return self.formatters[name].format(val)
 
-    def calculate(self, item, plot, onlimits):
+    def calculate(self, item, plot, onlimits, limits=None):
         """
         compute all statistic registred and return the list of formatted
         statistics result.
 
+        All the statistics share the same context, so the item data is read
+        and filtered only once.
+        This method does not access the plot if `limits` is provided, thus it
+        can be called from a worker thread.
+
         :param item: item for which we want to compute statistics
         :param plot: plot containing the item
         :param onlimits: True if we want to compute statistics on visible data
                          only
+        :param limits: ((xmin, xmax), (ymin, ymax)) of the visible data.
+                       If None, the current limits of the plot are used.
         :return: list of formatted statistics (as str)
         :rtype: dict
         """
-        res = self.stats.calculate(item, plot, onlimits)
+        context = self.stats.createContext(item, plot, onlimits, limits)
+        res = self.stats.calculateContext(context)
         for resName, resValue in list(res.items()):
             res[resName] = self.format(resName, res[resName])
         return res
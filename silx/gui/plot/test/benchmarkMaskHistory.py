@@ -0,0 +1,91 @@
+# coding: utf-8
+# /*##########################################################################
+#
+# Copyright (c) 2026 European Synchrotron Radiation Facility
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# ###########################################################################*/
+"""Benchmark of the undo/redo history of masks"""
+
+from __future__ import division
+
+__authors__ = ["T. Vincent"]
+__license__ = "MIT"
+__date__ = "19/10/2026"
+
+
+import logging
+import time
+import unittest
+
+import numpy
+
+from silx.gui.plot.MaskToolsWidget import ImageMask
+
+
+_logger = logging.getLogger(__name__)
+_logger.setLevel(logging.DEBUG)
+
+
+class BenchmarkMaskHistory(unittest.TestCase):
+    """Benchmark a 100 steps editing session on a large mask"""
+
+    SHAPE = 4096, 4096
+    NB_STEPS = 100
+
+    def test_benchmark_history(self):
+        mask = ImageMask()
+        mask.historyDepth = self.NB_STEPS + 1
+        mask.reset(shape=self.SHAPE)
+        mask.resetHistory()
+
+        random = numpy.random.RandomState(0)
+        centers = random.randint(0, min(self.SHAPE), size=(self.NB_STEPS, 2))
+
+        start = time.time()
+        for crow, ccol in centers:
+            mask.updateDisk(1, crow, ccol, radius=20)
+            mask.commit()
+        commitDuration = time.time() - start
+
+        start = time.time()
+        for _ in range(self.NB_STEPS):
+            mask.undo()
+        for _ in range(self.NB_STEPS):
+            mask.redo()
+        undoRedoDuration = time.time() - start
+
+        historySize = mask._committed.nbytes + sum(
+            delta.nbytes() for delta in mask._history)
+        fullCopiesSize = (self.NB_STEPS + 1) * mask.getMask(copy=False).nbytes
+
+        _logger.info(
+            'Mask %s, %d edits: commit %.3fs, undo+redo %.3fs',
+            self.SHAPE, self.NB_STEPS, commitDuration, undoRedoDuration)
+        _logger.info(
+            'History memory: %.1f MB (full copies: %.1f MB)',
+            historySize / 2**20, fullCopiesSize / 2**20)
+
+        self.assertLess(historySize, fullCopiesSize)
+
+
+if __name__ == '__main__':
+    logging.basicConfig()
+    unittest.main()
@@ -33,8 +33,10 @@ import unittest
 
 import numpy
 
+from silx.utils.testutils import ParametricTestCase
 from silx.gui.utils.testutils import SignalListener
 from silx.gui.plot.items import ItemChangedType
+from silx.gui.plot.items._pyramid import ImagePyramid
 from .utils import PlotWidgetTestCase
 
 
@@ -237,11 +239,230 @@ class TestSymbol(PlotWidgetTestCase):
         self.assertEqual('Diamond', name)
 
 
+class TestImageDataRgbaCache(PlotWidgetTestCase):
+    """Test ImageData colormapped image and autoscale range caches"""
+
+    def test(self):
+        data = numpy.arange(100, dtype=numpy.float32).reshape(10, 10)
+        self.plot.addImage(data, legend='test')
+        image = self.plot.getImage('test')
+        colormap = image.getColormap()
+
+        self.assertEqual(colormap.getColormapRange(image), (0., 99.))
+        rgba = image.getRgbaImageData(copy=False)
+        self.assertIs(image.getRgbaImageData(copy=False), rgba)
+
+        # Colormap-independent changes reuse the cache
+        image.setZValue(10)
+        self.qapp.processEvents()
+        self.assertIs(image.getRgbaImageData(copy=False), rgba)
+
+        # Colormap changes invalidate the cache
+        colormap.setVRange(10, 20)
+        newRgba = image.getRgbaImageData(copy=False)
+        self.assertIsNot(newRgba, rgba)
+        self.assertTrue(numpy.array_equal(
+            newRgba, colormap.applyToData(data)))
+
+        colormap.setVRange(None, None)
+        colormap.setNormalization('log')
+        self.assertEqual(colormap.getColormapRange(image), (1., 99.))
+
+        # Data changes invalidate the cache
+        image.setData(data + 100)
+        self.assertEqual(colormap.getColormapRange(image), (100., 199.))
+        self.assertTrue(numpy.array_equal(
+            image.getRgbaImageData(copy=False),
+            colormap.applyToData(data + 100)))
+
+    def _wrapAddImage(self):
+        """Record the data and colormap passed to the backend addImage"""
+        calls = []
+        backend = self.plot._backend
+        addImage = backend.addImage
+
+        def wrappedAddImage(data, *args, **kwargs):
+            calls.append((data, kwargs['colormap']))
+            return addImage(data, *args, **kwargs)
+        backend.addImage = wrappedAddImage
+        return calls
+
+    def testBackendColormap(self):
+        """Test a GPU backend gets data and a colormap with autoscale range"""
+        self.plot._backend.isColormapOnGPU = lambda: True
+        calls = self._wrapAddImage()
+
+        data = numpy.arange(100, dtype=numpy.float32).reshape(10, 10)
+        self.plot.addImage(data, legend='test')
+        self.qapp.processEvents()
+        image = self.plot.getImage('test')
+
+        self.assertTrue(len(calls) > 0)
+        backendData, backendColormap = calls[-1]
+        self.assertEqual(backendData.ndim, 2)
+        self.assertTrue(numpy.array_equal(backendData, data))
+        self.assertEqual(backendColormap.getVMin(), 0.)
+        self.assertEqual(backendColormap.getVMax(), 99.)
+        self.assertTrue(image.getColormap().isAutoscale())
+
+    def testBackendRgba(self):
+        """Test a CPU backend gets the cached colormapped image"""
+        self.plot._backend.isColormapOnGPU = lambda: False
+        calls = self._wrapAddImage()
+
+        data = numpy.arange(100, dtype=numpy.float32).reshape(10, 10)
+        self.plot.addImage(data, legend='test')
+        self.qapp.processEvents()
+        image = self.plot.getImage('test')
+        colormap = image.getColormap()
+
+        applyToDataCalls = []
+        applyToData = colormap.applyToData
+
+        def wrappedApplyToData(*args, **kwargs):
+            applyToDataCalls.append(1)
+            return applyToData(*args, **kwargs)
+        colormap.applyToData = wrappedApplyToData
+
+        self.assertTrue(len(calls) > 0)
+        backendData, backendColormap = calls[-1]
+        self.assertIs(backendData, image.getRgbaImageData(copy=False))
+        self.assertIsNone(backendColormap)
+
+        # Colormap-independent changes do not colormap the data again
+        del calls[:]
+        image.setZValue(10)
+        self.plot.setGraphTitle('title')
+        self.qapp.processEvents()
+        self.assertTrue(len(calls) > 0)
+        self.assertIs(calls[-1][0], backendData)
+        self.assertEqual(len(applyToDataCalls), 0)
+
+        # Colormap changes do
+        colormap.setVRange(10, 20)
+        self.qapp.processEvents()
+        self.assertEqual(len(applyToDataCalls), 1)
+        self.assertTrue(numpy.array_equal(
+            calls[-1][0], applyToData(data)))
+
+
+class TestImagePyramid(ParametricTestCase):
+    """Test ImagePyramid multi-resolution image"""
+
+    def testLevels(self):
+        """Test levels computation with mean and max binning"""
+        data = numpy.arange(15 * 9, dtype=numpy.float32).reshape(15, 9)
+        for binning, function in (('mean', numpy.mean), ('max', numpy.max)):
+            with self.subTest(binning=binning):
+                pyramid = ImagePyramid(data, binning=binning, tileSize=4)
+                self.assertEqual(pyramid.getLevelCount(), 3)
+                self.assertEqual(pyramid.getLevelShape(1), (8, 5))
+
+                level1 = pyramid.getLevel(1)
+                self.assertEqual(level1.shape, (8, 5))
+                self.assertEqual(level1[0, 0], function(data[:2, :2]))
+                self.assertEqual(level1[-1, -1], function(data[-1:, -1:]))
+
+                level2 = pyramid.getLevel(2)
+                self.assertEqual(level2.shape, pyramid.getLevelShape(2))
+
+    def testParallelBinning(self):
+        """Test binning of an image larger than a chunk"""
+        data = numpy.random.random((1001, 300))
+        pyramid = ImagePyramid(data, binning='max', tileSize=64)
+        level = pyramid.getLevel(1)
+        self.assertEqual(level.shape, (501, 150))
+        self.assertTrue(numpy.array_equal(
+            level[:500], data[:1000].reshape(500, 2, 150, 2).max(axis=(1, 3))))
+
+    def testTiles(self):
+        """Test tiles selection and RGBA tiles cache"""
+        data = numpy.arange(100 * 100).reshape(100, 100)
+        pyramid = ImagePyramid(data, tileSize=16, cacheSize=2)
+        self.assertEqual(pyramid.getLevelForRatio(0.5), 0)
+        self.assertEqual(pyramid.getLevelForRatio(4.5), 2)
+        self.assertEqual(pyramid.getLevelForRatio(1000.), 3)
+
+        self.assertEqual(pyramid.getTileIndices(0, 0, 20, 30, 40),
+                         [(1, 0), (1, 1), (2, 0), (2, 1)])
+        self.assertEqual(pyramid.getTileIndices(3, -10, 200, -10, 200),
+                         [(0, 0)])
+
+        colors = numpy.array(((0, 0, 0, 255), (255, 255, 255, 255)),
+                             dtype=numpy.uint8)
+        pyramid.setColormap(colors, 0, 1, 'linear')
+        rgba = pyramid.getTileRgba(0, 0, 0)
+        self.assertEqual(rgba.shape, (16, 16, 4))
+        self.assertIs(pyramid.getTileRgba(0, 0, 0), rgba)
+
+        # Cache is full: least recently used tile is discarded
+        pyramid.getTileRgba(0, 0, 1)
+        pyramid.getTileRgba(0, 1, 1)
+        self.assertIsNot(pyramid.getTileRgba(0, 0, 0), rgba)
+
+        # Changing colormap clears the cache
+        rgba = pyramid.getTileRgba(0, 0, 0)
+        pyramid.setColormap(colors, 0, 10, 'linear')
+        self.assertIsNot(pyramid.getTileRgba(0, 0, 0), rgba)
+
+
+class TestImageDataPyramid(PlotWidgetTestCase):
+    """Test ImageData rendering with an image pyramid"""
+
+    def test(self):
+        self.plot.addImage(numpy.arange(1000 * 1000).reshape(1000, 1000),
+                           legend='test')
+        image = self.plot.getImage('test')
+        self.assertIsNone(image.getPyramidMode())
+
+        image.setPyramidMode('max')
+        self.assertEqual(image.getPyramidMode(), 'max')
+        self.plot.resetZoom()
+        self.qapp.processEvents()
+
+        # Zoom in a corner: only a few full resolution tiles are rendered
+        self.plot.setLimits(0, 10, 0, 10)
+        self.qapp.processEvents()
+        self.assertTrue(0 < len(image._backendRenderer) <= 4)
+
+        image.setPyramidMode(None)
+        self.qapp.processEvents()
+        self.assertNotIsInstance(image._backendRenderer, list)
+
+    def testLimitsConnection(self):
+        """Test plot limits are only listened to with pyramid enabled"""
+        xAxis = self.plot.getXAxis()
+        nbReceivers = xAxis.receivers(xAxis.sigLimitsChanged)
+
+        self.plot.addImage(numpy.arange(100).reshape(10, 10), legend='test')
+        image = self.plot.getImage('test')
+        self.assertEqual(xAxis.receivers(xAxis.sigLimitsChanged), nbReceivers)
+
+        image.setPyramidMode('mean')
+        self.assertEqual(xAxis.receivers(xAxis.sigLimitsChanged),
+                         nbReceivers + 1)
+        image.setPyramidMode('max')
+        self.assertEqual(xAxis.receivers(xAxis.sigLimitsChanged),
+                         nbReceivers + 1)
+
+        self.plot.removeImage('test')
+        self.assertEqual(xAxis.receivers(xAxis.sigLimitsChanged), nbReceivers)
+
+        self.plot._add(image)
+        self.assertEqual(xAxis.receivers(xAxis.sigLimitsChanged),
+                         nbReceivers + 1)
+        image.setPyramidMode(None)
+        self.assertEqual(xAxis.receivers(xAxis.sigLimitsChanged), nbReceivers)
+
+
 def suite():
     test_suite = unittest.TestSuite()
     loadTests = unittest.defaultTestLoader.loadTestsFromTestCase
     test_suite.addTest(loadTests(TestSigItemChangedSignal))
     test_suite.addTest(loadTests(TestSymbol))
+    test_suite.addTest(loadTests(TestImageDataRgbaCache))
+    test_suite.addTest(loadTests(TestImagePyramid))
+    test_suite.addTest(loadTests(TestImageDataPyramid))
     return test_suite
 
 
@@ -282,9 +282,90 @@ class TestMaskToolsWidget(PlotWidgetTestCase, ParametricTestCase):
         self.assertGreater(len(l), 0)
 
 
+class TestImageMaskHistory(unittest.TestCase):
+    """Test undo/redo history of ImageMask"""
+
+    def setUp(self):
+        self.mask = MaskToolsWidget.ImageMask()
+        self.mask.reset(shape=(200, 300))
+        self.mask.resetHistory()
+
+    def tearDown(self):
+        self.mask = None
+
+    def testUndoRedo(self):
+        states = [self.mask.getMask()]
+        for index in range(5):
+            self.mask.updateRectangle(
+                index + 1, row=10 * index, col=20, height=30, width=40)
+            self.mask.commit()
+            states.append(self.mask.getMask())
+
+        for state in reversed(states[:-1]):
+            self.mask.undo()
+            self.assertTrue(numpy.array_equal(self.mask.getMask(), state))
+
+        self.mask.undo()  # Nothing to undo
+        self.assertTrue(numpy.array_equal(self.mask.getMask(), states[0]))
+
+        for state in states[1:]:
+            self.mask.redo()
+            self.assertTrue(numpy.array_equal(self.mask.getMask(), state))
+
+    def testUncommittedChanges(self):
+        self.mask.updateRectangle(1, row=0, col=0, height=10, width=10)
+        self.mask.commit()
+        committed = self.mask.getMask()
+
+        self.mask.updateRectangle(2, row=100, col=100, height=10, width=10)
+        self.mask.undo()
+        self.assertFalse(numpy.any(self.mask.getMask()))
+        self.mask.redo()
+        self.assertTrue(numpy.array_equal(self.mask.getMask(), committed))
+
+    def testHistoryDepth(self):
+        self.mask.historyDepth = 3
+        states = []
+        for index in range(10):
+            self.mask.updateRectangle(
+                1, row=10 * index, col=10 * index, height=5, width=5)
+            self.mask.commit()
+            states.append(self.mask.getMask())
+        self.assertEqual(len(self.mask._history), 2)
+
+        self.mask.undo()
+        self.mask.undo()
+        self.mask.undo()  # Nothing to undo
+        self.assertTrue(numpy.array_equal(self.mask.getMask(), states[-3]))
+
+    def testShapeChange(self):
+        self.mask.updateRectangle(1, row=0, col=0, height=10, width=10)
+        self.mask.commit()
+        before = self.mask.getMask()
+
+        self.mask.setMask(numpy.ones((20, 30), dtype=numpy.uint8))
+        self.mask.commit()
+
+        self.mask.undo()
+        self.assertTrue(numpy.array_equal(self.mask.getMask(), before))
+        self.mask.redo()
+        self.assertTrue(numpy.array_equal(
+            self.mask.getMask(), numpy.ones((20, 30))))
+
+    def testMemory(self):
+        """Test that history size depends on the edited area"""
+        self.mask.reset(shape=(2000, 2000))
+        self.mask.resetHistory()
+        for index in range(5):
+            self.mask.updateDisk(1, 100 * index, 100, 10)
+            self.mask.commit()
+        size = sum(delta.nbytes() for delta in self.mask._history)
+        self.assertLess(size, 5 * 21 * 21 * 2)
+
+
 def suite():
     test_suite = unittest.TestSuite()
-    for TestClass in (TestMaskToolsWidget,):
+    for TestClass in (TestMaskToolsWidget, TestImageMaskHistory):
         test_suite.addTest(
             unittest.defaultTestLoader.loadTestsFromTestCase(TestClass))
     return test_suite
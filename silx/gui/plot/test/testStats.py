@@ -38,10 +38,24 @@ from silx.gui.plot import Plot1D, Plot2D
 import unittest
 import logging
 import numpy
+import gc
+import threading
 
 _logger = logging.getLogger(__name__)
 
 
+class _StatsWidgetTestCase(TestCaseQt):
+    """Base class for tests of the StatsTable"""
+
+    def waitForStats(self, widget, timeout=5000):
+        """Wait for the statistics computed in background to be displayed"""
+        for _ in range(timeout // 10):
+            if not widget.isUpdating():
+                break
+            self.qWait(10)
+        self.assertFalse(widget.isUpdating())
+
+
 class TestStats(TestCaseQt):
     """
     Test :class:`BaseClass` class and inheriting classes
@@ -356,7 +370,7 @@ class TestStatsHandler(unittest.TestCase):
             statshandler.StatsHandler(('name'))
 
 
-class TestStatsWidgetWithCurves(TestCaseQt):
+class TestStatsWidgetWithCurves(_StatsWidgetTestCase):
     """Basic test for StatsWidget with curves"""
     def setUp(self):
         TestCaseQt.setUp(self)
@@ -420,6 +434,7 @@ class TestStatsWidgetWithCurves(TestCaseQt):
         curve"""
         self.plot.addCurve(legend='curve0', x=range(10), y=range(10))
         self.assertTrue(self.widget.rowCount() is 3)
+        self.waitForStats(self.widget)
         itemMax = self.widget._getItem(name='max', legend='curve0',
                                        kind='curve', indexTable=None)
         self.assertTrue(itemMax.text() == '9')
@@ -427,10 +442,82 @@ class TestStatsWidgetWithCurves(TestCaseQt):
     def testUpdateCurveFrmCurveObj(self):
         self.plot.getCurve('curve0').setData(x=range(4), y=range(4))
         self.assertTrue(self.widget.rowCount() is 3)
+        self.waitForStats(self.widget)
         itemMax = self.widget._getItem(name='max', legend='curve0',
                                        kind='curve', indexTable=None)
         self.assertTrue(itemMax.text() == '3')
 
+    def testOutdatedRequests(self):
+        """Make sure only the last request is displayed"""
+        curve = self.plot.getCurve('curve0')
+        for size in range(2, 50):
+            curve.setData(x=range(size), y=range(size))
+        self.waitForStats(self.widget)
+        itemMax = self.widget._getItem(name='max', legend='curve0',
+                                       kind='curve', indexTable=None)
+        self.assertEqual(itemMax.text(), '48')
+
+    def testWidgetDeleted(self):
+        """Make sure a computation ending after the widget deletion is
+        ignored"""
+        self._testWidgetDeleted(keepReference=True)
+        self._testWidgetDeleted(keepReference=False)
+
+    def _testWidgetDeleted(self, keepReference):
+        started = threading.Event()
+        release = threading.Event()
+
+        def blockingStat(data):
+            started.set()
+            release.wait(5)
+            return 0
+
+        widget = StatsWidget.StatsTable(plot=self.plot)
+        widget.setStats(statshandler.StatsHandler((('blocking', blockingStat),)))
+        self.assertTrue(started.wait(5))
+        self.assertTrue(widget.isUpdating())
+
+        notifications = []
+        submit = StatsWidget.submitToQtMainThread
+
+        def wrappedSubmit(*args, **kwargs):
+            future = submit(*args, **kwargs)
+            notifications.append(future)
+            return future
+        StatsWidget.submitToQtMainThread = wrappedSubmit
+        try:
+            widget.setAttribute(qt.Qt.WA_DeleteOnClose)
+            widget.close()
+            self.qapp.sendPostedEvents(None, qt.QEvent.DeferredDelete)
+            if not keepReference:
+                widget = None
+                gc.collect()
+
+            release.set()
+            for _ in range(500):
+                if notifications and all(f.done() for f in notifications):
+                    break
+                self.qWait(10)
+        finally:
+            StatsWidget.submitToQtMainThread = submit
+
+        self.assertTrue(len(notifications) > 0)
+        for future in notifications:
+            self.assertIsNone(future.exception())
+
+    def testOnVisibleData(self):
+        """Make sure the stats follow the plot limits"""
+        self.widget.setStatsOnVisibleData(True)
+        self.plot.getXAxis().setLimits(0, 5)
+        self.waitForStats(self.widget)
+        itemMax = self.widget._getItem(name='max', legend='curve0',
+                                       kind='curve', indexTable=None)
+        self.assertEqual(itemMax.text(), '5')
+
+        self.plot.getXAxis().setLimits(0, 10)
+        self.waitForStats(self.widget)
+        self.assertEqual(itemMax.text(), '10')
+
     def testSetAnotherPlot(self):
         plot2 = Plot1D()
         plot2.addCurve(x=range(26), y=range(26), legend='new curve')
@@ -442,7 +529,7 @@ class TestStatsWidgetWithCurves(TestCaseQt):
         plot2 = None
 
 
-class TestStatsWidgetWithImages(TestCaseQt):
+class TestStatsWidgetWithImages(_StatsWidgetTestCase):
     """Basic test for StatsWidget with images"""
     def setUp(self):
         TestCaseQt.setUp(self)
@@ -476,6 +563,7 @@ class TestStatsWidgetWithImages(TestCaseQt):
         TestCaseQt.tearDown(self)
 
     def test(self):
+        self.waitForStats(self.widget)
         columnsIndex = self.widget._columns_index
         itemLegend = self.widget._lgdAndKindToItems[('test image', 'image')]['legend']
         itemMin = self.widget.item(itemLegend.row(), columnsIndex['min'])
@@ -493,7 +581,7 @@ class TestStatsWidgetWithImages(TestCaseQt):
         self.assertTrue(itemCoordsMax.text() == '127.0, 127.0')
 
 
-class TestStatsWidgetWithScatters(TestCaseQt):
+class TestStatsWidgetWithScatters(_StatsWidgetTestCase):
     def setUp(self):
         TestCaseQt.setUp(self)
         self.scatterPlot = Plot2D()
@@ -526,6 +614,7 @@ class TestStatsWidgetWithScatters(TestCaseQt):
         TestCaseQt.tearDown(self)
 
     def testStats(self):
+        self.waitForStats(self.widget)
         columnsIndex = self.widget._columns_index
         itemLegend = self.widget._lgdAndKindToItems[('scatter plot', 'scatter')]['legend']
         itemMin = self.widget.item(itemLegend.row(), columnsIndex['min'])
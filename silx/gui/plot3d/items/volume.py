@@ -31,15 +31,18 @@ __authors__ = ["T. Vincent"]
 __license__ = "MIT"
 __date__ = "24/04/2018"
 
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import time
 import numpy
 
 from silx.math.combo import min_max
-from silx.math.marchingcubes import MarchingCubes
+from silx.math.marchingcubes import BlockMinMax, MarchingCubes, marching_cubes
+import silx.utils.weakref
 
 from ... import qt
 from ...colors import rgba
+from ...utils.concurrent import submitToQtMainThread
 
 from ..scene import cutplane, primitives, transform, utils
 
@@ -51,6 +54,40 @@ from ._pick import PickingResult
 _logger = logging.getLogger(__name__)
 
 
+_executor = None
+"""Worker thread used to compute iso-surfaces"""
+
+_SYNC_MAX_SIZE = 64 ** 3
+"""Iso-surfaces of data up to this size are computed in the main thread"""
+
+
+def _getExecutor():
+    """Returns the executor used to compute iso-surfaces.
+
+    A single worker is used, iso-surface computation is itself parallel.
+
+    :rtype: concurrent.futures.ThreadPoolExecutor
+    """
+    global _executor
+    if _executor is None:  # Lazy-loading
+        _executor = ThreadPoolExecutor(max_workers=1)
+    return _executor
+
+
+def _computeIsosurface(data, level, blockMinMax):
+    """Compute the iso-surface of data (run in the worker thread)
+
+    :param numpy.ndarray data: 3D scalar field
+    :param float level: Iso-level
+    :param BlockMinMax blockMinMax: Min/max index of data or None
+    :return: (vertices, normals, indices)
+    """
+    st = time.time()
+    result = marching_cubes(data, isolevel=level, block_min_max=blockMinMax)
+    _logger.info('Computed iso-surface in %f s.', time.time() - st)
+    return result
+
+
 class CutPlane(Item3D, ColormapMixIn, InterpolationMixIn, PlaneMixIn):
     """Class representing a cutting plane in a :class:`ScalarField3D` item.
 
@@ -176,6 +213,10 @@ class Isosurface(Item3D):
         self._level = float('nan')
         self._autoLevelFunction = None
         self._color = rgba('#FFD700FF')
+        self._requestId = 0
+        """Id of the latest iso-surface computation"""
+        self._future = None
+        """Future of the pending iso-surface computation"""
         self._updateScenePrimitive()
 
     def _scalarField3DChanged(self, event):
@@ -252,58 +293,115 @@ class Isosurface(Item3D):
                 primitive.children[0].setAttribute('color', self._color)
             self._updated(ItemChangedType.COLOR)
 
+    def isComputing(self):
+        """Returns True while the iso-surface is being computed.
+
+        The iso-surface of large data is computed in a worker thread,
+        the mesh is updated in the Qt main thread once available.
+
+        :rtype: bool
+        """
+        return self._future is not None
+
     def _updateScenePrimitive(self):
-        """Update underlying mesh"""
-        self._getScenePrimitive().children = []
+        """Update underlying mesh.
+
+        The iso-surface of large data is computed in a worker thread,
+        the current mesh is replaced once it is available.
+        """
+        self._cancelIsosurface()
 
         data = self.getData(copy=False)
 
         if data is None:
             if self.isAutoLevel():
                 self._level = float('nan')
+            self._getScenePrimitive().children = []
+            return
 
-        else:
-            if self.isAutoLevel():
-                st = time.time()
-                try:
-                    level = float(self.getAutoLevelFunction()(data))
-
-                except Exception:
-                    module_ = self.getAutoLevelFunction().__module__
-                    name = self.getAutoLevelFunction().__name__
-                    _logger.error(
-                        "Error while executing iso level function %s.%s",
-                        module_,
-                        name,
-                        exc_info=True)
-                    level = float('nan')
-
-                else:
-                    _logger.info(
-                        'Computed iso-level in %f s.', time.time() - st)
-
-                if level != self._level:
-                    self._level = level
-                    self._updated(Item3DChangedType.ISO_LEVEL)
-
-            if not numpy.isfinite(self._level):
-                return
-
+        if self.isAutoLevel():
             st = time.time()
-            vertices, normals, indices = MarchingCubes(
-                data,
-                isolevel=self._level)
-            _logger.info('Computed iso-surface in %f s.', time.time() - st)
+            try:
+                level = float(self.getAutoLevelFunction()(data))
+
+            except Exception:
+                module_ = self.getAutoLevelFunction().__module__
+                name = self.getAutoLevelFunction().__name__
+                _logger.error(
+                    "Error while executing iso level function %s.%s",
+                    module_,
+                    name,
+                    exc_info=True)
+                level = float('nan')
 
-            if len(vertices) == 0:
-                return
             else:
-                mesh = primitives.Mesh3D(vertices,
-                                         colors=self._color,
-                                         normals=normals,
-                                         mode='triangles',
-                                         indices=indices)
-                self._getScenePrimitive().children = [mesh]
+                _logger.info(
+                    'Computed iso-level in %f s.', time.time() - st)
+
+            if level != self._level:
+                self._level = level
+                self._updated(Item3DChangedType.ISO_LEVEL)
+
+        if not numpy.isfinite(self._level):
+            self._getScenePrimitive().children = []
+            return
+
+        blockMinMax = self.parent()._getBlockMinMax()
+        if data.size <= _SYNC_MAX_SIZE:
+            self._setMesh(_computeIsosurface(data, self._level, blockMinMax))
+            return
+
+        requestId = self._requestId
+        callback = silx.utils.weakref.WeakMethodProxy(self._computed)
+
+        def done(future):
+            if not future.cancelled():
+                submitToQtMainThread(callback, requestId, future)
+
+        self._future = _getExecutor().submit(
+            _computeIsosurface, data, self._level, blockMinMax)
+        self._future.add_done_callback(done)
+
+    def _cancelIsosurface(self):
+        """Cancel the pending iso-surface computation, if any"""
+        self._requestId += 1
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+
+    def _computed(self, requestId, future):
+        """Called in the Qt main thread when an iso-surface is computed
+
+        :param int requestId: Id of the computation
+        :param concurrent.futures.Future future: The computation
+        """
+        if requestId != self._requestId:
+            return  # Outdated
+        self._future = None
+
+        try:
+            result = future.result()
+        except Exception:
+            _logger.error("Error while computing iso-surface", exc_info=True)
+            self._getScenePrimitive().children = []
+        else:
+            self._setMesh(result)
+
+    def _setMesh(self, result):
+        """Replace the mesh of the iso-surface
+
+        :param result: (vertices, normals, indices)
+        """
+        vertices, normals, indices = result
+        if len(vertices) == 0:
+            self._getScenePrimitive().children = []
+        else:
+            mesh = primitives.Mesh3D(vertices,
+                                     colors=self._color,
+                                     normals=normals,
+                                     mode='triangles',
+                                     indices=indices)
+            self._getScenePrimitive().children = [mesh]
 
     def _pickFull(self, context):
         """Perform picking in this item at given widget position.
@@ -370,6 +468,9 @@ class ScalarField3D(BaseNodeItem):
     :param parent: The View widget this item belongs to.
     """
 
+    _BLOCK_SIZE = 8
+    """Size of the blocks of the min/max index used for iso-surfaces"""
+
     def __init__(self, parent=None):
         BaseNodeItem.__init__(self, parent=parent)
 
@@ -382,6 +483,7 @@ class ScalarField3D(BaseNodeItem):
 
         self._data = None
         self._dataRange = None
+        self._blockMinMax = None
 
         self._cutPlane = CutPlane(parent=self)
         self._cutPlane.setVisible(False)
@@ -417,6 +519,7 @@ class ScalarField3D(BaseNodeItem):
         if data is None:
             self._data = None
             self._dataRange = None
+            self._blockMinMax = None
             self._boundedGroup.shape = None
 
         else:
@@ -438,6 +541,10 @@ class ScalarField3D(BaseNodeItem):
                 dataRange = dataRange.minimum, min_positive, dataRange.maximum
             self._dataRange = dataRange
 
+            # Index of blocks used to speed-up iso-surfaces computation
+            self._blockMinMax = BlockMinMax(self._data,
+                                            block_size=self._BLOCK_SIZE)
+
             self._boundedGroup.shape = self._data.shape
 
         self._updated(ItemChangedType.DATA)
@@ -464,6 +571,13 @@ class ScalarField3D(BaseNodeItem):
         """
         return self._dataRange
 
+    def _getBlockMinMax(self):
+        """Return the min/max index of the data by blocks.
+
+        :rtype: Union[None,~silx.math.marchingcubes.BlockMinMax]
+        """
+        return self._blockMinMax
+
     # Cut Plane
 
     def getCutPlanes(self):
@@ -535,6 +649,7 @@ class ScalarField3D(BaseNodeItem):
                 str(isosurface))
         else:
             isosurface.sigItemChanged.disconnect(self._isosurfaceItemChanged)
+            isosurface._cancelIsosurface()
             self._isosurfaces.remove(isosurface)
             self._updateIsosurfaces()
             self.sigIsosurfaceRemoved.emit(isosurface)
@@ -57,12 +57,14 @@ def suite():
     from ..scene.test import suite as sceneTestSuite
     from ..tools.test import suite as toolsTestSuite
     from .testGL import suite as testGLSuite
+    from .testItems import suite as testItemsSuite
     from .testScalarFieldView import suite as testScalarFieldViewSuite
     from .testSceneWidgetPicking import suite as testSceneWidgetPickingSuite
 
     testsuite = unittest.TestSuite()
     testsuite.addTest(testGLSuite())
     testsuite.addTest(sceneTestSuite())
+    testsuite.addTest(testItemsSuite())
     testsuite.addTest(testScalarFieldViewSuite())
     testsuite.addTest(testSceneWidgetPickingSuite())
     testsuite.addTest(toolsTestSuite())
@@ -0,0 +1,165 @@
+# coding: utf-8
+# /*##########################################################################
+#
+# Copyright (c) 2018 European Synchrotron Radiation Facility
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# ###########################################################################*/
+"""Test plot3d items"""
+
+__authors__ = ["T. Vincent"]
+__license__ = "MIT"
+__date__ = "19/10/2018"
+
+
+import threading
+import time
+import unittest
+
+import numpy
+
+from silx.gui.utils.testutils import TestCaseQt
+from silx.math.marchingcubes import MarchingCubes
+
+from silx.gui.plot3d import items
+from silx.gui.plot3d.items import volume
+
+
+class TestIsosurface(TestCaseQt):
+    """Tests of the computation of Isosurface items"""
+
+    def setUp(self):
+        super(TestIsosurface, self).setUp()
+        self.data = numpy.arange(10**3, dtype=numpy.float32).reshape(10, 10, 10)
+        self.scalarField = items.ScalarField3D()
+        self.scalarField.setData(self.data)
+
+        # Compute all iso-surfaces in the worker thread
+        syncMaxSize = volume._SYNC_MAX_SIZE
+        volume._SYNC_MAX_SIZE = 0
+        self.addCleanup(setattr, volume, '_SYNC_MAX_SIZE', syncMaxSize)
+
+        # Computations wait for this event
+        self.event = threading.Event()
+        self.event.set()
+        self.levels = []
+
+        computeIsosurface = volume._computeIsosurface
+
+        def blockingComputeIsosurface(data, level, blockMinMax):
+            self.levels.append(level)
+            self.event.wait()
+            return computeIsosurface(data, level, blockMinMax)
+
+        volume._computeIsosurface = blockingComputeIsosurface
+        self.addCleanup(setattr, volume, '_computeIsosurface', computeIsosurface)
+
+    def tearDown(self):
+        self.event.set()
+        for isosurface in self.scalarField.getIsosurfaces():
+            self._waitComputed(isosurface)
+        self.scalarField = None
+        super(TestIsosurface, self).tearDown()
+
+    def _waitComputed(self, isosurface, timeout=10.):
+        """Wait for the end of the computation of isosurface"""
+        end = time.time() + timeout
+        while isosurface.isComputing():
+            self.assertLess(time.time(), end, "Computation timed out")
+            self.qWait(10)
+
+    def _assertMesh(self, isosurface, level):
+        """Check that the mesh of isosurface is the one of level"""
+        children = isosurface._getScenePrimitive().children
+        self.assertEqual(len(children), 1)
+        expected = MarchingCubes(self.data, isolevel=level).get_vertices()
+        self.assertTrue(numpy.allclose(
+            children[0].getAttribute('position', copy=False), expected))
+
+    def testSynchronous(self):
+        """Test that iso-surfaces of small data are computed at once"""
+        volume._SYNC_MAX_SIZE = self.data.size
+        isosurface = self.scalarField.addIsosurface(500, 'red')
+        self.assertFalse(isosurface.isComputing())
+        self._assertMesh(isosurface, 500)
+
+    def testAsynchronous(self):
+        """Test that the mesh is replaced once computed"""
+        isosurface = self.scalarField.addIsosurface(500, 'red')
+        self._waitComputed(isosurface)
+        self._assertMesh(isosurface, 500)
+
+        self.event.clear()
+        isosurface.setLevel(200)
+        self.assertTrue(isosurface.isComputing())
+        self.qapp.processEvents()
+        # Previous mesh is displayed during the computation
+        self._assertMesh(isosurface, 500)
+
+        self.event.set()
+        self._waitComputed(isosurface)
+        self._assertMesh(isosurface, 200)
+
+    def testLevelChanged(self):
+        """Test that an outdated computation is ignored"""
+        self.event.clear()
+        isosurface = self.scalarField.addIsosurface(500, 'red')
+        # Wait for the worker to start the computation
+        end = time.time() + 10.
+        while not self.levels:
+            self.assertLess(time.time(), end, "Computation not started")
+            time.sleep(0.01)
+
+        isosurface.setLevel(200)
+        self.event.set()
+        self._waitComputed(isosurface)
+        self.assertEqual(self.levels, [500, 200])
+        self._assertMesh(isosurface, 200)
+
+        # Outdated result has been ignored
+        self.qWait(100)
+        self._assertMesh(isosurface, 200)
+
+    def testRemoved(self):
+        """Test that the computation is cancelled when the item is removed"""
+        self.event.clear()
+        first = self.scalarField.addIsosurface(500, 'red')
+        second = self.scalarField.addIsosurface(200, 'blue')
+        future = second._future
+
+        self.scalarField.removeIsosurface(second)
+        self.assertFalse(second.isComputing())
+        self.assertTrue(future.cancelled())
+
+        self.event.set()
+        self._waitComputed(first)
+        self.assertEqual(self.levels, [500])
+        self._assertMesh(first, 500)
+        self.assertEqual(len(second._getScenePrimitive().children), 0)
+
+
+def suite():
+    test_suite = unittest.TestSuite()
+    loadTests = unittest.defaultTestLoader.loadTestsFromTestCase
+    test_suite.addTest(loadTests(TestIsosurface))
+    return test_suite
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
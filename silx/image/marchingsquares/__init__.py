@@ -33,7 +33,8 @@ Utilitary functions are provided as facade for simple use.
 :meth:`find_contours` to find iso contours from an image and using the same
 main signature as `find_contours` from `skimage`, but supporting mask.
 And :meth:`find_pixels` which returns a set of pixel coords containing the
-points of the iso contours.
+points of the iso contours. :meth:`find_contours_stack` finds the iso contours
+of each frame of a stack of images.
 """
 
 __authors__ = ["V. Valls"]
@@ -41,6 +42,11 @@ __license__ = "MIT"
 __date__ = "02/07/2018"
 
 
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy
+
 from ._mergeimpl import MarchingSquaresMergeImpl
 
 
@@ -74,11 +80,14 @@ def find_pixels(image, level, mask=None):
         pixels = silx.image.marchingsquares.find_pixels(image, 0.5, mask=mask)
 
     :param numpy.ndarray image: Image to process
-    :param float level: Level of the requested iso contours.
+    :param level: Level of the requested iso contours. If a sequence of
+        levels is provided, they are computed in a single pass and a list
+        of results is returned.
+    :type level: Union[float, List[float], numpy.ndarray]
     :param numpy.ndarray mask: An optional mask (a non-zero value invalidate
         the pixels of the image)
-    :returns: An array of coordinates in y/x
-    :rtype: numpy.ndarray
+    :returns: An array of coordinates in y/x, or a list of arrays
+    :rtype: Union[numpy.ndarray, List[numpy.ndarray]]
     """
     assert(image is not None)
     if mask is not None:
@@ -103,11 +112,15 @@ def find_contours(image, level, mask=None):
         polygons = silx.image.marchingsquares.find_contours(image, 0.5, mask=mask)
 
     :param numpy.ndarray image: Image to process
-    :param float level: Level of the requested iso contours.
+    :param level: Level of the requested iso contours. If a sequence of
+        levels is provided, they are computed in a single pass and a list
+        of results is returned.
+    :type level: Union[float, List[float], numpy.ndarray]
     :param numpy.ndarray mask: An optional mask (a non-zero value invalidate
         the pixels of the image)
-    :returns: A list of array containing y-x coordinates of points
-    :rtype: List[numpy.ndarray]
+    :returns: A list of array containing y-x coordinates of points, or a
+        list of such lists
+    :rtype: Union[List[numpy.ndarray], List[List[numpy.ndarray]]]
     """
     assert(image is not None)
     if mask is not None:
@@ -115,3 +128,76 @@ def find_contours(image, level, mask=None):
     engine = "merge"
     impl = _factory(engine, image, mask)
     return impl.find_contours(level)
+
+
+def find_contours_stack(data, level, mask=None, max_workers=None, slab_size=16):
+    """
+    Find the iso contours at the given `level` for each frame of a stack
+    of images.
+
+    Frames are processed in parallel by a pool of threads. The stack is read
+    by slabs of `slab_size` frames along the first dimension, so that only
+    two slabs are loaded in memory at the same time. Data can then be a
+    large dataset stored in a file, e.g., a :class:`h5py.Dataset`.
+
+    .. code-block:: python
+
+        # Example using many levels
+        stack = numpy.random.random((10, 100, 100))
+        levels = [0.25, 0.5, 0.75]
+        result = silx.image.marchingsquares.find_contours_stack(stack, levels)
+        polygons = result[frame_index][level_index]
+
+    :param data: 3D stack of images, any object supporting ``shape`` and
+        slicing along the first dimension.
+    :param level: Level of the requested iso contours, or a sequence of
+        levels computed in a single pass for each frame.
+    :type level: Union[float, List[float], numpy.ndarray]
+    :param numpy.ndarray mask: An optional mask (a non-zero value invalidate
+        the pixels of the image). Either a 2D mask used for all the frames,
+        or a 3D mask with the same shape as `data`.
+    :param int max_workers: Number of threads processing the frames.
+        Default: the number of CPUs
+    :param int slab_size: Number of frames read at once
+    :returns: The result of :meth:`find_contours` for each frame
+    :rtype: List
+    """
+    assert(data is not None)
+    assert(len(data.shape) == 3)
+    if mask is not None:
+        assert(mask.shape in (data.shape, data.shape[1:]))
+    if max_workers is None:
+        max_workers = multiprocessing.cpu_count()
+    slab_size = max(1, int(slab_size))
+
+    def process(image, frame_mask):
+        return MarchingSquaresMergeImpl(image, frame_mask).find_contours(level)
+
+    def frame_masks(start, stop):
+        if mask is None or mask.ndim == 2:
+            return [mask] * (stop - start)
+        return numpy.asarray(mask[start:stop])
+
+    results = []
+    if max_workers <= 1:
+        for start in range(0, data.shape[0], slab_size):
+            stop = min(start + slab_size, data.shape[0])
+            slab = numpy.asarray(data[start:stop])
+            results.extend(map(process, slab, frame_masks(start, stop)))
+        return results
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        previous_futures = []
+        for start in range(0, data.shape[0], slab_size):
+            stop = min(start + slab_size, data.shape[0])
+            slab = numpy.asarray(data[start:stop])
+            futures = [executor.submit(process, image, frame_mask)
+                       for image, frame_mask in zip(slab, frame_masks(start, stop))]
+            # Collect the previous slab while this one is processed
+            results.extend(future.result() for future in previous_futures)
+            previous_futures = futures
+        results.extend(future.result() for future in previous_futures)
+    finally:
+        executor.shutdown(wait=True)
+    return results
@@ -58,6 +58,77 @@ from libc.float cimport DBL_MAX
 cdef double INFINITY = DBL_MAX + DBL_MAX
 # from libc.math cimport INFINITY
 
+cdef enum:
+    IMAGE_FLOAT32 = 0
+    IMAGE_FLOAT64 = 1
+    IMAGE_UINT16 = 2
+"""Types of images processed without conversion"""
+
+_NATIVE_IMAGE_TYPES = {
+    numpy.dtype(numpy.float32): IMAGE_FLOAT32,
+    numpy.dtype(numpy.float64): IMAGE_FLOAT64,
+    numpy.dtype(numpy.uint16): IMAGE_UINT16,
+}
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline cnumpy.float64_t _image_value(void *image_ptr,
+                                          int image_type,
+                                          int index) nogil:
+    """Returns the value of a pixel of an image stored with a native type.
+
+    :param image_ptr: Pointer to the data of the image
+    :param image_type: Type of the image data (one of `IMAGE_*`)
+    :param index: Index of the pixel in the flat image
+    """
+    if image_type == IMAGE_FLOAT32:
+        return (<cnumpy.float32_t*> image_ptr)[index]
+    elif image_type == IMAGE_FLOAT64:
+        return (<cnumpy.float64_t*> image_ptr)[index]
+    else:
+        return (<cnumpy.uint16_t*> image_ptr)[index]
+
+
+@cython.cdivision(True)
+cdef inline int _cell_pattern(cnumpy.float64_t v0,
+                              cnumpy.float64_t v1,
+                              cnumpy.float64_t v2,
+                              cnumpy.float64_t v3,
+                              cnumpy.float64_t level) nogil:
+    """Returns the pattern of a cell of 2*2 pixels.
+
+    :param v0: Value of the top-left pixel
+    :param v1: Value of the top-right pixel
+    :param v2: Value of the bottom-right pixel
+    :param v3: Value of the bottom-left pixel
+    :param level: The requested level
+    """
+    cdef:
+        int pattern = 0
+        cnumpy.float64_t tmpf
+    if v0 > level:
+        pattern += 1
+    if v1 > level:
+        pattern += 2
+    if v2 > level:
+        pattern += 4
+    if v3 > level:
+        pattern += 8
+
+    # Resolve ambiguity
+    if pattern == 5 or pattern == 10:
+        # Calculate value of cell center (i.e. average of corners)
+        tmpf = 0.25 * (v0 + v1 + v2 + v3)
+        # If below level, swap
+        if tmpf <= level:
+            if pattern == 5:
+                pattern = 10
+            else:
+                pattern = 5
+    return pattern
+
+
 cdef extern from "include/patterns.h":
     cdef unsigned char EDGE_TO_POINT[][2]
     cdef unsigned char CELL_TO_EDGE[][5]
@@ -114,7 +185,8 @@ cdef class _MarchingSquaresAlgorithm(object):
     logic between `_MarchingSquaresContours` and `_MarchingSquaresPixels`.
     """
 
-    cdef cnumpy.float32_t *_image_ptr
+    cdef void *_image_ptr
+    cdef int _image_type
     cdef cnumpy.int8_t *_mask_ptr
     cdef int _dim_x
     cdef int _dim_y
@@ -124,8 +196,8 @@ cdef class _MarchingSquaresAlgorithm(object):
 
     cdef TileContext* _final_context
 
-    cdef cnumpy.float32_t *_min_cache
-    cdef cnumpy.float32_t *_max_cache
+    cdef cnumpy.float64_t *_min_cache
+    cdef cnumpy.float64_t *_max_cache
 
     def __cinit__(self):
         self._use_minmax_cache = False
@@ -168,22 +240,97 @@ cdef class _MarchingSquaresAlgorithm(object):
         for i in prange(nb_valid_contexts, nogil=True):
             self.marching_squares_mp(valid_contexts[i], level)
 
-        if nb_valid_contexts == 1:
-            # shortcut
-            self._final_context = valid_contexts[0]
-            libc.stdlib.free(valid_contexts)
-            libc.stdlib.free(contexts)
-            return
+        libc.stdlib.free(valid_contexts)
+        self.reduce_contexts(dim_x, dim_y, contexts, nb_valid_contexts)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    cdef void marching_squares_levels(self,
+                                      cnumpy.float64_t *levels,
+                                      int nb_levels,
+                                      TileContext **final_contexts) nogil:
+        """
+        Execute the marching squares for many levels at once.
+
+        Each tile is processed a single time for all the levels, and each
+        cell is only compared to the levels in the range of its pixels.
+
+        :param levels: The levels expected, sorted in ascending order
+        :param nb_levels: Number of levels
+        :param final_contexts: Resulting context of each level
+        """
+        cdef:
+            TileContext*** level_contexts
+            TileContext** tile_contexts
+            int *nb_valid_contexts
+            int nb_tiles, ilevel, itile
+            int dim_x, dim_y
+
+        level_contexts = <TileContext ***>libc.stdlib.malloc(nb_levels * sizeof(TileContext**))
+        nb_valid_contexts = <int *>libc.stdlib.malloc(nb_levels * sizeof(int))
+        for ilevel in range(nb_levels):
+            level_contexts[ilevel] = self.create_contexts(levels[ilevel], &dim_x, &dim_y, &nb_valid_contexts[ilevel])
+        nb_tiles = dim_x * dim_y
+
+        # Contexts of all the levels grouped by tile
+        tile_contexts = <TileContext **>libc.stdlib.malloc(nb_tiles * nb_levels * sizeof(TileContext*))
+        for itile in range(nb_tiles):
+            for ilevel in range(nb_levels):
+                tile_contexts[itile * nb_levels + ilevel] = level_contexts[ilevel][itile]
+
+        # openmp
+        for itile in prange(nb_tiles, nogil=True):
+            self.marching_squares_mp_levels(tile_contexts + itile * nb_levels, levels, nb_levels)
+
+        libc.stdlib.free(tile_contexts)
+
+        for ilevel in range(nb_levels):
+            self.reduce_contexts(dim_x, dim_y, level_contexts[ilevel], nb_valid_contexts[ilevel])
+            final_contexts[ilevel] = self._final_context
+        self._final_context = NULL
+
+        libc.stdlib.free(nb_valid_contexts)
+        libc.stdlib.free(level_contexts)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    cdef void reduce_contexts(self,
+                              int dim_x,
+                              int dim_y,
+                              TileContext **contexts,
+                              int nb_valid_contexts) nogil:
+        """
+        Merge the processed contexts of a level into the final context.
 
-        if self._force_sequencial_reduction:
-            self.sequencial_reduction(nb_valid_contexts, valid_contexts)
+        The array of contexts is released.
+
+        :param dim_x: Number of contexts in the x dimension
+        :param dim_y: Number of contexts in the y dimension
+        :param contexts: Array of contexts, containing `NULL` for skipped tiles
+        :param nb_valid_contexts: Number of non `NULL` contexts
+        """
+        cdef:
+            int i
+
+        if nb_valid_contexts == 0:
+            # shortcut
+            self._final_context = new TileContext()
+        elif nb_valid_contexts == 1:
+            # shortcut
+            for i in range(dim_x * dim_y):
+                if contexts[i] != NULL:
+                    self._final_context = contexts[i]
+                    break
+        elif self._force_sequencial_reduction:
+            self.sequencial_reduction(dim_x * dim_y, contexts)
         # FIXME can only be used if compiled with openmp
         # elif copenmp.omp_get_num_threads() <= 1:
-        #     self._sequencial_reduction(nb_valid_contexts, valid_contexts)
+        #     self._sequencial_reduction(dim_x * dim_y, contexts)
         else:
             self.reduction_2d(dim_x, dim_y, contexts)
 
-        libc.stdlib.free(valid_contexts)
         libc.stdlib.free(contexts)
 
     @cython.boundscheck(False)
@@ -295,43 +442,24 @@ cdef class _MarchingSquaresAlgorithm(object):
         :param level: The requested level
         """
         cdef:
-            int x, y, pattern
-            cnumpy.float64_t tmpf
-            cnumpy.float32_t *image_ptr
+            int x, y, pattern, index
             cnumpy.int8_t *mask_ptr
 
-        image_ptr = self._image_ptr + (context.pos_y * self._dim_x + context.pos_x)
+        index = context.pos_y * self._dim_x + context.pos_x
         if self._mask_ptr != NULL:
-            mask_ptr = self._mask_ptr + (context.pos_y * self._dim_x + context.pos_x)
+            mask_ptr = self._mask_ptr + index
         else:
             mask_ptr = NULL
 
         for y in range(context.pos_y, context.pos_y + context.dim_y):
             for x in range(context.pos_x, context.pos_x + context.dim_x):
                 # Calculate index.
-                pattern = 0
-                if image_ptr[0] > level:
-                    pattern += 1
-                if image_ptr[1] > level:
-                    pattern += 2
-                if image_ptr[self._dim_x] > level:
-                    pattern += 8
-                if image_ptr[self._dim_x + 1] > level:
-                    pattern += 4
-
-                # Resolve ambiguity
-                if pattern == 5 or pattern == 10:
-                    # Calculate value of cell center (i.e. average of corners)
-                    tmpf = 0.25 * (image_ptr[0] +
-                                   image_ptr[1] +
-                                   image_ptr[self._dim_x] +
-                                   image_ptr[self._dim_x + 1])
-                    # If below level, swap
-                    if tmpf <= level:
-                        if pattern == 5:
-                            pattern = 10
-                        else:
-                            pattern = 5
+                pattern = _cell_pattern(
+                    _image_value(self._image_ptr, self._image_type, index),
+                    _image_value(self._image_ptr, self._image_type, index + 1),
+                    _image_value(self._image_ptr, self._image_type, index + self._dim_x + 1),
+                    _image_value(self._image_ptr, self._image_type, index + self._dim_x),
+                    level)
 
                 # Cache mask information
                 if mask_ptr != NULL:
@@ -351,15 +479,106 @@ cdef class _MarchingSquaresAlgorithm(object):
                 if pattern < 16 and pattern != 0 and pattern != 15:
                     self.insert_pattern(context, x, y, pattern, level)
 
-                image_ptr += 1
+                index += 1
 
             # There is a missing pixel at the end of each rows
-            image_ptr += self._dim_x - context.dim_x
+            index += self._dim_x - context.dim_x
             if mask_ptr != NULL:
                 mask_ptr += self._dim_x - context.dim_x
 
         self.after_marching_squares(context)
 
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    cdef void marching_squares_mp_levels(self,
+                                         TileContext **contexts,
+                                         cnumpy.float64_t *levels,
+                                         int nb_levels) nogil:
+        """
+        Entry of the multi-level marching squares algorithm for each threads.
+
+        All the contexts are describing the same tile. A `NULL` context
+        means the level can be skipped for this tile.
+
+        :param contexts: Context of each level for this tile
+        :param levels: The requested levels, sorted in ascending order
+        :param nb_levels: Number of levels
+        """
+        cdef:
+            int x, y, pattern, index, ilevel, first_level, last_level
+            int lower, upper, middle
+            cnumpy.float64_t v0, v1, v2, v3, vmin, vmax
+            cnumpy.int8_t *mask_ptr
+            TileContext *tile = NULL
+            TileContext *context
+
+        # Location of the tile, shared by all contexts
+        for ilevel in range(nb_levels):
+            if contexts[ilevel] != NULL:
+                tile = contexts[ilevel]
+                break
+        if tile == NULL:
+            return
+
+        index = tile.pos_y * self._dim_x + tile.pos_x
+        if self._mask_ptr != NULL:
+            mask_ptr = self._mask_ptr + index
+        else:
+            mask_ptr = NULL
+
+        for y in range(tile.pos_y, tile.pos_y + tile.dim_y):
+            for x in range(tile.pos_x, tile.pos_x + tile.dim_x):
+                if mask_ptr != NULL:
+                    if (mask_ptr[0] > 0 or mask_ptr[1] > 0 or
+                            mask_ptr[self._dim_x] > 0 or mask_ptr[self._dim_x + 1] > 0):
+                        mask_ptr += 1
+                        index += 1
+                        continue
+                    mask_ptr += 1
+
+                v0 = _image_value(self._image_ptr, self._image_type, index)
+                v1 = _image_value(self._image_ptr, self._image_type, index + 1)
+                v2 = _image_value(self._image_ptr, self._image_type, index + self._dim_x + 1)
+                v3 = _image_value(self._image_ptr, self._image_type, index + self._dim_x)
+                index += 1
+
+                if v0 != v0 or v1 != v1 or v2 != v2 or v3 != v3:
+                    # NaN are never above a level, all levels have to be checked
+                    first_level, last_level = 0, nb_levels
+                else:
+                    vmin = min(min(v0, v1), min(v2, v3))
+                    vmax = max(max(v0, v1), max(v2, v3))
+                    # Only levels in [vmin, vmax[ provide segments
+                    lower, upper = 0, nb_levels
+                    while lower < upper:
+                        middle = (lower + upper) // 2
+                        if levels[middle] < vmin:
+                            lower = middle + 1
+                        else:
+                            upper = middle
+                    first_level = lower
+                    last_level = lower
+                    while last_level < nb_levels and levels[last_level] < vmax:
+                        last_level += 1
+
+                for ilevel in range(first_level, last_level):
+                    context = contexts[ilevel]
+                    if context == NULL:
+                        continue
+                    pattern = _cell_pattern(v0, v1, v2, v3, levels[ilevel])
+                    if pattern != 0 and pattern != 15:
+                        self.insert_pattern(context, x, y, pattern, levels[ilevel])
+
+            # There is a missing pixel at the end of each rows
+            index += self._dim_x - tile.dim_x
+            if mask_ptr != NULL:
+                mask_ptr += self._dim_x - tile.dim_x
+
+        for ilevel in range(nb_levels):
+            if contexts[ilevel] != NULL:
+                self.after_marching_squares(contexts[ilevel])
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.cdivision(True)
@@ -529,8 +748,8 @@ cdef class _MarchingSquaresAlgorithm(object):
         # Define "strength" of each corner of the cube that we need
         index1 = (y + dy1) * self._dim_x + x + dx1
         index2 = (y + dy2) * self._dim_x + x + dx2
-        weight1 = 1.0 / (EPSILON + fabs(self._image_ptr[index1] - level))
-        weight2 = 1.0 / (EPSILON + fabs(self._image_ptr[index2] - level))
+        weight1 = 1.0 / (EPSILON + fabs(_image_value(self._image_ptr, self._image_type, index1) - level))
+        weight2 = 1.0 / (EPSILON + fabs(_image_value(self._image_ptr, self._image_type, index2) - level))
         # Apply a kind of center-of-mass method
         fx, fy, ff = 0.0, 0.0, 0.0
         fx += dx1 * weight1
@@ -576,8 +795,8 @@ cdef class _MarchingSquaresAlgorithm(object):
         # Define "strength" of each corner of the cube that we need
         index1 = (y + dy1) * self._dim_x + x + dx1
         index2 = (y + dy2) * self._dim_x + x + dx2
-        weight1 = EPSILON + fabs(self._image_ptr[index1] - level)
-        weight2 = EPSILON + fabs(self._image_ptr[index2] - level)
+        weight1 = EPSILON + fabs(_image_value(self._image_ptr, self._image_type, index1) - level)
+        weight2 = EPSILON + fabs(_image_value(self._image_ptr, self._image_type, index2) - level)
         # Apply a kind of center-of-mass method
         if edge == 0:
             result_coord.x = x + (weight1 > weight2)
@@ -1092,31 +1311,43 @@ cdef class MarchingSquaresMergeImpl(object):
         for level in levels:
             polygons = ms.find_contours(level=level)
 
+    .. code-block:: python
+
+        # Many levels computed in a single pass
+        shape = 1000, 1000
+        image = numpy.random.random(shape)
+        ms = MarchingSquaresMergeImpl(image, use_minmax_cache=True)
+        levels = numpy.arange(0, 1, 0.05)
+        polygons_per_level = ms.find_contours(level=levels)
+
     :param numpy.ndarray image: Image to process.
-        If the image is not a continuous array of native float 32bits, the data
-        will be first normalized. This can reduce efficiency.
+        Continuous arrays of native float 32bits, float 64bits and unsigned
+        integer 16bits are processed without copy. Other images will be first
+        normalized to float 32bits. This can reduce efficiency.
     :param numpy.ndarray mask: An optional mask (a non-zero value invalidate
         the pixels of the image)
-        If the image is not a continuous array of signed integer 8bits, the
-        data will be first normalized. This can reduce efficiency.
+        If the mask is not a continuous array of signed integer 8bits or of
+        booleans, the data will be first normalized. This can reduce
+        efficiency.
     :param int group_size: Specify the size of the tile to split the
         computation with OpenMP. It is also used as tile size to compute the
         min/max cache
     :param bool use_minmax_cache: If true the min/max cache is enabled.
     """
 
-    cdef cnumpy.float32_t[:, ::1] _image
+    cdef cnumpy.ndarray _image
     cdef cnumpy.int8_t[:, ::1] _mask
 
-    cdef cnumpy.float32_t *_image_ptr
+    cdef void *_image_ptr
+    cdef int _image_type
     cdef cnumpy.int8_t *_mask_ptr
     cdef int _dim_x
     cdef int _dim_y
     cdef int _group_size
     cdef bool _use_minmax_cache
 
-    cdef cnumpy.float32_t *_min_cache
-    cdef cnumpy.float32_t *_max_cache
+    cdef cnumpy.float64_t *_min_cache
+    cdef cnumpy.float64_t *_max_cache
 
     cdef _MarchingSquaresContours _contours_algo
     cdef _MarchingSquaresPixels _pixels_algo
@@ -1129,14 +1360,21 @@ cdef class MarchingSquaresMergeImpl(object):
             raise ValueError("Only 2D arrays are supported.")
         if image.shape[0] < 2 or image.shape[1] < 2:
             raise ValueError("Input array must be at least 2x2.")
-        # Force contiguous native array
-        self._image = numpy.ascontiguousarray(image, dtype='=f4')
-        self._image_ptr = &self._image[0][0]
+        # Force contiguous native array, keeping supported types
+        dtype = image.dtype.newbyteorder('=')
+        if dtype not in _NATIVE_IMAGE_TYPES:
+            dtype = numpy.dtype(numpy.float32)
+        self._image = numpy.ascontiguousarray(image, dtype=dtype)
+        self._image_ptr = cnumpy.PyArray_DATA(self._image)
+        self._image_type = _NATIVE_IMAGE_TYPES[dtype]
         if mask is not None:
             if not isinstance(mask, numpy.ndarray):
                 raise ValueError("Only 2D arrays are supported.")
             if image.shape != mask.shape:
                 raise ValueError("Mask size and image size must be the same.")
+            if mask.dtype == numpy.bool_ and mask.flags.c_contiguous:
+                # Same memory layout
+                mask = mask.view(numpy.int8)
             # Force contiguous native array
             self._mask = numpy.ascontiguousarray(mask, dtype='=i1')
             self._mask_ptr = &self._mask[0][0]
@@ -1181,10 +1419,9 @@ cdef class MarchingSquaresMergeImpl(object):
         :param block_index: Index of the tile in the minmax cache structure
         """
         cdef:
-            int x, y
+            int x, y, index
             int pos_x, end_x, pos_y, end_y
-            cnumpy.float32_t minimum, maximum, value
-            cnumpy.float32_t *image_ptr
+            cnumpy.float64_t minimum, maximum, value
             cnumpy.int8_t *mask_ptr
 
         pos_x = block_x * self._group_size
@@ -1196,7 +1433,7 @@ cdef class MarchingSquaresMergeImpl(object):
         if end_y > self._dim_y:
             end_y = self._dim_y
 
-        image_ptr = self._image_ptr + (pos_y * self._dim_x + pos_x)
+        index = pos_y * self._dim_x + pos_x
         if self._mask_ptr != NULL:
             mask_ptr = self._mask_ptr + (pos_y * self._dim_x + pos_x)
         else:
@@ -1208,18 +1445,18 @@ cdef class MarchingSquaresMergeImpl(object):
             for x in range(pos_x, end_x):
                 if mask_ptr != NULL:
                     if mask_ptr[0] != 0:
-                        image_ptr += 1
+                        index += 1
                         mask_ptr += 1
                         continue
-                value = image_ptr[0]
+                value = _image_value(self._image_ptr, self._image_type, index)
                 if value < minimum:
                     minimum = value
                 if value > maximum:
                     maximum = value
-                image_ptr += 1
+                index += 1
                 if mask_ptr != NULL:
                     mask_ptr += 1
-            image_ptr += self._dim_x + pos_x - end_x
+            index += self._dim_x + pos_x - end_x
             if mask_ptr != NULL:
                 mask_ptr += self._dim_x + pos_x - end_x
 
@@ -1241,78 +1478,126 @@ cdef class MarchingSquaresMergeImpl(object):
         context_dim_y = self._dim_y // self._group_size + (self._dim_y % self._group_size > 0)
         context_size = context_dim_x * context_dim_y
 
-        self._min_cache = <cnumpy.float32_t *>libc.stdlib.malloc(context_size * sizeof(cnumpy.float32_t))
-        self._max_cache = <cnumpy.float32_t *>libc.stdlib.malloc(context_size * sizeof(cnumpy.float32_t))
+        self._min_cache = <cnumpy.float64_t *>libc.stdlib.malloc(context_size * sizeof(cnumpy.float64_t))
+        self._max_cache = <cnumpy.float64_t *>libc.stdlib.malloc(context_size * sizeof(cnumpy.float64_t))
 
         for icontext in prange(context_size, nogil=True):
             context_x = icontext % context_dim_x
             context_y = icontext // context_dim_x
             self._compute_minmax_on_block(context_x, context_y, icontext)
 
-    @cython.boundscheck(False)
-    @cython.wraparound(False)
-    @cython.cdivision(True)
+    cdef _MarchingSquaresAlgorithm _create_algorithm(self, algorithm_class):
+        """
+        Create a marching squares algorithm sharing the image, the mask and
+        the min/max cache of this object.
+
+        :param algorithm_class: Subclass of `_MarchingSquaresAlgorithm`
+        """
+        cdef:
+            _MarchingSquaresAlgorithm algo
+        if self._use_minmax_cache and self._min_cache == NULL:
+            self._create_minmax_cache()
+
+        algo = algorithm_class()
+        algo._image_ptr = self._image_ptr
+        algo._image_type = self._image_type
+        algo._mask_ptr = self._mask_ptr
+        algo._dim_x = self._dim_x
+        algo._dim_y = self._dim_y
+        algo._group_size = self._group_size
+        algo._use_minmax_cache = self._use_minmax_cache
+        algo._force_sequencial_reduction = COMPILED_WITH_OPENMP == 0
+        if self._use_minmax_cache:
+            algo._min_cache = self._min_cache
+            algo._max_cache = self._max_cache
+        return algo
+
+    cdef list _process_levels(self, _MarchingSquaresAlgorithm algo, levels):
+        """
+        Execute the marching squares algorithm for many levels in a single
+        pass.
+
+        :param algo: The algorithm to use
+        :param levels: Sequence of levels
+        :returns: The result of each level, in the order of `levels`
+        """
+        cdef:
+            cnumpy.float64_t[::1] sorted_levels
+            vector[TileContext*] final_contexts
+            int nb_levels, i
+
+        levels = numpy.array(levels, dtype=numpy.float64).reshape(-1)
+        order = numpy.argsort(levels, kind='mergesort')
+        nb_levels = len(levels)
+        if nb_levels == 0:
+            return []
+
+        sorted_levels = numpy.ascontiguousarray(levels[order])
+        final_contexts.resize(nb_levels)
+        algo.marching_squares_levels(&sorted_levels[0], nb_levels, &final_contexts[0])
+
+        results = [None] * nb_levels
+        for i in range(nb_levels):
+            algo._final_context = final_contexts[i]
+            if isinstance(algo, _MarchingSquaresPixels):
+                results[order[i]] = (<_MarchingSquaresPixels> algo).extract_pixels()
+            else:
+                results[order[i]] = (<_MarchingSquaresContours> algo).extract_polygons()
+        return results
+
     def find_pixels(self, level):
         """
         Compute the pixels from the image over the requested iso contours
         at this `level`. Pixels are those over the bound of the segments.
 
-        :param float level: Level of the requested iso contours.
-        :returns: An array of y-x coordinates.
-        :rtype: numpy.ndarray
+        If a sequence of levels is provided, all the levels are computed in
+        a single pass over the image, and a list containing the result of
+        each level is returned.
+
+        :param level: Level, or sequence of levels, of the requested iso
+            contours.
+        :type level: Union[float, List[float], numpy.ndarray]
+        :returns: An array of y-x coordinates, or a list of arrays
+        :rtype: Union[numpy.ndarray, List[numpy.ndarray]]
         """
-        if self._use_minmax_cache and self._min_cache == NULL:
-            self._create_minmax_cache()
+        cdef:
+            _MarchingSquaresPixels algo
 
         if self._pixels_algo is None:
-            algo = _MarchingSquaresPixels()
-            algo._image_ptr = self._image_ptr
-            algo._mask_ptr = self._mask_ptr
-            algo._dim_x = self._dim_x
-            algo._dim_y = self._dim_y
-            algo._group_size = self._group_size
-            algo._use_minmax_cache = self._use_minmax_cache
-            algo._force_sequencial_reduction = COMPILED_WITH_OPENMP == 0
-            if self._use_minmax_cache:
-                algo._min_cache = self._min_cache
-                algo._max_cache = self._max_cache
-            self._pixels_algo = algo
-        else:
-            algo = self._pixels_algo
+            self._pixels_algo = <_MarchingSquaresPixels> self._create_algorithm(_MarchingSquaresPixels)
+        algo = self._pixels_algo
+
+        if numpy.ndim(level) > 0:
+            return self._process_levels(algo, level)
 
         algo.marching_squares(level)
         pixels = algo.extract_pixels()
         return pixels
 
-    @cython.boundscheck(False)
-    @cython.wraparound(False)
-    @cython.cdivision(True)
     def find_contours(self, level=None):
         """
         Compute the list of polygons of the iso contours at this `level`.
 
-        :param float level: Level of the requested iso contours.
-        :returns: A list of array containg y-x coordinates of points
-        :rtype: List[numpy.ndarray]
+        If a sequence of levels is provided, all the levels are computed in
+        a single pass over the image, and a list containing the result of
+        each level is returned.
+
+        :param level: Level, or sequence of levels, of the requested iso
+            contours.
+        :type level: Union[float, List[float], numpy.ndarray]
+        :returns: A list of array containg y-x coordinates of points, or a
+            list of such lists
+        :rtype: Union[List[numpy.ndarray], List[List[numpy.ndarray]]]
         """
-        if self._use_minmax_cache and self._min_cache == NULL:
-            self._create_minmax_cache()
+        cdef:
+            _MarchingSquaresContours algo
 
         if self._contours_algo is None:
-            algo = _MarchingSquaresContours()
-            algo._image_ptr = self._image_ptr
-            algo._mask_ptr = self._mask_ptr
-            algo._dim_x = self._dim_x
-            algo._dim_y = self._dim_y
-            algo._group_size = self._group_size
-            algo._use_minmax_cache = self._use_minmax_cache
-            algo._force_sequencial_reduction = COMPILED_WITH_OPENMP == 0
-            if self._use_minmax_cache:
-                algo._min_cache = self._min_cache
-                algo._max_cache = self._max_cache
-            self._contours_algo = algo
-        else:
-            algo = self._contours_algo
+            self._contours_algo = <_MarchingSquaresContours> self._create_algorithm(_MarchingSquaresContours)
+        algo = self._contours_algo
+
+        if numpy.ndim(level) > 0:
+            return self._process_levels(algo, level)
 
         algo.marching_squares(level)
         polygons = algo.extract_polygons()
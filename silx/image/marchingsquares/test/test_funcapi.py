@@ -92,8 +92,45 @@ class TestFunctionalApi(unittest.TestCase):
         self.assertEqual(events[2][1], level)
 
 
+class TestFindContoursStack(unittest.TestCase):
+
+    def setUp(self):
+        x, y = numpy.ogrid[-numpy.pi:numpy.pi:50j, -numpy.pi:numpy.pi:60j]
+        self.stack = numpy.array(
+            [numpy.sin(numpy.exp((numpy.sin(x + i)**3 + numpy.cos(y)**2)))
+             for i in range(7)])
+
+    def assertSameContours(self, contours1, contours2):
+        self.assertEqual(len(contours1), len(contours2))
+        for polygons1, polygons2 in zip(contours1, contours2):
+            self.assertEqual(len(polygons1), len(polygons2))
+            for polygon1, polygon2 in zip(polygons1, polygons2):
+                numpy.testing.assert_array_equal(polygon1, polygon2)
+
+    def test_stack(self):
+        expected = [silx.image.marchingsquares.find_contours(image, 0.5)
+                    for image in self.stack]
+        for max_workers in (1, 3):
+            results = silx.image.marchingsquares.find_contours_stack(
+                self.stack, 0.5, max_workers=max_workers, slab_size=3)
+            self.assertSameContours(results, expected)
+
+    def test_stack_levels_and_mask(self):
+        mask = numpy.zeros(self.stack.shape, dtype=numpy.int8)
+        mask[:, 10:20, 10:20] = 1
+        levels = [0.2, 0.5]
+        expected = [silx.image.marchingsquares.find_contours(image, levels, frame_mask)
+                    for image, frame_mask in zip(self.stack, mask)]
+        results = silx.image.marchingsquares.find_contours_stack(
+            self.stack, levels, mask=mask, max_workers=2, slab_size=2)
+        self.assertEqual(len(results), len(expected))
+        for result, frame_expected in zip(results, expected):
+            self.assertSameContours(result, frame_expected)
+
+
 def suite():
     test_suite = unittest.TestSuite()
     loadTests = unittest.defaultTestLoader.loadTestsFromTestCase
     test_suite.addTest(loadTests(TestFunctionalApi))
+    test_suite.addTest(loadTests(TestFindContoursStack))
     return test_suite
@@ -264,9 +264,65 @@ class TestMergeImplContours(unittest.TestCase):
         self.assertEqual(self.count_closed_polygons(polygons), 3)
 
 
+class TestMergeImplLevels(unittest.TestCase):
+
+    def setUp(self):
+        x, y = numpy.ogrid[-numpy.pi:numpy.pi:100j, -numpy.pi:numpy.pi:120j]
+        self.image = numpy.sin(numpy.exp((numpy.sin(x)**3 + numpy.cos(y)**2)))
+        self.image[10:13, 20:30] = numpy.nan
+        self.mask = numpy.zeros(self.image.shape, dtype=bool)
+        self.mask[50:60, 70:75] = True
+        # Unsorted, with a duplicate and levels outside of the data range
+        self.levels = [0.5, -0.2, 0.9, 0.5, -2.0, 0.1, 2.0]
+
+    def assertSameResults(self, results1, results2):
+        self.assertEqual(len(results1), len(results2))
+        for result1, result2 in zip(results1, results2):
+            if isinstance(result1, numpy.ndarray):
+                numpy.testing.assert_array_equal(result1, result2)
+            else:
+                self.assertEqual(len(result1), len(result2))
+                for polygon1, polygon2 in zip(result1, result2):
+                    numpy.testing.assert_array_equal(polygon1, polygon2)
+
+    def test_find_contours(self):
+        for kwargs in ({}, {"group_size": 16}, {"group_size": 16, "use_minmax_cache": True}):
+            for mask in (None, self.mask):
+                ms = MarchingSquaresMergeImpl(self.image, mask, **kwargs)
+                expected = [ms.find_contours(level) for level in self.levels]
+                ms = MarchingSquaresMergeImpl(self.image, mask, **kwargs)
+                results = ms.find_contours(self.levels)
+                self.assertSameResults(results, expected)
+
+    def test_find_pixels(self):
+        for kwargs in ({}, {"group_size": 16, "use_minmax_cache": True}):
+            for mask in (None, self.mask):
+                ms = MarchingSquaresMergeImpl(self.image, mask, **kwargs)
+                expected = [ms.find_pixels(level) for level in self.levels]
+                results = ms.find_pixels(numpy.array(self.levels))
+                self.assertSameResults(results, expected)
+
+    def test_no_level(self):
+        ms = MarchingSquaresMergeImpl(self.image)
+        self.assertEqual(ms.find_contours([]), [])
+        self.assertEqual(ms.find_pixels([]), [])
+
+    def test_native_types(self):
+        image = numpy.arange(12 * 10, dtype=numpy.uint16).reshape(12, 10)
+        image[5, 5] = 1000
+        expected = MarchingSquaresMergeImpl(image.astype(numpy.float32)).find_contours([15.5, 60., 500.])
+        results = MarchingSquaresMergeImpl(image).find_contours([15.5, 60., 500.])
+        self.assertSameResults(results, expected)
+        results = MarchingSquaresMergeImpl(image.astype(numpy.float64)).find_contours([15.5, 60., 500.])
+        self.assertSameResults(results, expected)
+        results = MarchingSquaresMergeImpl(image.astype('>f8')).find_contours([15.5, 60., 500.])
+        self.assertSameResults(results, expected)
+
+
 def suite():
     test_suite = unittest.TestSuite()
     loadTests = unittest.defaultTestLoader.loadTestsFromTestCase
     test_suite.addTest(loadTests(TestMergeImplApi))
     test_suite.addTest(loadTests(TestMergeImplContours))
+    test_suite.addTest(loadTests(TestMergeImplLevels))
     return test_suite
@@ -1,7 +1,7 @@
 # coding: utf-8
 # /*##########################################################################
 #
-# Copyright (c) 2015-2017 European Synchrotron Radiation Facility
+# Copyright (c) 2015-2026 European Synchrotron Radiation Facility
 #
 # Permission is hereby granted, free of charge, to any person obtaining a copy
 # of this software and associated documentation files (the "Software"), to deal
@@ -29,6 +29,15 @@
 - :func:`polygon_fill_mask` function generates a mask from a set of points
   defining a polygon.
 
+The following functions update an existing mask in place, only processing
+the bounding box of the shape:
+
+- :func:`update_polygon` fills a polygon.
+- :func:`update_disk` fills a disk.
+- :func:`update_line` draws a thick line.
+- :func:`update_polyline` draws a thick polyline with rounded joins
+  (e.g., a pencil stroke).
+
 The :class:`Polygon` class provides checking if a point is inside a polygon.
 
 The whole module uses the (row, col) (i.e., (y, x))) convention
@@ -37,13 +46,14 @@ for 2D coordinates.
 
 __authors__ = ["Jérôme Kieffer", "T. Vincent"]
 __license__ = "MIT"
-__date__ = "03/06/2016"
+__date__ = "19/10/2026"
 __status__ = "dev"
 
 
 cimport cython
 import numpy
-from libc.math cimport ceil, fabs
+from libc.math cimport ceil, fabs, floor
+from libc.stdlib cimport abs
 
 
 cdef class Polygon(object):
@@ -293,3 +303,311 @@ def circle_fill(int crow, int ccol, float radius):
     rows, cols = numpy.where(coords.reshape(1, len_coords) +
                              coords.reshape(len_coords, 1) < radius ** 2)
     return rows + crow - i_radius, cols + ccol - i_radius
+
+
+# In place mask update ########################################################
+
+cdef enum:
+    _MODE_SET = 0
+    _MODE_UNSET = 1
+    _MODE_XOR = 2
+
+
+_MODES = {'set': _MODE_SET, 'unset': _MODE_UNSET, 'xor': _MODE_XOR}
+
+
+cdef class _Stencil(object):
+    """Boolean stencil covering a rectangular region of a mask.
+
+    Shapes are rasterized in the stencil before it is applied to the mask,
+    so that overlapping parts of a shape are only applied once.
+
+    :param int height: Height of the mask
+    :param int width: Width of the mask
+    :param float row_min: Lower row bound of the region
+    :param float row_max: Upper row bound of the region
+    :param float col_min: Lower column bound of the region
+    :param float col_max: Upper column bound of the region
+    """
+
+    cdef int row0, col0, height, width
+    cdef unsigned char[:, :] data
+
+    def __init__(self, int height, int width,
+                 float row_min, float row_max, float col_min, float col_max):
+        # Clip region to the mask
+        self.row0 = max(0, <int>floor(row_min))
+        self.col0 = max(0, <int>floor(col_min))
+        self.height = max(0, min(height, <int>ceil(row_max) + 1) - self.row0)
+        self.width = max(0, min(width, <int>ceil(col_max) + 1) - self.col0)
+        self.data = numpy.zeros((self.height, self.width), dtype=numpy.uint8)
+
+    @cython.wraparound(False)
+    @cython.boundscheck(False)
+    cdef inline void set_pixel(self, int row, int col) nogil:
+        """Mark a pixel given in mask coordinates, ignoring out of region ones"""
+        row -= self.row0
+        col -= self.col0
+        if 0 <= row < self.height and 0 <= col < self.width:
+            self.data[row, col] = 1
+
+    @cython.cdivision(True)
+    @cython.wraparound(False)
+    @cython.boundscheck(False)
+    cdef void fill_polygon(self, float[:, :] vertices) nogil:
+        """Rasterize a polygon with the same rule as :meth:`Polygon.make_mask`
+
+        :param vertices: (row, col) corners of the polygon
+        """
+        cdef int nvert = vertices.shape[0]
+        cdef int row, col, index, xinters, is_inside, current
+        cdef float pt1x, pt1y, pt2x, pt2y
+
+        for row in range(self.height):
+            pt1x = vertices[nvert - 1, 1] - self.col0
+            pt1y = vertices[nvert - 1, 0] - self.row0
+            is_inside = 0
+
+            # Mark intersections and xor scan, see Polygon.make_mask
+            for index in range(nvert):
+                pt2x = vertices[index, 1] - self.col0
+                pt2y = vertices[index, 0] - self.row0
+
+                if ((pt1y <= row and row < pt2y) or
+                        (pt2y <= row and row < pt1y)):
+                    xinters = (<int>ceil(pt1x + (row - pt1y) *
+                               (pt2x - pt1x) / (pt2y - pt1y))) - 1
+                    if xinters < 0:
+                        is_inside ^= 1
+                    elif xinters < self.width:
+                        self.data[row, xinters] ^= 1
+                pt1x, pt1y = pt2x, pt2y
+
+            for col in range(self.width):
+                current = self.data[row, col]
+                self.data[row, col] = is_inside
+                is_inside = current ^ is_inside
+
+    @cython.wraparound(False)
+    @cython.boundscheck(False)
+    cdef void fill_disk(self, int crow, int ccol, float radius) nogil:
+        """Rasterize a disk with the same rule as :func:`circle_fill`"""
+        cdef int row, col, drow, dcol
+        cdef int i_radius = <int>radius
+        cdef int c_radius = <int>ceil(radius)
+        cdef float radius2 = radius * radius
+
+        for drow in range(-i_radius, c_radius + 1):
+            for dcol in range(-i_radius, c_radius + 1):
+                if drow * drow + dcol * dcol < radius2:
+                    self.set_pixel(crow + drow, ccol + dcol)
+
+    @cython.wraparound(False)
+    @cython.boundscheck(False)
+    cdef void draw_line(self, int row0, int col0, int row1, int col1,
+                        int width) nogil:
+        """Rasterize a thick line with the same rule as :func:`draw_line`"""
+        cdef int drow, dcol, invert_coords
+        cdef int db, da, delta, b, a, step_a, step_b
+        cdef int index, offset
+
+        dcol = abs(col1 - col0)
+        drow = abs(row1 - row0)
+        invert_coords = dcol < drow
+
+        if dcol == 0 and drow == 0:
+            self.set_pixel(row0, col0)
+            return
+
+        if width < 1:
+            width = 1
+
+        if not invert_coords:
+            da, db = dcol, drow
+            step_a = 1 if col1 > col0 else -1
+            step_b = 1 if row1 > row0 else -1
+            a, b = col0, row0
+        else:
+            da, db = drow, dcol
+            step_a = 1 if row1 > row0 else -1
+            step_b = 1 if col1 > col0 else -1
+            a, b = row0, col0
+
+        b -= (width - 1) // 2
+        delta = 2 * db - da
+        for index in range(da + 1):
+            for offset in range(width):
+                if not invert_coords:
+                    self.set_pixel(b + offset, a)
+                else:
+                    self.set_pixel(a, b + offset)
+
+            if delta >= 0:
+                b += step_b
+                delta -= 2 * da
+            a += step_a
+            delta += 2 * db
+
+    @cython.wraparound(False)
+    @cython.boundscheck(False)
+    cdef void apply(self, unsigned char[:, :] mask,
+                    unsigned char value, int mode) nogil:
+        """Apply the stencil to the mask"""
+        cdef int row, col
+        cdef unsigned char current
+
+        for row in range(self.height):
+            for col in range(self.width):
+                if self.data[row, col]:
+                    if mode == _MODE_SET:
+                        mask[self.row0 + row, self.col0 + col] = value
+                    elif mode == _MODE_UNSET:
+                        current = mask[self.row0 + row, self.col0 + col]
+                        if current == value:
+                            mask[self.row0 + row, self.col0 + col] = 0
+                    else:  # XOR
+                        mask[self.row0 + row, self.col0 + col] ^= value
+
+
+def _check_mask(mask, mode):
+    """Check mask and mode arguments and convert mode to its code"""
+    if mode not in _MODES:
+        raise ValueError('Unsupported mode: %s' % mode)
+    if mask.ndim != 2:
+        raise ValueError('mask must be a 2D array')
+    return _MODES[mode]
+
+
+def update_polygon(unsigned char[:, :] mask, vertices,
+                   int value=1, mode='set'):
+    """Update a mask in place with a filled polygon.
+
+    Filled pixels are the same as those of :func:`polygon_fill_mask`.
+
+    :param numpy.ndarray mask: 2D array of uint8 to update in place
+    :param vertices: Polygon corners as (row, column) or (y, x)
+    :type vertices: numpy.ndarray like container of dimension Nx2
+    :param int value: Value to use for filled pixels
+    :param str mode: The way to update the mask:
+
+        - 'set' (default) to set filled pixels to value
+        - 'unset' to set filled pixels equal to value to 0
+        - 'xor' to apply a bitwise xor with value to filled pixels
+    """
+    cdef int c_mode = _check_mask(numpy.asarray(mask), mode)
+    cdef float[:, :] c_vertices = numpy.ascontiguousarray(
+        vertices, dtype=numpy.float32)
+    if c_vertices.shape[0] == 0:
+        return
+
+    vertices = numpy.asarray(c_vertices)
+    stencil = _Stencil(mask.shape[0], mask.shape[1],
+                       numpy.min(vertices[:, 0]), numpy.max(vertices[:, 0]),
+                       numpy.min(vertices[:, 1]) - 1, numpy.max(vertices[:, 1]))
+    _apply_polygon(stencil, c_vertices, mask, value, c_mode)
+
+
+cdef _apply_polygon(_Stencil stencil, float[:, :] vertices,
+                    unsigned char[:, :] mask, unsigned char value, int mode):
+    with nogil:
+        stencil.fill_polygon(vertices)
+        stencil.apply(mask, value, mode)
+
+
+def update_disk(unsigned char[:, :] mask, int crow, int ccol, float radius,
+                int value=1, mode='set'):
+    """Update a mask in place with a filled disk.
+
+    Filled pixels are the same as those of :func:`circle_fill`.
+
+    :param numpy.ndarray mask: 2D array of uint8 to update in place
+    :param int crow: Row of the center of the disk
+    :param int ccol: Column of the center of the disk
+    :param float radius: Radius of the disk
+    :param int value: Value to use for filled pixels
+    :param str mode: The way to update the mask, see :func:`update_polygon`
+    """
+    cdef int c_mode = _check_mask(numpy.asarray(mask), mode)
+    cdef _Stencil stencil
+
+    radius = fabs(radius)
+    stencil = _Stencil(mask.shape[0], mask.shape[1],
+                       crow - radius, crow + radius,
+                       ccol - radius, ccol + radius)
+    with nogil:
+        stencil.fill_disk(crow, ccol, radius)
+        stencil.apply(mask, value, c_mode)
+
+
+def update_line(unsigned char[:, :] mask,
+                int row0, int col0, int row1, int col1, int width=1,
+                int value=1, mode='set'):
+    """Update a mask in place with a thick line.
+
+    Filled pixels are the same as those of :func:`draw_line`.
+
+    :param numpy.ndarray mask: 2D array of uint8 to update in place
+    :param int row0: Start point row
+    :param int col0: Start point col
+    :param int row1: End point row
+    :param int col1: End point col
+    :param int width: Thickness of the line in pixels (default 1)
+    :param int value: Value to use for filled pixels
+    :param str mode: The way to update the mask, see :func:`update_polygon`
+    """
+    update_polyline(mask, ((row0, col0), (row1, col1)), width,
+                    value=value, mode=mode, joins=False)
+
+
+@cython.wraparound(False)
+@cython.boundscheck(False)
+def update_polyline(unsigned char[:, :] mask, vertices, int width=1,
+                    int value=1, mode='set', bint joins=True):
+    """Update a mask in place with a thick polyline.
+
+    Segments are drawn as with :func:`draw_line` and, if joins is True,
+    a disk of diameter width is drawn at each vertex as with
+    :func:`circle_fill`.
+    The whole polyline is rasterized before the mask is updated,
+    so overlapping parts are only applied once (which matters for 'xor').
+
+    :param numpy.ndarray mask: 2D array of uint8 to update in place
+    :param vertices: Polyline points as (row, column) or (y, x)
+    :type vertices: numpy.ndarray like container of dimension Nx2
+    :param int width: Thickness of the line in pixels (default 1)
+    :param int value: Value to use for filled pixels
+    :param str mode: The way to update the mask, see :func:`update_polygon`
+    :param bool joins: True (default) to draw disks at vertices
+    """
+    cdef int c_mode = _check_mask(numpy.asarray(mask), mode)
+    cdef int[:, :] c_vertices = numpy.ascontiguousarray(
+        vertices, dtype=numpy.int32).reshape(-1, 2)
+    cdef int index, nvert = c_vertices.shape[0]
+    cdef float radius = 0.5 * width
+    cdef _Stencil stencil
+
+    if nvert == 0:
+        return
+
+    vertices = numpy.asarray(c_vertices)
+    margin = max(width, 1)
+    stencil = _Stencil(mask.shape[0], mask.shape[1],
+                       numpy.min(vertices[:, 0]) - margin,
+                       numpy.max(vertices[:, 0]) + margin,
+                       numpy.min(vertices[:, 1]) - margin,
+                       numpy.max(vertices[:, 1]) + margin)
+    with nogil:
+        for index in range(nvert):
+            if index > 0:
+                stencil.draw_line(c_vertices[index - 1, 0],
+                                  c_vertices[index - 1, 1],
+                                  c_vertices[index, 0],
+                                  c_vertices[index, 1],
+                                  width)
+            elif nvert == 1:
+                stencil.set_pixel(c_vertices[0, 0], c_vertices[0, 1])
+            if joins:
+                stencil.fill_disk(c_vertices[index, 0],
+                                  c_vertices[index, 1],
+                                  radius)
+        stencil.apply(mask, value, c_mode)
@@ -320,9 +320,99 @@ class TestCircleFill(ParametricTestCase):
                 self.assertTrue(is_equal)
 
 
+class TestUpdateMask(ParametricTestCase):
+    """Tests for in place mask update functions"""
+
+    SHAPE = 20, 30
+
+    def _coords_to_mask(self, rows, cols, value=1):
+        """Returns a mask with the given (possibly out of mask) points set"""
+        mask = numpy.zeros(self.SHAPE, dtype=numpy.uint8)
+        valid = numpy.logical_and(
+            numpy.logical_and(rows >= 0, cols >= 0),
+            numpy.logical_and(rows < self.SHAPE[0], cols < self.SHAPE[1]))
+        mask[rows[valid], cols[valid]] = value
+        return mask
+
+    def test_polygon(self):
+        """Test update_polygon against polygon_fill_mask"""
+        tests = {
+            'square': [(1, 3), (10, 3), (10, 12), (1, 12)],
+            'eight': [(0, 0), (18, 25), (18, 0), (0, 25)],
+            'outside': [(-5, -5), (8, 40), (25, 10)],
+            'empty': [(-10, -10), (-5, -10), (-5, -5)],
+        }
+        for name, vertices in tests.items():
+            with self.subTest(name=name):
+                ref = shapes.polygon_fill_mask(vertices, self.SHAPE)
+                mask = numpy.zeros(self.SHAPE, dtype=numpy.uint8)
+                shapes.update_polygon(mask, vertices, 5)
+                self.assertTrue(numpy.array_equal(mask, 5 * ref))
+
+    def test_disk(self):
+        """Test update_disk against circle_fill"""
+        for crow, ccol, radius in ((5, 5, 3.5), (0, 29, 4), (10, 10, 0.5)):
+            with self.subTest(crow=crow, ccol=ccol, radius=radius):
+                rows, cols = shapes.circle_fill(crow, ccol, radius)
+                mask = numpy.zeros(self.SHAPE, dtype=numpy.uint8)
+                shapes.update_disk(mask, crow, ccol, radius)
+                self.assertTrue(numpy.array_equal(
+                    mask, self._coords_to_mask(rows, cols)))
+
+    def test_line(self):
+        """Test update_line against draw_line"""
+        for args in ((1, 1, 18, 7, 1), (15, -2, 3, 35, 3), (4, 4, 4, 4, 2)):
+            with self.subTest(args=args):
+                rows, cols = shapes.draw_line(*args)
+                mask = numpy.zeros(self.SHAPE, dtype=numpy.uint8)
+                shapes.update_line(mask, *args)
+                self.assertTrue(numpy.array_equal(
+                    mask, self._coords_to_mask(rows, cols)))
+
+    def test_polyline(self):
+        """Test update_polyline against lines and disks"""
+        vertices = (2, 2), (15, 10), (5, 25)
+        width = 3
+        ref = numpy.zeros(self.SHAPE, dtype=numpy.uint8)
+        for (row0, col0), (row1, col1) in zip(vertices[:-1], vertices[1:]):
+            ref |= self._coords_to_mask(
+                *shapes.draw_line(row0, col0, row1, col1, width))
+        for row, col in vertices:
+            ref |= self._coords_to_mask(
+                *shapes.circle_fill(row, col, width / 2.))
+
+        mask = numpy.zeros(self.SHAPE, dtype=numpy.uint8)
+        shapes.update_polyline(mask, vertices, width)
+        self.assertTrue(numpy.array_equal(mask, ref))
+
+    def test_modes(self):
+        """Test set, unset and xor modes"""
+        mask = numpy.zeros(self.SHAPE, dtype=numpy.uint8)
+        mask[:, :10] = 2
+        mask[:, 10:] = 3
+        vertices = (0, 0), (0, 29), (19, 29), (19, 0)
+
+        result = mask.copy()
+        shapes.update_polyline(result, vertices, 5, value=2, mode='unset')
+        stroke = numpy.zeros(self.SHAPE, dtype=numpy.uint8)
+        shapes.update_polyline(stroke, vertices, 5)
+        self.assertTrue(numpy.array_equal(
+            result, numpy.where(numpy.logical_and(stroke, mask == 2), 0, mask)))
+
+        # Overlapping parts of the polyline are only applied once
+        result = mask.copy()
+        shapes.update_polyline(result, vertices, 5, value=1, mode='xor')
+        self.assertTrue(numpy.array_equal(
+            result, numpy.where(stroke, mask ^ 1, mask)))
+
+        with self.assertRaises(ValueError):
+            shapes.update_disk(mask, 5, 5, 2, mode='unknown')
+
+
 def suite():
     test_suite = unittest.TestSuite()
-    for testClass in (TestPolygonFill, TestDrawLine, TestCircleFill):
+    for testClass in (TestPolygonFill, TestDrawLine, TestCircleFill,
+                      TestUpdateMask):
         test_suite.addTest(
             unittest.defaultTestLoader.loadTestsFromTestCase(testClass))
     return test_suite
@@ -83,6 +83,22 @@ class _MappingProxyType(collections.MutableMapping):
         raise RuntimeError("Cannot modify read-only dictionary")
 
 
+_EMPTY_ATTRS = {}
+"""Attributes shared by all the nodes created without attributes.
+
+It must never be modified."""
+
+
+def _intern_name(name):
+    """Returns an interned version of a node name.
+
+    Files with a lot of nodes use the same few names many times.
+    """
+    if isinstance(name, str):
+        return six.moves.intern(name)
+    return name
+
+
 class Node(object):
     """This is the base class for all :mod:`spech5` and :mod:`fabioh5`
     classes. It represents a tree node, and knows its parent node
@@ -91,15 +107,18 @@ class Node(object):
     :attr:`attrs`, :attr:`name`, and :attr:`basename`.
     """
 
+    __slots__ = ("__parent", "__basename", "__attrs", "__weakref__")
+
     def __init__(self, name, parent=None, attrs=None):
         self._set_parent(parent)
-        self.__basename = name
-        self.__attrs = {}
-        if attrs is not None:
-            self.__attrs.update(attrs)
+        self.__basename = _intern_name(name)
+        if attrs:
+            self.__attrs = dict(attrs)
+        else:
+            self.__attrs = _EMPTY_ATTRS
 
     def _set_basename(self, name):
-        self.__basename = name
+        self.__basename = _intern_name(name)
 
     @property
     def h5_class(self):
@@ -176,6 +195,8 @@ class Node(object):
         :rtype: dict
         """
         if self._is_editable():
+            if self.__attrs is _EMPTY_ATTRS:
+                self.__attrs = {}
             return self.__attrs
         else:
             return _MappingProxyType(self.__attrs)
@@ -212,6 +233,8 @@ class Dataset(Node):
     *h5py.Dataset*.
     """
 
+    __slots__ = ("__data",)
+
     def __init__(self, name, data, parent=None, attrs=None):
         Node.__init__(self, name, parent, attrs=attrs)
         if data is not None:
@@ -486,6 +509,8 @@ class Dataset(Node):
 class DatasetProxy(Dataset):
     """Virtual dataset providing content of another dataset"""
 
+    __slots__ = ("__target",)
+
     def __init__(self, name, target, parent=None):
         Dataset.__init__(self, name, data=None, parent=parent)
         if not utils.is_dataset(target):
@@ -515,6 +540,8 @@ class DatasetProxy(Dataset):
 class _LinkToDataset(Dataset):
     """Virtual dataset providing link to another dataset"""
 
+    __slots__ = ("__target",)
+
     def __init__(self, name, target, parent=None):
         Dataset.__init__(self, name, data=None, parent=parent)
         self.__target = target
@@ -535,6 +562,8 @@ class LazyLoadableDataset(Dataset):
     method is only called once, when the data is needed.
     """
 
+    __slots__ = ("_is_initialized",)
+
     def __init__(self, name, parent=None, attrs=None):
         super(LazyLoadableDataset, self).__init__(name, None, parent, attrs=attrs)
         self._is_initialized = False
@@ -571,6 +600,9 @@ class SoftLink(Node):
 
     In this implementation, the path to the target must be absolute.
     """
+
+    __slots__ = ("target", "_resolved")
+
     def __init__(self, name, path, parent=None):
         assert str(path).startswith("/")  # TODO: h5py also allows a relative path
 
@@ -578,6 +610,7 @@ class SoftLink(Node):
 
         # attr target defined for spech5 backward compatibility
         self.target = str(path)
+        self._resolved = None
 
     @property
     def h5_class(self):
@@ -592,10 +625,39 @@ class SoftLink(Node):
         """Soft link value. Not guaranteed to be a valid path."""
         return self.target
 
+    def _get_target_node(self):
+        """Returns a typed group or dataset exposing the target of the link.
+
+        The result is memoized when the file is read-only.
+
+        :rtype: Node
+        :raises KeyError: If the link is broken
+        """
+        if self._resolved is not None:
+            return self._resolved
+
+        target = self.file.get(self.path)
+        if target is None:
+            msg = "Unable to open object (broken SoftLink %s -> %s)"
+            raise KeyError(msg % (self.name, self.path))
+        # Convert SoftLink into typed group/dataset
+        if isinstance(target, Group):
+            result = _LinkToGroup(name=self.basename, target=target, parent=self.parent)
+        elif isinstance(target, Dataset):
+            result = _LinkToDataset(name=self.basename, target=target, parent=self.parent)
+        else:
+            raise TypeError("Unexpected target type %s" % type(target))
+
+        if not self._is_editable():
+            self._resolved = result
+        return result
+
 
 class Group(Node):
     """This class mimics a `h5py.Group`."""
 
+    __slots__ = ("__items",)
+
     def __init__(self, name, parent=None, attrs=None):
         Node.__init__(self, name, parent, attrs=attrs)
         self.__items = collections.OrderedDict()
@@ -612,7 +674,13 @@ class Group(Node):
 
         :param Node node: Child to add to this group
         """
-        self._get_items()[node.basename] = node
+        items = self._get_items()
+        if node.basename in items:
+            # A node is replaced: paths cached by the file can be wrong
+            f = self.file
+            if f is not None:
+                f._clear_path_cache()
+        items[node.basename] = node
         node._set_parent(self)
 
     @property
@@ -655,18 +723,7 @@ class Group(Node):
                 result = result._get_items()[item_name]
 
         if isinstance(result, SoftLink) and not getlink:
-            link = result
-            target = result.file.get(link.path)
-            if result is None:
-                msg = "Unable to open object (broken SoftLink %s -> %s)"
-                raise KeyError(msg % (link.name, link.path))
-            # Convert SoftLink into typed group/dataset
-            if isinstance(target, Group):
-                result = _LinkToGroup(name=link.basename, target=target, parent=link.parent)
-            elif isinstance(target, Dataset):
-                result = _LinkToDataset(name=link.basename, target=target, parent=link.parent)
-            else:
-                raise TypeError("Unexpected target type %s" % type(target))
+            result = result._get_target_node()
 
         return result
 
@@ -863,8 +920,7 @@ class Group(Node):
         :param func: Callable (function, method or callable object)
         :type func: callable
         """
-        origin_name = self.name
-        return self._visit(func, origin_name, visit_links)
+        return self._visit(func, "", visit_links)
 
     def visititems(self, func, visit_links=False):
         """Recursively visit names and objects in this group.
@@ -875,24 +931,20 @@ class Group(Node):
         :param bool visit_links: If *False*, ignore links. If *True*,
             call `func(name)` for links and recurse into target groups.
         """
-        origin_name = self.name
-        return self._visit(func, origin_name, visit_links,
-                           visititems=True)
+        return self._visit(func, "", visit_links, visititems=True)
 
-    def _visit(self, func, origin_name,
+    def _visit(self, func, prefix,
                visit_links=False, visititems=False):
         """
 
-        :param origin_name: name of first group that initiated the recursion
-            This is used to compute the relative path from each item's
-            absolute path.
+        :param str prefix: Path of this group relative to the group which
+            initiated the recursion, followed by a "/" (empty string for
+            this first group).
         """
-        for member in self.values():
+        for basename, member in self.items():
             ret = None
+            relative_name = prefix + basename
             if not isinstance(member, SoftLink) or visit_links:
-                relative_name = member.name[len(origin_name):]
-                # remove leading slash and unnecessary trailing slash
-                relative_name = relative_name.strip("/")
                 if visititems:
                     ret = func(relative_name, member)
                 else:
@@ -900,7 +952,7 @@ class Group(Node):
             if ret is not None:
                 return ret
             if isinstance(member, Group):
-                member._visit(func, origin_name, visit_links, visititems)
+                member._visit(func, relative_name + "/", visit_links, visititems)
 
     def create_group(self, name):
         """Create and return a new subgroup.
@@ -966,6 +1018,8 @@ class Group(Node):
 class _LinkToGroup(Group):
     """Virtual group providing link to another group"""
 
+    __slots__ = ("__target",)
+
     def __init__(self, name, target, parent=None):
         Group.__init__(self, name, parent=parent)
         self.__target = target
@@ -986,6 +1040,8 @@ class LazyLoadableGroup(Group):
     is only called once, when children are needed.
     """
 
+    __slots__ = ("__is_initialized",)
+
     def __init__(self, name, parent=None, attrs=None):
         Group.__init__(self, name, parent, attrs)
         self.__is_initialized = False
@@ -1034,6 +1090,7 @@ class File(Group):
             mode = "r"
         assert(mode in ["r", "w"])
         self._mode = mode
+        self.__path_cache = {}
 
     @property
     def filename(self):
@@ -1048,6 +1105,27 @@ class File(Group):
         """Returns the :class:`h5py.File` class"""
         return utils.H5Type.FILE
 
+    def _clear_path_cache(self):
+        """Forget all the nodes cached by :meth:`_get`."""
+        self.__path_cache.clear()
+
+    def _get(self, name, getlink):
+        """Overwrite :meth:`Group._get` to cache the nodes found from
+        their absolute path when the file is read-only."""
+        if self._mode == "w":
+            return Group._get(self, name, getlink)
+
+        key = name.lstrip("/"), getlink
+        try:
+            return self.__path_cache[key]
+        except KeyError:
+            pass
+        if key[0] == "":
+            return Group._get(self, name, getlink)
+        result = Group._get(self, key[0], getlink)
+        self.__path_cache[key] = result
+        return result
+
     def __enter__(self):
         return self
 
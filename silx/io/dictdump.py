@@ -25,7 +25,11 @@
 by text strings to following file formats: `HDF5, INI, JSON`
 """
 
+import collections
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import io
 import json
 import logging
 import numpy
@@ -35,12 +39,15 @@ import sys
 try:
     import h5py
 except ImportError as e:
+    h5py = None
     h5py_missing = True
     h5py_import_error = e
 else:
     h5py_missing = False
 
 from .configdict import ConfigDict
+from .utils import _iter_h5py_links
+from .utils import is_dataset
 from .utils import is_group
 from .utils import is_file as is_h5_file_like
 from .utils import open as h5open
@@ -152,9 +159,142 @@ class _SafeH5FileRead(object):
             self.h5file.close()
 
 
+# Datasets up to this size are stored in the object header in compact mode
+_COMPACT_MAX_NBYTES = 16 * 1024
+
+
+def _flatten_tree(treedict, h5path, compound_name=None):
+    """Flatten a nested dictionary into the groups and datasets to write.
+
+    :param dict treedict: Nested dictionary
+    :param str h5path: Path of the group of ``treedict``, ending with ``/``
+    :param compound_name: If not None, the scalars and small arrays of each
+        group are packed as the fields of a single compound dataset with
+        this name.
+    :return: List of empty group paths, list of (path, numpy.ndarray)
+    :rtype: List[str], List[Tuple[str,numpy.ndarray]]
+    """
+    groups = []
+    datasets = []
+    stack = [(h5path, treedict)]
+    while stack:
+        path, ddict = stack.pop()
+        fields = []
+        for key, value in ddict.items():
+            if isinstance(value, dict) and len(value):
+                stack.append((path + key + "/", value))
+            elif value is None or isinstance(value, dict):
+                groups.append(path + key)
+            else:
+                array = numpy.asarray(_prepare_hdf5_dataset(value))
+                if (compound_name is not None and
+                        array.dtype.kind in "biufcS" and
+                        0 < array.nbytes <= _COMPACT_MAX_NBYTES):
+                    fields.append((key, array))
+                else:
+                    datasets.append((path + key, array))
+        if fields:
+            dtype = numpy.dtype([(key, array.dtype, array.shape)
+                                 for key, array in fields])
+            compound = numpy.empty((), dtype=dtype)
+            for key, array in fields:
+                compound[key] = array
+            datasets.append((path + compound_name, compound))
+    return groups, datasets
+
+
+def _can_overwrite(h5f, name, overwrite_data):
+    """Remove an existing member if overwriting is allowed.
+
+    This is called once the creation of the member failed.
+
+    :return: True if the member was removed
+    :raise RuntimeError: If a parent of the member is not a group, as
+        when not writing in bulk
+    """
+    parts = name.strip("/").split("/")
+    for index in range(1, len(parts)):
+        parent = h5f.get("/" + "/".join(parts[:index]))
+        if parent is not None and not isinstance(parent, h5py.Group):
+            raise RuntimeError(
+                "Unable to create %s: %s is not a group" % (name, parent.name))
+
+    if overwrite_data is True:
+        del h5f[name]
+        return True
+    logger.warning('key (%s) already exists. Not overwriting.' % name)
+    return False
+
+
+def _bulk_write(h5f, groups, datasets, overwrite_data, create_dataset_args,
+                compact=False):
+    """Write flattened groups and datasets with the low-level h5py API.
+
+    Intermediate groups are created with the links, and the property lists
+    are shared by all the members. Existing members are only looked for
+    when a creation fails.
+
+    If compact is True, small datasets use the compact layout.
+    """
+    lcpl = h5py.h5p.create(h5py.h5p.LINK_CREATE)
+    lcpl.set_create_intermediate_group(True)
+    lcpl.set_char_encoding(h5py.h5t.CSET_UTF8)
+
+    compact_dcpl = h5py.h5p.create(h5py.h5p.DATASET_CREATE)
+    compact_dcpl.set_layout(h5py.h5d.COMPACT)
+    contiguous_dcpl = h5py.h5p.create(h5py.h5p.DATASET_CREATE)
+    # Data is written right after creation: do not write fill values
+    contiguous_dcpl.set_fill_time(h5py.h5d.FILL_TIME_NEVER)
+
+    for name in groups:
+        bname = name.encode("utf-8")
+        try:
+            h5py.h5g.create(h5f.id, bname, lcpl=lcpl)
+        except ValueError:
+            if not _can_overwrite(h5f, name, overwrite_data):
+                continue
+            h5py.h5g.create(h5f.id, bname, lcpl=lcpl)
+
+    for name, array in datasets:
+        if array.dtype.kind == "O" or (
+                create_dataset_args is not None and array.shape != ()):
+            # Filters and python objects go through the high-level API
+            if name in h5f and not _can_overwrite(h5f, name, overwrite_data):
+                continue
+            if array.shape == ():
+                h5f.create_dataset(name, data=array)
+            else:
+                h5f.create_dataset(name, data=array, **create_dataset_args)
+            continue
+
+        if array.shape == ():
+            space = h5py.h5s.create(h5py.h5s.SCALAR)
+        else:
+            space = h5py.h5s.create_simple(array.shape)
+        dtype = h5py.h5t.py_create(array.dtype, logical=True)
+        if compact and 0 < array.nbytes <= _COMPACT_MAX_NBYTES:
+            dcpl = compact_dcpl
+        else:
+            dcpl = contiguous_dcpl
+
+        bname = name.encode("utf-8")
+        try:
+            dataset = h5py.h5d.create(h5f.id, bname, dtype, space,
+                                      dcpl=dcpl, lcpl=lcpl)
+        except ValueError:
+            if not _can_overwrite(h5f, name, overwrite_data):
+                continue
+            dataset = h5py.h5d.create(h5f.id, bname, dtype, space,
+                                      dcpl=dcpl, lcpl=lcpl)
+        if array.size:
+            dataset.write(h5py.h5s.ALL, h5py.h5s.ALL,
+                          numpy.ascontiguousarray(array))
+
+
 def dicttoh5(treedict, h5file, h5path='/',
              mode="w", overwrite_data=False,
-             create_dataset_args=None):
+             create_dataset_args=None, bulk=False, compound_name=None,
+             compact=False):
     """Write a nested dictionary to a HDF5 file, using keys as member names.
 
     If a dictionary value is a sub-dictionary, a group is created. If it is
@@ -184,6 +324,18 @@ def dicttoh5(treedict, h5file, h5path='/',
     :param create_dataset_args: Dictionary of args you want to pass to
         ``h5f.create_dataset``. This allows you to specify filters and
         compression parameters. Don't specify ``name`` and ``data``.
+    :param bool bulk: If ``True``, the tree is flattened first and all the
+        members are then created in a single pass with the low-level h5py
+        API. This is much faster for dictionaries with many small leafs.
+    :param str compound_name: If provided, the scalars and small arrays of
+        each group are written as the fields of a single compound dataset
+        with this name, instead of one dataset each.
+        This implies ``bulk=True``.
+    :param bool compact: If ``True``, the datasets up to 16 kB are stored
+        in their object header (HDF5 compact layout). This does not make
+        writing faster, and :func:`h5todict` can't read such datasets by
+        batches, so reading them back is slower than with the default
+        contiguous layout. This implies ``bulk=True``.
 
     Example::
 
@@ -215,6 +367,13 @@ def dicttoh5(treedict, h5file, h5path='/',
     if not h5path.endswith("/"):
         h5path += "/"
 
+    if bulk or compact or compound_name is not None:
+        groups, datasets = _flatten_tree(treedict, h5path, compound_name)
+        with _SafeH5FileWrite(h5file, mode=mode) as h5f:
+            _bulk_write(h5f, groups, datasets,
+                        overwrite_data, create_dataset_args, compact)
+        return
+
     with _SafeH5FileWrite(h5file, mode=mode) as h5f:
         for key in treedict:
             if isinstance(treedict[key], dict) and len(treedict[key]):
@@ -272,7 +431,345 @@ def _name_contains_string_in_list(name, strlist):
     return False
 
 
-def h5todict(h5file, path="/", exclude_names=None):
+class _LazyH5Dict(collections.MutableMapping):
+    """Dictionary returned by :func:`h5todict` in lazy mode.
+
+    Datasets are stored as references and are read the first time they are
+    accessed. The file is kept open until :meth:`close` is called on the
+    root dictionary, which can also be used as a context manager.
+
+    :param h5file: The file containing the datasets
+    :param bool close_file: True if :meth:`close` closes the file
+    """
+
+    def __init__(self, h5file, close_file=False):
+        self.__h5file = h5file
+        self.__close_file = close_file
+        self.__dict = {}
+
+    def __getitem__(self, key):
+        value = self.__dict[key]
+        if is_dataset(value):
+            # Convert HDF5 dataset to numpy array
+            value = value[...]
+            self.__dict[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        self.__dict[key] = value
+
+    def __delitem__(self, key):
+        del self.__dict[key]
+
+    def __iter__(self):
+        return iter(self.__dict)
+
+    def __len__(self):
+        return len(self.__dict)
+
+    def __repr__(self):
+        return "<%s with keys %s>" % (self.__class__.__name__,
+                                      list(self.__dict.keys()))
+
+    def close(self):
+        """Close the file if it was opened by :func:`h5todict`.
+
+        Datasets which were not accessed yet can no longer be read.
+        """
+        if self.__close_file:
+            self.__h5file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _collect_h5_tree(group, ddict, exclude_names, datasets, dict_factory):
+    """Create the nested dictionaries of a group and collect its datasets.
+
+    Each member of the group is resolved only once.
+
+    :param group: h5py-like group
+    :param ddict: Dictionary to fill with the content of the group
+    :param List[str] exclude_names: Names to ignore
+    :param List datasets: List filled with `(ddict, key, dataset)` tuples
+    :param callable dict_factory: Create the dictionaries of sub-groups
+    """
+    for key in group:
+        if _name_contains_string_in_list(key, exclude_names):
+            continue
+        node = group[key]
+        if is_group(node):
+            sub_dict = dict_factory()
+            ddict[key] = sub_dict
+            _collect_h5_tree(node, sub_dict, exclude_names, datasets,
+                             dict_factory)
+        else:
+            datasets.append((ddict, key, node))
+
+
+def _collect_h5py_tree(group_id, ddict, exclude_names, datasets,
+                       dict_factory):
+    """Same as :func:`_collect_h5_tree` with the h5py low-level API.
+
+    The members of each group are listed in a single iteration over its
+    links and are opened without creating h5py high-level objects.
+
+    :param h5py.h5g.GroupID group_id: Low-level h5py group
+    :param ddict: Dictionary to fill with the content of the group
+    :param List[str] exclude_names: Names to ignore
+    :param List datasets: List filled with `(ddict, key, dataset_id)` tuples
+    :param callable dict_factory: Create the dictionaries of sub-groups
+    """
+    for bname, _link_type in _iter_h5py_links(group_id):
+        key = bname.decode("utf-8")
+        if _name_contains_string_in_list(key, exclude_names):
+            continue
+        obj_id = h5py.h5o.open(group_id, bname)
+        if isinstance(obj_id, h5py.h5g.GroupID):
+            sub_dict = dict_factory()
+            ddict[key] = sub_dict
+            _collect_h5py_tree(obj_id, sub_dict, exclude_names, datasets,
+                               dict_factory)
+        elif isinstance(obj_id, h5py.h5d.DatasetID):
+            datasets.append((ddict, key, obj_id))
+
+
+_BATCH_DATASET_MAX_NBYTES = 2**16
+"""Contiguous datasets up to this size are read by batches"""
+
+_BATCH_MAX_NBYTES = 2**20
+"""Maximum size of the region of a file read at once for a batch"""
+
+_BATCH_MAX_GAP = 2**12
+"""Maximum number of unused bytes between two datasets of a batch"""
+
+
+def _is_simple_dtype(dtype):
+    """Returns True for fixed size numerical and string types, which can
+    be read in a numpy array of the same type with the low-level API."""
+    return dtype.kind in "biufcS" and dtype.fields is None
+
+
+def _get_size(shape):
+    """Returns the number of elements of an array of the given shape"""
+    size = 1
+    for length in shape:
+        size *= length
+    return size
+
+
+def _get_h5py_dataset_shape(dataset_id):
+    """Returns the shape of a low-level h5py dataset, None if it has no
+    dataspace.
+
+    :rtype: Union[Tuple[int],None]
+    """
+    space = dataset_id.get_space()
+    if space.get_simple_extent_type() == h5py.h5s.NULL:
+        return None
+    return space.shape
+
+
+def _read_h5py_dataset(dataset_id):
+    """Read a low-level h5py dataset.
+
+    :param h5py.h5d.DatasetID dataset_id:
+    :rtype: numpy.ndarray
+    """
+    dtype = dataset_id.dtype
+    shape = _get_h5py_dataset_shape(dataset_id)
+    if shape is None or not _is_simple_dtype(dtype):
+        return h5py.Dataset(dataset_id)[...]
+    array = numpy.empty(shape, dtype=dtype)
+    if array.size != 0:
+        dataset_id.read(h5py.h5s.ALL, h5py.h5s.ALL, array)
+    return array
+
+
+def _is_raw_readable(dataset_id):
+    """Returns True if the file of a low-level h5py dataset can be read
+    directly, without the HDF5 library.
+
+    This is the case of local files opened read-only with the default
+    driver.
+    """
+    file_id = h5py.h5i.get_file_id(dataset_id)
+    return (file_id.get_intent() == h5py.h5f.ACC_RDONLY and
+            file_id.get_access_plist().get_driver() == h5py.h5fd.SEC2)
+
+
+def _get_batch_read_info(dataset_id, raw_readable_files):
+    """Returns the information to read a dataset by batch, or None if it
+    must be read on its own.
+
+    Batched datasets are small, stored contiguously in a file that can be
+    read directly, and have a numerical or fixed-length string type.
+
+    :param h5py.h5d.DatasetID dataset_id:
+    :param dict raw_readable_files:
+        Cache of :func:`_is_raw_readable` results per file name
+    :return: (file name, offset, nbytes, dtype, shape) or None
+    """
+    dtype = dataset_id.dtype
+    if not _is_simple_dtype(dtype):
+        return None
+    shape = _get_h5py_dataset_shape(dataset_id)
+    if shape is None:
+        return None
+    nbytes = dtype.itemsize * _get_size(shape)
+    if nbytes == 0 or nbytes > _BATCH_DATASET_MAX_NBYTES:
+        return None
+    # None for compact and chunked datasets. The storage size is checked
+    # as the offset of not allocated datasets is wrong with a user block.
+    offset = dataset_id.get_offset()
+    if offset is None or dataset_id.get_storage_size() != nbytes:
+        return None
+
+    filename = h5py.h5f.get_name(dataset_id)
+    raw_readable = raw_readable_files.get(filename)
+    if raw_readable is None:
+        raw_readable = _is_raw_readable(dataset_id)
+        raw_readable_files[filename] = raw_readable
+    if not raw_readable:
+        return None
+    return filename, offset, nbytes, dtype, shape
+
+
+def _make_batches(datasets):
+    """Group small contiguous h5py datasets which are close in their file.
+
+    :param List datasets: List of `(ddict, key, dataset_id)` tuples
+    :return: List of batches and list of datasets to read one by one.
+        A batch is `(file name, start, stop, datasets)` where `datasets`
+        is a list of `(ddict, key, dataset_id, offset, dtype, shape)`
+        tuples.
+    """
+    raw_readable_files = {}
+    batchable = []
+    others = []
+    for item in datasets:
+        info = _get_batch_read_info(item[2], raw_readable_files)
+        if info is None:
+            others.append(item)
+        else:
+            batchable.append((info, item))
+    batchable.sort(key=lambda entry: entry[0][:2])
+
+    batches = []
+    for info, (ddict, key, dataset_id) in batchable:
+        filename, offset, nbytes, dtype, shape = info
+        item = ddict, key, dataset_id, offset, dtype, shape
+        if batches:
+            batch_filename, start, stop, items = batches[-1]
+            if (filename == batch_filename and
+                    offset - stop <= _BATCH_MAX_GAP and
+                    offset + nbytes - start <= _BATCH_MAX_NBYTES):
+                batches[-1] = (filename, start, max(stop, offset + nbytes),
+                               items)
+                items.append(item)
+                continue
+        batches.append((filename, offset, offset + nbytes, [item]))
+    return batches, others
+
+
+def _read_batch(batch):
+    """Read a batch of datasets with a single read in the file.
+
+    :param batch: Batch as returned by :func:`_make_batches`
+    :return: List of `(ddict, key, value)` tuples
+    """
+    filename, start, stop, items = batch
+    try:
+        with io.open(filename, "rb") as f:
+            f.seek(start)
+            buffer = f.read(stop - start)
+    except (IOError, OSError):
+        buffer = None
+    if buffer is None or len(buffer) != stop - start:
+        logger.debug("Cannot read %s directly", filename, exc_info=True)
+        return [(ddict, key, _read_h5py_dataset(dataset_id))
+                for ddict, key, dataset_id, _, _, _ in items]
+
+    results = []
+    for ddict, key, _, offset, dtype, shape in items:
+        value = numpy.frombuffer(buffer,
+                                 dtype=dtype,
+                                 count=_get_size(shape),
+                                 offset=offset - start)
+        results.append((ddict, key, value.reshape(shape).copy()))
+    return results
+
+
+def _read_dataset(item):
+    """Read a dataset
+
+    :param item: `(ddict, key, dataset)` tuple
+    :return: List of `(ddict, key, value)` tuples
+    """
+    ddict, key, dataset = item
+    if h5py is not None and isinstance(dataset, h5py.h5d.DatasetID):
+        value = _read_h5py_dataset(dataset)
+    else:
+        # Convert HDF5 dataset to numpy array
+        value = dataset[...]
+    return [(ddict, key, value)]
+
+
+def _read_datasets(datasets, max_workers=None):
+    """Read datasets and store them in their dictionary.
+
+    Small contiguous datasets of h5py files are read by batches with a
+    single read of the file region containing them.
+    The other datasets are read one by one.
+
+    :param List datasets: List of `(ddict, key, dataset)` tuples,
+        dataset being an h5py-like dataset or a low-level h5py dataset.
+    :param Union[int,None] max_workers: Number of threads used to read and
+        decompress the datasets. Default: read in the calling thread.
+    """
+    h5py_datasets = []
+    others = []
+    for item in datasets:
+        if h5py is not None and isinstance(item[2], h5py.h5d.DatasetID):
+            h5py_datasets.append(item)
+        else:
+            others.append(item)
+
+    batches, h5py_datasets = _make_batches(h5py_datasets)
+    tasks = [functools.partial(_read_batch, batch) for batch in batches]
+    tasks += [functools.partial(_read_dataset, item)
+              for item in h5py_datasets + others]
+
+    if max_workers is not None and max_workers > 1 and len(tasks) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(lambda task: task(), tasks))
+    else:
+        results = [task() for task in tasks]
+
+    for result in results:
+        for ddict, key, value in result:
+            ddict[key] = value
+
+
+def _collect_tree(group, ddict, exclude_names, datasets, dict_factory):
+    """Create the nested dictionaries of a group and collect its datasets,
+    using the h5py low-level API when possible.
+
+    See :func:`_collect_h5_tree`.
+    """
+    if h5py is not None and isinstance(group, h5py.Group):
+        _collect_h5py_tree(group.id, ddict, exclude_names, datasets,
+                           dict_factory)
+    else:
+        _collect_h5_tree(group, ddict, exclude_names, datasets,
+                         dict_factory)
+
+
+def h5todict(h5file, path="/", exclude_names=None, lazy=False,
+             max_workers=None):
     """Read a HDF5 file and return a nested dictionary with the complete file
     structure and all data.
 
@@ -295,36 +792,73 @@ def h5todict(h5file, path="/", exclude_names=None):
     .. note:: This function requires `h5py <http://www.h5py.org/>`_ to be
         installed.
 
-    .. note:: If you write a dictionary to a HDF5 file with
+    .. note:: If you write a dictionary to a HDF5 file with
         :func:`dicttoh5` and then read it back with :func:`h5todict`, data
         types are not preserved. All values are cast to numpy arrays before
         being written to file, and they are read back as numpy arrays (or
         scalars). In some cases, you may find that a list of heterogeneous
         data types is converted to a numpy array of strings.
 
+    The structure of the file is browsed once, then the datasets are read.
+    Small contiguous datasets of HDF5 files opened read-only are read by
+    batches, with a single read of the region of the file containing them.
+
+    In lazy mode, the datasets are only read when they are accessed from the
+    returned dictionaries. In this case the file is kept open until the
+    ``close`` method of the returned dictionary is called, which can also be
+    used as a context manager::
+
+        with h5todict("data.h5", lazy=True) as ddict:
+            data = ddict["entry"]["data"]
+
     :param h5file: File name or :class:`h5py.File` object or spech5 file or
         fabioh5 file.
     :param str path: Name of HDF5 group to use as dictionary root level,
         to read only a sub-group in the file
     :param List[str] exclude_names: Groups and datasets whose name contains
         a string in this list will be ignored. Default is None (ignore nothing)
+    :param bool lazy: If True, returns dict-like objects which read the
+        datasets on first access. Closing the root dictionary closes the
+        file only if it was opened by this function.
+    :param int max_workers: Number of threads used to read the datasets
+        (not lazy mode only). It can speed up the decompression of datasets
+        of formats which are not read through the HDF5 library, which
+        serializes the reads. Default is to read in the calling thread.
     :return: Nested dictionary
     """
     if h5py_missing:
         raise h5py_import_error
 
+    if lazy:
+        if is_h5_file_like(h5file):
+            h5f = h5file
+            close_file = False
+        else:
+            h5f = h5open(h5file)
+            close_file = True
+        try:
+            ddict = _LazyH5Dict(h5f, close_file=close_file)
+            dict_factory = functools.partial(_LazyH5Dict, h5f)
+            datasets = []
+            _collect_tree(h5f[path], ddict, exclude_names, datasets,
+                          dict_factory)
+        except Exception:
+            if close_file:
+                h5f.close()
+            raise
+        for sub_ddict, key, dataset in datasets:
+            if isinstance(dataset, h5py.h5d.DatasetID):
+                dataset = h5py.Dataset(dataset)
+            sub_ddict[key] = dataset
+        return ddict
+
     with _SafeH5FileRead(h5file) as h5f:
         ddict = {}
-        for key in h5f[path]:
-            if _name_contains_string_in_list(key, exclude_names):
-                continue
-            if is_group(h5f[path + "/" + key]):
-                ddict[key] = h5todict(h5f,
-                                      path + "/" + key,
-                                      exclude_names=exclude_names)
-            else:
-                # Convert HDF5 dataset to numpy array
-                ddict[key] = h5f[path + "/" + key][...]
+        datasets = []
+        _collect_tree(h5f[path], ddict, exclude_names, datasets, dict)
+        _read_datasets(datasets, max_workers=max_workers)
+        # Release the datasets before closing the file
+        del datasets[:]
 
     return ddict
 
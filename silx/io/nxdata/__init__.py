@@ -62,5 +62,6 @@ Functions
 """
 from .parse import NXdata, get_default, is_valid_nxdata, InvalidNXdataError, \
     is_NXentry_with_default_NXdata, is_NXroot_with_default_NXdata, is_group_with_default_NXdata
-from ._utils import get_attr_as_unicode, get_attr_as_string, nxdata_logger
+from ._utils import get_attr_as_unicode, get_attr_as_string, attr_as_unicode, \
+    nxdata_logger
 from .write import save_NXdata
@@ -69,8 +69,16 @@ def get_attr_as_unicode(item, attr_name, default=None):
     :param default: Value to be returned if attribute is not found.
     :return: item.attrs[attr_name]
     """
-    attr = item.attrs.get(attr_name, default)
+    return attr_as_unicode(item.attrs.get(attr_name, default))
 
+
+def attr_as_unicode(attr):
+    """Return an attribute value as unicode or as a list of unicode.
+
+    See :func:`get_attr_as_unicode`.
+
+    :param attr: Attribute value
+    """
     if isinstance(attr, six.binary_type):
         # byte-string
         return attr.decode("utf-8")
@@ -41,14 +41,21 @@ Other public functions:
 
 """
 
+import collections
+import functools
+import os
+import threading
+import weakref
+
 import numpy
 import six
 
-from silx.io.utils import is_group, is_file, is_dataset
+from silx.io.utils import is_group, is_file, is_dataset, h5py
+from silx.io import commonh5
 
-from ._utils import get_attr_as_unicode, INTERPDIM, nxdata_logger, \
-    get_uncertainties_names, get_signal_name, \
-    get_auxiliary_signals_names, validate_auxiliary_signals, validate_number_of_axes
+from ._utils import get_attr_as_unicode, attr_as_unicode, INTERPDIM, \
+    nxdata_logger, get_signal_name, validate_auxiliary_signals, \
+    validate_number_of_axes
 
 
 __authors__ = ["P. Knobel"]
@@ -60,6 +67,28 @@ class InvalidNXdataError(Exception):
     pass
 
 
+def _memoized(method):
+    """Decorator caching the result of a :class:`NXdata` method without
+    argument.
+
+    Lists are copied, so that the cached value can't be modified by the
+    caller.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self):
+        try:
+            result = self._memo[name]
+        except KeyError:
+            result = method(self)
+            self._memo[name] = result
+        if isinstance(result, list):
+            result = list(result)
+        return result
+    return wrapper
+
+
 class NXdata(object):
     """NXdata parser.
 
@@ -84,6 +113,9 @@ class NXdata(object):
         self.issues = []
         """List of error messages for malformed NXdata."""
 
+        self._attrs = {}
+        self._memo = {}
+
         if validate:
             self._validate()
         self.is_valid = not self.issues
@@ -122,7 +154,8 @@ class NXdata(object):
             nxdata_logger.debug("%s", self.issues)
         else:
             self.signal = self.group[self.signal_dataset_name]
-            self.signal_name = get_attr_as_unicode(self.signal, "long_name")
+            self.signal_name = self._get_attr("long_name",
+                                              self.signal_dataset_name)
 
             if self.signal_name is None:
                 self.signal_name = self.signal_dataset_name
@@ -139,23 +172,53 @@ class NXdata(object):
             self.axes_names = []
             # check if axis dataset defines @long_name
             for i, dsname in enumerate(self.axes_dataset_names):
-                if dsname is not None and "long_name" in self.group[dsname].attrs:
-                    self.axes_names.append(get_attr_as_unicode(self.group[dsname], "long_name"))
+                if dsname is not None and "long_name" in self._get_attrs(dsname):
+                    self.axes_names.append(self._get_attr("long_name", dsname))
                 else:
                     self.axes_names.append(dsname)
 
             # excludes scatters
             self.signal_is_1d = self.signal_is_1d and len(self.axes) <= 1  # excludes n-D scatters
 
+    def _get_attrs(self, name=None):
+        """Returns the attributes of the group, or of one of its members.
+
+        All the attributes of a node are read at once, the first time
+        they are needed.
+
+        :param Union[str,None] name: Name of the member, or None for the group
+        :rtype: dict
+        """
+        attrs = self._attrs.get(name)
+        if attrs is None:
+            item = self.group if name is None else self.group[name]
+            attrs = dict(item.attrs.items())
+            self._attrs[name] = attrs
+        return attrs
+
+    def _get_attr(self, attr_name, name=None, default=None):
+        """Returns an attribute of the group, or of one of its members, as
+        unicode.
+
+        See :func:`silx.io.nxdata.get_attr_as_unicode`.
+
+        :param str attr_name: Name of the attribute
+        :param Union[str,None] name: Name of the member, or None for the group
+        :param default: Value to be returned if attribute is not found.
+        """
+        return attr_as_unicode(self._get_attrs(name).get(attr_name, default))
+
     def _validate(self):
         """Fill :attr:`issues` with error messages for each error found."""
         if not is_group(self.group):
             raise TypeError("group must be a h5py-like group")
-        if get_attr_as_unicode(self.group, "NX_class") != "NXdata":
+        if self._get_attr("NX_class") != "NXdata":
             self.issues.append("Group has no attribute @NX_class='NXdata'")
             return
 
-        signal_name = get_signal_name(self.group)
+        signal_name = self._get_attr("signal")
+        if signal_name is None:
+            signal_name = get_signal_name(self.group)
         if signal_name is None:
             self.issues.append("No @signal attribute on the NXdata group, "
                                "and no dataset with a @signal=1 attr found")
@@ -166,13 +229,15 @@ class NXdata(object):
             self.issues.append("Cannot find signal dataset '%s'" % signal_name)
             return
 
-        auxiliary_signals_names = get_auxiliary_signals_names(self.group)
+        auxiliary_signals_names = self._get_attr("auxiliary_signals", default=[])
+        if isinstance(auxiliary_signals_names, (six.text_type, six.binary_type)):
+            auxiliary_signals_names = [auxiliary_signals_names]
         self.issues += validate_auxiliary_signals(self.group,
                                                   signal_name,
                                                   auxiliary_signals_names)
 
-        if "axes" in self.group.attrs:
-            axes_names = get_attr_as_unicode(self.group, "axes")
+        if "axes" in self._get_attrs():
+            axes_names = self._get_attr("axes")
             if isinstance(axes_names, (six.text_type, six.binary_type)):
                 axes_names = [axes_names]
 
@@ -180,7 +245,11 @@ class NXdata(object):
                                                    num_axes=len(axes_names))
 
             # Test consistency of @uncertainties
-            uncertainties_names = get_uncertainties_names(self.group, signal_name)
+            uncertainties_names = self._get_attr("uncertainties")
+            if uncertainties_names is None:
+                uncertainties_names = self._get_attr("uncertainties", signal_name)
+            if isinstance(uncertainties_names, six.text_type):
+                uncertainties_names = [uncertainties_names]
             if uncertainties_names is not None:
                 if len(uncertainties_names) != len(axes_names):
                     if len(uncertainties_names) < len(axes_names):
@@ -216,8 +285,9 @@ class NXdata(object):
                     continue
                 else:
                     # for a  1-d axis,
-                    fg_idx = self.group[axis_name].attrs.get("first_good", 0)
-                    lg_idx = self.group[axis_name].attrs.get("last_good", len(self.group[axis_name]) - 1)
+                    axis_attrs = self._get_attrs(axis_name)
+                    fg_idx = axis_attrs.get("first_good", 0)
+                    lg_idx = axis_attrs.get("last_good", len(self.group[axis_name]) - 1)
                     axis_len = lg_idx + 1 - fg_idx
 
                 if axis_len != signal_size:
@@ -257,15 +327,16 @@ class NXdata(object):
                         "have the same dimensions as the signal.")
 
     @property
+    @_memoized
     def signal_dataset_name(self):
         """Name of the main signal dataset."""
         if not self.is_valid:
             raise InvalidNXdataError("Unable to parse invalid NXdata")
-        signal_dataset_name = get_attr_as_unicode(self.group, "signal")
+        signal_dataset_name = self._get_attr("signal")
         if signal_dataset_name is None:
             # find a dataset with @signal == 1
             for dsname in self.group:
-                signal_attr = self.group[dsname].attrs.get("signal")
+                signal_attr = self._get_attrs(dsname).get("signal")
                 if signal_attr in [1, b"1", u"1"]:
                     # This is the main (default) signal
                     signal_dataset_name = dsname
@@ -274,6 +345,7 @@ class NXdata(object):
         return signal_dataset_name
 
     @property
+    @_memoized
     def auxiliary_signals_dataset_names(self):
         """Sorted list of names of the auxiliary signals datasets.
 
@@ -286,9 +358,9 @@ class NXdata(object):
         (deprecated NXdata specification)."""
         if not self.is_valid:
             raise InvalidNXdataError("Unable to parse invalid NXdata")
-        signal_dataset_name = get_attr_as_unicode(self.group, "signal")
+        signal_dataset_name = self._get_attr("signal")
         if signal_dataset_name is not None:
-            auxiliary_signals_names = get_attr_as_unicode(self.group, "auxiliary_signals")
+            auxiliary_signals_names = self._get_attr("auxiliary_signals")
             if auxiliary_signals_names is not None:
                 if not isinstance(auxiliary_signals_names,
                                   (tuple, list, numpy.ndarray)):
@@ -304,7 +376,7 @@ class NXdata(object):
                 # main signal, not auxiliary
                 continue
             ds = self.group[dsname]
-            signal_attr = ds.attrs.get("signal")
+            signal_attr = self._get_attrs(dsname).get("signal")
             if signal_attr is not None and not is_dataset(ds):
                 nxdata_logger.warning("Item %s with @signal=%s is not a dataset (%s)",
                                       dsname, signal_attr, type(ds))
@@ -321,6 +393,7 @@ class NXdata(object):
         return [a[1] for a in sorted(numbered_names)]
 
     @property
+    @_memoized
     def auxiliary_signals_names(self):
         """List of names of the auxiliary signals.
 
@@ -332,8 +405,9 @@ class NXdata(object):
 
         signal_names = []
         for asdn in self.auxiliary_signals_dataset_names:
-            if "long_name" in self.group[asdn].attrs:
-                signal_names.append(self.group[asdn].attrs["long_name"])
+            attrs = self._get_attrs(asdn)
+            if "long_name" in attrs:
+                signal_names.append(attrs["long_name"])
             else:
                 signal_names.append(asdn)
         return signal_names
@@ -347,6 +421,7 @@ class NXdata(object):
         return [self.group[dsname] for dsname in self.auxiliary_signals_dataset_names]
 
     @property
+    @_memoized
     def interpretation(self):
         """*@interpretation* attribute associated with the *signal*
         dataset of the NXdata group. ``None`` if no interpretation
@@ -377,9 +452,10 @@ class NXdata(object):
                                    "rgba-image",  # "hsla-image", "cmyk-image"
                                    "vertex"]
 
-        interpretation = get_attr_as_unicode(self.signal, "interpretation")
+        interpretation = self._get_attr("interpretation",
+                                        self.signal_dataset_name)
         if interpretation is None:
-            interpretation = get_attr_as_unicode(self.group, "interpretation")
+            interpretation = self._get_attr("interpretation")
 
         if interpretation not in allowed_interpretations:
             nxdata_logger.warning("Interpretation %s is not valid." % interpretation +
@@ -426,23 +502,22 @@ class NXdata(object):
         for axis_name in self.axes_dataset_names:
             if axis_name is None:
                 axes.append(None)
-            else:
-                axes.append(self.group[axis_name])
-
-        # keep only good range of axis data
-        for i, axis in enumerate(axes):
-            if axis is None:
                 continue
-            if "first_good" not in axis.attrs and "last_good" not in axis.attrs:
-                continue
-            fg_idx = axis.attrs.get("first_good", 0)
-            lg_idx = axis.attrs.get("last_good", len(axis) - 1)
-            axes[i] = axis[fg_idx:lg_idx + 1]
+            axis = self.group[axis_name]
+
+            # keep only good range of axis data
+            attrs = self._get_attrs(axis_name)
+            if "first_good" in attrs or "last_good" in attrs:
+                fg_idx = attrs.get("first_good", 0)
+                lg_idx = attrs.get("last_good", len(axis) - 1)
+                axis = axis[fg_idx:lg_idx + 1]
+            axes.append(axis)
 
         self._axes = axes
         return self._axes
 
     @property
+    @_memoized
     def axes_dataset_names(self):
         """List of axes dataset names.
 
@@ -457,10 +532,10 @@ class NXdata(object):
             raise InvalidNXdataError("Unable to parse invalid NXdata")
 
         numbered_names = []     # used in case of @axis=0 (old spec)
-        axes_dataset_names = get_attr_as_unicode(self.group, "axes")
+        axes_dataset_names = self._get_attr("axes")
         if axes_dataset_names is None:
             # try @axes on signal dataset (older NXdata specification)
-            axes_dataset_names = get_attr_as_unicode(self.signal, "axes")
+            axes_dataset_names = self._get_attr("axes", self.signal_dataset_name)
             if axes_dataset_names is not None:
                 # we expect a comma separated string
                 if hasattr(axes_dataset_names, "split"):
@@ -470,7 +545,7 @@ class NXdata(object):
                 for dsname in self.group:
                     if not is_dataset(self.group[dsname]):
                         continue
-                    axis_attr = self.group[dsname].attrs.get("axis")
+                    axis_attr = self._get_attrs(dsname).get("axis")
                     if axis_attr is not None:
                         try:
                             axis_num = int(axis_attr)
@@ -526,6 +601,7 @@ class NXdata(object):
         return list(axes_dataset_names)
 
     @property
+    @_memoized
     def title(self):
         """Plot title. If not found, returns an empty string.
 
@@ -546,7 +622,7 @@ class NXdata(object):
                 "title" not in data_dataset_names):
             return str(title[()])
 
-        title = self.group.attrs.get("title")
+        title = self._get_attrs().get("title")
         if title is None:
             return ""
         return str(title)
@@ -571,7 +647,7 @@ class NXdata(object):
         if axis_name not in self.group:
             # tolerate axis_name given as @long_name
             for item in self.group:
-                long_name = get_attr_as_unicode(self.group[item], "long_name")
+                long_name = self._get_attr("long_name", item)
                 if long_name is not None and long_name == axis_name:
                     axis_name = item
                     break
@@ -581,8 +657,9 @@ class NXdata(object):
 
         len_axis = len(self.group[axis_name])
 
-        fg_idx = self.group[axis_name].attrs.get("first_good", 0)
-        lg_idx = self.group[axis_name].attrs.get("last_good", len_axis - 1)
+        axis_attrs = self._get_attrs(axis_name)
+        fg_idx = axis_attrs.get("first_good", 0)
+        lg_idx = axis_attrs.get("last_good", len_axis - 1)
 
         # case of axisname_errors dataset present
         errors_name = axis_name + "_errors"
@@ -592,16 +669,17 @@ class NXdata(object):
             else:
                 return self.group[errors_name]
         # case of uncertainties dataset name provided in @uncertainties
-        uncertainties_names = get_attr_as_unicode(self.group, "uncertainties")
+        uncertainties_names = self._get_attr("uncertainties")
         if uncertainties_names is None:
-            uncertainties_names = get_attr_as_unicode(self.signal, "uncertainties")
+            uncertainties_names = self._get_attr("uncertainties",
+                                                 self.signal_dataset_name)
         if isinstance(uncertainties_names, six.text_type):
             uncertainties_names = [uncertainties_names]
         if uncertainties_names is not None:
             # take the uncertainty with the same index as the axis in @axes
-            axes_ds_names = get_attr_as_unicode(self.group, "axes")
+            axes_ds_names = self._get_attr("axes")
             if axes_ds_names is None:
-                axes_ds_names = get_attr_as_unicode(self.signal, "axes")
+                axes_ds_names = self._get_attr("axes", self.signal_dataset_name)
             if isinstance(axes_ds_names, six.text_type):
                 axes_ds_names = [axes_ds_names]
             elif isinstance(axes_ds_names, numpy.ndarray):
@@ -621,6 +699,7 @@ class NXdata(object):
         return None
 
     @property
+    @_memoized
     def errors(self):
         """Return errors (uncertainties) associated with the signal values.
 
@@ -747,6 +826,106 @@ class NXdata(object):
         return True
 
 
+_NXDATA_CACHE_SIZE = 256
+"""Maximum number of parsed NXdata groups kept in the cache"""
+
+_nxdata_cache = collections.OrderedDict()
+"""Parsed NXdata from read-only HDF5 files: {key: (stamp, NXdata)}"""
+
+_commonh5_nxdata_cache = weakref.WeakKeyDictionary()
+"""Parsed NXdata from read-only commonh5 files: {file: {name: NXdata}}
+
+Files are weakly referenced, and a group only holds a weak reference to
+its parent, so the cached NXdata do not keep a dropped tree alive."""
+
+_nxdata_cache_lock = threading.Lock()
+
+
+def _get_cache_key(group):
+    """Returns the key and the stamp used to cache the parsing of a HDF5
+    group.
+
+    Only groups from read-only files can be cached. The key is the file
+    id and the object address, and the stamp changes with the file on disk.
+
+    :param group: h5py-like group
+    :return: (key, stamp), or None if this group can't be cached
+    """
+    if h5py is None or not isinstance(group, h5py.Group):
+        return None
+    h5file = group.file
+    if h5file.mode != "r":
+        return None
+    try:
+        stat = os.stat(h5file.filename)
+    except (OSError, TypeError):
+        return None
+    key = group.id.fileno, h5py.h5o.get_info(group.id).addr
+    num_attrs = h5py.h5a.get_num_attrs(group.id)
+    return key, (stat.st_mtime, stat.st_size, num_attrs)
+
+
+def _get_commonh5_nxdata(group):
+    """Returns the validated :class:`NXdata` of a group from a read-only
+    commonh5 tree, cached per file.
+
+    :param commonh5.Group group: Group of a read-only tree
+    :rtype: NXdata
+    """
+    h5file = group.file
+    if h5file is None or h5file is group:
+        # The cached NXdata would keep its own key alive
+        return NXdata(group)
+
+    with _nxdata_cache_lock:
+        nxdatas = _commonh5_nxdata_cache.get(h5file)
+        if nxdatas is None:
+            nxdatas = {}
+            _commonh5_nxdata_cache[h5file] = nxdatas
+        nxd = nxdatas.get(group.name)
+        if nxd is not None and nxd.group is group:
+            return nxd
+
+    nxd = NXdata(group)
+    with _nxdata_cache_lock:
+        nxdatas[group.name] = nxd
+    return nxd
+
+
+def _get_nxdata(group):
+    """Returns the validated :class:`NXdata` of a group.
+
+    The result is cached for groups of read-only files, so that the
+    group is parsed only once.
+
+    :param group: h5py-like group
+    :rtype: NXdata
+    :raise TypeError: if group is not a h5py-like group
+    """
+    if isinstance(group, commonh5.Group) and not group._is_editable():
+        return _get_commonh5_nxdata(group)
+
+    cache_key = _get_cache_key(group)
+    if cache_key is None:
+        return NXdata(group)
+
+    key, stamp = cache_key
+    with _nxdata_cache_lock:
+        entry = _nxdata_cache.pop(key, None)
+        if entry is not None:
+            entry_stamp, nxd = entry
+            if entry_stamp == stamp and nxd.group.id.valid:
+                _nxdata_cache[key] = entry
+                return nxd
+
+    nxd = NXdata(group)
+    with _nxdata_cache_lock:
+        _nxdata_cache[key] = stamp, nxd
+        while len(_nxdata_cache) > _NXDATA_CACHE_SIZE:
+            _nxdata_cache.popitem(last=False)
+    return nxd
+
+
 def is_valid_nxdata(group):   # noqa
     """Check if a h5py group is a **valid** NX_data group.
 
@@ -755,7 +934,7 @@ def is_valid_nxdata(group):   # noqa
     :raise TypeError: if group is not a h5py group, a spech5 group,
         or a fabioh5 group
     """
-    nxd = NXdata(group)
+    nxd = _get_nxdata(group)
     return nxd.is_valid
 
 
@@ -871,4 +1050,8 @@ def get_default(group, validate=True):
     else:
         return None
 
+    if is_group(default_data):
+        nxd = _get_nxdata(default_data)
+        if nxd.is_valid:
+            return nxd
     return NXdata(default_data, validate=False)
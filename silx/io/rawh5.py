@@ -25,7 +25,11 @@
 This module contains wrapper from file format to h5py. The exposed layout is
 as close as possible to the original file format.
 """
+import struct
+import zipfile
+
 import numpy
+import numpy.lib.format
 from . import commonh5
 import logging
 
@@ -50,22 +54,125 @@ class _FreeDataset(commonh5.Dataset):
             _logger.warning(msg)
 
 
+def _read_array_header(fp):
+    """Read the header of a `npy` stream.
+
+    :param fp: File-like object at the beginning of a `npy` stream
+    :return: (shape, fortran_order, dtype)
+    """
+    version = numpy.lib.format.read_magic(fp)
+    if version == (1, 0):
+        return numpy.lib.format.read_array_header_1_0(fp)
+    elif version == (2, 0):
+        return numpy.lib.format.read_array_header_2_0(fp)
+    else:
+        return numpy.lib.format._read_array_header(fp, version)
+
+
+class _NpzDataset(_FreeDataset, commonh5.LazyLoadableDataset):
+    """Dataset exposing a member of a `npz` file.
+
+    Only the header of the member is read at the creation. The data is
+    memory-mapped in place if the member is stored without compression,
+    else it is decompressed the first time it is accessed.
+
+    :param str name: Name of the dataset
+    :param str filename: Name of the `npz` file
+    :param zipfile.ZipInfo info: Description of the member in the archive
+    :param zipfile.ZipFile archive: The opened archive
+    """
+
+    def __init__(self, name, filename, info, archive):
+        commonh5.LazyLoadableDataset.__init__(self, name)
+        self.__filename = filename
+        self.__info = info
+        with archive.open(info) as fp:
+            shape, fortran_order, dtype = _read_array_header(fp)
+        self.__shape = shape
+        self.__fortran_order = fortran_order
+        self.__dtype = dtype
+
+    @property
+    def shape(self):
+        return self.__shape
+
+    @property
+    def dtype(self):
+        return self.__dtype
+
+    @property
+    def size(self):
+        if self.__shape == tuple():
+            # It is returned as float64 1.0 by h5py
+            return numpy.float64(1.0)
+        return int(numpy.prod(self.__shape, dtype=numpy.int64))
+
+    @property
+    def compression(self):
+        if self.__info.compress_type == zipfile.ZIP_DEFLATED:
+            return "gzip"
+        return None
+
+    def __data_offset(self):
+        """Returns the offset of the array data in the `npz` file"""
+        with open(self.__filename, "rb") as f:
+            f.seek(self.__info.header_offset)
+            header = f.read(30)
+            # Sizes of the filename and extra field of the local file header
+            name_size, extra_size = struct.unpack("<HH", header[26:30])
+            offset = self.__info.header_offset + 30 + name_size + extra_size
+            # Size of the npy header
+            f.seek(offset)
+            header = f.read(12)
+            if header[6:7] == b"\x01":
+                header_size = 10 + struct.unpack("<H", header[8:10])[0]
+            else:
+                header_size = 12 + struct.unpack("<I", header[8:12])[0]
+        return offset + header_size
+
+    def _create_data(self):
+        if (self.__info.compress_type == zipfile.ZIP_STORED and
+                not self.__dtype.hasobject and
+                self.__shape != tuple() and
+                self.size > 0):
+            order = "F" if self.__fortran_order else "C"
+            return numpy.memmap(self.__filename, dtype=self.__dtype, mode="r",
+                                offset=self.__data_offset(),
+                                shape=self.__shape, order=order)
+
+        with zipfile.ZipFile(self.__filename) as archive:
+            with archive.open(self.__info) as fp:
+                return numpy.lib.format.read_array(fp)
+
+
 class NumpyFile(commonh5.File):
     """
     Expose a numpy file `npy`, or `npz` as an h5py.File-like.
 
+    The content of a `npy` file is memory-mapped. The members of a `npz`
+    file are only read when they are accessed, uncompressed members are
+    memory-mapped.
+
     :param str name: Filename to load
     """
     def __init__(self, name=None):
         commonh5.File.__init__(self, name=name, mode="w")
-        np_file = numpy.load(name)
-        if hasattr(np_file, "close"):
+        if zipfile.is_zipfile(name):
             # For npz (created using  by numpy.savez, numpy.savez_compressed)
-            for key, value in np_file.items():
-                self[key] = _FreeDataset(None, data=value)
-            np_file.close()
+            with zipfile.ZipFile(name) as archive:
+                for info in archive.infolist():
+                    key = info.filename
+                    if not key.endswith(".npy"):
+                        continue
+                    key = key[:-len(".npy")]
+                    self[key] = _NpzDataset(None, name, info, archive)
         else:
             # For npy (created using numpy.save)
-            value = np_file
+            try:
+                value = numpy.load(name, mmap_mode="r")
+            except ValueError:
+                # Python objects can't be memory-mapped
+                _logger.debug("Backtrace", exc_info=True)
+                value = numpy.load(name)
             dataset = _FreeDataset("data", data=value)
             self.add_node(dataset)
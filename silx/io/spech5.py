@@ -449,6 +449,36 @@ def _demultiplex_mca(scan, analyser_index):
 
 
 # Node classes
+def _to_spech5_value(data):
+    """Convert a value read from the SPEC file into the type exposed
+    by the SpecH5 datasets.
+
+    Text is converted to unicode, floating point values to *float32*.
+
+    :param data: Scalar, string or array-like
+    :return: Converted value
+    """
+    # get proper value types, to inherit from numpy
+    # attributes (dtype, shape, size)
+    if isinstance(data, six.string_types):
+        # use unicode (utf-8 when saved to HDF5 output)
+        return to_h5py_utf8(data)
+    elif isinstance(data, float):
+        # use 32 bits for float scalars
+        return numpy.float32(data)
+    elif isinstance(data, int):
+        return numpy.int_(data)
+
+    # Enforce numpy array
+    array = numpy.array(data)
+    data_kind = array.dtype.kind
+    if data_kind in ["S", "U"]:
+        return numpy.asarray(array, dtype=text_dtype)
+    elif data_kind in ["f"]:
+        return numpy.asarray(array, dtype=numpy.float32)
+    return array
+
+
 class SpecH5Dataset(object):
     """This convenience class is to be inherited by all datasets, for
     compatibility purpose with code that tests for
@@ -460,7 +490,8 @@ class SpecH5Dataset(object):
     Datasets must also inherit :class:`SpecH5NodeDataset` or
     :class:`SpecH5LazyNodeDataset` which actually implement all the
     API."""
-    pass
+
+    __slots__ = ()
 
 
 class SpecH5NodeDataset(commonh5.Dataset, SpecH5Dataset):
@@ -469,30 +500,12 @@ class SpecH5NodeDataset(commonh5.Dataset, SpecH5Dataset):
     proxy behavior that allows to mimic the numpy array stored in this
     class.
     """
+
+    __slots__ = ()
+
     def __init__(self, name, data, parent=None, attrs=None):
-        # get proper value types, to inherit from numpy
-        # attributes (dtype, shape, size)
-        if isinstance(data, six.string_types):
-            # use unicode (utf-8 when saved to HDF5 output)
-            value = to_h5py_utf8(data)
-        elif isinstance(data, float):
-            # use 32 bits for float scalars
-            value = numpy.float32(data)
-        elif isinstance(data, int):
-            value = numpy.int_(data)
-        else:
-            # Enforce numpy array
-            array = numpy.array(data)
-            data_kind = array.dtype.kind
-
-            if data_kind in ["S", "U"]:
-                value = numpy.asarray(array,
-                                      dtype=text_dtype)
-            elif data_kind in ["f"]:
-                value = numpy.asarray(array, dtype=numpy.float32)
-            else:
-                value = array
-        commonh5.Dataset.__init__(self, name, value, parent, attrs)
+        commonh5.Dataset.__init__(self, name, _to_spech5_value(data),
+                                  parent, attrs)
 
     def __getattr__(self, item):
         """Proxy to underlying numpy array methods.
@@ -512,6 +525,9 @@ class SpecH5LazyNodeDataset(commonh5.LazyLoadableDataset, SpecH5Dataset):
     implemented to return the numpy data exposed by the dataset. This factory
     method is only called once, when the data is needed.
     """
+
+    __slots__ = ()
+
     def __getattr__(self, item):
         """Proxy to underlying numpy array methods.
         """
@@ -541,7 +557,8 @@ class SpecH5Group(object):
 
     Groups must also inherit :class:`silx.io.commonh5.Group`, which
     actually implements all the methods and attributes."""
-    pass
+
+    __slots__ = ()
 
 
 class SpecH5(commonh5.File, SpecH5Group):
@@ -569,9 +586,10 @@ class SpecH5(commonh5.File, SpecH5Group):
                  "creator": to_h5py_utf8("silx spech5 %s" % silx_version)}
         commonh5.File.__init__(self, filename, attrs=attrs)
 
+        # Only the scan index is read here, scan headers and data are
+        # parsed when a scan group is accessed
         for scan_key in self._sf.keys():
-            scan = self._sf[scan_key]
-            scan_group = ScanGroup(scan_key, parent=self, scan=scan)
+            scan_group = ScanGroup(scan_key, parent=self)
             self.add_node(scan_group)
 
     def close(self):
@@ -579,16 +597,42 @@ class SpecH5(commonh5.File, SpecH5Group):
         self._sf = None
 
 
-class ScanGroup(commonh5.Group, SpecH5Group):
-    def __init__(self, scan_key, parent, scan):
+class ScanGroup(commonh5.LazyLoadableGroup, SpecH5Group):
+    """Group exposing a scan.
+
+    The scan is only parsed from the file when the content of the group
+    is accessed for the first time.
+    """
+
+    __slots__ = ("_scan_key", "_scan")
+
+    def __init__(self, scan_key, parent, scan=None):
         """
 
-        :param parent: parent Group
         :param str scan_key: Scan key (e.g. "1.1")
-        :param scan: specfile.Scan object
+        :param parent: parent Group
+        :param scan: specfile.Scan object. If not provided, it is read
+            from the :class:`SpecFile` of the parent :class:`SpecH5` file
+            when the group content is needed.
         """
-        commonh5.Group.__init__(self, scan_key, parent=parent,
-                                attrs={"NX_class": to_h5py_utf8("NXentry")})
+        commonh5.LazyLoadableGroup.__init__(
+            self, scan_key, parent=parent,
+            attrs={"NX_class": to_h5py_utf8("NXentry")})
+        self._scan_key = scan_key
+        self._scan = scan
+
+    def _get_scan(self):
+        """Returns the specfile.Scan object exposed by this group"""
+        if self._scan is None:
+            specfile = self.file._sf
+            if specfile is None:
+                raise ValueError("SpecH5 file %s is closed" % self.file.filename)
+            self._scan = specfile[self._scan_key]
+        return self._scan
+
+    def _create_child(self):
+        scan = self._get_scan()
+        scan_key = self._scan_key
 
         # take title in #S after stripping away scan number and spaces
         s_hdr_line = scan.scan_header_dict["S"]
@@ -631,6 +675,8 @@ class ScanGroup(commonh5.Group, SpecH5Group):
 
 
 class InstrumentGroup(commonh5.Group, SpecH5Group):
+    __slots__ = ()
+
     def __init__(self, parent, scan):
         """
 
@@ -651,6 +697,8 @@ class InstrumentGroup(commonh5.Group, SpecH5Group):
 
 
 class InstrumentSpecfileGroup(commonh5.Group, SpecH5Group):
+    __slots__ = ()
+
     def __init__(self, parent, scan):
         commonh5.Group.__init__(self, name="specfile", parent=parent,
                                 attrs={"NX_class": to_h5py_utf8("NXcollection")})
@@ -667,24 +715,44 @@ class InstrumentSpecfileGroup(commonh5.Group, SpecH5Group):
 
 
 class PositionersGroup(commonh5.Group, SpecH5Group):
+    __slots__ = ()
+
     def __init__(self, parent, scan):
         commonh5.Group.__init__(self, name="positioners", parent=parent,
                                 attrs={"NX_class": to_h5py_utf8("NXcollection")})
         for motor_name in scan.motor_names:
-            safe_motor_name = motor_name.replace("/", "%")
-            if motor_name in scan.labels and scan.data.shape[0] > 0:
-                # return a data column if one has the same label as the motor
-                motor_value = scan.data_column_by_name(motor_name)
-            else:
-                # Take value from #P scan header.
-                # (may return float("inf") if #P line is missing from scan hdr)
-                motor_value = scan.motor_position_by_name(motor_name)
-            self.add_node(SpecH5NodeDataset(name=safe_motor_name,
-                                            data=motor_value,
-                                            parent=self))
+            self.add_node(PositionerDataset(parent=self,
+                                            motor_name=motor_name,
+                                            scan=scan))
+
+
+class PositionerDataset(SpecH5LazyNodeDataset):
+    """Lazy loadable dataset for a motor position"""
+
+    __slots__ = ("_scan", "_motor_name")
+
+    def __init__(self, parent, motor_name, scan):
+        commonh5.LazyLoadableDataset.__init__(
+            self, name=motor_name.replace("/", "%"), parent=parent)
+        self._scan = scan
+        self._motor_name = motor_name
+
+    def _create_data(self):
+        scan = self._scan
+        motor_name = self._motor_name
+        if motor_name in scan.labels and scan.data.shape[0] > 0:
+            # return a data column if one has the same label as the motor
+            motor_value = scan.data_column_by_name(motor_name)
+        else:
+            # Take value from #P scan header.
+            # (may return float("inf") if #P line is missing from scan hdr)
+            motor_value = scan.motor_position_by_name(motor_name)
+        return _to_spech5_value(motor_value)
 
 
 class InstrumentMcaGroup(commonh5.Group, SpecH5Group):
+    __slots__ = ()
+
     def __init__(self, parent, analyser_index, scan):
         name = "mca_%d" % analyser_index
         commonh5.Group.__init__(self, name=name, parent=parent,
@@ -742,6 +810,9 @@ class InstrumentMcaGroup(commonh5.Group, SpecH5Group):
 
 class McaDataDataset(SpecH5LazyNodeDataset):
     """Lazy loadable dataset for MCA data"""
+
+    __slots__ = ("_scan", "_analyser_index", "_shape", "_num_analysers")
+
     def __init__(self, parent, analyser_index, scan):
         commonh5.LazyLoadableDataset.__init__(
             self, name="data", parent=parent,
@@ -801,6 +872,8 @@ class McaDataDataset(SpecH5LazyNodeDataset):
 
 
 class MeasurementGroup(commonh5.Group, SpecH5Group):
+    __slots__ = ()
+
     def __init__(self, parent, scan):
         """
 
@@ -810,17 +883,32 @@ class MeasurementGroup(commonh5.Group, SpecH5Group):
         commonh5.Group.__init__(self, name="measurement", parent=parent,
                                 attrs={"NX_class": to_h5py_utf8("NXcollection"),})
         for label in scan.labels:
-            safe_label = label.replace("/", "%")
-            self.add_node(SpecH5NodeDataset(name=safe_label,
-                                            data=scan.data_column_by_name(label),
-                                            parent=self))
+            self.add_node(DataColumnDataset(parent=self, label=label,
+                                            scan=scan))
 
         num_analysers = _get_number_of_mca_analysers(scan)
         for anal_idx in range(num_analysers):
             self.add_node(MeasurementMcaGroup(parent=self, analyser_index=anal_idx))
 
 
+class DataColumnDataset(SpecH5LazyNodeDataset):
+    """Lazy loadable dataset for a scan data column"""
+
+    __slots__ = ("_scan", "_label")
+
+    def __init__(self, parent, label, scan):
+        commonh5.LazyLoadableDataset.__init__(
+            self, name=label.replace("/", "%"), parent=parent)
+        self._scan = scan
+        self._label = label
+
+    def _create_data(self):
+        return _to_spech5_value(self._scan.data_column_by_name(self._label))
+
+
 class MeasurementMcaGroup(commonh5.Group, SpecH5Group):
+    __slots__ = ()
+
     def __init__(self, parent, analyser_index):
         basename = "mca_%d" % analyser_index
         commonh5.Group.__init__(self, name=basename, parent=parent,
@@ -836,6 +924,8 @@ class MeasurementMcaGroup(commonh5.Group, SpecH5Group):
 
 
 class SampleGroup(commonh5.Group, SpecH5Group):
+    __slots__ = ()
+
     def __init__(self, parent, scan):
         """
 
@@ -0,0 +1,126 @@
+# coding: utf-8
+# /*##########################################################################
+# Copyright (C) 2018 European Synchrotron Radiation Facility
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# ############################################################################*/
+"""Benchmarks of the commonh5 tree on a synthetic file with a lot of nodes"""
+
+from __future__ import division
+
+__authors__ = ["V. Valls"]
+__license__ = "MIT"
+__date__ = "19/10/2018"
+
+
+import logging
+import time
+import unittest
+
+import numpy
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from silx.io import commonh5
+
+_logger = logging.getLogger(__name__)
+_logger.setLevel(logging.DEBUG)
+
+
+class BenchmarkCommonH5(unittest.TestCase):
+    """Benchmark building and browsing a large commonh5 tree.
+
+    The tree mimics a SPEC file: scans containing a measurement group
+    with many scalar datasets and links to them.
+    """
+
+    NB_NODES = 10**6
+    """Approximate number of nodes of the synthetic tree"""
+
+    NB_DATASETS_PER_SCAN = 98
+
+    def _create_tree(self):
+        h5 = commonh5.File(name="benchmark", mode="r")
+        value = numpy.array(0.)
+        nb_scans = self.NB_NODES // (self.NB_DATASETS_PER_SCAN + 2)
+        names = ["counter_%d" % i for i in range(self.NB_DATASETS_PER_SCAN)]
+        for scan_index in range(nb_scans):
+            scan = commonh5.Group("%d.1" % scan_index,
+                                  attrs={"NX_class": "NXentry"})
+            h5.add_node(scan)
+            measurement = commonh5.Group("measurement")
+            scan.add_node(measurement)
+            for name in names:
+                measurement.add_node(commonh5.Dataset(name, data=value))
+        scan.add_node(commonh5.SoftLink("title", path="/0.1/measurement/counter_0"))
+        return h5, nb_scans, names
+
+    def test_benchmark_tree(self):
+        if tracemalloc is not None:
+            tracemalloc.start()
+        start = time.time()
+        h5, nb_scans, names = self._create_tree()
+        duration = time.time() - start
+        if tracemalloc is not None:
+            memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            _logger.info("Memory used by the tree: %.1f MB", memory / 2**20)
+        _logger.info("Tree with %d scans created in %.2fs", nb_scans, duration)
+
+        paths = ["/%d.1/measurement/%s" % (scan_index, name)
+                 for scan_index in range(0, nb_scans, 7)
+                 for name in names[::5]]
+
+        for label in ("first access", "cached access"):
+            start = time.time()
+            for path in paths:
+                h5[path]
+            duration = time.time() - start
+            _logger.info("%d path lookups (%s): %.3fs", len(paths), label, duration)
+
+        link_path = "/%d.1/title" % (nb_scans - 1)
+        start = time.time()
+        for _ in range(10**4):
+            h5[link_path][()]
+        duration = time.time() - start
+        _logger.info("10**4 link resolutions: %.3fs", duration)
+
+        start = time.time()
+        count = [0]
+
+        def visitor(name):
+            count[0] += 1
+        h5.visit(visitor)
+        duration = time.time() - start
+        _logger.info("Visit of %d nodes: %.2fs", count[0], duration)
+
+
+def suite():
+    test_suite = unittest.TestSuite()
+    test_suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromTestCase(BenchmarkCommonH5))
+    return test_suite
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest="suite")
@@ -0,0 +1,121 @@
+# coding: utf-8
+# /*##########################################################################
+# Copyright (C) 2018 European Synchrotron Radiation Facility
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# ############################################################################*/
+"""Benchmarks of h5todict and dicttoh5 on a file with many small datasets"""
+
+__authors__ = ["P. Knobel"]
+__license__ = "MIT"
+__date__ = "19/10/2018"
+
+
+import logging
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import numpy
+
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+from silx.io.dictdump import dicttoh5, h5todict
+
+_logger = logging.getLogger(__name__)
+_logger.setLevel(logging.DEBUG)
+
+
+def _h5todict_reference(group):
+    """Read a group with one high-level h5py lookup and read per member"""
+    ddict = {}
+    for key in group:
+        node = group[key]
+        if isinstance(node, h5py.Group):
+            ddict[key] = _h5todict_reference(node)
+        else:
+            ddict[key] = node[...]
+    return ddict
+
+
+@unittest.skipIf(h5py is None, "h5py is not available")
+class BenchmarkDictDump(unittest.TestCase):
+    """Benchmark reading a file with many scalar datasets"""
+
+    NB_GROUPS = 1000
+
+    NB_DATASETS_PER_GROUP = 20
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.ddict = dict(
+            ("group_%d" % group_index,
+             dict(("counter_%d" % index, numpy.float64(index))
+                  for index in range(self.NB_DATASETS_PER_GROUP)))
+            for group_index in range(self.NB_GROUPS))
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_benchmark_dicttoh5(self):
+        nb_datasets = self.NB_GROUPS * self.NB_DATASETS_PER_GROUP
+        filename = os.path.join(self.tempdir, "write.h5")
+        for kwargs in ({}, {"bulk": True}, {"compact": True}):
+            start = time.time()
+            dicttoh5(self.ddict, filename, **kwargs)
+            duration = time.time() - start
+            _logger.info("%d datasets, dicttoh5(%s): %.2fs",
+                         nb_datasets, kwargs, duration)
+
+    def test_benchmark_h5todict(self):
+        nb_datasets = self.NB_GROUPS * self.NB_DATASETS_PER_GROUP
+        for compact, layout in ((False, "contiguous"), (True, "compact")):
+            filename = os.path.join(self.tempdir, "%s.h5" % layout)
+            dicttoh5(self.ddict, filename, compact=compact)
+
+            start = time.time()
+            with h5py.File(filename, "r") as h5file:
+                expected = _h5todict_reference(h5file)
+            duration = time.time() - start
+            _logger.info("%d %s datasets, one read per dataset: %.2fs",
+                         nb_datasets, layout, duration)
+
+            start = time.time()
+            ddict = h5todict(filename)
+            duration = time.time() - start
+            _logger.info("%d %s datasets, h5todict: %.2fs",
+                         nb_datasets, layout, duration)
+            self.assertEqual(ddict, expected)
+
+
+def suite():
+    test_suite = unittest.TestSuite()
+    test_suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromTestCase(BenchmarkDictDump))
+    return test_suite
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest="suite")
@@ -292,6 +292,42 @@ class TestSpecificCommonH5(unittest.TestCase):
         group["b"] = commonh5.SoftLink(None, path="/" + self.id() + "/a")
         self.assertEqual(group["b"].dtype.kind, "i")
 
+    def test_compact_nodes(self):
+        group = commonh5.Group("foo")
+        dataset = commonh5.Dataset("bar", data=numpy.array(1))
+        self.assertFalse(hasattr(group, "__dict__"))
+        self.assertFalse(hasattr(dataset, "__dict__"))
+        # nodes without attributes share the same empty dict
+        group.add_node(dataset)
+        self.assertEqual(len(dataset.attrs), 0)
+        dataset.attrs["a"] = 1
+        self.assertEqual(len(commonh5.Node("spam").attrs), 0)
+
+    def test_readonly_path_cache(self):
+        f = commonh5.File(name="Foo", mode="r")
+        group = commonh5.Group("group")
+        f.add_node(group)
+        group.add_node(commonh5.Dataset("a", data=numpy.array(1)))
+        self.assertIs(f["/group/a"], f["group/a"])
+        self.assertEqual(f["/group/a"][()], 1)
+
+        # replacing a node invalidates the cache
+        group.add_node(commonh5.Dataset("a", data=numpy.array(2)))
+        self.assertEqual(f["/group/a"][()], 2)
+
+    def test_readonly_link_resolution(self):
+        f = commonh5.File(name="Foo", mode="r")
+        group = commonh5.Group("group")
+        f.add_node(group)
+        group.add_node(commonh5.Dataset("a", data=numpy.array(1)))
+        group.add_node(commonh5.SoftLink("b", path="/group/a"))
+        group.add_node(commonh5.SoftLink("broken", path="/group/c"))
+        link = group["b"]
+        self.assertEqual(link[()], 1)
+        self.assertIs(group["b"], link)
+        with self.assertRaises(KeyError):
+            group["broken"]
+
 
 def suite():
     loadTests = unittest.defaultTestLoader.loadTestsFromTestCase
@@ -30,6 +30,7 @@ __date__ = "17/01/2018"
 from collections import OrderedDict
 import numpy
 import os
+import shutil
 import tempfile
 import unittest
 
@@ -114,6 +115,95 @@ class TestDictToH5(unittest.TestCase):
         res = h5todict(self.h5_fname)
         assert(res['t'] == False)
 
+    def testBulk(self):
+        dicttoh5(city_attrs, self.h5_fname, h5path='/city attributes',
+                 mode="w", bulk=True)
+        ddict = h5todict(self.h5_fname)
+        grenoble = ddict["city attributes"]["Europe"]["France"]["Grenoble"]
+        self.assertEqual(grenoble["inhabitants"], 160215)
+        numpy.testing.assert_array_equal(grenoble["coordinates"],
+                                         [45.1830, 5.7196])
+        self.assertEqual(grenoble["area"], b"18.44 km2")
+
+        dicttoh5({"a": {"empty": {}, "none": None, "b": numpy.arange(10000)}},
+                 self.h5_fname, mode="w", bulk=True)
+        with h5py.File(self.h5_fname, "r") as h5f:
+            self.assertIsInstance(h5f["a/empty"], h5py.Group)
+            self.assertIsInstance(h5f["a/none"], h5py.Group)
+            numpy.testing.assert_array_equal(h5f["a/b"], numpy.arange(10000))
+
+    def testBulkLayout(self):
+        ddict = {"a": numpy.arange(10), "b": numpy.arange(10000)}
+        for compact in (False, True):
+            dicttoh5(ddict, self.h5_fname, mode="w", bulk=True,
+                     compact=compact)
+            with h5py.File(self.h5_fname, "r") as h5f:
+                layout = h5f["a"].id.get_create_plist().get_layout()
+                self.assertEqual(layout == h5py.h5d.COMPACT, compact)
+                layout = h5f["b"].id.get_create_plist().get_layout()
+                self.assertEqual(layout, h5py.h5d.CONTIGUOUS)
+            result = h5todict(self.h5_fname)
+            numpy.testing.assert_array_equal(result["a"], ddict["a"])
+            numpy.testing.assert_array_equal(result["b"], ddict["b"])
+
+    def testBulkOverwrite(self):
+        dicttoh5({"t": True, "g": {}}, self.h5_fname, mode="a", bulk=True)
+        with TestLogging(dictdump_logger, warning=2):
+            dicttoh5({"t": False, "g": {}}, self.h5_fname, mode="a",
+                     overwrite_data=False, bulk=True)
+        self.assertEqual(h5todict(self.h5_fname)["t"], True)
+
+        dicttoh5({"t": False}, self.h5_fname, mode="a",
+                 overwrite_data=True, bulk=True)
+        self.assertEqual(h5todict(self.h5_fname)["t"], False)
+
+    def testBulkSameAsDefault(self):
+        """Test bulk and default modes behave the same with existing members
+        """
+        def writeDataset(h5f):
+            h5f["a"] = 5
+
+        def writeGroup(h5f):
+            h5f.create_group("a/x")
+
+        cases = ((writeDataset, {"a": {"b": 1}}),
+                 (writeDataset, {"a": {"b": {"c": 1}}}),
+                 (writeDataset, {"a": None}),
+                 (writeDataset, {"a": 2}),
+                 (writeGroup, {"a": 1}),
+                 (writeGroup, {"a": None}),
+                 (writeGroup, {"a": {"b": 1}}))
+
+        for overwrite_data in (False, True):
+            for init, treedict in cases:
+                results = []
+                for bulk in (False, True):
+                    with h5py.File(self.h5_fname, "w") as h5f:
+                        init(h5f)
+                    with TestLogging(dictdump_logger):
+                        try:
+                            dicttoh5(treedict, self.h5_fname, mode="a",
+                                     overwrite_data=overwrite_data,
+                                     bulk=bulk)
+                        except Exception as e:
+                            results.append(type(e))
+                        else:
+                            results.append(h5todict(self.h5_fname))
+                self.assertEqual(results[0], results[1])
+
+    def testCompound(self):
+        ddict = {"x": 1, "y": 2.5, "pos": [1, 2, 3], "name": "a",
+                 "big": numpy.arange(10000), "sub": {"z": 3}}
+        dicttoh5(ddict, self.h5_fname, mode="w", compound_name="values")
+        with h5py.File(self.h5_fname, "r") as h5f:
+            self.assertEqual(set(h5f.keys()), {"values", "big", "sub"})
+            values = h5f["values"][()]
+            self.assertEqual(values["x"], 1)
+            self.assertEqual(values["y"], 2.5)
+            numpy.testing.assert_array_equal(values["pos"], [1, 2, 3])
+            self.assertEqual(values["name"], b"a")
+            self.assertEqual(h5f["sub/values"][()]["z"], 3)
+
 
 @unittest.skipIf(h5py_missing, "Could not import h5py")
 class TestH5ToDict(unittest.TestCase):
@@ -137,6 +227,102 @@ class TestH5ToDict(unittest.TestCase):
         self.assertIn("area", ddict["Grenoble"])
 
 
+    def testLazy(self):
+        expected = h5todict(self.h5_fname, path="/Europe/France")
+        with h5todict(self.h5_fname, path="/Europe/France", lazy=True) as ddict:
+            self.assertEqual(set(ddict.keys()), set(["Grenoble", "Tourcoing"]))
+            grenoble = ddict["Grenoble"]
+            self.assertEqual(grenoble["inhabitants"], 160215)
+            numpy.testing.assert_array_equal(grenoble["coordinates"],
+                                             [45.1830, 5.7196])
+            self.assertEqual(grenoble["area"], expected["Grenoble"]["area"])
+            self.assertEqual(list(ddict["Tourcoing"].keys()), ["area"])
+
+    def testLazyExcludeNames(self):
+        ddict = h5todict(self.h5_fname, path="/Europe/France",
+                         exclude_names=["inhab"], lazy=True)
+        self.assertNotIn("inhabitants", ddict["Grenoble"])
+        self.assertIn("area", ddict["Grenoble"])
+        ddict.close()
+
+    def testLazyClose(self):
+        ddict = h5todict(self.h5_fname, lazy=True)
+        ddict.close()
+        # The file is closed: it can be opened for writing
+        with h5py.File(self.h5_fname, "a") as h5file:
+            h5file["new"] = 1
+
+        # A file opened by the caller is not closed
+        with h5py.File(self.h5_fname, "r") as h5file:
+            with h5todict(h5file, lazy=True) as ddict:
+                self.assertEqual(ddict["new"], 1)
+            self.assertTrue(bool(h5file))
+
+    def testBatchedRead(self):
+        """Test that datasets read by batches are the same as read
+        by h5py"""
+        tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tempdir)
+        filename = os.path.join(tempdir, "batches.h5")
+        external = os.path.join(tempdir, "external.h5")
+        with h5py.File(external, "w") as h5file:
+            h5file["data"] = numpy.arange(4, dtype=numpy.int16)
+        with h5py.File(filename, "w", userblock_size=512) as h5file:
+            group = h5file.create_group("group")
+            for index in range(10):
+                group["scalar%d" % index] = numpy.float64(index)
+            group["big_endian"] = numpy.arange(6, dtype=">i4").reshape(2, 3)
+            group["bool"] = numpy.array([True, False])
+            group["string"] = numpy.string_("text")
+            group["strings"] = numpy.array([b"a", b"bc"])
+            group["vlen"] = u"unicode"
+            group["empty"] = numpy.zeros((0, 3))
+            group["large"] = numpy.arange(10**5, dtype=numpy.float32)
+            group.create_dataset("chunked", data=numpy.arange(10),
+                                 chunks=(5,), compression="gzip")
+            group.create_dataset("not_allocated", shape=(2,), dtype="i2")
+            dcpl = h5py.h5p.create(h5py.h5p.DATASET_CREATE)
+            dcpl.set_layout(h5py.h5d.COMPACT)
+            h5file.create_dataset("compact", data=numpy.arange(3), dcpl=dcpl)
+            h5file["soft"] = h5py.SoftLink("/group/big_endian")
+            h5file["external"] = h5py.ExternalLink(external, "/data")
+
+        for mode in ("r", "r+"):  # r+: not read by batches
+            with h5py.File(filename, mode) as h5file:
+                expected = {}
+
+                def visitor(name, obj):
+                    if isinstance(obj, h5py.Dataset):
+                        expected[name] = obj[...]
+                h5file.visititems(visitor)
+                expected["soft"] = h5file["soft"][...]
+                expected["external"] = h5file["external"][...]
+
+                for max_workers in (None, 2):
+                    ddict = h5todict(h5file, max_workers=max_workers)
+                    self.assertEqual(set(ddict["group"].keys()),
+                                     set(k[6:] for k in expected
+                                         if k.startswith("group/")))
+                    for name, value in expected.items():
+                        result = ddict
+                        for key in name.split("/"):
+                            result = result[key]
+                        self.assertEqual(type(result), type(value))
+                        self.assertEqual(result.dtype, value.dtype)
+                        numpy.testing.assert_array_equal(result, value)
+
+    def testMaxWorkers(self):
+        expected = h5todict(self.h5_fname)
+        ddict = h5todict(self.h5_fname, max_workers=4)
+        grenoble = ddict["Europe"]["France"]["Grenoble"]
+        self.assertEqual(grenoble["inhabitants"], 160215)
+        numpy.testing.assert_array_equal(
+            grenoble["coordinates"],
+            expected["Europe"]["France"]["Grenoble"]["coordinates"])
+        self.assertEqual(grenoble["area"],
+                         expected["Europe"]["France"]["Grenoble"]["area"])
+
+
 class TestDictToJson(unittest.TestCase):
     def setUp(self):
         self.dir_path = tempfile.mkdtemp()
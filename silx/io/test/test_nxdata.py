@@ -28,8 +28,11 @@ __license__ = "MIT"
 __date__ = "27/01/2018"
 
 
+import gc
+import os
 import tempfile
 import unittest
+import weakref
 
 try:
     import h5py
@@ -38,6 +41,7 @@ except ImportError:
 import numpy
 import six
 
+from .. import commonh5
 from .. import nxdata
 
 
@@ -569,6 +573,97 @@ class TestSaveNXdata(unittest.TestCase):
         h5f.close()
 
 
+@unittest.skipIf(h5py is None, "silx.io.nxdata tests depend on h5py")
+class TestNXdataCache(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.h5fname = os.path.join(self.tempdir, "nxdata_cache.h5")
+        with h5py.File(self.h5fname, "w") as h5f:
+            h5f.attrs["NX_class"] = "NXroot"
+            h5f.attrs["default"] = "entry"
+            entry = h5f.create_group("entry")
+            entry.attrs["NX_class"] = "NXentry"
+            entry.attrs["default"] = "data"
+            data = entry.create_group("data")
+            data.attrs["NX_class"] = "NXdata"
+            data.attrs["signal"] = "count"
+            data.attrs["axes"] = "energy"
+            data.create_dataset("count", data=numpy.arange(10))
+            data.create_dataset("energy", data=numpy.arange(10) * 0.1)
+
+    def tearDown(self):
+        nxdata.parse._nxdata_cache.clear()
+        nxdata.parse._commonh5_nxdata_cache.clear()
+        os.unlink(self.h5fname)
+        os.rmdir(self.tempdir)
+
+    def testCachedDefault(self):
+        with h5py.File(self.h5fname, "r") as h5f:
+            nxd = nxdata.get_default(h5f)
+            self.assertTrue(nxd.is_valid)
+            self.assertTrue(nxd.is_curve)
+            self.assertIs(nxdata.get_default(h5f), nxd)
+            self.assertIs(nxdata.get_default(h5f["entry"]), nxd)
+            self.assertIs(nxdata.get_default(h5f["entry/data"]), nxd)
+            self.assertTrue(nxdata.is_valid_nxdata(h5f["entry/data"]))
+            self.assertFalse(nxdata.is_valid_nxdata(h5f["entry"]))
+
+    def testInvalidatedOnFileChange(self):
+        with h5py.File(self.h5fname, "r") as h5f:
+            nxd = nxdata.get_default(h5f)
+            self.assertEqual(nxd.interpretation, None)
+
+        with h5py.File(self.h5fname, "r+") as h5f:
+            h5f["entry/data"].attrs["interpretation"] = "spectrum"
+
+        with h5py.File(self.h5fname, "r") as h5f:
+            nxd2 = nxdata.get_default(h5f)
+            self.assertIsNot(nxd2, nxd)
+            self.assertEqual(nxd2.interpretation, "spectrum")
+
+    def testNotCachedWhenWritable(self):
+        with h5py.File(self.h5fname, "r+") as h5f:
+            nxd = nxdata.get_default(h5f)
+            self.assertIsNot(nxdata.get_default(h5f), nxd)
+            self.assertEqual(len(nxdata.parse._nxdata_cache), 0)
+
+    def testCommonh5TreeReleased(self):
+        tree = commonh5.File(name="tree", mode="r",
+                             attrs={"NX_class": "NXroot", "default": "entry"})
+        entry = commonh5.Group("entry", attrs={"NX_class": "NXentry",
+                                               "default": "data"})
+        tree.add_node(entry)
+        data = commonh5.Group("data", attrs={"NX_class": "NXdata",
+                                             "signal": "count",
+                                             "axes": "energy"})
+        entry.add_node(data)
+        data.add_node(commonh5.Dataset("count", data=numpy.arange(10)))
+        data.add_node(commonh5.Dataset("energy", data=numpy.arange(10) * 0.1))
+
+        nxd = nxdata.get_default(tree)
+        self.assertTrue(nxd.is_curve)
+        self.assertIs(nxdata.get_default(tree), nxd)
+        self.assertEqual(len(nxdata.parse._nxdata_cache), 0)
+
+        tree_ref = weakref.ref(tree)
+        data_ref = weakref.ref(nxd.group)
+        del tree, entry, data, nxd
+        gc.collect()
+        self.assertIsNone(tree_ref())
+        self.assertIsNone(data_ref())
+        self.assertEqual(len(nxdata.parse._commonh5_nxdata_cache), 0)
+
+    def testMemoizedProperties(self):
+        with h5py.File(self.h5fname, "r") as h5f:
+            nxd = nxdata.NXdata(h5f["entry/data"])
+            names = nxd.axes_dataset_names
+            self.assertEqual(names, ["energy"])
+            names.append("modified")
+            self.assertEqual(nxd.axes_dataset_names, ["energy"])
+            self.assertEqual(nxd.signal_dataset_name, "count")
+            self.assertEqual(nxd.auxiliary_signals_dataset_names, [])
+
+
 def suite():
     test_suite = unittest.TestSuite()
     test_suite.addTest(
@@ -577,6 +672,8 @@ def suite():
         unittest.defaultTestLoader.loadTestsFromTestCase(TestLegacyNXdata))
     test_suite.addTest(
         unittest.defaultTestLoader.loadTestsFromTestCase(TestSaveNXdata))
+    test_suite.addTest(
+        unittest.defaultTestLoader.loadTestsFromTestCase(TestNXdataCache))
     return test_suite
 
 
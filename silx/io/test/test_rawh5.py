@@ -85,10 +85,62 @@ class TestNumpyFile(unittest.TestCase):
         self.assertIn("a/b/e", h5)
 
 
+class TestLazyNumpyFile(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpDirectory = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmpDirectory)
+
+    def testMemoryMappedNumpyFile(self):
+        filename = "%s/%s.npy" % (self.tmpDirectory, self.id())
+        c = numpy.arange(100 * 100, dtype=numpy.float32).reshape(100, 100)
+        numpy.save(filename, c)
+        h5 = rawh5.NumpyFile(filename)
+        self.assertIsInstance(h5["data"][()], numpy.memmap)
+        numpy.testing.assert_array_equal(h5["data"][10:20, 5], c[10:20, 5])
+
+    def _testNumpyZFile(self, compressed):
+        filename = "%s/%s.npz" % (self.tmpDirectory, self.id())
+        data = {
+            "scalar": numpy.array(5.),
+            "c_order": numpy.arange(20).reshape(4, 5),
+            "f_order": numpy.asfortranarray(numpy.arange(20.).reshape(4, 5)),
+            "empty": numpy.array([], dtype=numpy.uint8),
+            "text": numpy.array(u"i \u2661 my mother"),
+        }
+        if compressed:
+            numpy.savez_compressed(filename, **data)
+        else:
+            numpy.savez(filename, **data)
+
+        h5 = rawh5.NumpyFile(filename)
+        for key, expected in data.items():
+            dataset = h5[key]
+            # Shape and dtype are known without reading the data
+            self.assertEqual(dataset.shape, expected.shape)
+            self.assertEqual(dataset.dtype, expected.dtype)
+            self.assertFalse(dataset._is_initialized)
+            numpy.testing.assert_array_equal(dataset[()], expected)
+        if not compressed:
+            self.assertIsInstance(h5["c_order"][()], numpy.memmap)
+            self.assertTrue(h5["f_order"][()].flags.f_contiguous)
+
+    def testStoredNumpyZFile(self):
+        self._testNumpyZFile(compressed=False)
+
+    def testCompressedNumpyZFile(self):
+        self._testNumpyZFile(compressed=True)
+
+
 def suite():
     test_suite = unittest.TestSuite()
     loadTests = unittest.defaultTestLoader.loadTestsFromTestCase
     test_suite.addTest(loadTests(TestNumpyFile))
+    test_suite.addTest(loadTests(TestLazyNumpyFile))
     return test_suite
 
 
@@ -569,6 +569,21 @@ class TestSpecH5(unittest.TestCase):
         with self.assertRaises(KeyError):
             self.sfh5["/1001.1/sample/unit_cell"]
 
+    def testLazyScans(self):
+        """Scans are only parsed when their content is accessed"""
+        sfh5 = SpecH5(self.fname)
+        self.assertEqual(list(sfh5.keys()), list(self.sfh5.keys()))
+        scan_group = sfh5["1.2"]
+        self.assertIsNone(scan_group._scan)
+
+        column = scan_group["measurement/duo"]
+        self.assertIsNotNone(scan_group._scan)
+        self.assertIsNone(sfh5["1.1"]._scan)
+        self.assertFalse(column._is_initialized)
+        self.assertAlmostEqual(sum(column), 12.0)
+        self.assertTrue(column._is_initialized)
+        sfh5.close()
+
     @testutils.test_logging(spech5.logger1.name, warning=2)
     def testOpenFileDescriptor(self):
         """Open a SpecH5 file from a file descriptor"""
@@ -249,6 +249,49 @@ class TestH5Ls(unittest.TestCase):
 
         os.unlink(self.h5_fname)
 
+    def testTreeSummary(self):
+        tempdir = tempfile.mkdtemp()
+        h5_fname = os.path.join(tempdir, "summary.h5")
+        with h5py.File(h5_fname, "w") as h5f:
+            h5f.create_dataset("/foo/bar/tmp", data=numpy.zeros((10, 4)),
+                               chunks=(5, 2), compression="gzip")
+            h5f["/foo/data"] = [3.14]
+            h5f["/foo/link"] = h5py.SoftLink("/foo/bar")
+            h5f["/foo/broken"] = h5py.SoftLink("/not/existing")
+            h5f["/foo/bar/loop"] = h5f["/foo"]
+
+        try:
+            nodes = list(utils.iter_tree_summary(h5_fname))
+            summary = dict((node.name, node) for node in nodes)
+            self.assertEqual([node.name for node in nodes],
+                             ["foo", "foo/bar", "foo/bar/loop", "foo/bar/tmp",
+                              "foo/broken", "foo/data",
+                              "foo/link", "foo/link/loop", "foo/link/tmp"])
+
+            node = summary["foo/bar/tmp"]
+            self.assertEqual(node.depth, 3)
+            self.assertEqual(node.link_type, utils.H5Type.HARD_LINK)
+            self.assertEqual(node.h5_class, utils.H5Type.DATASET)
+            self.assertEqual(node.shape, (10, 4))
+            self.assertEqual(node.dtype, numpy.float64)
+            self.assertEqual(node.chunks, (5, 2))
+            self.assertEqual(node.compression, "gzip")
+
+            node = summary["foo/data"]
+            self.assertIsNone(node.chunks)
+            self.assertIsNone(node.compression)
+
+            self.assertEqual(summary["foo/link"].link_type, utils.H5Type.SOFT_LINK)
+            self.assertEqual(summary["foo/link"].h5_class, utils.H5Type.GROUP)
+            self.assertIsNone(summary["foo/broken"].h5_class)
+
+            nodes = list(utils.iter_tree_summary(h5_fname, max_depth=2))
+            self.assertEqual(max(node.depth for node in nodes), 2)
+            self.assertEqual(len(nodes), 5)
+        finally:
+            os.unlink(h5_fname)
+            os.rmdir(tempdir)
+
     # Following test case disabled d/t errors on AppVeyor:
     #     os.unlink(spec_fname)
     # PermissionError: [WinError 32] The process cannot access the file because
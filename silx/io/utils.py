@@ -380,6 +380,195 @@ def savespec(specfile, x, y, xlabel="X", ylabel="Y", fmt="%.7g",
     return f
 
 
+H5NodeSummary = collections.namedtuple(
+    "H5NodeSummary",
+    ["name", "depth", "link_type", "h5_class",
+     "shape", "dtype", "chunks", "compression"])
+"""Description of a node of a HDF5 tree, yielded by :func:`iter_tree_summary`.
+
+- ``name``: Path of the node relative to the walked group
+- ``depth``: 1 for the children of the walked group, 2 for their children...
+- ``link_type``: :class:`H5Type` of the link (``HARD_LINK``, ``SOFT_LINK``
+  or ``EXTERNAL_LINK``), or None if unknown
+- ``h5_class``: :class:`H5Type` of the object (``GROUP`` or ``DATASET``),
+  or None for a broken link
+- ``shape``, ``dtype``, ``chunks``, ``compression``: Description of a
+  dataset, None for groups
+"""
+
+
+_FILTER_NAMES = {}
+"""Mapping from HDF5 filter ids to the compression names used by h5py"""
+
+if h5py is not None:
+    _FILTER_NAMES = {
+        h5py.h5z.FILTER_DEFLATE: "gzip",
+        h5py.h5z.FILTER_SZIP: "szip",
+        h5py.h5z.FILTER_LZF: "lzf",
+    }
+
+    _NOT_COMPRESSION_FILTERS = (
+        h5py.h5z.FILTER_SHUFFLE,
+        h5py.h5z.FILTER_FLETCHER32,
+        h5py.h5z.FILTER_SCALEOFFSET,
+    )
+
+
+def _get_h5py_dataset_layout(dataset_id):
+    """Returns the chunks and the compression of a low-level h5py dataset.
+
+    :param h5py.h5d.DatasetID dataset_id:
+    :rtype: Tuple[Union[Tuple[int],None],Union[str,None]]
+    """
+    dcpl = dataset_id.get_create_plist()
+    if dcpl.get_layout() != h5py.h5d.CHUNKED:
+        return None, None
+    chunks = dcpl.get_chunk()
+    compression = None
+    for index in range(dcpl.get_nfilters()):
+        filter_id, _flags, _values, name = dcpl.get_filter(index)
+        if filter_id in _NOT_COMPRESSION_FILTERS:
+            continue
+        compression = _FILTER_NAMES.get(filter_id)
+        if compression is None:
+            compression = name.decode("ascii", "replace") or str(filter_id)
+        break
+    return chunks, compression
+
+
+def _iter_h5py_links(group_id):
+    """Returns the names and link types of the members of a low-level h5py
+    group, read in a single iteration."""
+    links = []
+
+    def visitor(name, info):
+        links.append((name, info.type))
+
+    group_id.links.iterate(visitor, info=True)
+    return iter(links)
+
+
+def _iter_h5py_tree_summary(group, max_depth):
+    """Implementation of :func:`iter_tree_summary` with the h5py low-level
+    API."""
+    link_types = {
+        h5py.h5l.TYPE_HARD: H5Type.HARD_LINK,
+        h5py.h5l.TYPE_SOFT: H5Type.SOFT_LINK,
+        h5py.h5l.TYPE_EXTERNAL: H5Type.EXTERNAL_LINK,
+    }
+
+    root_addr = h5py.h5o.get_info(group.id).addr
+    # Stack of (links iterator, group id, path prefix, ancestors addresses)
+    stack = [(_iter_h5py_links(group.id), group.id, "", (root_addr,))]
+    while stack:
+        links, group_id, prefix, ancestors = stack[-1]
+        link = next(links, None)
+        if link is None:
+            stack.pop()
+            continue
+
+        bname, link_type = link
+        name = prefix + bname.decode("utf-8")
+        depth = len(stack)
+        link_type = link_types.get(link_type)
+        try:
+            obj_id = h5py.h5o.open(group_id, bname)
+        except Exception:
+            # Broken link
+            yield H5NodeSummary(name, depth, link_type, None,
+                                None, None, None, None)
+            continue
+
+        if isinstance(obj_id, h5py.h5d.DatasetID):
+            chunks, compression = _get_h5py_dataset_layout(obj_id)
+            yield H5NodeSummary(name, depth, link_type, H5Type.DATASET,
+                                obj_id.shape, obj_id.dtype,
+                                chunks, compression)
+        elif isinstance(obj_id, h5py.h5g.GroupID):
+            yield H5NodeSummary(name, depth, link_type, H5Type.GROUP,
+                                None, None, None, None)
+            addr = h5py.h5o.get_info(obj_id).addr
+            if (max_depth is None or depth < max_depth) and addr not in ancestors:
+                stack.append((_iter_h5py_links(obj_id), obj_id,
+                              name + "/", ancestors + (addr,)))
+        else:
+            yield H5NodeSummary(name, depth, link_type, None,
+                                None, None, None, None)
+
+
+def _iter_generic_tree_summary(group, max_depth):
+    """Implementation of :func:`iter_tree_summary` for any h5py-like
+    group."""
+    stack = [(iter(list(group.keys())), group, "")]
+    while stack:
+        names, parent, prefix = stack[-1]
+        basename = next(names, None)
+        if basename is None:
+            stack.pop()
+            continue
+
+        name = prefix + basename
+        depth = len(stack)
+        try:
+            link_class = parent.get(basename, getclass=True, getlink=True)
+            link_type = get_h5_class(class_=link_class)
+        except Exception:
+            link_type = None
+        obj = parent.get(basename)
+        h5_class = None if obj is None else get_h5_class(obj)
+
+        if h5_class == H5Type.DATASET:
+            yield H5NodeSummary(name, depth, link_type, h5_class,
+                                obj.shape, obj.dtype,
+                                getattr(obj, "chunks", None),
+                                getattr(obj, "compression", None))
+        else:
+            yield H5NodeSummary(name, depth, link_type, h5_class,
+                                None, None, None, None)
+            if h5_class == H5Type.GROUP and (max_depth is None or depth < max_depth):
+                stack.append((iter(list(obj.keys())), obj, name + "/"))
+
+
+def iter_tree_summary(h5group, max_depth=None):
+    """Walk a HDF5 tree and yield a description of each of its nodes.
+
+    The tree is walked depth-first, and each group is listed before its
+    members. For :mod:`h5py` groups, the tree is walked a single time with
+    the low-level API, without creating any high-level h5py object.
+    Members of a group which is one of its own ancestors are not listed
+    again.
+
+    Example::
+
+        >>> for node in iter_tree_summary("sample.h5", max_depth=2):
+        ...     print(node.name, node.shape, node.compression)
+
+    :param h5group: Any :class:`h5py.Group` or h5py-like group,
+        or a HDF5 file name
+    :param Union[int,None] max_depth: Maximum depth of the yielded nodes,
+        1 to list only the children of the group. Default: no limit
+    :rtype: Iterator[H5NodeSummary]
+    """
+    if max_depth is not None and max_depth < 1:
+        return
+
+    if isinstance(h5group, string_types):
+        with open(h5group) as h5f:  # silx.io.open
+            for node in iter_tree_summary(h5f, max_depth):
+                yield node
+        return
+
+    if not is_group(h5group):
+        raise TypeError("h5group must be a hdf5-like group object or a file name.")
+
+    if h5py is not None and isinstance(h5group, h5py.Group):
+        iterator = _iter_h5py_tree_summary(h5group, max_depth)
+    else:
+        iterator = _iter_generic_tree_summary(h5group, max_depth)
+    for node in iterator:
+        yield node
+
+
 def h5ls(h5group, lvl=0):
     """Return a simple string representation of a HDF5 tree structure.
 
@@ -419,6 +608,21 @@ def h5ls(h5group, lvl=0):
     else:
         raise TypeError("h5group must be a hdf5-like group object or a file name.")
 
+    if isinstance(h5f, h5py.Group):
+        # Single walk with the low-level API
+        lines = []
+        for node in iter_tree_summary(h5f):
+            indent = '\t' * (lvl + node.depth - 1)
+            basename = node.name.rsplit("/", 1)[-1]
+            if node.h5_class == H5Type.GROUP:
+                lines.append(indent + '+' + basename + '\n')
+            elif node.h5_class == H5Type.DATASET:
+                lines.append(indent + '<HDF5 dataset "%s": shape %s, type "%s">\n' %
+                             (basename, node.shape, node.dtype.str))
+        if isinstance(h5group, string_types):
+            h5f.close()
+        return ''.join(lines)
+
     for key in h5f.keys():
         # group
         if hasattr(h5f[key], 'keys'):
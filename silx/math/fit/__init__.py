@@ -27,13 +27,13 @@ __license__ = "MIT"
 __date__ = "22/06/2016"
 
 
-from .leastsq import leastsq, chisq_alpha_beta
+from .leastsq import leastsq, leastsq_batch, chisq_alpha_beta
 from .leastsq import \
     CFREE, CPOSITIVE, CQUOTED, CFIXED, \
     CFACTOR, CDELTA, CSUM
 
 from .functions import *
 from .filters import *
-from .peaks import peak_search, guess_fwhm
+from .peaks import peak_search, peak_search_along_axis, guess_fwhm
 from .fitmanager import FitManager
 from .fittheory import FitTheory
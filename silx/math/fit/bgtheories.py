@@ -163,7 +163,7 @@ def strip_bg(x, y0, width, niter):
     # same parameters
     if not parameters_changed:
         # same data
-        if numpy.sum(_BG_STRIP_OLDY == y0) == len(y0):
+        if numpy.array_equal(_BG_STRIP_OLDY, y0):
             # same result
             return _BG_STRIP_OLDBG
 
@@ -209,7 +209,7 @@ def snip_bg(x, y0, width):
     # same parameters
     if not parameters_changed:
         # same data
-        if numpy.sum(_BG_SNIP_OLDY == y0) == len(y0):
+        if numpy.array_equal(_BG_SNIP_OLDY, y0):
             # same result
             return _BG_SNIP_OLDBG
 
@@ -349,6 +349,26 @@ def estimate_quintic_poly(x, y):
     return estimate_poly(x, y, deg=5)
 
 
+def _no_bg(x, y0):
+    """Null background"""
+    return numpy.zeros_like(x)
+
+
+def _constant_bg(x, y0, c):
+    """Constant background"""
+    return c * numpy.ones_like(x)
+
+
+def _estimate_constant_bg(x, y):
+    """Estimate the constant background as the minimum of the data"""
+    return [min(y)], [[0, 0, 0]]
+
+
+def _linear_bg(x, y0, a, b):
+    """Linear background"""
+    return a + b * x
+
+
 def configure(**kw):
     """Update the CONFIG dict
     """
@@ -364,21 +384,21 @@ THEORY = OrderedDict(
         (('No Background',
           FitTheory(
                 description="No background function",
-                function=lambda x, y0: numpy.zeros_like(x),
+                function=_no_bg,
                 parameters=[],
                 is_background=True)),
          ('Constant',
           FitTheory(
                 description='Constant background',
-                function=lambda x, y0, c: c * numpy.ones_like(x),
+                function=_constant_bg,
                 parameters=['Constant', ],
-                estimate=lambda x, y: ([min(y)], [[0, 0, 0]]),
+                estimate=_estimate_constant_bg,
                 is_background=True)),
          ('Linear',
           FitTheory(
                 description="Linear background, parameters 'Constant' and"
                             " 'Slope'",
-                function=lambda x, y0, a, b: a + b * x,
+                function=_linear_bg,
                 parameters=['Constant', 'Slope'],
                 estimate=estimate_linear,
                 configure=configure,
@@ -40,6 +40,13 @@ Smoothing functions:
     - :func:`smooth2d`
     - :func:`smooth3d`
 
+Functions processing many independent spectra in parallel:
+-----------------------------------------------------------
+
+    - :func:`strip_along_axis`
+    - :func:`snip1d_along_axis`
+    - :func:`smooth1d_along_axis`
+
 References:
 -----------
 
@@ -68,6 +75,8 @@ import numpy
 _logger = logging.getLogger(__name__)
 
 cimport cython
+from cython.parallel import prange, parallel
+from libc.stdlib cimport malloc, free
 cimport silx.math.fit.filters_wrapper as filters_wrapper
 
 
@@ -96,7 +105,7 @@ def strip(data, w=1, niterations=1000, factor=1.0, anchors=None):
     """
     cdef:
         double[::1] input_c
-        double[::1] output
+        double[::1] workspace
         long[::1] anchors_c
 
     if not isinstance(data, numpy.ndarray):
@@ -112,8 +121,8 @@ def strip(data, w=1, niterations=1000, factor=1.0, anchors=None):
                           dtype=numpy.float64,
                           order='C').reshape(-1)
 
-    output = numpy.empty(shape=(input_c.size,),
-                         dtype=numpy.float64)
+    workspace = numpy.empty(shape=(2 * input_c.size,),
+                            dtype=numpy.float64)
 
     if anchors is not None and len(anchors):
         # numpy.int_ is the same as C long (http://docs.scipy.org/doc/numpy/user/basics.types.html)
@@ -129,12 +138,11 @@ def strip(data, w=1, niterations=1000, factor=1.0, anchors=None):
                                 dtype=numpy.int_)
         len_anchors = 0
 
+    filters_wrapper.strip_inplace(&input_c[0], input_c.size,
+                                  factor, niterations, w,
+                                  &anchors_c[0], len_anchors, &workspace[0])
 
-    status = filters_wrapper.strip(&input_c[0], input_c.size,
-                                    factor, niterations, w,
-                                    &anchors_c[0], len_anchors, &output[0])
-
-    return numpy.asarray(output).reshape(data_shape)
+    return numpy.asarray(input_c).reshape(data_shape)
 
 
 def snip1d(data, snip_width):
@@ -414,3 +422,175 @@ def smooth3d(data):
     filters_wrapper.smooth3d(&data_c[0], nx, ny, nz)
 
     return numpy.asarray(data_c).reshape(data_shape)
+
+
+def _spectra_along_axis(data, axis, out):
+    """Copy a stack of spectra into an array of shape
+    ``(number of spectra, spectrum length)`` to be processed in place by the
+    ``*_along_axis`` functions.
+
+    :param data: N-dimensional array of spectra
+    :param int axis: Axis of the spectra in *data*
+    :param out: None or preallocated float64 array with the shape of *data*
+    :return: Tuple ``(spectra, out)``. *spectra* is a view on *out* when
+        possible, else a temporary array which must be copied to *out* with
+        :func:`_copy_spectra`.
+    """
+    data = numpy.asarray(data)
+    if data.ndim == 0:
+        raise TypeError("data must be at least 1-dimensional")
+    if out is None:
+        out = numpy.empty(data.shape, dtype=numpy.float64)
+    elif (not isinstance(out, numpy.ndarray) or out.shape != data.shape or
+            out.dtype != numpy.float64):
+        raise ValueError("out must be a float64 array with the shape of data")
+
+    moved_out = numpy.rollaxis(out, axis, out.ndim)
+    if moved_out.flags.c_contiguous:
+        spectra = moved_out.reshape(-1, data.shape[axis])
+    else:
+        spectra = numpy.empty((out.size // data.shape[axis], data.shape[axis]),
+                              dtype=numpy.float64)
+    spectra.reshape(moved_out.shape)[...] = numpy.rollaxis(data, axis, data.ndim)
+    return spectra, out
+
+
+def _copy_spectra(spectra, out, axis):
+    """Copy the processed spectra to *out* if they are not a view on it."""
+    moved_out = numpy.rollaxis(out, axis, out.ndim)
+    if not moved_out.flags.c_contiguous:
+        moved_out[...] = spectra.reshape(moved_out.shape)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def strip_along_axis(data, w=1, niterations=1000, factor=1.0, anchors=None,
+                     axis=-1, out=None):
+    """Apply :func:`strip` to all the spectra of a N-dimensional array.
+
+    The spectra are processed in parallel with OpenMP.
+
+    :param data: N-dimensional array of spectra
+    :type data: numpy.ndarray
+    :param w: Strip width
+    :param niterations: number of iterations
+    :param factor: scaling factor applied to the average of ``y(i-w)`` and
+        ``y(i+w)`` before comparing to ``y(i)``
+    :param anchors: Array of anchors, indices of points that will not be
+          modified during the stripping procedure. The same anchors are
+          used for all the spectra.
+    :param int axis: Axis of the spectra in *data*. Default: last axis
+    :param out: Optional preallocated float64 array with the shape of
+        *data*, to store the result. It can be *data* itself to strip
+        the spectra in place.
+    :return: Backgrounds of the spectra, with the shape of *data*
+    :rtype: numpy.ndarray
+    """
+    cdef:
+        double[:, ::1] spectra_c
+        long[::1] anchors_c
+        long len_anchors, n_channels, i
+        long niterations_c = niterations
+        int w_c = w
+        double factor_c = factor
+        double* workspace
+        int failed = 0
+
+    spectra, out = _spectra_along_axis(data, axis, out)
+    spectra_c = spectra
+    n_channels = spectra.shape[1]
+
+    if anchors is not None and len(anchors):
+        anchors_c = numpy.array(anchors,
+                                copy=False,
+                                dtype=numpy.int_,
+                                order='C')
+        len_anchors = anchors_c.size
+    else:
+        anchors_c = numpy.empty(shape=(1,),
+                                dtype=numpy.int_)
+        len_anchors = 0
+
+    with nogil, parallel():
+        # One workspace per thread, reused for all its spectra
+        workspace = <double*> malloc(2 * n_channels * sizeof(double))
+        for i in prange(spectra_c.shape[0]):
+            if workspace == NULL:
+                failed += 1
+            else:
+                filters_wrapper.strip_inplace(&spectra_c[i, 0], n_channels,
+                                              factor_c, niterations_c, w_c,
+                                              &anchors_c[0], len_anchors,
+                                              workspace)
+        free(workspace)
+
+    if failed:
+        raise MemoryError("Failed to allocate memory for strip")
+
+    _copy_spectra(spectra, out, axis)
+    return out
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def snip1d_along_axis(data, snip_width, axis=-1, out=None):
+    """Apply :func:`snip1d` to all the spectra of a N-dimensional array.
+
+    Unlike :func:`snip2d` and :func:`snip3d`, the spectra are processed
+    as independent 1D signals. They are processed in parallel with OpenMP.
+
+    :param data: N-dimensional array of spectra
+    :type data: numpy.ndarray
+    :param int snip_width: Width of the snip operator, in number of samples.
+    :param int axis: Axis of the spectra in *data*. Default: last axis
+    :param out: Optional preallocated float64 array with the shape of
+        *data*, to store the result
+    :return: Baselines of the spectra, with the shape of *data*
+    :rtype: numpy.ndarray
+    """
+    cdef:
+        double[:, ::1] spectra_c
+        int n_channels, width = snip_width
+        long i
+
+    spectra, out = _spectra_along_axis(data, axis, out)
+    spectra_c = spectra
+    n_channels = spectra.shape[1]
+
+    for i in prange(spectra_c.shape[0], nogil=True):
+        filters_wrapper.snip1d(&spectra_c[i, 0], n_channels, width)
+
+    _copy_spectra(spectra, out, axis)
+    return out
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def smooth1d_along_axis(data, axis=-1, out=None):
+    """Apply :func:`smooth1d` to all the spectra of a N-dimensional array.
+
+    Unlike :func:`smooth2d` and :func:`smooth3d`, the spectra are smoothed
+    only along *axis*. They are processed in parallel with OpenMP.
+
+    :param data: N-dimensional array of spectra
+    :type data: numpy.ndarray
+    :param int axis: Axis of the spectra in *data*. Default: last axis
+    :param out: Optional preallocated float64 array with the shape of
+        *data*, to store the result
+    :return: Smoothed spectra, with the shape of *data*
+    :rtype: numpy.ndarray(dtype=numpy.float64)
+    """
+    cdef:
+        double[:, ::1] spectra_c
+        int n_channels
+        long i
+
+    spectra, out = _spectra_along_axis(data, axis, out)
+    spectra_c = spectra
+    n_channels = spectra.shape[1]
+
+    for i in prange(spectra_c.shape[0], nogil=True):
+        filters_wrapper.smooth1d(&spectra_c[i, 0], n_channels)
+
+    _copy_spectra(spectra, out, axis)
+    return out
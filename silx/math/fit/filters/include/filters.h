@@ -32,6 +32,9 @@ void snip3d(double *data, int nx, int ny, int nz, int width);
 
 int strip(double* input, long len_input, double c, long niter, int deltai,
           long* anchors, long len_anchors, double* output);
+long strip_inplace(double* data, long len_data, double c, long niter,
+                   int deltai, long* anchors, long len_anchors,
+                   double* workspace);
 
 /* Smoothing functions */
 
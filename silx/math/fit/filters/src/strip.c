@@ -116,3 +116,115 @@ int strip(double* input, long len_input,
     }
     return(0);
 }
+
+
+/*  strip_inplace(double* data, long len_data, double c, long niter,
+                  int deltai, long* anchors, long len_anchors,
+                  double* workspace)
+
+    Same algorithm as strip, but the background replaces the data and no
+    memory is allocated, so that a workspace can be reused for many spectra.
+
+    Instead of copying the whole spectrum at each iteration, the data and
+    the workspace are used alternately as input and output of the
+    iterations. The iterations stop as soon as one of them does not modify
+    the spectrum, as the following ones would not modify it either.
+
+    Parameters:
+
+        - data: Input data array, replaced by the background
+        - len_data: Number of samples in data
+        - c: scaling factor applied to the average of y(i-w) and y(i+w) before
+          comparing to y(i)
+        - niter: number of iterations
+        - deltai: operator width (in number of channels)
+        - anchors: Array of anchors, indices of points that will not be
+          modified during the stripping procedure.
+        - len_anchors: Number of anchors
+        - workspace: Array of at least len_data doubles, or
+          (2 * len_data) doubles if there are anchors
+
+    Return the number of iterations actually performed, or -1 if the data
+    is too short for the operator width.
+*/
+long strip_inplace(double* data, long len_data,
+                   double c, long niter, int deltai,
+                   long* anchors, long len_anchors,
+                   double* workspace)
+{
+    long iter_index, array_index, anchor_index, anchor;
+    long first, last;
+    int modified;
+    double t_mean;
+    double *input, *output, *tmp, *skip;
+
+    if (deltai <=0) deltai = 1;
+
+    if (len_data < (2*deltai+1)) return(-1);
+
+    /* samples closer than deltai to the edges are never modified */
+    memcpy(workspace, data, deltai * sizeof(double));
+    memcpy(workspace + len_data - deltai, data + len_data - deltai,
+           deltai * sizeof(double));
+
+    input = data;
+    output = workspace;
+    iter_index = 0;
+
+    if (len_anchors > 0) {
+        /* flag the indices within +- deltai of an anchor once for all */
+        skip = workspace + len_data;
+        memset(skip, 0, len_data * sizeof(double));
+        for (anchor_index = 0; anchor_index < len_anchors; anchor_index++) {
+            anchor = anchors[anchor_index];
+            first = anchor - deltai + 1;
+            last = anchor + deltai - 1;
+            if (first < 0) first = 0;
+            if (last > len_data - 1) last = len_data - 1;
+            for (array_index = first; array_index <= last; array_index++) {
+                skip[array_index] = 1.;
+            }
+        }
+
+        while (iter_index < niter) {
+            iter_index++;
+            modified = 0;
+            for (array_index = deltai; array_index < len_data - deltai; array_index++) {
+                t_mean = 0.5 * (input[array_index-deltai] + input[array_index+deltai]);
+                if (skip[array_index] == 0. && input[array_index] > (t_mean * c)) {
+                    output[array_index] = t_mean;
+                    modified = 1;
+                }
+                else {
+                    output[array_index] = input[array_index];
+                }
+            }
+            tmp = input; input = output; output = tmp;
+            if (!modified) break;
+        }
+    }
+    else {
+        while (iter_index < niter) {
+            iter_index++;
+            modified = 0;
+            for (array_index = deltai; array_index < len_data - deltai; array_index++) {
+                t_mean = 0.5 * (input[array_index-deltai] + input[array_index+deltai]);
+                if (input[array_index] > (t_mean * c)) {
+                    output[array_index] = t_mean;
+                    modified = 1;
+                }
+                else {
+                    output[array_index] = input[array_index];
+                }
+            }
+            tmp = input; input = output; output = tmp;
+            if (!modified) break;
+        }
+    }
+
+    /* the result of the last iteration is in input */
+    if (input != data) {
+        memcpy(data, input, len_data * sizeof(double));
+    }
+    return(iter_index);
+}
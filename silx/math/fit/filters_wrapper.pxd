@@ -28,7 +28,7 @@ __date__ = "22/06/2016"
 
 cimport cython
 
-cdef extern from "filters.h":
+cdef extern from "filters.h" nogil:
     void snip1d(double *data,
                 int size,
                 int width)
@@ -53,6 +53,15 @@ cdef extern from "filters.h":
               long len_anchors,
               double* output)
 
+    long strip_inplace(double* data,
+                       long len_data,
+                       double c,
+                       long niter,
+                       int deltai,
+                       long* anchors,
+                       long len_anchors,
+                       double* workspace)
+
     int SavitskyGolay(double* input,
                       long len_input,
                       int npoints,
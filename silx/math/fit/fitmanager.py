@@ -40,7 +40,10 @@ This module deals with:
     - providing different background models
 
 """
-from collections import OrderedDict
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+import copy
+import functools
 import logging
 import numpy
 from numpy.linalg.linalg import LinAlgError
@@ -49,7 +52,10 @@ import sys
 
 from .filters import strip, smooth1d
 from .leastsq import leastsq
+from .leastsq import _get_parameters, _parse_constraints, \
+    CFACTOR, CDELTA, CSUM, CIGNORED
 from .fittheory import FitTheory
+from .fittheories import derivative_from_jacobian
 from . import bgtheories
 
 
@@ -128,6 +134,9 @@ class FitManager(object):
               signature is described in the documentation of
               :func:`silx.math.fit.leastsq.leastsq`
               (``model_deriv(xdata, parameters, index)``).
+            - *"jacobian"* (optional) is a function computing the derivatives
+              of the fit function for all its parameters at once. It is used
+              rather than *"derivative"* when provided.
             - *"description"* is a description string
         """
 
@@ -148,6 +157,17 @@ class FitManager(object):
         """Name of currently selected background theory. This name must be
         an existing key in :attr:`bgtheories`."""
 
+        self._data_version = 0
+        """Incremented when the data or the configuration change, to
+        invalidate :attr:`_bg_cache`"""
+
+        self._bg_cache = None
+        """Last background computed by :meth:`fitfunction`, as a tuple
+        ``(key, x, y, background)``. Background functions such as strip
+        and snip are costly and their parameters are usually fixed, so
+        the background is reused as long as the key and the data stay
+        the same during the fit iterations."""
+
         self.fit_results = []
         """This list stores detailed information about all fit parameters.
         It is initialized in :meth:`estimate` and completed with final fit
@@ -224,7 +244,7 @@ class FitManager(object):
     def addtheory(self, name, theory=None,
                   function=None, parameters=None,
                   estimate=None, configure=None, derivative=None,
-                  description=None, pymca_legacy=False):
+                  description=None, pymca_legacy=False, jacobian=None):
         """Add a new theory to dictionary :attr:`theories`.
 
         You can pass a name and a :class:`FitTheory` object as arguments, or
@@ -256,6 +276,8 @@ class FitManager(object):
             :attr:`silx.math.fit.fittheory.FitTheory.config_widget`
         :param bool pymca_legacy: See documentation for
             :attr:`silx.math.fit.fittheory.FitTheory.pymca_legacy`
+        :param callable jacobian: See documentation for
+            :attr:`silx.math.fit.fittheory.FitTheory.jacobian`
         """
         if theory is not None:
             self.theories[name] = theory
@@ -268,7 +290,8 @@ class FitManager(object):
                 estimate=estimate,
                 configure=configure,
                 derivative=derivative,
-                pymca_legacy=pymca_legacy
+                pymca_legacy=pymca_legacy,
+                jacobian=jacobian
             )
 
         else:
@@ -342,6 +365,9 @@ class FitManager(object):
             if key in kw:
                 self.fitconfig[key] = kw[key]
 
+        # the background functions may depend on the configuration
+        self._invalidate_bg_cache()
+
         # initialize dict with existing config dict
         result = {}
         result.update(self.fitconfig)
@@ -715,6 +741,8 @@ class FitManager(object):
         :param xmin: Lower value of x values to use for fitting
         :param xmax: Upper value of x values to use for fitting
         """
+        self._invalidate_bg_cache()
+
         if y is None:
             self.xdata0 = numpy.array([], numpy.float)
             self.ydata0 = numpy.array([], numpy.float)
@@ -824,6 +852,16 @@ class FitManager(object):
 
         ywork = self.ydata
 
+        theory = self.theories[self.selectedtheory]
+        model_deriv = theory.derivative
+        if theory.jacobian is not None:
+            constraints = _parse_constraints(param_constraints,
+                                             len(param_val))[0]
+            # ignored parameters are removed from the fit function arguments
+            if not any(cons[0] == CIGNORED for cons in constraints):
+                model_deriv = functools.partial(
+                    self._fitderivative, constraints,
+                    derivative_from_jacobian(theory.jacobian))
 
         try:
             params, covariance_matrix, infodict = leastsq(
@@ -831,11 +869,12 @@ class FitManager(object):
                     self.xdata, ywork, param_val,
                     sigma=self.sigmay,
                     constraints=param_constraints,
-                    model_deriv=self.theories[self.selectedtheory].derivative,
+                    model_deriv=model_deriv,
                     full_output=True, left_derivative=True)
         except LinAlgError:
             self.state = 'Fit failed'
-            callback(data={'status': self.state})
+            if callback is not None:
+                callback(data={'status': self.state})
             raise
 
         sigmas = infodict['uncertainties']
@@ -855,6 +894,96 @@ class FitManager(object):
 
         return params, sigmas, infodict
 
+    def fit_batch(self, curves, xmin=None, xmax=None, nparameters=None,
+                  max_workers=None, chunk_size=16):
+        """Estimate and fit a series of curves with the current theory,
+        background and configuration.
+
+        This is a generator yielding the results by chunks of curves, in the
+        order of *curves*, as soon as they are available. Each chunk is a
+        structured array with one record per curve and the following fields:
+
+            - ``'index'``: index of the curve in *curves*
+            - ``'status'``: ``'Ready'`` if the fit succeeded, else
+              ``'Estimate failed'`` or ``'Fit failed'``
+            - ``'chisq'``: reduced chi-square
+            - ``'niter'``: number of iterations
+            - ``'nparameters'``: number of fit parameters, background
+              parameters included
+            - ``'parameters'``: fitted parameters, as returned by
+              :meth:`runfit`
+            - ``'sigmas'``: uncertainties on the fitted parameters
+
+        The number of parameters may differ from one curve to another
+        (e.g. the number of peaks found by the estimation).
+        ``'parameters'`` and ``'sigmas'`` are padded with NaN to
+        *nparameters* values, or to the largest number of parameters of the
+        chunk if *nparameters* is None.
+
+        A failure on a curve is logged and reported by its ``'status'``
+        without stopping the processing of the other curves.
+
+        The data of this :class:`FitManager` (:attr:`xdata`,
+        :attr:`ydata`, :attr:`fit_results`…) is not modified.
+
+        :param curves: Iterable of curves. Each curve is either an array of
+            ``y`` values or a tuple ``(x, y)`` or ``(x, y, sigmay)``,
+            as for :meth:`setdata`.
+        :param xmin: Lower value of x values to use for fitting
+        :param xmax: Upper value of x values to use for fitting
+        :param int nparameters: Size of the ``'parameters'`` and
+            ``'sigmas'`` fields, so that all the chunks have the same dtype.
+            The parameters of curves with more parameters are truncated.
+        :param int max_workers: If greater than 1, the chunks of curves are
+            fitted in parallel in this number of processes.
+            The theories and background functions must then be picklable.
+        :param int chunk_size: Number of curves in each chunk of results
+        :return: Generator of structured arrays
+        """
+        chunk_size = max(1, int(chunk_size))
+
+        # copy of this fit manager without data, shared by all the chunks
+        manager = copy.copy(self)
+        manager.setdata(x=None, y=None)
+        manager.fit_results = []
+
+        def chunks():
+            chunk = []
+            start = 0
+            for index, curve in enumerate(curves):
+                if not isinstance(curve, tuple):
+                    curve = None, curve
+                chunk.append(tuple(curve) + (None,) * (3 - len(curve)))
+                if len(chunk) == chunk_size:
+                    yield start, chunk
+                    chunk = []
+                    start = index + 1
+            if chunk:
+                yield start, chunk
+
+        if max_workers is None or max_workers <= 1:
+            for start, chunk in chunks():
+                yield _fit_batch_chunk(manager, None, xmin, xmax, nparameters,
+                                       start, chunk)
+            return
+
+        # Configuration of the theory and background functions, which can be
+        # stored in their module instead of the FitManager
+        config = self.configure()
+        config.pop("WeightFlag", None)
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque()
+            for start, chunk in chunks():
+                pending.append(executor.submit(_fit_batch_chunk, manager, config,
+                                               xmin, xmax, nparameters,
+                                               start, chunk))
+                # limit the number of curves waiting in memory
+                if len(pending) >= 2 * max_workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
     ###################
     # Private methods #
     ###################
@@ -876,8 +1005,7 @@ class FitManager(object):
             bg_pars_list = self.bgtheories[self.selectedbg].parameters
             nb_bg_pars = len(bg_pars_list)
 
-            bgfun = self.bgtheories[self.selectedbg].function
-            result += bgfun(x, self.ydata, *pars[0:nb_bg_pars])
+            result += self._background(x, pars[0:nb_bg_pars])
         else:
             nb_bg_pars = 0
 
@@ -886,6 +1014,93 @@ class FitManager(object):
 
         return result
 
+    def _background(self, x, bg_pars):
+        """Return the selected background function evaluated at ``x``.
+
+        The last result is cached, and reused when this method is called
+        with the same ``x`` array, the same data and the same background
+        parameters, as is the case at each iteration of a fit with fixed
+        background parameters.
+
+        :param x: Independent variable where the background is calculated.
+        :param bg_pars: Sequence of background parameters
+        :return: Background array
+        """
+        key = (self._data_version, self.selectedbg, tuple(bg_pars))
+        if self._bg_cache is not None:
+            cached_key, cached_x, cached_y, background = self._bg_cache
+            if (cached_key == key and cached_x is x and
+                    cached_y is self.ydata):
+                return background
+
+        bgfun = self.bgtheories[self.selectedbg].function
+        background = bgfun(x, self.ydata, *bg_pars)
+        self._bg_cache = key, x, self.ydata, background
+        return background
+
+    def _invalidate_bg_cache(self):
+        """Discard the background cached by :meth:`_background`"""
+        self._data_version += 1
+        self._bg_cache = None
+
+    def _fitderivative(self, constraints, peak_derivative, x, pars, index):
+        """Derivative of :meth:`fitfunction` with respect to the fit
+        parameter ``pars[index]``, as expected by the ``model_deriv``
+        argument of :func:`silx.math.fit.leastsq`.
+
+        The derivatives of the peak function parameters are provided by
+        ``peak_derivative``, built from the ``jacobian`` function of the
+        selected theory. The derivatives of the background parameters are
+        computed numerically.
+        Parameters tied to ``pars[index]`` by a FACTOR, DELTA or SUM
+        constraint contribute to the derivative.
+
+        :param constraints: Constraints with numerical codes, as returned by
+            :func:`silx.math.fit.leastsq._parse_constraints`
+        :param peak_derivative: Derivative of the peak function,
+            ``peak_derivative(x, peak_parameters, index)``
+        :param x: Independent variable where the derivative is calculated.
+        :param pars: Sequence of all fit parameters, before applying the
+            constraints.
+        :param int index: Index of the parameter
+        :return: Array of derivatives with the same shape as ``x``
+        """
+        params = _get_parameters(list(pars), constraints)
+        deriv = self._fitfunction_derivative(x, params, index,
+                                             peak_derivative)
+        for i, cons in enumerate(constraints):
+            if cons[0] in (CFACTOR, CDELTA, CSUM) and int(cons[1]) == index:
+                if cons[0] == CFACTOR:
+                    factor = cons[2]
+                elif cons[0] == CDELTA:
+                    factor = 1.0
+                else:
+                    factor = -1.0
+                deriv = deriv + factor * self._fitfunction_derivative(
+                    x, params, i, peak_derivative)
+        return deriv
+
+    def _fitfunction_derivative(self, x, params, index, peak_derivative):
+        """Derivative of :meth:`fitfunction` with respect to ``params[index]``,
+        without considering constraints."""
+        if self.selectedbg is not None:
+            nb_bg_pars = len(self.bgtheories[self.selectedbg].parameters)
+        else:
+            nb_bg_pars = 0
+
+        if index >= nb_bg_pars:
+            return peak_derivative(x, params[nb_bg_pars:], index - nb_bg_pars)
+
+        # numerical derivative of the background function
+        bg_params = numpy.array(params[0:nb_bg_pars], dtype=numpy.float64)
+        delta = (bg_params[index] + (bg_params[index] == 0.)) * \
+            numpy.sqrt(numpy.finfo(numpy.float64).eps)
+        bg_params[index] += delta
+        f1 = self._background(x, bg_params)
+        bg_params[index] -= 2 * delta
+        f2 = self._background(x, bg_params)
+        return (f1 - f2) / (2.0 * delta)
+
     def estimate_bkg(self, x, y):
         """Estimate background parameters using the function defined in
         the current fit configuration.
@@ -1014,6 +1229,63 @@ class FitManager(object):
                                pymca_legacy=True))
 
 
+def _fit_batch_chunk(manager, config, xmin, xmax, nparameters, start, curves):
+    """Estimate and fit a chunk of curves for :meth:`FitManager.fit_batch`.
+
+    :param FitManager manager: Fit manager with the theory to fit.
+        Its data is modified.
+    :param dict config: If not None, configuration to apply to the fit
+        manager before fitting
+    :param xmin: Lower value of x values to use for fitting
+    :param xmax: Upper value of x values to use for fitting
+    :param int nparameters: Size of the parameters fields, or None to use
+        the largest number of parameters of the chunk
+    :param int start: Index of the first curve of the chunk
+    :param curves: List of ``(x, y, sigmay)`` tuples
+    :return: Structured array with one record per curve
+    """
+    if config is not None:
+        manager.configure(**config)
+
+    results = []
+    for index, (x, y, sigmay) in enumerate(curves, start):
+        status, chisq, niter = 'Estimate failed', numpy.nan, 0
+        params, sigmas = [], []
+        try:
+            manager.setdata(x=x, y=y, sigmay=sigmay, xmin=xmin, xmax=xmax)
+            manager.estimate()
+            status = 'Fit failed'
+            params, sigmas, infodict = manager.runfit()
+        except Exception as e:
+            _logger.warning("%s for curve %d: %s", status, index, e)
+            _logger.debug("Backtrace", exc_info=True)
+        else:
+            status, chisq, niter = 'Ready', manager.chisq, manager.niter
+        results.append((index, status, chisq, niter, params, sigmas))
+
+    if nparameters is None:
+        nparameters = max(len(result[4]) for result in results)
+    dtype = numpy.dtype([('index', numpy.int64),
+                         ('status', 'U16'),
+                         ('chisq', numpy.float64),
+                         ('niter', numpy.int64),
+                         ('nparameters', numpy.int64),
+                         ('parameters', numpy.float64, (nparameters,)),
+                         ('sigmas', numpy.float64, (nparameters,))])
+    array = numpy.zeros(len(results), dtype=dtype)
+    array['parameters'] = numpy.nan
+    array['sigmas'] = numpy.nan
+    for record, (index, status, chisq, niter, params, sigmas) in zip(array, results):
+        record['index'] = index
+        record['status'] = status
+        record['chisq'] = chisq
+        record['niter'] = niter
+        record['nparameters'] = len(params)
+        record['parameters'][:len(params)] = params[:nparameters]
+        record['sigmas'][:len(sigmas)] = sigmas[:nparameters]
+    return array
+
+
 def test():
     from .functions import sum_gauss
     from . import fittheories
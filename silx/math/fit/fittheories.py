@@ -198,6 +198,19 @@ class FitTheories(object):
                                        gaussian_term=g_term, st_term=st_term,
                                        lt_term=lt_term, step_term=step_term)
 
+    def ahypermet_jacobian(self, x, *pars):
+        """
+        Wrapping of :func:`silx.math.fit.functions.sum_ahypermet_jacobian`
+        using the same tail flags as :meth:`ahypermet`.
+        """
+        g_term = self.config['HypermetTails'] & 1
+        st_term = (self.config['HypermetTails'] >> 1) & 1
+        lt_term = (self.config['HypermetTails'] >> 2) & 1
+        step_term = (self.config['HypermetTails'] >> 3) & 1
+        return functions.sum_ahypermet_jacobian(x, *pars,
+                                                gaussian_term=g_term, st_term=st_term,
+                                                lt_term=lt_term, step_term=step_term)
+
     def poly(self, x, *pars):
         """Order n polynomial.
         The order of the polynomial is defined by the number of
@@ -1210,42 +1223,96 @@ class FitTheories(object):
 
 fitfuns = FitTheories()
 
+
+class _JacobianDerivative(object):
+    """Derivative function computing the derivatives for all the parameters
+    at once. See :func:`derivative_from_jacobian`."""
+
+    def __init__(self, jacobian):
+        self.jacobian = jacobian
+        # (x, parameters, jacobian) of the last evaluation, replaced as a
+        # whole so that concurrent fits can share the same instance
+        self._last_evaluation = None
+
+    def __getstate__(self):
+        return {"jacobian": self.jacobian}
+
+    def __setstate__(self, state):
+        self.__init__(state["jacobian"])
+
+    def __call__(self, x, parameters, index):
+        parameters = numpy.array(parameters, dtype=numpy.float64)
+        cached = self._last_evaluation
+        if (cached is None or cached[0] is not x or
+                not numpy.array_equal(cached[1], parameters)):
+            cached = x, parameters, self.jacobian(x, *parameters)
+            self._last_evaluation = cached
+        return numpy.array(cached[2][index])
+
+
+def derivative_from_jacobian(jacobian):
+    """Return a derivative function suitable for the ``model_deriv``
+    argument of :func:`silx.math.fit.leastsq` or for
+    :attr:`FitTheory.derivative` from a function computing the derivatives
+    for all the parameters at once, such as :attr:`FitTheory.jacobian`.
+
+    :func:`silx.math.fit.leastsq` requests the derivatives one parameter
+    at a time, with the same parameter values. The jacobian computed for
+    the first parameter is kept and reused for the following ones.
+
+    The returned function can be pickled if *jacobian* can be pickled.
+
+    :param callable jacobian: Function with signature
+        ``jacobian(x, *params) -> array`` returning an array of shape
+        ``(len(params), len(x))``, such as
+        :func:`silx.math.fit.functions.sum_gauss_jacobian`.
+    :return: Function with signature ``model_deriv(x, parameters, index)``
+    """
+    return _JacobianDerivative(jacobian)
+
+
 THEORY = OrderedDict((
     ('Gaussians',
         FitTheory(description='Gaussian functions',
                   function=functions.sum_gauss,
                   parameters=('Height', 'Position', 'FWHM'),
                   estimate=fitfuns.estimate_height_position_fwhm,
+                  jacobian=functions.sum_gauss_jacobian,
                   configure=fitfuns.configure)),
     ('Lorentz',
         FitTheory(description='Lorentzian functions',
                   function=functions.sum_lorentz,
                   parameters=('Height', 'Position', 'FWHM'),
                   estimate=fitfuns.estimate_height_position_fwhm,
+                  jacobian=functions.sum_lorentz_jacobian,
                   configure=fitfuns.configure)),
     ('Area Gaussians',
         FitTheory(description='Gaussian functions (area)',
                   function=functions.sum_agauss,
                   parameters=('Area', 'Position', 'FWHM'),
                   estimate=fitfuns.estimate_agauss,
+                  jacobian=functions.sum_agauss_jacobian,
                   configure=fitfuns.configure)),
     ('Area Lorentz',
         FitTheory(description='Lorentzian functions (area)',
                   function=functions.sum_alorentz,
                   parameters=('Area', 'Position', 'FWHM'),
                   estimate=fitfuns.estimate_alorentz,
+                  jacobian=functions.sum_alorentz_jacobian,
                   configure=fitfuns.configure)),
     ('Pseudo-Voigt Line',
         FitTheory(description='Pseudo-Voigt functions',
                   function=functions.sum_pvoigt,
                   parameters=('Height', 'Position', 'FWHM', 'Eta'),
                   estimate=fitfuns.estimate_pvoigt,
+                  jacobian=functions.sum_pvoigt_jacobian,
                   configure=fitfuns.configure)),
     ('Area Pseudo-Voigt',
         FitTheory(description='Pseudo-Voigt functions (area)',
                   function=functions.sum_apvoigt,
                   parameters=('Area', 'Position', 'FWHM', 'Eta'),
                   estimate=fitfuns.estimate_apvoigt,
+                  jacobian=functions.sum_apvoigt_jacobian,
                   configure=fitfuns.configure)),
     ('Split Gaussian',
         FitTheory(description='Asymmetric gaussian functions',
@@ -1253,12 +1320,14 @@ THEORY = OrderedDict((
                   parameters=('Height', 'Position', 'LowFWHM',
                               'HighFWHM'),
                   estimate=fitfuns.estimate_splitgauss,
+                  jacobian=functions.sum_splitgauss_jacobian,
                   configure=fitfuns.configure)),
     ('Split Lorentz',
         FitTheory(description='Asymmetric lorentzian functions',
                   function=functions.sum_splitlorentz,
                   parameters=('Height', 'Position', 'LowFWHM', 'HighFWHM'),
                   estimate=fitfuns.estimate_splitgauss,
+                  jacobian=functions.sum_splitlorentz_jacobian,
                   configure=fitfuns.configure)),
     ('Split Pseudo-Voigt',
         FitTheory(description='Asymmetric pseudo-Voigt functions',
@@ -1266,24 +1335,28 @@ THEORY = OrderedDict((
                   parameters=('Height', 'Position', 'LowFWHM',
                               'HighFWHM', 'Eta'),
                   estimate=fitfuns.estimate_splitpvoigt,
+                  jacobian=functions.sum_splitpvoigt_jacobian,
                   configure=fitfuns.configure)),
     ('Step Down',
         FitTheory(description='Step down function',
                   function=functions.sum_stepdown,
                   parameters=('Height', 'Position', 'FWHM'),
                   estimate=fitfuns.estimate_stepdown,
+                  jacobian=functions.sum_stepdown_jacobian,
                   configure=fitfuns.configure)),
     ('Step Up',
         FitTheory(description='Step up function',
                   function=functions.sum_stepup,
                   parameters=('Height', 'Position', 'FWHM'),
                   estimate=fitfuns.estimate_stepup,
+                  jacobian=functions.sum_stepup_jacobian,
                   configure=fitfuns.configure)),
     ('Slit',
         FitTheory(description='Slit function',
                   function=functions.sum_slit,
                   parameters=('Height', 'Position', 'FWHM', 'BeamFWHM'),
                   estimate=fitfuns.estimate_slit,
+                  jacobian=functions.sum_slit_jacobian,
                   configure=fitfuns.configure)),
     ('Atan',
         FitTheory(description='Arctan step up function',
@@ -1297,6 +1370,7 @@ THEORY = OrderedDict((
                   parameters=('G_Area', 'Position', 'FWHM', 'ST_Area',
                               'ST_Slope', 'LT_Area', 'LT_Slope', 'Step_H'),
                   estimate=fitfuns.estimate_ahypermet,
+                  jacobian=fitfuns.ahypermet_jacobian,
                   configure=fitfuns.configure)),
     # ('Periodic Gaussians',
     #     FitTheory(description='Periodic gaussian functions',
@@ -45,10 +45,13 @@ class FitTheory(object):
           and the estimation function
         - an optional derivative function, that replaces the default model
           derivative used in :func:`silx.math.fit.leastsq`
+        - an optional jacobian function, computing the derivatives of the
+          fit function for all its parameters at once
     """
     def __init__(self, function, parameters,
                  estimate=None, configure=None, derivative=None,
-                 description=None, pymca_legacy=False, is_background=False):
+                 description=None, pymca_legacy=False, is_background=False,
+                 jacobian=None):
         """
         :param function function: Actual function. See documentation for
             :attr:`function`.
@@ -67,6 +70,8 @@ class FitTheory(object):
         :param bool is_background: Flag to indicate that the theory is a
             background theory. This has implications regarding the function's
             signature, as explained in the documentation for :attr:`function`.
+        :param function jacobian: Optional jacobian function.
+            See documentation for :attr:`jacobian`
         """
         self.function = function
         """Regular fit functions must have the signature ``f(x, *params) -> y``,
@@ -130,6 +135,18 @@ class FitTheory(object):
         the fitting parameter index for which the the derivative has to be
         provided in the supplied array of xdata points."""
 
+        self.jacobian = jacobian
+        """The optional jacobian function must conform to the signature
+        ``jacobian(x, *params) -> array``, with the same parameters as
+        :attr:`function`, and return an array of shape
+        ``(len(params), len(x))`` with the derivatives of :attr:`function`
+        with respect to each parameter, e.g.
+        :func:`silx.math.fit.functions.sum_gauss_jacobian`.
+
+        :class:`silx.math.fit.FitManager` uses it rather than
+        :attr:`derivative`, the derivatives of the background being computed
+        numerically."""
+
         self.description = description
         """Optional description string for this particular fit theory."""
 
@@ -46,6 +46,30 @@ List of fit functions:
     - :func:`sum_ahypermet`
     - :func:`sum_fastahypermet`
 
+List of analytic derivatives:
+-----------------------------
+
+These functions return the partial derivatives of the fit functions with
+respect to all their parameters at once.
+
+    - :func:`sum_gauss_jacobian`
+    - :func:`sum_agauss_jacobian`
+    - :func:`sum_splitgauss_jacobian`
+
+    - :func:`sum_apvoigt_jacobian`
+    - :func:`sum_pvoigt_jacobian`
+    - :func:`sum_splitpvoigt_jacobian`
+
+    - :func:`sum_lorentz_jacobian`
+    - :func:`sum_alorentz_jacobian`
+    - :func:`sum_splitlorentz_jacobian`
+
+    - :func:`sum_stepdown_jacobian`
+    - :func:`sum_stepup_jacobian`
+    - :func:`sum_slit_jacobian`
+
+    - :func:`sum_ahypermet_jacobian`
+
 Full documentation:
 -------------------
 
@@ -938,6 +962,286 @@ def sum_fastahypermet(x, *params,
     return numpy.asarray(y_c).reshape(x.shape)
 
 
+ctypedef int (*jacobian_function)(double* x,
+                                  int len_x,
+                                  double* params,
+                                  int len_params,
+                                  double* jacobian)
+
+
+cdef _sum_jacobian(jacobian_function function, x, params,
+                   int len_params_one_function):
+    """Compute the jacobian of a sum of functions using one of the
+    ``sum_*_jacobian`` C functions.
+
+    :param function: C function filling the jacobian array
+    :param x: Independent variable where the derivatives are calculated
+    :param params: Array of function parameters
+    :param len_params_one_function: Number of parameters of each function
+    :return: Array of shape ``(len(params),) + x.shape``
+    """
+    cdef:
+        double[::1] x_c
+        double[::1] params_c
+        double[:, ::1] jacobian_c
+
+    if not len(params):
+        raise IndexError("No parameters specified. " +
+                         "At least %d parameters are required." %
+                         len_params_one_function)
+
+    x = numpy.asarray(x)
+    x_c = numpy.array(x,
+                      copy=False,
+                      dtype=numpy.float64,
+                      order='C').reshape(-1)
+    params_c = numpy.array(params,
+                           copy=False,
+                           dtype=numpy.float64,
+                           order='C').reshape(-1)
+    jacobian_c = numpy.empty(shape=(params_c.size, x.size),
+                             dtype=numpy.float64)
+
+    status = function(&x_c[0], x.size,
+                      &params_c[0], params_c.size,
+                      &jacobian_c[0, 0])
+
+    if status:
+        raise IndexError("Wrong number of parameters for function")
+
+    return numpy.asarray(jacobian_c).reshape((params_c.size,) + x.shape)
+
+
+def sum_gauss_jacobian(x, *params):
+    """Return the partial derivatives of :func:`sum_gauss` with respect to
+    each of its parameters.
+
+    :param x: Independent variable where the derivatives are calculated
+    :type x: numpy.ndarray
+    :param params: Array of gaussian parameters (length must be a multiple
+        of 3): *(height1, centroid1, fwhm1, height2, centroid2, fwhm2,...)*
+    :return: Array of shape ``(len(params),) + x.shape``. Item ``i`` is the
+        derivative with respect to ``params[i]``.
+    """
+    return _sum_jacobian(functions_wrapper.sum_gauss_jacobian, x, params, 3)
+
+
+def sum_agauss_jacobian(x, *params):
+    """Return the partial derivatives of :func:`sum_agauss` with respect to
+    each of its parameters.
+
+    :param x: Independent variable where the derivatives are calculated
+    :type x: numpy.ndarray
+    :param params: Array of gaussian parameters (length must be a multiple
+        of 3): *(area1, centroid1, fwhm1, area2, centroid2, fwhm2,...)*
+    :return: Array of shape ``(len(params),) + x.shape``. Item ``i`` is the
+        derivative with respect to ``params[i]``.
+    """
+    return _sum_jacobian(functions_wrapper.sum_agauss_jacobian, x, params, 3)
+
+
+def sum_splitgauss_jacobian(x, *params):
+    """Return the partial derivatives of :func:`sum_splitgauss` with respect
+    to each of its parameters.
+
+    :param x: Independent variable where the derivatives are calculated
+    :type x: numpy.ndarray
+    :param params: Array of gaussian parameters (length must be a multiple
+        of 4): *(height1, centroid1, fwhm11, fwhm21, ...)*
+    :return: Array of shape ``(len(params),) + x.shape``. Item ``i`` is the
+        derivative with respect to ``params[i]``.
+    """
+    return _sum_jacobian(functions_wrapper.sum_splitgauss_jacobian, x, params, 4)
+
+
+def sum_apvoigt_jacobian(x, *params):
+    """Return the partial derivatives of :func:`sum_apvoigt` with respect to
+    each of its parameters.
+
+    :param x: Independent variable where the derivatives are calculated
+    :type x: numpy.ndarray
+    :param params: Array of pseudo-Voigt parameters (length must be a
+        multiple of 4): *(area1, centroid1, fwhm1, eta1, ...)*
+    :return: Array of shape ``(len(params),) + x.shape``. Item ``i`` is the
+        derivative with respect to ``params[i]``.
+    """
+    return _sum_jacobian(functions_wrapper.sum_apvoigt_jacobian, x, params, 4)
+
+
+def sum_pvoigt_jacobian(x, *params):
+    """Return the partial derivatives of :func:`sum_pvoigt` with respect to
+    each of its parameters.
+
+    :param x: Independent variable where the derivatives are calculated
+    :type x: numpy.ndarray
+    :param params: Array of pseudo-Voigt parameters (length must be a
+        multiple of 4): *(height1, centroid1, fwhm1, eta1, ...)*
+    :return: Array of shape ``(len(params),) + x.shape``. Item ``i`` is the
+        derivative with respect to ``params[i]``.
+    """
+    return _sum_jacobian(functions_wrapper.sum_pvoigt_jacobian, x, params, 4)
+
+
+def sum_splitpvoigt_jacobian(x, *params):
+    """Return the partial derivatives of :func:`sum_splitpvoigt` with respect
+    to each of its parameters.
+
+    :param x: Independent variable where the derivatives are calculated
+    :type x: numpy.ndarray
+    :param params: Array of pseudo-Voigt parameters (length must be a
+        multiple of 5): *(height1, centroid1, fwhm11, fwhm21, eta1, ...)*
+    :return: Array of shape ``(len(params),) + x.shape``. Item ``i`` is the
+        derivative with respect to ``params[i]``.
+    """
+    return _sum_jacobian(functions_wrapper.sum_splitpvoigt_jacobian, x, params, 5)
+
+
+def sum_lorentz_jacobian(x, *params):
+    """Return the partial derivatives of :func:`sum_lorentz` with respect to
+    each of its parameters.
+
+    :param x: Independent variable where the derivatives are calculated
+    :type x: numpy.ndarray
+    :param params: Array of Lorentz parameters (length must be a multiple
+        of 3): *(height1, centroid1, fwhm1, ...)*
+    :return: Array of shape ``(len(params),) + x.shape``. Item ``i`` is the
+        derivative with respect to ``params[i]``.
+    """
+    return _sum_jacobian(functions_wrapper.sum_lorentz_jacobian, x, params, 3)
+
+
+def sum_alorentz_jacobian(x, *params):
+    """Return the partial derivatives of :func:`sum_alorentz` with respect to
+    each of its parameters.
+
+    :param x: Independent variable where the derivatives are calculated
+    :type x: numpy.ndarray
+    :param params: Array of Lorentz parameters (length must be a multiple
+        of 3): *(area1, centroid1, fwhm1, ...)*
+    :return: Array of shape ``(len(params),) + x.shape``. Item ``i`` is the
+        derivative with respect to ``params[i]``.
+    """
+    return _sum_jacobian(functions_wrapper.sum_alorentz_jacobian, x, params, 3)
+
+
+def sum_splitlorentz_jacobian(x, *params):
+    """Return the partial derivatives of :func:`sum_splitlorentz` with
+    respect to each of its parameters.
+
+    :param x: Independent variable where the derivatives are calculated
+    :type x: numpy.ndarray
+    :param params: Array of Lorentz parameters (length must be a multiple
+        of 4): *(height1, centroid1, fwhm11, fwhm21, ...)*
+    :return: Array of shape ``(len(params),) + x.shape``. Item ``i`` is the
+        derivative with respect to ``params[i]``.
+    """
+    return _sum_jacobian(functions_wrapper.sum_splitlorentz_jacobian, x, params, 4)
+
+
+def sum_stepdown_jacobian(x, *params):
+    """Return the partial derivatives of :func:`sum_stepdown` with respect to
+    each of its parameters.
+
+    :param x: Independent variable where the derivatives are calculated
+    :type x: numpy.ndarray
+    :param params: Array of stepdown parameters (length must be a multiple
+        of 3): *(height1, centroid1, fwhm1, ...)*
+    :return: Array of shape ``(len(params),) + x.shape``. Item ``i`` is the
+        derivative with respect to ``params[i]``.
+    """
+    return _sum_jacobian(functions_wrapper.sum_stepdown_jacobian, x, params, 3)
+
+
+def sum_stepup_jacobian(x, *params):
+    """Return the partial derivatives of :func:`sum_stepup` with respect to
+    each of its parameters.
+
+    :param x: Independent variable where the derivatives are calculated
+    :type x: numpy.ndarray
+    :param params: Array of stepup parameters (length must be a multiple
+        of 3): *(height1, centroid1, fwhm1, ...)*
+    :return: Array of shape ``(len(params),) + x.shape``. Item ``i`` is the
+        derivative with respect to ``params[i]``.
+    """
+    return _sum_jacobian(functions_wrapper.sum_stepup_jacobian, x, params, 3)
+
+
+def sum_slit_jacobian(x, *params):
+    """Return the partial derivatives of :func:`sum_slit` with respect to
+    each of its parameters.
+
+    :param x: Independent variable where the derivatives are calculated
+    :type x: numpy.ndarray
+    :param params: Array of slit parameters (length must be a multiple
+        of 4): *(height1, centroid1, fwhm1, beamfwhm1, ...)*
+    :return: Array of shape ``(len(params),) + x.shape``. Item ``i`` is the
+        derivative with respect to ``params[i]``.
+    """
+    return _sum_jacobian(functions_wrapper.sum_slit_jacobian, x, params, 4)
+
+
+def sum_ahypermet_jacobian(x, *params,
+                           gaussian_term=True, st_term=True, lt_term=True,
+                           step_term=True):
+    """Return the partial derivatives of :func:`sum_ahypermet` with respect
+    to each of its parameters.
+
+    :param x: Independent variable where the derivatives are calculated
+    :type x: numpy.ndarray
+    :param params: Array of hypermet parameters (length must be a multiple
+        of 8):
+        *(area1, position1, fwhm1, st_area_r1, st_slope_r1, lt_area_r1,
+        lt_slope_r1, step_height_r1...)*
+    :param gaussian_term: If ``True``, enable gaussian term. Default ``True``
+    :param st_term: If ``True``, enable short tail term. Default ``True``
+    :param lt_term: If ``True``, enable long tail term. Default ``True``
+    :param step_term: If ``True``, enable step term. Default ``True``
+    :return: Array of shape ``(len(params),) + x.shape``. Item ``i`` is the
+        derivative with respect to ``params[i]``.
+    """
+    cdef:
+        double[::1] x_c
+        double[::1] params_c
+        double[:, ::1] jacobian_c
+
+    if not len(params):
+        raise IndexError("No parameters specified. " +
+                         "At least 8 parameters are required.")
+
+    # Sum binary flags to activate various terms of the equation
+    tail_flags = 1 if gaussian_term else 0
+    if st_term:
+        tail_flags += 2
+    if lt_term:
+        tail_flags += 4
+    if step_term:
+        tail_flags += 8
+
+    x = numpy.asarray(x)
+    x_c = numpy.array(x,
+                      copy=False,
+                      dtype=numpy.float64,
+                      order='C').reshape(-1)
+    params_c = numpy.array(params,
+                           copy=False,
+                           dtype=numpy.float64,
+                           order='C').reshape(-1)
+    jacobian_c = numpy.empty(shape=(params_c.size, x.size),
+                             dtype=numpy.float64)
+
+    status = functions_wrapper.sum_ahypermet_jacobian(&x_c[0],
+                            x.size,
+                            &params_c[0],
+                            params_c.size,
+                            &jacobian_c[0, 0],
+                            tail_flags)
+
+    if status:
+        raise IndexError("Wrong number of parameters for function")
+
+    return numpy.asarray(jacobian_c).reshape((params_c.size,) + x.shape)
+
+
 def atan_stepup(x, a, b, c):
     """
     Step up function using an inverse tangent.
@@ -65,4 +65,23 @@ int sum_slit(double* x, int len_x, double* pslit, int len_pslit, double* y);
 int sum_ahypermet(double* x, int len_x, double* phypermet, int len_phypermet, double* y, int tail_flags);
 int sum_fastahypermet(double* x, int len_x, double* phypermet, int len_phypermet, double* y, int tail_flags);
 
+/* Analytic jacobians of the fit functions */
+int sum_gauss_jacobian(double* x, int len_x, double* pgauss, int len_pgauss, double* jacobian);
+int sum_agauss_jacobian(double* x, int len_x, double* pgauss, int len_pgauss, double* jacobian);
+int sum_splitgauss_jacobian(double* x, int len_x, double* pgauss, int len_pgauss, double* jacobian);
+
+int sum_apvoigt_jacobian(double* x, int len_x, double* pvoigt, int len_pvoigt, double* jacobian);
+int sum_pvoigt_jacobian(double* x, int len_x, double* pvoigt, int len_pvoigt, double* jacobian);
+int sum_splitpvoigt_jacobian(double* x, int len_x, double* pvoigt, int len_pvoigt, double* jacobian);
+
+int sum_lorentz_jacobian(double* x, int len_x, double* plorentz, int len_plorentz, double* jacobian);
+int sum_alorentz_jacobian(double* x, int len_x, double* plorentz, int len_plorentz, double* jacobian);
+int sum_splitlorentz_jacobian(double* x, int len_x, double* plorentz, int len_plorentz, double* jacobian);
+
+int sum_stepdown_jacobian(double* x, int len_x, double* pdstep, int len_pdstep, double* jacobian);
+int sum_stepup_jacobian(double* x, int len_x, double* pustep, int len_pustep, double* jacobian);
+int sum_slit_jacobian(double* x, int len_x, double* pslit, int len_pslit, double* jacobian);
+
+int sum_ahypermet_jacobian(double* x, int len_x, double* phypermet, int len_phypermet, double* jacobian, int tail_flags);
+
 #endif /* #define FITFUNCTIONS_H */
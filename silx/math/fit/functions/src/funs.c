@@ -1234,6 +1234,671 @@ int sum_fastahypermet(double* x, int len_x, double* phypermet, int len_phypermet
     return(0);
 }
 
+/*  Analytic jacobians of the fit functions
+
+    Each *sum_xxx_jacobian* function computes the partial derivatives of the
+    matching *sum_xxx* function with respect to all of its parameters, in a
+    single pass over the data.
+
+    Parameters:
+    -----------
+
+        - x: Independant variable where the derivatives are calculated.
+        - len_x: Number of elements in the x array.
+        - params: Array of function parameters, same as for the
+          *sum_xxx* function.
+        - len_params: Number of elements in the params array.
+        - jacobian: Output array. Must have memory allocated for
+          len_params * len_x elements. The derivatives with respect to
+          parameter ``k`` are stored in ``jacobian[k*len_x:(k+1)*len_x]``.
+
+    The same cutoffs as in the *sum_xxx* functions are used, so that the
+    jacobian is consistent with the computed function.
+*/
+
+/* Derivatives of a gaussian G(x) = exp(-0.5 * d * d), with d = (x - c) / sigma,
+   multiplied by height: (d/dheight, d/dcentroid, d/dfwhm) */
+static void gauss_derivatives(double x_minus_centroid, double height,
+                              double sigma, double fwhm, double cutoff,
+                              double* dheight, double* dcentroid, double* dfwhm)
+{
+    double dhelp, g;
+
+    dhelp = x_minus_centroid / sigma;
+    if (dhelp <= cutoff) {
+        g = exp(-0.5 * dhelp * dhelp);
+    }
+    else {
+        g = 0.;
+    }
+    *dheight = g;
+    *dcentroid = height * g * dhelp / sigma;
+    *dfwhm = height * g * dhelp * dhelp / fwhm;
+}
+
+/* Derivatives of a lorentzian L(x) = 1 / (1 + u * u), with u = (x - c) / (0.5 * fwhm),
+   multiplied by height: (d/dheight, d/dcentroid, d/dfwhm) */
+static void lorentz_derivatives(double x_minus_centroid, double height, double fwhm,
+                                double* dheight, double* dcentroid, double* dfwhm)
+{
+    double u, inv_dhelp;
+
+    u = x_minus_centroid / (0.5 * fwhm);
+    inv_dhelp = 1.0 / (1.0 + u * u);
+    *dheight = inv_dhelp;
+    *dcentroid = 4.0 * height * u * inv_dhelp * inv_dhelp / fwhm;
+    *dfwhm = 2.0 * height * u * u * inv_dhelp * inv_dhelp / fwhm;
+}
+
+int sum_gauss_jacobian(double* x, int len_x, double* pgauss, int len_pgauss, double* jacobian)
+{
+    int i, j;
+    double inv_two_sqrt_two_log2, sigma;
+    double fwhm, centroid, height;
+    double *dheight, *dcentroid, *dfwhm;
+
+    if (test_params(len_pgauss, 3, "sum_gauss_jacobian", "height, centroid, fwhm")) {
+        return(1);
+    }
+
+    inv_two_sqrt_two_log2 = 1.0 / (2.0 * sqrt(2.0 * LOG2));
+
+    for (i=0; i<len_pgauss/3; i++) {
+        height = pgauss[3*i];
+        centroid = pgauss[3*i+1];
+        fwhm = pgauss[3*i+2];
+        dheight = jacobian + (3*i) * len_x;
+        dcentroid = jacobian + (3*i+1) * len_x;
+        dfwhm = jacobian + (3*i+2) * len_x;
+
+        sigma = fwhm * inv_two_sqrt_two_log2;
+
+        for (j=0; j<len_x;  j++) {
+            gauss_derivatives(x[j] - centroid, height, sigma, fwhm, 20,
+                              dheight + j, dcentroid + j, dfwhm + j);
+        }
+    }
+    return(0);
+}
+
+int sum_agauss_jacobian(double* x, int len_x, double* pgauss, int len_pgauss, double* jacobian)
+{
+    int i, j;
+    double inv_two_sqrt_two_log2, sqrt2PI, sigma, height;
+    double fwhm, centroid, area;
+    double *darea, *dcentroid, *dfwhm;
+
+    if (test_params(len_pgauss, 3, "sum_agauss_jacobian", "area, centroid, fwhm")) {
+        return(1);
+    }
+
+    inv_two_sqrt_two_log2 = 1.0 / (2.0 * sqrt(2.0 * LOG2));
+    sqrt2PI = sqrt(2.0*M_PI);
+
+    for (i=0; i<len_pgauss/3; i++) {
+        area = pgauss[3*i];
+        centroid = pgauss[3*i+1];
+        fwhm = pgauss[3*i+2];
+        darea = jacobian + (3*i) * len_x;
+        dcentroid = jacobian + (3*i+1) * len_x;
+        dfwhm = jacobian + (3*i+2) * len_x;
+
+        sigma = fwhm * inv_two_sqrt_two_log2;
+        height = area / (sigma * sqrt2PI);
+
+        for (j=0; j<len_x;  j++) {
+            gauss_derivatives(x[j] - centroid, height, sigma, fwhm, 35,
+                              darea + j, dcentroid + j, dfwhm + j);
+            /* height depends on area and fwhm */
+            dfwhm[j] -= height * darea[j] / fwhm;
+            darea[j] /= sigma * sqrt2PI;
+        }
+    }
+    return(0);
+}
+
+int sum_splitgauss_jacobian(double* x, int len_x, double* pgauss, int len_pgauss, double* jacobian)
+{
+    int i, j;
+    double inv_two_sqrt_two_log2, x_minus_centroid, sigma1, sigma2;
+    double height, centroid, fwhm1, fwhm2;
+    double *dheight, *dcentroid, *dfwhm1, *dfwhm2;
+
+    if (test_params(len_pgauss, 4, "sum_splitgauss_jacobian", "height, centroid, fwhm1, fwhm2")) {
+        return(1);
+    }
+
+    inv_two_sqrt_two_log2 = 1.0 / (2.0 * sqrt(2.0 * LOG2));
+
+    for (i=0; i<len_pgauss/4; i++) {
+        height = pgauss[4*i];
+        centroid = pgauss[4*i+1];
+        fwhm1 = pgauss[4*i+2];
+        fwhm2 = pgauss[4*i+3];
+        dheight = jacobian + (4*i) * len_x;
+        dcentroid = jacobian + (4*i+1) * len_x;
+        dfwhm1 = jacobian + (4*i+2) * len_x;
+        dfwhm2 = jacobian + (4*i+3) * len_x;
+
+        sigma1 = fwhm1 * inv_two_sqrt_two_log2;
+        sigma2 = fwhm2 * inv_two_sqrt_two_log2;
+
+        for (j=0; j<len_x;  j++) {
+            x_minus_centroid = x[j] - centroid;
+            /* Use fwhm2 when x > centroid */
+            if (x_minus_centroid > 0) {
+                gauss_derivatives(x_minus_centroid, height, sigma2, fwhm2, 20,
+                                  dheight + j, dcentroid + j, dfwhm2 + j);
+                dfwhm1[j] = 0.;
+            }
+            /* Use fwhm1 when x < centroid */
+            else {
+                gauss_derivatives(x_minus_centroid, height, sigma1, fwhm1, 20,
+                                  dheight + j, dcentroid + j, dfwhm1 + j);
+                dfwhm2[j] = 0.;
+            }
+        }
+    }
+    return(0);
+}
+
+int sum_apvoigt_jacobian(double* x, int len_x, double* pvoigt, int len_pvoigt, double* jacobian)
+{
+    int i, j;
+    double inv_two_sqrt_two_log2, sqrt2PI, sigma, height, lorentz_height;
+    double area, centroid, fwhm, eta;
+    double g_darea, g_dcentroid, g_dfwhm, l_darea, l_dcentroid, l_dfwhm;
+    double *darea, *dcentroid, *dfwhm, *deta;
+
+    if (test_params(len_pvoigt, 4, "sum_apvoigt_jacobian", "area, centroid, fwhm, eta")) {
+        return(1);
+    }
+
+    inv_two_sqrt_two_log2 = 1.0 / (2.0 * sqrt(2.0 * LOG2));
+    sqrt2PI = sqrt(2.0*M_PI);
+
+    for (i=0; i<len_pvoigt/4; i++) {
+        area = pvoigt[4*i];
+        centroid = pvoigt[4*i+1];
+        fwhm = pvoigt[4*i+2];
+        eta = pvoigt[4*i+3];
+        darea = jacobian + (4*i) * len_x;
+        dcentroid = jacobian + (4*i+1) * len_x;
+        dfwhm = jacobian + (4*i+2) * len_x;
+        deta = jacobian + (4*i+3) * len_x;
+
+        sigma = fwhm * inv_two_sqrt_two_log2;
+        height = area / (sigma * sqrt2PI);
+        lorentz_height = area / (0.5 * M_PI * fwhm);
+
+        for (j=0; j<len_x;  j++) {
+            /*  Lorentzian term */
+            lorentz_derivatives(x[j] - centroid, lorentz_height, fwhm,
+                                &l_darea, &l_dcentroid, &l_dfwhm);
+            l_dfwhm -= lorentz_height * l_darea / fwhm;
+            /* Gaussian term */
+            gauss_derivatives(x[j] - centroid, height, sigma, fwhm, 35,
+                              &g_darea, &g_dcentroid, &g_dfwhm);
+            g_dfwhm -= height * g_darea / fwhm;
+
+            deta[j] = lorentz_height * l_darea - height * g_darea;
+            darea[j] = eta * l_darea / (0.5 * M_PI * fwhm) + \
+                       (1.0 - eta) * g_darea / (sigma * sqrt2PI);
+            dcentroid[j] = eta * l_dcentroid + (1.0 - eta) * g_dcentroid;
+            dfwhm[j] = eta * l_dfwhm + (1.0 - eta) * g_dfwhm;
+        }
+    }
+    return(0);
+}
+
+int sum_pvoigt_jacobian(double* x, int len_x, double* pvoigt, int len_pvoigt, double* jacobian)
+{
+    int i, j;
+    double inv_two_sqrt_two_log2, sigma;
+    double height, centroid, fwhm, eta;
+    double g_dheight, g_dcentroid, g_dfwhm, l_dheight, l_dcentroid, l_dfwhm;
+    double *dheight, *dcentroid, *dfwhm, *deta;
+
+    if (test_params(len_pvoigt, 4, "sum_pvoigt_jacobian", "height, centroid, fwhm, eta")) {
+        return(1);
+    }
+
+    inv_two_sqrt_two_log2 = 1.0 / (2.0 * sqrt(2.0 * LOG2));
+
+    for (i=0; i<len_pvoigt/4; i++) {
+        height = pvoigt[4*i];
+        centroid = pvoigt[4*i+1];
+        fwhm = pvoigt[4*i+2];
+        eta = pvoigt[4*i+3];
+        dheight = jacobian + (4*i) * len_x;
+        dcentroid = jacobian + (4*i+1) * len_x;
+        dfwhm = jacobian + (4*i+2) * len_x;
+        deta = jacobian + (4*i+3) * len_x;
+
+        sigma = fwhm * inv_two_sqrt_two_log2;
+
+        for (j=0; j<len_x;  j++) {
+            lorentz_derivatives(x[j] - centroid, height, fwhm,
+                                &l_dheight, &l_dcentroid, &l_dfwhm);
+            gauss_derivatives(x[j] - centroid, height, sigma, fwhm, 35,
+                              &g_dheight, &g_dcentroid, &g_dfwhm);
+
+            dheight[j] = eta * l_dheight + (1.0 - eta) * g_dheight;
+            dcentroid[j] = eta * l_dcentroid + (1.0 - eta) * g_dcentroid;
+            dfwhm[j] = eta * l_dfwhm + (1.0 - eta) * g_dfwhm;
+            deta[j] = height * (l_dheight - g_dheight);
+        }
+    }
+    return(0);
+}
+
+int sum_splitpvoigt_jacobian(double* x, int len_x, double* pvoigt, int len_pvoigt, double* jacobian)
+{
+    int i, j;
+    double inv_two_sqrt_two_log2, x_minus_centroid, sigma1, sigma2;
+    double height, centroid, fwhm1, fwhm2, eta;
+    double g_dheight, g_dcentroid, g_dfwhm, l_dheight, l_dcentroid, l_dfwhm;
+    double *dheight, *dcentroid, *dfwhm1, *dfwhm2, *deta;
+
+    if (test_params(len_pvoigt, 5, "sum_splitpvoigt_jacobian", "height, centroid, fwhm1, fwhm2, eta")) {
+        return(1);
+    }
+
+    inv_two_sqrt_two_log2 = 1.0 / (2.0 * sqrt(2.0 * LOG2));
+
+    for (i=0; i<len_pvoigt/5; i++) {
+        height = pvoigt[5*i];
+        centroid = pvoigt[5*i+1];
+        fwhm1 = pvoigt[5*i+2];
+        fwhm2 = pvoigt[5*i+3];
+        eta = pvoigt[5*i+4];
+        dheight = jacobian + (5*i) * len_x;
+        dcentroid = jacobian + (5*i+1) * len_x;
+        dfwhm1 = jacobian + (5*i+2) * len_x;
+        dfwhm2 = jacobian + (5*i+3) * len_x;
+        deta = jacobian + (5*i+4) * len_x;
+
+        sigma1 = fwhm1 * inv_two_sqrt_two_log2;
+        sigma2 = fwhm2 * inv_two_sqrt_two_log2;
+
+        for (j=0; j<len_x;  j++) {
+            x_minus_centroid = x[j] - centroid;
+            /* Use fwhm2 when x > centroid */
+            if (x_minus_centroid > 0) {
+                lorentz_derivatives(x_minus_centroid, height, fwhm2,
+                                    &l_dheight, &l_dcentroid, &l_dfwhm);
+                gauss_derivatives(x_minus_centroid, height, sigma2, fwhm2, 35,
+                                  &g_dheight, &g_dcentroid, &g_dfwhm);
+                dfwhm1[j] = 0.;
+                dfwhm2[j] = eta * l_dfwhm + (1.0 - eta) * g_dfwhm;
+            }
+            /* Use fwhm1 when x < centroid */
+            else {
+                lorentz_derivatives(x_minus_centroid, height, fwhm1,
+                                    &l_dheight, &l_dcentroid, &l_dfwhm);
+                gauss_derivatives(x_minus_centroid, height, sigma1, fwhm1, 35,
+                                  &g_dheight, &g_dcentroid, &g_dfwhm);
+                dfwhm1[j] = eta * l_dfwhm + (1.0 - eta) * g_dfwhm;
+                dfwhm2[j] = 0.;
+            }
+            dheight[j] = eta * l_dheight + (1.0 - eta) * g_dheight;
+            dcentroid[j] = eta * l_dcentroid + (1.0 - eta) * g_dcentroid;
+            deta[j] = height * (l_dheight - g_dheight);
+        }
+    }
+    return(0);
+}
+
+int sum_lorentz_jacobian(double* x, int len_x, double* plorentz, int len_plorentz, double* jacobian)
+{
+    int i, j;
+    double height, centroid, fwhm;
+    double *dheight, *dcentroid, *dfwhm;
+
+    if (test_params(len_plorentz, 3, "sum_lorentz_jacobian", "height, centroid, fwhm")) {
+        return(1);
+    }
+
+    for (i=0; i<len_plorentz/3; i++) {
+        height = plorentz[3*i];
+        centroid = plorentz[3*i+1];
+        fwhm = plorentz[3*i+2];
+        dheight = jacobian + (3*i) * len_x;
+        dcentroid = jacobian + (3*i+1) * len_x;
+        dfwhm = jacobian + (3*i+2) * len_x;
+
+        for (j=0; j<len_x;  j++) {
+            lorentz_derivatives(x[j] - centroid, height, fwhm,
+                                dheight + j, dcentroid + j, dfwhm + j);
+        }
+    }
+    return(0);
+}
+
+int sum_alorentz_jacobian(double* x, int len_x, double* plorentz, int len_plorentz, double* jacobian)
+{
+    int i, j;
+    double height;
+    double area, centroid, fwhm;
+    double *darea, *dcentroid, *dfwhm;
+
+    if (test_params(len_plorentz, 3, "sum_alorentz_jacobian", "area, centroid, fwhm")) {
+        return(1);
+    }
+
+    for (i=0; i<len_plorentz/3; i++) {
+        area = plorentz[3*i];
+        centroid = plorentz[3*i+1];
+        fwhm = plorentz[3*i+2];
+        darea = jacobian + (3*i) * len_x;
+        dcentroid = jacobian + (3*i+1) * len_x;
+        dfwhm = jacobian + (3*i+2) * len_x;
+
+        height = area / (0.5 * M_PI * fwhm);
+
+        for (j=0; j<len_x;  j++) {
+            lorentz_derivatives(x[j] - centroid, height, fwhm,
+                                darea + j, dcentroid + j, dfwhm + j);
+            /* height depends on area and fwhm */
+            dfwhm[j] -= height * darea[j] / fwhm;
+            darea[j] /= 0.5 * M_PI * fwhm;
+        }
+    }
+    return(0);
+}
+
+int sum_splitlorentz_jacobian(double* x, int len_x, double* plorentz, int len_plorentz, double* jacobian)
+{
+    int i, j;
+    double x_minus_centroid;
+    double height, centroid, fwhm1, fwhm2;
+    double *dheight, *dcentroid, *dfwhm1, *dfwhm2;
+
+    if (test_params(len_plorentz, 4, "sum_splitlorentz_jacobian", "height, centroid, fwhm1, fwhm2")) {
+        return(1);
+    }
+
+    for (i=0; i<len_plorentz/4; i++) {
+        height = plorentz[4*i];
+        centroid = plorentz[4*i+1];
+        fwhm1 = plorentz[4*i+2];
+        fwhm2 = plorentz[4*i+3];
+        dheight = jacobian + (4*i) * len_x;
+        dcentroid = jacobian + (4*i+1) * len_x;
+        dfwhm1 = jacobian + (4*i+2) * len_x;
+        dfwhm2 = jacobian + (4*i+3) * len_x;
+
+        for (j=0; j<len_x;  j++) {
+            x_minus_centroid = x[j] - centroid;
+            if (x_minus_centroid > 0) {
+                lorentz_derivatives(x_minus_centroid, height, fwhm2,
+                                    dheight + j, dcentroid + j, dfwhm2 + j);
+                dfwhm1[j] = 0.;
+            }
+            else {
+                lorentz_derivatives(x_minus_centroid, height, fwhm1,
+                                    dheight + j, dcentroid + j, dfwhm1 + j);
+                dfwhm2[j] = 0.;
+            }
+        }
+    }
+    return(0);
+}
+
+int sum_stepdown_jacobian(double* x, int len_x, double* pdstep, int len_pdstep, double* jacobian)
+{
+    int i, j;
+    double dhelp, width, g, sqrt2_inv_2_sqrt_two_log2, inv_sqrt_pi;
+    double height, centroid, fwhm;
+    double *dheight, *dcentroid, *dfwhm;
+
+    if (test_params(len_pdstep, 3, "sum_stepdown_jacobian", "height, centroid, fwhm")) {
+        return(1);
+    }
+
+    sqrt2_inv_2_sqrt_two_log2 = sqrt(2.0) / (2.0 * sqrt(2.0 * LOG2));
+    inv_sqrt_pi = 1.0 / sqrt(M_PI);
+
+    for (i=0; i<len_pdstep/3; i++) {
+        height = pdstep[3*i];
+        centroid = pdstep[3*i+1];
+        fwhm = pdstep[3*i+2];
+        dheight = jacobian + (3*i) * len_x;
+        dcentroid = jacobian + (3*i+1) * len_x;
+        dfwhm = jacobian + (3*i+2) * len_x;
+
+        width = fwhm * sqrt2_inv_2_sqrt_two_log2;
+
+        for (j=0; j<len_x;  j++) {
+            dhelp = (x[j] - centroid) / width;
+            g = height * inv_sqrt_pi * exp(-dhelp * dhelp);
+            dheight[j] = 0.5 * erfc(dhelp);
+            dcentroid[j] = g / width;
+            dfwhm[j] = g * dhelp / fwhm;
+        }
+    }
+    return(0);
+}
+
+int sum_stepup_jacobian(double* x, int len_x, double* pustep, int len_pustep, double* jacobian)
+{
+    int i, j;
+    double dhelp, width, g, sqrt2_inv_2_sqrt_two_log2, inv_sqrt_pi;
+    double height, centroid, fwhm;
+    double *dheight, *dcentroid, *dfwhm;
+
+    if (test_params(len_pustep, 3, "sum_stepup_jacobian", "height, centroid, fwhm")) {
+        return(1);
+    }
+
+    sqrt2_inv_2_sqrt_two_log2 = sqrt(2.0) / (2.0 * sqrt(2.0 * LOG2));
+    inv_sqrt_pi = 1.0 / sqrt(M_PI);
+
+    for (i=0; i<len_pustep/3; i++) {
+        height = pustep[3*i];
+        centroid = pustep[3*i+1];
+        fwhm = pustep[3*i+2];
+        dheight = jacobian + (3*i) * len_x;
+        dcentroid = jacobian + (3*i+1) * len_x;
+        dfwhm = jacobian + (3*i+2) * len_x;
+
+        width = fwhm * sqrt2_inv_2_sqrt_two_log2;
+
+        for (j=0; j<len_x;  j++) {
+            dhelp = (x[j] - centroid) / width;
+            g = height * inv_sqrt_pi * exp(-dhelp * dhelp);
+            dheight[j] = 0.5 * (1.0 + erf(dhelp));
+            dcentroid[j] = -g / width;
+            dfwhm[j] = -g * dhelp / fwhm;
+        }
+    }
+    return(0);
+}
+
+int sum_slit_jacobian(double* x, int len_x, double* pslit, int len_pslit, double* jacobian)
+{
+    int i, j;
+    double width, dhelp1, dhelp2, erf1, erfc2, g1, g2;
+    double sqrt2_inv_2_sqrt_two_log2, inv_sqrt_pi, centroid1, centroid2;
+    double height, position, fwhm, beamfwhm;
+    double *dheight, *dposition, *dfwhm, *dbeamfwhm;
+
+    if (test_params(len_pslit, 4, "sum_slit_jacobian", "height, centroid, fwhm, beamfwhm")) {
+        return(1);
+    }
+
+    sqrt2_inv_2_sqrt_two_log2 = sqrt(2.0) / (2.0 * sqrt(2.0 * LOG2));
+    inv_sqrt_pi = 1.0 / sqrt(M_PI);
+
+    for (i=0; i<len_pslit/4; i++) {
+        height = pslit[4*i];
+        position = pslit[4*i+1];
+        fwhm = pslit[4*i+2];
+        beamfwhm = pslit[4*i+3];
+        dheight = jacobian + (4*i) * len_x;
+        dposition = jacobian + (4*i+1) * len_x;
+        dfwhm = jacobian + (4*i+2) * len_x;
+        dbeamfwhm = jacobian + (4*i+3) * len_x;
+
+        centroid1 = position - 0.5 * fwhm;
+        centroid2 = position + 0.5 * fwhm;
+        width = beamfwhm * sqrt2_inv_2_sqrt_two_log2;
+
+        for (j=0; j<len_x;  j++) {
+            dhelp1 = (x[j] - centroid1) / width;
+            dhelp2 = (x[j] - centroid2) / width;
+            erf1 = 1.0 + erf(dhelp1);
+            erfc2 = erfc(dhelp2);
+            /* derivatives of erf1 and -erfc2 with respect to dhelp1 and dhelp2 */
+            g1 = 2.0 * inv_sqrt_pi * exp(-dhelp1 * dhelp1);
+            g2 = 2.0 * inv_sqrt_pi * exp(-dhelp2 * dhelp2);
+
+            dheight[j] = 0.25 * erf1 * erfc2;
+            dposition[j] = 0.25 * height * (erf1 * g2 - g1 * erfc2) / width;
+            dfwhm[j] = 0.125 * height * (g1 * erfc2 + erf1 * g2) / width;
+            dbeamfwhm[j] = 0.25 * height * \
+                           (erf1 * g2 * dhelp2 - g1 * erfc2 * dhelp1) / beamfwhm;
+        }
+    }
+    return(0);
+}
+
+/* Derivatives of a hypermet tail term
+   T(x) = area * area_r * 0.5 * erfc(z) * exp(p) / slope_r
+   with z = x_minus_position / sigma_sqrt2 + 0.5 * sigma_sqrt2 / slope_r
+   and  p = 0.5 * (sigma / slope_r)**2 + x_minus_position / slope_r
+   The derivatives are added to the output values. */
+static void hypermet_tail_derivatives(double x_minus_position, double area,
+                                      double fwhm, double sigma, double sigma_sqrt2,
+                                      double area_r, double slope_r,
+                                      double* darea, double* dposition, double* dfwhm,
+                                      double* darea_r, double* dslope_r)
+{
+    double z, e, de, term, dz_dfwhm;
+
+    z = x_minus_position / sigma_sqrt2 + 0.5 * sigma_sqrt2 / slope_r;
+    /* erfc(z) * exp(p) / slope_r, and derivative of erfc(z) */
+    e = 0.5 * erfc(z) * exp(0.5 * (sigma / slope_r) * (sigma / slope_r) + \
+                            x_minus_position / slope_r) / slope_r;
+    de = -0.5 * 2.0 / sqrt(M_PI) * \
+         exp(-z * z + 0.5 * (sigma / slope_r) * (sigma / slope_r) + \
+             x_minus_position / slope_r) / slope_r;
+    term = area * area_r;
+
+    *darea += area_r * e;
+    *darea_r += area * e;
+    *dposition += term * (-de / sigma_sqrt2 - e / slope_r);
+    dz_dfwhm = (0.5 * sigma_sqrt2 / slope_r - x_minus_position / sigma_sqrt2) / fwhm;
+    *dfwhm += term * (de * dz_dfwhm + e * sigma * sigma / (slope_r * slope_r * fwhm));
+    *dslope_r += term * (-e / slope_r - \
+                         de * 0.5 * sigma_sqrt2 / (slope_r * slope_r) - \
+                         e * (sigma * sigma / (slope_r * slope_r * slope_r) + \
+                              x_minus_position / (slope_r * slope_r)));
+}
+
+int sum_ahypermet_jacobian(double* x, int len_x, double* phypermet, int len_phypermet, double* jacobian, int tail_flags)
+{
+    int i, j, k;
+    int g_term_flag, st_term_flag, lt_term_flag, step_term_flag;
+    double c2, g, step, sigma, height, sigma_sqrt2, sqrt2PI, inv_2_sqrt_2_log2, x_minus_position, epsilon;
+    double area, position, fwhm, st_area_r, st_slope_r, lt_area_r, lt_slope_r, step_height_r;
+    double *darea, *dposition, *dfwhm, *dst_area_r, *dst_slope_r, *dlt_area_r, *dlt_slope_r, *dstep_height_r;
+
+    if (test_params(len_phypermet, 8, "sum_ahypermet_jacobian",
+                    "height, centroid, fwhm, st_area_r, st_slope_r, lt_area_r, lt_slope_r, step_height_r")) {
+        return(1);
+    }
+
+    g_term_flag    = tail_flags & 1;
+    st_term_flag   = (tail_flags>>1) & 1;
+    lt_term_flag   = (tail_flags>>2) & 1;
+    step_term_flag = (tail_flags>>3) & 1;
+
+    /* Initialize output array */
+    for (k=0; k<len_phypermet * len_x;  k++) {
+        jacobian[k] = 0.;
+    }
+
+    /* define epsilon to compare floating point values with 0. */
+    epsilon = 0.00000000001;
+
+    sqrt2PI= sqrt(2.0 * M_PI);
+    inv_2_sqrt_2_log2 = 1.0 / (2.0 * sqrt(2.0 * LOG2));
+
+    for (i=0; i<len_phypermet/8; i++) {
+        area = phypermet[8*i];
+        position = phypermet[8*i+1];
+        fwhm = phypermet[8*i+2];
+        st_area_r = phypermet[8*i+3];
+        st_slope_r =  phypermet[8*i+4];
+        lt_area_r = phypermet[8*i+5];
+        lt_slope_r = phypermet[8*i+6];
+        step_height_r = phypermet[8*i+7];
+        darea = jacobian + (8*i) * len_x;
+        dposition = jacobian + (8*i+1) * len_x;
+        dfwhm = jacobian + (8*i+2) * len_x;
+        dst_area_r = jacobian + (8*i+3) * len_x;
+        dst_slope_r = jacobian + (8*i+4) * len_x;
+        dlt_area_r = jacobian + (8*i+5) * len_x;
+        dlt_slope_r = jacobian + (8*i+6) * len_x;
+        dstep_height_r = jacobian + (8*i+7) * len_x;
+
+        sigma = fwhm * inv_2_sqrt_2_log2;
+        height = area / (sigma * sqrt2PI);
+
+        /* Prevent division by 0 */
+        if (sigma == 0) {
+            printf("fwhm must not be equal to 0");
+            return(1);
+        }
+        sigma_sqrt2 = sigma * 1.4142135623730950488;
+
+        for (j=0; j<len_x;  j++) {
+            x_minus_position = x[j] - position;
+            c2 = (0.5 * x_minus_position * x_minus_position) / (sigma * sigma);
+            g = exp(-c2);
+            /* gaussian term */
+            if (g_term_flag) {
+                darea[j] += g / (sigma * sqrt2PI);
+                dposition[j] += height * g * x_minus_position / (sigma * sigma);
+                dfwhm[j] += height * g * (2.0 * c2 - 1.0) / fwhm;
+            }
+
+            /* st term */
+            if (st_term_flag) {
+                if (fabs(st_slope_r) > epsilon) {
+                    hypermet_tail_derivatives(x_minus_position, area, fwhm, sigma, sigma_sqrt2,
+                                              st_area_r, st_slope_r,
+                                              darea + j, dposition + j, dfwhm + j,
+                                              dst_area_r + j, dst_slope_r + j);
+                }
+            }
+
+            /* lt term */
+            if (lt_term_flag) {
+                if (fabs(lt_slope_r) > epsilon) {
+                    hypermet_tail_derivatives(x_minus_position, area, fwhm, sigma, sigma_sqrt2,
+                                              lt_area_r, lt_slope_r,
+                                              darea + j, dposition + j, dfwhm + j,
+                                              dlt_area_r + j, dlt_slope_r + j);
+                }
+            }
+
+            /* step term flag */
+            if (step_term_flag) {
+                step = 0.5 * erfc(x_minus_position / sigma_sqrt2);
+                dstep_height_r[j] += height * step;
+                darea[j] += step_height_r * step / (sigma * sqrt2PI);
+                /* d(erfc(u))/du = -2/sqrt(pi) exp(-u*u), with u*u == c2 */
+                dposition[j] += step_height_r * height * g / (sqrt(M_PI) * sigma_sqrt2);
+                dfwhm[j] += step_height_r * height * \
+                            (-step + g * x_minus_position / (sqrt(M_PI) * sigma_sqrt2)) / fwhm;
+            }
+        }
+    }
+    return(0);
+}
+
 void pileup(double* x, long len_x, double* ret, int input2, double zero, double gain)
 {
     //int    input2=0;
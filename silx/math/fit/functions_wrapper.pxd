@@ -153,6 +153,85 @@ cdef extern from "functions.h":
                           double* y,
                           int tail_flags)
 
+    int sum_gauss_jacobian(double* x,
+                           int len_x,
+                           double* params,
+                           int len_params,
+                           double* jacobian)
+
+    int sum_agauss_jacobian(double* x,
+                            int len_x,
+                            double* params,
+                            int len_params,
+                            double* jacobian)
+
+    int sum_splitgauss_jacobian(double* x,
+                                int len_x,
+                                double* params,
+                                int len_params,
+                                double* jacobian)
+
+    int sum_apvoigt_jacobian(double* x,
+                             int len_x,
+                             double* params,
+                             int len_params,
+                             double* jacobian)
+
+    int sum_pvoigt_jacobian(double* x,
+                            int len_x,
+                            double* params,
+                            int len_params,
+                            double* jacobian)
+
+    int sum_splitpvoigt_jacobian(double* x,
+                                 int len_x,
+                                 double* params,
+                                 int len_params,
+                                 double* jacobian)
+
+    int sum_lorentz_jacobian(double* x,
+                             int len_x,
+                             double* params,
+                             int len_params,
+                             double* jacobian)
+
+    int sum_alorentz_jacobian(double* x,
+                              int len_x,
+                              double* params,
+                              int len_params,
+                              double* jacobian)
+
+    int sum_splitlorentz_jacobian(double* x,
+                                  int len_x,
+                                  double* params,
+                                  int len_params,
+                                  double* jacobian)
+
+    int sum_stepdown_jacobian(double* x,
+                              int len_x,
+                              double* params,
+                              int len_params,
+                              double* jacobian)
+
+    int sum_stepup_jacobian(double* x,
+                            int len_x,
+                            double* params,
+                            int len_params,
+                            double* jacobian)
+
+    int sum_slit_jacobian(double* x,
+                          int len_x,
+                          double* params,
+                          int len_params,
+                          double* jacobian)
+
+    int sum_ahypermet_jacobian(double* x,
+                               int len_x,
+                               double* params,
+                               int len_params,
+                               double* jacobian,
+                               int tail_flags)
+
     long seek(long begin_index,
               long end_index,
               long nsamples,
@@ -43,6 +43,8 @@ from numpy.linalg.linalg import LinAlgError
 import time
 import logging
 import copy
+import functools
+from concurrent.futures import ProcessPoolExecutor
 
 _logger = logging.getLogger(__name__)
 
@@ -294,41 +296,7 @@ def leastsq(model, xdata, ydata, p0, sigma=None,
         epsfcn = max(epsfcn, numpy.finfo(numpy.float).eps)
 
     # check if constraints have been passed as text
-    constrained_fit = False
-    if constraints is not None:
-        # make sure we work with a list of lists
-        input_constraints = constraints
-        tmp_constraints = [None] * len(input_constraints)
-        for i in range(nparameters):
-            tmp_constraints[i] = list(input_constraints[i])
-        constraints = tmp_constraints
-        for i in range(nparameters):
-            if hasattr(constraints[i][0], "upper"):
-                txt = constraints[i][0].upper()
-                if txt == "FREE":
-                    constraints[i][0] = CFREE
-                elif txt == "POSITIVE":
-                    constraints[i][0] = CPOSITIVE
-                elif txt == "QUOTED":
-                    constraints[i][0] = CQUOTED
-                elif txt == "FIXED":
-                    constraints[i][0] = CFIXED
-                elif txt == "FACTOR":
-                    constraints[i][0] = CFACTOR
-                    constraints[i][1] = int(constraints[i][1])
-                elif txt == "DELTA":
-                    constraints[i][0] = CDELTA
-                    constraints[i][1] = int(constraints[i][1])
-                elif txt == "SUM":
-                    constraints[i][0] = CSUM
-                    constraints[i][1] = int(constraints[i][1])
-                elif txt in ["IGNORED", "IGNORE"]:
-                    constraints[i][0] = CIGNORED
-                else:
-                    #I should raise an exception
-                    raise ValueError("Unknown constraint %s" % constraints[i][0])
-            if constraints[i][0] > 0:
-                constrained_fit = True
+    constraints, constrained_fit = _parse_constraints(constraints, nparameters)
     if constrained_fit:
         if full_output is None:
             _logger.info("Recommended to set full_output to True when using constraints")
@@ -739,6 +707,55 @@ def chisq_alpha_beta(model, parameters, x, y, weight, constraints=None,
         return chisq, alpha, beta
 
 
+def _parse_constraints(constraints, nparameters):
+    """Convert constraints to a list of lists with numerical codes.
+
+    :param constraints: None or 2D sequence of dimension (n_parameters, 3),
+        as described in :func:`leastsq`. Codes can be provided as text.
+    :param int nparameters: Number of parameters
+    :return: Tuple (constraints, constrained_fit) with the converted
+        constraints (None if no constraints were provided) and a boolean
+        telling if at least one parameter is not free.
+    :raise ValueError: If a constraint is unknown
+    """
+    constrained_fit = False
+    if constraints is not None:
+        # make sure we work with a list of lists
+        input_constraints = constraints
+        tmp_constraints = [None] * len(input_constraints)
+        for i in range(nparameters):
+            tmp_constraints[i] = list(input_constraints[i])
+        constraints = tmp_constraints
+        for i in range(nparameters):
+            if hasattr(constraints[i][0], "upper"):
+                txt = constraints[i][0].upper()
+                if txt == "FREE":
+                    constraints[i][0] = CFREE
+                elif txt == "POSITIVE":
+                    constraints[i][0] = CPOSITIVE
+                elif txt == "QUOTED":
+                    constraints[i][0] = CQUOTED
+                elif txt == "FIXED":
+                    constraints[i][0] = CFIXED
+                elif txt == "FACTOR":
+                    constraints[i][0] = CFACTOR
+                    constraints[i][1] = int(constraints[i][1])
+                elif txt == "DELTA":
+                    constraints[i][0] = CDELTA
+                    constraints[i][1] = int(constraints[i][1])
+                elif txt == "SUM":
+                    constraints[i][0] = CSUM
+                    constraints[i][1] = int(constraints[i][1])
+                elif txt in ["IGNORED", "IGNORE"]:
+                    constraints[i][0] = CIGNORED
+                else:
+                    #I should raise an exception
+                    raise ValueError("Unknown constraint %s" % constraints[i][0])
+            if constraints[i][0] > 0:
+                constrained_fit = True
+    return constraints, constrained_fit
+
+
 def _get_parameters(parameters, constraints):
     """
     Apply constraints to input parameters.
@@ -834,6 +851,443 @@ def _get_sigma_parameters(parameters, sigma0, constraints):
     return sigma_par
 
 
+_BATCH_CHUNK_NBYTES = 64 * 1024 ** 2
+"""Approximate size of the Jacobian of a chunk of spectra fitted together
+by :func:`leastsq_batch`"""
+
+
+def leastsq_batch(model, xdata, ydata, p0, sigma=None,
+                  constraints=None, model_deriv=None, epsfcn=None,
+                  deltachi=None, full_output=False,
+                  left_derivative=False, max_iter=100,
+                  vectorized=True, max_workers=None, chunk_size=None):
+    """
+    Fit the same model to many spectra with the Levenberg-Marquardt
+    algorithm used by :func:`leastsq`.
+
+    All spectra of a chunk go through the iterations together: the model,
+    its derivatives and the linear systems are evaluated for all the
+    spectra which are not yet converged at once. Each spectrum keeps its
+    own damping factor, convergence state and number of iterations, so
+    the result of each fit is the one :func:`leastsq` would provide.
+
+    This is intended to fit maps of spectra, e.g. a XRF map of shape
+    ``(rows, columns, channels)``.
+
+    :param model: callable
+        The model function, f(x, ...). It takes the independent variable as
+        first argument and the parameters as separate remaining arguments.
+        If ``vectorized`` is True (default), each parameter is provided as
+        an array of shape (n, 1) and the model must return an array of
+        shape (n, M), one row per set of parameters. Else, it is called
+        with scalar parameters, as for :func:`leastsq`, once per spectrum.
+        The model must be picklable when ``max_workers`` is used.
+
+    :param xdata: An M-length sequence.
+        The independent variable where the data is measured.
+        It is shared by all the spectra.
+
+    :param ydata: Array of shape (..., M)
+        The spectra to fit, the last dimension being the data points.
+
+    :param p0: Array of shape (N, ) or (..., N)
+        Initial guess for the parameters, common to all spectra or
+        provided for each spectrum.
+
+    :param sigma: None, or array of shape (M, ) or (..., M)
+        The uncertainties in ydata, common to all spectra or provided for
+        each spectrum. If None, the uncertainties are assumed to be 1.
+
+    :param constraints: None or 2D sequence of dimension (n_parameters, 3)
+        The constraints applied to all the spectra, as described in
+        :func:`leastsq`. Initial values of QUOTED parameters are clipped
+        to their limits.
+
+    :param model_deriv:
+        None (default) or function providing the derivatives of the model
+        with respect to the fitted parameters. It is called as
+        ``model_deriv(xdata, parameters, index)`` where parameters is an
+        array of shape (n, N) and must return an array of shape (n, M).
+    :type model_deriv: *optional*, None or callable
+
+    :param float epsfcn: See :func:`leastsq`
+    :param float deltachi: See :func:`leastsq`
+    :param bool full_output: True to also return a dictionary with
+        additional outputs
+    :param bool left_derivative: See :func:`leastsq`
+    :param int max_iter: Maximum number of iterations (default is 100)
+    :param bool vectorized: True if the model function is able to evaluate
+        many sets of parameters at once (see ``model``).
+    :param int max_workers: If greater than 1, the chunks of spectra are
+        fitted in this number of processes.
+    :param int chunk_size: Number of spectra fitted together.
+        The default is computed from the size of the data.
+
+    :return: Returns a tuple of length 3 (or 4 if full_ouput is True) with the content:
+
+         ``parameters``: array of shape (..., N)
+           The fitted parameters of each spectrum
+         ``uncertainties``: array of shape (..., N)
+           The uncertainties on the fitted parameters, as provided
+           in the ``uncertainties`` output of :func:`leastsq`
+         ``chisq``: array of shape (...)
+           The chi square of each fit
+         ``infodict``: dict
+           a dictionary of optional outputs with the keys:
+
+            ``reduced_chisq``
+                The chi square divided by the number of degrees of freedom
+            ``niter``
+                The number of iterations performed for each spectrum
+
+    :raise ValueError: If the input data is not finite or if the shapes
+        are not consistent
+    """
+    ydata = numpy.asarray_chkfinite(ydata, dtype=numpy.float64)
+    if ydata.ndim < 2:
+        raise ValueError("ydata must be an array of spectra")
+    map_shape = ydata.shape[:-1]
+    n_points = ydata.shape[-1]
+    ydata = ydata.reshape(-1, n_points)
+    n_spectra = ydata.shape[0]
+    xdata = numpy.asarray_chkfinite(xdata)
+
+    p0 = numpy.asarray(p0, dtype=numpy.float64)
+    n_param = p0.shape[-1]
+    parameters = numpy.empty(map_shape + (n_param, ), dtype=numpy.float64)
+    parameters[...] = p0
+    parameters.shape = -1, n_param
+
+    if sigma is None:
+        weight = numpy.ones((1, n_points), dtype=numpy.float64)
+    else:
+        sigma = numpy.asarray_chkfinite(sigma, dtype=numpy.float64)
+        weight = 1.0 / (sigma + numpy.equal(sigma, 0))
+        weight = weight * weight
+        if weight.ndim == 1:
+            weight = weight.reshape(1, n_points)
+        else:
+            weights = numpy.empty(map_shape + (n_points, ), dtype=numpy.float64)
+            weights[...] = weight
+            weights.shape = -1, n_points
+            weight = weights
+
+    if deltachi is None:
+        deltachi = 0.001
+    if epsfcn is None:
+        epsfcn = numpy.finfo(numpy.float).eps
+    else:
+        epsfcn = max(epsfcn, numpy.finfo(numpy.float).eps)
+
+    constraints, _constrained_fit = _parse_constraints(constraints, n_param)
+    if constraints is None:
+        constraints = [[CFREE, 0, 0] for _i in range(n_param)]
+    n_free = len([c for c in constraints
+                  if c[0] in (CFREE, CPOSITIVE, CQUOTED)])
+    if n_free == 0:
+        raise ValueError("No free parameters to fit")
+
+    if chunk_size is None:
+        chunk_size = _BATCH_CHUNK_NBYTES // (8 * n_points * (n_free + 2))
+        if max_workers is not None and max_workers > 1:
+            chunk_size = min(chunk_size, -(-n_spectra // max_workers))
+    chunk_size = max(1, int(chunk_size))
+
+    fit_chunk = functools.partial(
+        _leastsq_batch_chunk, model, xdata,
+        constraints=constraints, model_deriv=model_deriv, epsfcn=epsfcn,
+        deltachi=deltachi, left_derivative=left_derivative,
+        max_iter=max_iter, vectorized=vectorized)
+
+    chunks = []
+    for start in range(0, n_spectra, chunk_size):
+        stop = start + chunk_size
+        chunk_weight = weight if len(weight) == 1 else weight[start:stop]
+        chunks.append((ydata[start:stop], chunk_weight, parameters[start:stop]))
+
+    if max_workers is not None and max_workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(fit_chunk, *zip(*chunks)))
+    else:
+        results = [fit_chunk(*chunk) for chunk in chunks]
+
+    fittedpar = numpy.concatenate([r[0] for r in results])
+    uncertainties = numpy.concatenate([r[1] for r in results])
+    chisq = numpy.concatenate([r[2] for r in results])
+    niter = numpy.concatenate([r[3] for r in results])
+
+    fittedpar.shape = map_shape + (n_param, )
+    uncertainties.shape = map_shape + (n_param, )
+    chisq.shape = map_shape
+    if not full_output:
+        return fittedpar, uncertainties, chisq
+
+    niter.shape = map_shape
+    ddict = {}
+    ddict["reduced_chisq"] = chisq / (n_points - n_free)
+    ddict["niter"] = niter
+    return fittedpar, uncertainties, chisq, ddict
+
+
+def _batch_evaluate(model, xdata, parameters, noigno, n_points, vectorized):
+    """Evaluate the model for many sets of parameters.
+
+    :param numpy.ndarray parameters: Parameters of shape (n, N)
+    :return: Array of shape (n, n_points)
+    """
+    parameters = parameters[:, noigno]
+    if vectorized:
+        result = model(xdata, *[parameters[:, i:i + 1]
+                                for i in range(parameters.shape[1])])
+        result = numpy.asarray(result, dtype=numpy.float64)
+        if result.shape != (len(parameters), n_points):
+            values = numpy.empty((len(parameters), n_points), numpy.float64)
+            values[...] = result.reshape(-1, n_points)
+            result = values
+        return result
+    result = numpy.empty((len(parameters), n_points), dtype=numpy.float64)
+    for i, par in enumerate(parameters):
+        result[i] = numpy.asarray(model(xdata, *par)).reshape(-1)
+    return result
+
+
+def _batch_solve(alpha, beta):
+    """Solve a stack of linear systems ``alpha . x = beta``.
+
+    Singular systems get a NaN solution instead of raising an error.
+    """
+    try:
+        return numpy.linalg.solve(alpha, beta[..., None])[..., 0]
+    except LinAlgError:
+        result = numpy.empty_like(beta)
+        for i in range(len(alpha)):
+            try:
+                result[i] = numpy.linalg.solve(alpha[i], beta[i])
+            except LinAlgError:
+                result[i] = numpy.nan
+        return result
+
+
+def _batch_inv(alpha):
+    """Invert a stack of matrices, singular ones are set to NaN."""
+    try:
+        return numpy.linalg.inv(alpha)
+    except LinAlgError:
+        result = numpy.empty_like(alpha)
+        for i in range(len(alpha)):
+            try:
+                result[i] = inv(alpha[i])
+            except LinAlgError:
+                result[i] = numpy.nan
+        return result
+
+
+def _get_batch_parameters(parameters, constraints):
+    """Version of :func:`_get_parameters` applied to an array of shape (n, N)
+    of parameters, one row per spectrum."""
+    newparam = parameters.copy()
+    for i, constraint in enumerate(constraints):
+        if constraint[0] == CPOSITIVE:
+            newparam[:, i] = abs(newparam[:, i])
+    for i, constraint in enumerate(constraints):
+        if constraint[0] == CFACTOR:
+            newparam[:, i] = constraint[2] * newparam[:, int(constraint[1])]
+        elif constraint[0] == CDELTA:
+            newparam[:, i] = constraint[2] + newparam[:, int(constraint[1])]
+        elif constraint[0] == CIGNORED:
+            newparam[:, i] = 0
+        elif constraint[0] == CSUM:
+            newparam[:, i] = constraint[2] - newparam[:, int(constraint[1])]
+    return newparam
+
+
+def _get_batch_sigma_parameters(parameters, sigma0, constraints, free_index):
+    """Version of :func:`_get_sigma_parameters` applied to arrays of
+    parameters and uncertainties, one row per spectrum."""
+    sigma_par = numpy.zeros(parameters.shape, numpy.float64)
+    for i, constraint in enumerate(constraints):
+        if constraint[0] in (CFREE, CPOSITIVE):
+            sigma_par[:, i] = sigma0[:, free_index.index(i)]
+        elif constraint[0] == CQUOTED:
+            par = parameters[:, i]
+            if i not in free_index:
+                sigma_par[:, i] = par
+                continue
+            pmax = max(constraint[1], constraint[2])
+            pmin = min(constraint[1], constraint[2])
+            B = 0.5 * (pmax - pmin)
+            inside = (par < pmax) & (par > pmin)
+            sigma = sigma0[:, free_index.index(i)]
+            sigma_par[:, i] = numpy.where(
+                inside, abs(B * numpy.cos(par) * sigma), par)
+        elif abs(constraint[0]) == CFIXED:
+            sigma_par[:, i] = parameters[:, i]
+    for i, constraint in enumerate(constraints):
+        if constraint[0] == CFACTOR:
+            sigma_par[:, i] = constraint[2] * sigma_par[:, int(constraint[1])]
+        elif constraint[0] in (CDELTA, CSUM):
+            sigma_par[:, i] = sigma_par[:, int(constraint[1])]
+    return sigma_par
+
+
+def _leastsq_batch_chunk(model, xdata, ydata, weight, parameters,
+                         constraints, model_deriv, epsfcn, deltachi,
+                         left_derivative, max_iter, vectorized):
+    """Fit a chunk of spectra for :func:`leastsq_batch`.
+
+    :return: Tuple (parameters, uncertainties, chisq, niter)
+    """
+    n_spectra, n_points = ydata.shape
+
+    def get_weight(index):
+        # weight is either shared by all spectra or provided per spectrum
+        return weight if len(weight) == 1 else weight[index]
+
+    free_index = []
+    noigno = []
+    for i, constraint in enumerate(constraints):
+        if constraint[0] != CIGNORED:
+            noigno.append(i)
+        if constraint[0] in (CFREE, CPOSITIVE):
+            free_index.append(i)
+        elif constraint[0] == CQUOTED:
+            pmax = max(constraint[1], constraint[2])
+            pmin = min(constraint[1], constraint[2])
+            if (pmax - pmin) > 0:
+                parameters[:, i] = numpy.clip(parameters[:, i], pmin, pmax)
+                free_index.append(i)
+    n_free = len(free_index)
+    if n_free == 0:
+        raise ValueError("No free parameters to fit")
+
+    # Parameters of QUOTED constraints, per free parameter
+    quoted = {}
+    for k, i in enumerate(free_index):
+        if constraints[i][0] == CQUOTED:
+            pmax = max(constraints[i][1], constraints[i][2])
+            pmin = min(constraints[i][1], constraints[i][2])
+            quoted[k] = 0.5 * (pmax + pmin), 0.5 * (pmax - pmin)
+
+    def evaluate(par):
+        return _batch_evaluate(model, xdata, par, noigno, n_points, vectorized)
+
+    def free_parameters(par):
+        fitparam = par[:, free_index]
+        for k, i in enumerate(free_index):
+            if constraints[i][0] == CPOSITIVE:
+                fitparam[:, k] = abs(fitparam[:, k])
+        return fitparam
+
+    def alpha_beta(index):
+        """Compute chisq, alpha and beta of a subset of spectra
+        (see :func:`chisq_alpha_beta`)"""
+        par = fittedpar[index]
+        fitparam = free_parameters(par)
+        derivfactor = numpy.ones(fitparam.shape, numpy.float64)
+        for k, (A, B) in quoted.items():
+            arg = numpy.clip((fitparam[:, k] - A) / B, -1, 1)
+            derivfactor[:, k] = B * numpy.cos(numpy.arcsin(arg))
+        delta = (fitparam + numpy.equal(fitparam, 0.0)) * numpy.sqrt(epsfcn)
+        f0 = yfit[index]
+
+        pwork = par.copy()
+        pwork[:, free_index] = fitparam
+        deriv = numpy.empty((len(index), n_free, n_points), numpy.float64)
+        for k, i in enumerate(free_index):
+            if model_deriv is None:
+                pwork[:, i] = fitparam[:, k] + delta[:, k]
+                f1 = evaluate(_get_batch_parameters(pwork, constraints))
+                if left_derivative:
+                    pwork[:, i] = fitparam[:, k] - delta[:, k]
+                    f2 = evaluate(_get_batch_parameters(pwork, constraints))
+                    deriv[:, k] = (f1 - f2) / (2.0 * delta[:, k, None])
+                else:
+                    deriv[:, k] = (f1 - f0) / delta[:, k, None]
+                pwork[:, i] = fitparam[:, k]
+            else:
+                deriv[:, k] = model_deriv(xdata, pwork, i)
+            deriv[:, k] *= derivfactor[:, k, None]
+
+        deltay = ydata[index] - f0
+        help0 = get_weight(index) * deltay
+        alpha = numpy.einsum("nim,njm->nij",
+                             deriv * get_weight(index)[:, None, :], deriv)
+        beta = numpy.einsum("nim,nm->ni", deriv, help0)
+        chisq = (help0 * deltay).sum(axis=1)
+        return chisq, alpha, beta
+
+    # Levenberg-Marquardt algorithm, each spectrum has its own state
+    fittedpar = _get_batch_parameters(parameters, constraints)
+    yfit = evaluate(fittedpar)
+    flambda = numpy.full(n_spectra, 0.001)
+    remaining_iter = numpy.full(n_spectra, max_iter, dtype=numpy.int64)
+    niter = numpy.zeros(n_spectra, dtype=numpy.int64)
+    chisq0 = numpy.zeros(n_spectra, numpy.float64)
+    alpha0 = numpy.zeros((n_spectra, n_free, n_free), numpy.float64)
+    beta0 = numpy.zeros((n_spectra, n_free), numpy.float64)
+    active = numpy.ones(n_spectra, dtype=bool)
+    need_alpha = numpy.ones(n_spectra, dtype=bool)
+    identity = numpy.identity(n_free)
+    min_absdeltachi = numpy.sqrt(epsfcn)
+
+    while active.any():
+        index = numpy.nonzero(active & need_alpha)[0]
+        if len(index) > 0:
+            chisq0[index], alpha0[index], beta0[index] = alpha_beta(index)
+            niter[index] += 1
+            need_alpha[index] = False
+
+        index = numpy.nonzero(active)[0]
+        alpha = alpha0[index] * (1.0 + flambda[index, None, None] * identity)
+        deltapar = _batch_solve(alpha, beta0[index])
+
+        fitparam = free_parameters(fittedpar[index])
+        newpar = fittedpar[index]
+        for k, i in enumerate(free_index):
+            if k in quoted:
+                A, B = quoted[k]
+                arg = numpy.clip((fitparam[:, k] - A) / B, -1, 1)
+                newpar[:, i] = A + B * numpy.sin(numpy.arcsin(arg) + deltapar[:, k])
+            else:
+                newpar[:, i] = fitparam[:, k] + deltapar[:, k]
+        newpar = _get_batch_parameters(newpar, constraints)
+        newyfit = evaluate(newpar)
+        chisq = (get_weight(index) * (ydata[index] - newyfit) ** 2).sum(axis=1)
+        absdeltachi = chisq0[index] - chisq
+
+        # NaN chisq (e.g. singular system) are rejected
+        accepted = absdeltachi >= 0
+        rejected = ~accepted
+
+        rejected_index = index[rejected]
+        flambda[rejected_index] *= 10.0
+        active[rejected_index[flambda[rejected_index] > 1000]] = False
+
+        accepted_index = index[accepted]
+        absdeltachi = absdeltachi[accepted]
+        chisq = chisq[accepted]
+        fittedpar[accepted_index] = newpar[accepted]
+        yfit[accepted_index] = newyfit[accepted]
+        lastdeltachi = 100 * (absdeltachi / (chisq + (chisq == 0)))
+        # the first iteration *has* to improve the fit
+        converged = (niter[accepted_index] >= 2) & (
+            (lastdeltachi < deltachi) | (absdeltachi < min_absdeltachi))
+        chisq0[accepted_index] = chisq
+        flambda[accepted_index] /= 10.0
+        need_alpha[accepted_index] = True
+        active[accepted_index[converged]] = False
+
+        remaining_iter[index] -= 1
+        active[index[remaining_iter[index] <= 0]] = False
+
+    # uncertainties of the actually fitted parameters
+    cov0 = _batch_inv(alpha0)
+    sigma0 = numpy.sqrt(abs(numpy.diagonal(cov0, axis1=1, axis2=2)))
+    uncertainties = _get_batch_sigma_parameters(
+        fittedpar, sigma0, constraints, free_index)
+    return fittedpar, uncertainties, chisq0, niter
+
+
 def main(argv=None):
     if argv is None:
         npoints = 10000
@@ -37,7 +37,8 @@ from silx.math.fit import filters
 _logger = logging.getLogger(__name__)
 
 cimport cython
-from libc.stdlib cimport free
+from cython.parallel import prange
+from libc.stdlib cimport calloc, free
 
 cimport silx.math.fit.peaks_wrapper as peaks_wrapper
 
@@ -131,6 +132,121 @@ def peak_search(y, fwhm, sensitivity=3.5,
         return list(zip(peaks, relevances))
 
 
+cdef long _seek_spectrum(double* spectrum, long n_channels,
+                         long begin_index, long end_index,
+                         double fwhm, double sensitivity,
+                         double** peaks, double** relevances) nogil:
+    """Run the peak search on a spectrum. Spectra containing only zeros have
+    no peak."""
+    cdef:
+        long i
+
+    for i in range(n_channels):
+        if spectrum[i] != 0:
+            return peaks_wrapper.seek(begin_index, end_index, n_channels,
+                                      fwhm, sensitivity, 0,
+                                      spectrum, peaks, relevances)
+    return 0
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def peak_search_along_axis(data, fwhm, sensitivity=3.5,
+                           begin_index=None, end_index=None, axis=-1):
+    """Find peaks in all the spectra of a N-dimensional array.
+
+    This is the same as calling :func:`peak_search` on each spectrum, but
+    the spectra are processed in parallel with OpenMP.
+
+    The peaks are returned as sparse rows, in the CSR (compressed sparse
+    row) layout: the indices and relevances of the peaks of spectrum
+    ``i`` are ``peaks[indptr[i]:indptr[i+1]]`` and
+    ``relevances[indptr[i]:indptr[i+1]]``.
+    Spectra are numbered in the C order of *data* without *axis*.
+
+    :param data: N-dimensional array of spectra
+    :type data: numpy.ndarray
+    :param fwhm: Estimated full width at half maximum of the typical peaks we
+        are interested in (expressed in number of samples)
+    :param sensitivity: Threshold factor used for peak detection.
+        See :func:`peak_search`.
+    :param begin_index: Index of the first sample of the region of interest
+         in the spectra. If ``None``, start from the first sample.
+    :param end_index: Index of the last sample of the region of interest in
+        the spectra. If ``None``, process until the last sample.
+    :param int axis: Axis of the spectra in *data*. Default: last axis
+    :return: Tuple of 1D arrays ``(indptr, peaks, relevances)``
+    :raise: ``MemoryError`` if the memory for the peaks could not be
+        allocated.
+    """
+    cdef:
+        double[:, ::1] spectra_c
+        long[::1] n_peaks_c
+        long[::1] indptr_c
+        double[::1] peaks_out
+        double[::1] relevances_out
+        double** peaks_c
+        double** relevances_c
+        long n_spectra, n_channels, i, j
+        long begin_c, end_c
+        double fwhm_c = fwhm
+        double sensitivity_c = sensitivity
+
+    data = numpy.asarray(data)
+    if data.ndim == 0:
+        raise TypeError("data must be at least 1-dimensional")
+    n_channels = data.shape[axis]
+    # The peak search modifies its input, always work on a copy
+    spectra = numpy.array(numpy.rollaxis(data, axis, data.ndim),
+                          copy=True, dtype=numpy.float64, order='C')
+    spectra_c = spectra.reshape(-1, n_channels)
+    n_spectra = spectra_c.shape[0]
+
+    begin_c = 0 if begin_index is None else begin_index
+    end_c = n_channels - 1 if end_index is None else end_index
+
+    n_peaks_c = numpy.zeros(n_spectra, dtype=numpy.int_)
+    peaks_c = <double**> calloc(max(n_spectra, 1), sizeof(double*))
+    relevances_c = <double**> calloc(max(n_spectra, 1), sizeof(double*))
+    if peaks_c == NULL or relevances_c == NULL:
+        free(peaks_c)
+        free(relevances_c)
+        raise MemoryError("Failed to allocate memory for output arrays")
+
+    try:
+        for i in prange(n_spectra, nogil=True, schedule='dynamic'):
+            n_peaks_c[i] = _seek_spectrum(&spectra_c[i, 0], n_channels,
+                                          begin_c, end_c,
+                                          fwhm_c, sensitivity_c,
+                                          &peaks_c[i], &relevances_c[i])
+
+        # Negative values mean memory allocation errors, see peak_search
+        if n_spectra and numpy.min(n_peaks_c) < 0:
+            raise MemoryError("Failed to allocate memory for output arrays")
+
+        indptr = numpy.zeros(n_spectra + 1, dtype=numpy.int_)
+        numpy.cumsum(n_peaks_c, out=indptr[1:])
+        indptr_c = indptr
+        peaks = numpy.empty(indptr_c[n_spectra], dtype=numpy.float64)
+        relevances = numpy.empty(indptr_c[n_spectra], dtype=numpy.float64)
+        if indptr_c[n_spectra]:
+            peaks_out = peaks
+            relevances_out = relevances
+            with nogil:
+                for i in range(n_spectra):
+                    for j in range(n_peaks_c[i]):
+                        peaks_out[indptr_c[i] + j] = peaks_c[i][j]
+                        relevances_out[indptr_c[i] + j] = relevances_c[i][j]
+    finally:
+        for i in range(n_spectra):
+            free(peaks_c[i])
+            free(relevances_c[i])
+        free(peaks_c)
+        free(relevances_c)
+
+    return indptr, peaks, relevances
+
+
 def guess_fwhm(y):
     """Return the full-width at half maximum for the largest peak in
     the data array.
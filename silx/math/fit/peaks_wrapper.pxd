@@ -28,7 +28,7 @@ __date__ = "22/06/2016"
 
 cimport cython
 
-cdef extern from "peaks.h":
+cdef extern from "peaks.h" nogil:
     long seek(long begin_index,
               long end_index,
               long nsamples,
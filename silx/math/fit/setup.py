@@ -61,7 +61,9 @@ def configuration(parent_package='', top_path=None):
     config.add_extension('filters',
                          sources=filt_src,
                          include_dirs=filt_inc,
-                         language='c')
+                         language='c',
+                         extra_link_args=['-fopenmp'],
+                         extra_compile_args=['-fopenmp'])
 
     # =====================================
     # peaks
@@ -73,7 +75,9 @@ def configuration(parent_package='', top_path=None):
     config.add_extension('peaks',
                          sources=peaks_src,
                          include_dirs=peaks_inc,
-                         language='c')
+                         language='c',
+                         extra_link_args=['-fopenmp'],
+                         extra_compile_args=['-fopenmp'])
     # =====================================
     # =====================================
     return config
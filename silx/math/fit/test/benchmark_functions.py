@@ -0,0 +1,134 @@
+# coding: utf-8
+# /*##########################################################################
+# Copyright (C) 2018 European Synchrotron Radiation Facility
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# ############################################################################*/
+"""Benchmarks of the analytic jacobians of the fit functions against
+numerical derivatives"""
+
+from __future__ import division
+
+__authors__ = ["P. Knobel"]
+__license__ = "MIT"
+__date__ = "19/10/2018"
+
+
+import logging
+import time
+import unittest
+
+import numpy
+
+from silx.math.fit import functions
+from silx.math.fit import fitmanager
+from silx.math.fit import fittheories
+from silx.math.fit.leastsq import leastsq
+
+_logger = logging.getLogger(__name__)
+_logger.setLevel(logging.DEBUG)
+
+
+class BenchmarkJacobians(unittest.TestCase):
+    """Compare fits using the analytic jacobians with fits using numerical
+    derivatives."""
+
+    NB_PEAKS = 20
+    """Number of peaks in the synthetic spectrum"""
+
+    NB_POINTS = 4096
+
+    def setUp(self):
+        self.x = numpy.arange(self.NB_POINTS).astype(numpy.float64)
+        positions = numpy.linspace(100, self.NB_POINTS - 100, self.NB_PEAKS)
+        self.params = []
+        for i, position in enumerate(positions):
+            self.params += [1000. + 100 * i, position, 20. + i, 0.3]
+        self.y = functions.sum_pvoigt(self.x, *self.params)
+        # start from slightly wrong parameters
+        self.p0 = []
+        for i in range(self.NB_PEAKS):
+            height, position, fwhm, eta = self.params[4 * i:4 * i + 4]
+            self.p0 += [1.05 * height, position + 2, 1.1 * fwhm, 0.5]
+
+    def test_benchmark_jacobian(self):
+        nb_repeats = 10
+        start = time.time()
+        for _ in range(nb_repeats):
+            functions.sum_pvoigt_jacobian(self.x, *self.params)
+        duration = (time.time() - start) / nb_repeats
+        _logger.info("Analytic jacobian (%d parameters): %.4fs",
+                     len(self.params), duration)
+
+        start = time.time()
+        for _ in range(nb_repeats):
+            for i in range(len(self.params)):
+                params = list(self.params)
+                params[i] *= 1. + 1e-8
+                functions.sum_pvoigt(self.x, *params)
+        duration = (time.time() - start) / nb_repeats
+        _logger.info("Numerical jacobian (%d parameters): %.4fs",
+                     len(self.params), duration)
+
+    def test_benchmark_leastsq(self):
+        derivative = fittheories.derivative_from_jacobian(
+            functions.sum_pvoigt_jacobian)
+        for label, model_deriv in (("numerical derivatives", None),
+                                   ("analytic derivatives", derivative)):
+            start = time.time()
+            params, _, infodict = leastsq(functions.sum_pvoigt,
+                                          self.x, self.y, self.p0,
+                                          model_deriv=model_deriv,
+                                          full_output=True)
+            duration = time.time() - start
+            _logger.info("leastsq with %s: %.3fs (%d iterations)",
+                         label, duration, infodict["niter"])
+            self.assertTrue(numpy.allclose(params, self.params, rtol=1e-3))
+
+    def test_benchmark_fitmanager(self):
+        for theory_name in ("Pseudo-Voigt Line", "Numerical derivatives"):
+            fit = fitmanager.FitManager()
+            fit.setdata(x=self.x, y=self.y + 10.)
+            fit.loadtheories(fittheories)
+            theory = fit.theories["Pseudo-Voigt Line"]
+            fit.addtheory("Numerical derivatives",
+                          function=theory.function,
+                          parameters=theory.parameters,
+                          estimate=theory.estimate,
+                          configure=theory.configure)
+            fit.settheory(theory_name)
+            fit.setbackground("Constant")
+            fit.estimate()
+            start = time.time()
+            fit.runfit()
+            duration = time.time() - start
+            _logger.info("FitManager.runfit (%s): %.3fs (%d iterations)",
+                         theory_name, duration, fit.niter)
+
+
+def suite():
+    test_suite = unittest.TestSuite()
+    test_suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromTestCase(BenchmarkJacobians))
+    return test_suite
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest="suite")
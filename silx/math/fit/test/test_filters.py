@@ -122,7 +122,99 @@ class TestSmooth(unittest.TestCase):
                                        expected_smooth[i, j])
 
 
-test_cases = (TestSmooth,)
+class TestStrip(unittest.TestCase):
+    """Compare strip with a direct numpy implementation of the algorithm"""
+    @staticmethod
+    def _strip(y, w, niterations, factor, anchors):
+        y = numpy.array(y, dtype=numpy.float64)
+        indices = numpy.arange(w, len(y) - w)
+        for anchor in anchors:
+            indices = indices[abs(indices - anchor) >= w]
+        for i in range(niterations):
+            mean = 0.5 * (y[indices - w] + y[indices + w])
+            stripped = y[indices] > factor * mean
+            y[indices[stripped]] = mean[stripped]
+        return y
+
+    def testStrip(self):
+        x = numpy.arange(300)
+        y = functions.sum_gauss(x, 50, 100, 20, 20, 250, 40) + 10 + 0.1 * x
+        y = add_relative_noise(y, 5.)
+        for w, niterations, factor, anchors in ((1, 1, 1.0, []),
+                                               (2, 100, 1.0, []),
+                                               (3, 10000, 1.0, []),
+                                               (2, 100, 0.9, [30, 110]),
+                                               (4, 1000, 1.1, [0, 299])):
+            result = filters.strip(y, w=w, niterations=niterations,
+                                   factor=factor, anchors=anchors)
+            expected = self._strip(y, w, niterations, factor, anchors)
+            self.assertTrue(numpy.allclose(result, expected))
+
+    def testTooShort(self):
+        y = [1., 5., 1., 1.]
+        self.assertTrue(numpy.array_equal(filters.strip(y, w=2), y))
+
+
+class TestAlongAxis(unittest.TestCase):
+    """Test that the functions processing a stack of spectra give the same
+    result as the 1D functions applied to each spectrum."""
+    def setUp(self):
+        x = numpy.arange(500)
+        step_params = (50, 100, 20,
+                       20, 250, 40,
+                       40, 400, 30)
+        spectra = []
+        for i in range(12):
+            y = functions.sum_gauss(x, *step_params) + 10 + 0.1 * i * x
+            spectra.append(add_relative_noise(y, 5.))
+        self.spectra = numpy.array(spectra).reshape(3, 4, 500)
+
+    def tearDown(self):
+        self.spectra = None
+
+    def _check(self, function, batch_function, *args, **kwargs):
+        expected = numpy.empty_like(self.spectra)
+        for i in range(3):
+            for j in range(4):
+                expected[i, j] = function(self.spectra[i, j], *args, **kwargs)
+
+        result = batch_function(self.spectra, *args, **kwargs)
+        self.assertTrue(numpy.allclose(result, expected))
+
+        # Spectra along first axis, in a preallocated output
+        data = numpy.rollaxis(self.spectra, 2)
+        out = numpy.empty(data.shape, dtype=numpy.float64)
+        result = batch_function(data, *args, axis=0, out=out, **kwargs)
+        self.assertIs(result, out)
+        self.assertTrue(numpy.allclose(numpy.rollaxis(out, 0, 3), expected))
+
+    def testStripAlongAxis(self):
+        self._check(filters.strip, filters.strip_along_axis,
+                    w=2, niterations=500, factor=1.0)
+
+    def testStripAlongAxisInPlace(self):
+        expected = filters.strip_along_axis(self.spectra, w=2)
+        result = filters.strip_along_axis(self.spectra, w=2, out=self.spectra)
+        self.assertIs(result, self.spectra)
+        self.assertTrue(numpy.array_equal(result, expected))
+
+    def testStripAlongAxisAnchors(self):
+        self._check(filters.strip, filters.strip_along_axis,
+                    anchors=[150, 300])
+
+    def testSnip1dAlongAxis(self):
+        self._check(filters.snip1d, filters.snip1d_along_axis, 30)
+
+    def testSmooth1dAlongAxis(self):
+        self._check(filters.smooth1d, filters.smooth1d_along_axis)
+
+    def testWrongOutput(self):
+        with self.assertRaises(ValueError):
+            filters.smooth1d_along_axis(self.spectra,
+                                        out=numpy.empty((3, 4)))
+
+
+test_cases = (TestSmooth, TestStrip, TestAlongAxis)
 
 
 def suite():
@@ -372,7 +372,67 @@ class Test_leastsq(unittest.TestCase):
                                        parameters_estimate[i])
 
 
-test_cases = (Test_leastsq,)
+class Test_leastsq_batch(unittest.TestCase):
+    """
+    Unit tests of the leastsq_batch function.
+    """
+
+    def setUp(self):
+        def gauss(x, *params):
+            dummy = 2.3548200450309493 * (x - params[3]) / params[4]
+            return params[0] + params[1] * x + \
+                params[2] * numpy.exp(-0.5 * dummy * dummy)
+
+        self.gauss = gauss
+        self.x = numpy.arange(200.)
+        state = numpy.random.RandomState(0)
+        n = 12
+        self.parameters_actual = numpy.column_stack([
+            state.uniform(5, 15, n), state.uniform(0, 0.1, n),
+            state.uniform(500, 1500, n), state.uniform(90, 110, n),
+            state.uniform(10, 30, n)])
+        params = [self.parameters_actual[:, i:i + 1] for i in range(5)]
+        self.y = gauss(self.x, *params) + state.normal(0, 1, (n, len(self.x)))
+        self.parameters_estimate = [10., 0.05, 900., 100., 20.]
+
+    def tearDown(self):
+        self.gauss = None
+
+    def testSameAsLeastsq(self):
+        from silx.math.fit import leastsq, leastsq_batch
+        sigma = numpy.sqrt(abs(self.y) + 1)
+        constraints_list = [
+            None,
+            [[0, 0, 0], [0, 0, 0], [1, 0, 0], [2, 80, 120], [0, 0, 0]],
+            [[3, 0, 0], [0, 0, 0], [1, 0, 0], [0, 0, 0], [0, 0, 0]]]
+        for constraints in constraints_list:
+            fittedpar, uncertainties, chisq = leastsq_batch(
+                self.gauss, self.x, self.y, self.parameters_estimate,
+                sigma=sigma, constraints=constraints)
+            for i in range(len(self.y)):
+                ref, cov, infodict = leastsq(
+                    self.gauss, self.x, self.y[i], self.parameters_estimate,
+                    sigma=sigma[i], constraints=constraints, full_output=True)
+                self.assertTrue(numpy.allclose(fittedpar[i], ref))
+                self.assertTrue(numpy.allclose(uncertainties[i],
+                                               infodict["uncertainties"]))
+                self.assertAlmostEqual(chisq[i], infodict["chisq"])
+
+    def testMap(self):
+        from silx.math.fit import leastsq_batch
+        ydata = self.y.reshape(3, 4, -1)
+        fittedpar, uncertainties, chisq, infodict = leastsq_batch(
+            self.gauss, self.x, ydata, self.parameters_estimate,
+            full_output=True, vectorized=False, chunk_size=5)
+        self.assertEqual(fittedpar.shape, (3, 4, 5))
+        self.assertEqual(uncertainties.shape, (3, 4, 5))
+        self.assertEqual(chisq.shape, (3, 4))
+        self.assertEqual(infodict["niter"].shape, (3, 4))
+        self.assertTrue(numpy.allclose(
+            fittedpar.reshape(-1, 5), self.parameters_actual, atol=1.))
+
+
+test_cases = (Test_leastsq, Test_leastsq_batch)
 
 def suite():
     loader = unittest.defaultTestLoader
@@ -33,7 +33,8 @@ from silx.math.fit import fitmanager
 from silx.math.fit import fittheories
 from silx.math.fit import bgtheories
 from silx.math.fit.fittheory import FitTheory
-from silx.math.fit.functions import sum_gauss, sum_stepdown, sum_stepup
+from silx.math.fit.functions import sum_gauss, sum_stepdown, sum_stepup, \
+    sum_pvoigt
 
 from silx.test.utils import temp_dir
 
@@ -381,6 +382,199 @@ class TestFitmanager(unittest.TestCase):
                                        _order_of_magnitude(p[i]))
 
 
+    def testAnalyticDerivative(self):
+        """Compare fit results obtained with the analytic derivatives of a
+        theory and with numerical derivatives, with a background and
+        constraints tying parameters together"""
+        x = numpy.arange(1000).astype(numpy.float)
+        p = [1000, 100., 95,
+             255, 650., 95,
+             1500, 800.5, 95]
+        y = 2.65 * x + 13 + sum_pvoigt(x, *[p[0], p[1], p[2], 0.3,
+                                            p[3], p[4], p[5], 0.3,
+                                            p[6], p[7], p[8], 0.3])
+
+        results = []
+        for theory_name in ('Pseudo-Voigt Line', 'Numerical derivatives'):
+            fit = fitmanager.FitManager()
+            fit.setdata(x=x, y=y)
+            fit.loadtheories(fittheories)
+            theory = fit.theories['Pseudo-Voigt Line']
+            fit.addtheory('Numerical derivatives',
+                          function=theory.function,
+                          parameters=theory.parameters,
+                          estimate=theory.estimate,
+                          configure=theory.configure)
+            fit.settheory(theory_name)
+            fit.setbackground('Linear')
+            # the configuration is shared by the default theories
+            self.addCleanup(fit.configure, SameFwhmFlag=False)
+            fit.configure(SameFwhmFlag=True)
+            fit.estimate()
+            self.assertIn('FACTOR', [param['code'] for param in fit.fit_results])
+            results.append(fit.runfit()[0])
+
+        self.assertTrue(numpy.allclose(results[0], results[1], rtol=1e-5))
+        self.assertAlmostEqual(results[0][0], 13, places=3)
+        self.assertAlmostEqual(results[0][1], 2.65, places=5)
+
+    def testDerivativeWithBackground(self):
+        """Check that a theory derivative is passed to leastsq as is,
+        with all the fit parameters, background parameters included"""
+        x = numpy.arange(100).astype(numpy.float)
+        y = 13 + sum_gauss(x, 100., 50., 10.)
+
+        calls = []
+
+        def myderiv(x_, parameters, index):
+            calls.append((len(parameters), index))
+            pars_plus = numpy.array(parameters, copy=True)
+            pars_plus[index] += 0.001
+            pars_minus = numpy.array(parameters, copy=True)
+            pars_minus[index] -= 0.001
+            return (fit.fitfunction(x_, *pars_plus) -
+                    fit.fitfunction(x_, *pars_minus)) / 0.002
+
+        fit = fitmanager.FitManager()
+        fit.setdata(x=x, y=y)
+        fit.addtheory('custom',
+                      function=sum_gauss,
+                      parameters=['Height', 'Position', 'FWHM'],
+                      derivative=myderiv)
+        fit.settheory('custom')
+        fit.setbackground('Constant')
+        fit.estimate()
+        fit.runfit()
+
+        self.assertTrue(calls)
+        self.assertEqual(set(calls), set((4, i) for i in range(4)))
+
+
+    def testFitBatch(self):
+        """Test fitting a series of curves, with a failing curve"""
+        x = numpy.arange(500).astype(numpy.float)
+        curves = []
+        for i in range(10):
+            p = [100. + 10 * i, 250. + i, 20.]
+            curves.append(2.65 * x + 13 + sum_gauss(x, *p))
+        curves[3] = numpy.zeros_like(x)
+        curves[5] = (x, curves[5])
+
+        fit = fitmanager.FitManager()
+        fit.loadtheories(fittheories)
+        fit.settheory('Gaussians')
+        fit.setbackground('Linear')
+
+        for max_workers in (None, 2):
+            chunks = list(fit.fit_batch(curves, nparameters=5,
+                                        max_workers=max_workers,
+                                        chunk_size=4))
+            self.assertEqual(len(chunks), 3)
+            results = numpy.concatenate(chunks)
+            self.assertEqual(list(results['index']), list(range(10)))
+            self.assertEqual(results['status'][3], 'Estimate failed')
+            self.assertEqual(results['nparameters'][3], 0)
+            self.assertTrue(numpy.all(numpy.isnan(results['parameters'][3])))
+            for i in (0, 1, 2, 4, 5, 6, 7, 8, 9):
+                self.assertEqual(results['status'][i], 'Ready')
+                self.assertEqual(results['nparameters'][i], 5)
+                self.assertTrue(numpy.allclose(
+                    results['parameters'][i],
+                    [13, 2.65, 100. + 10 * i, 250. + i, 20.], rtol=1e-4))
+                self.assertGreater(results['niter'][i], 0)
+
+        # the data of the fit manager is not modified
+        self.assertEqual(len(fit.ydata), 0)
+
+    def testBackgroundCache(self):
+        """Test that the strip background is computed once per fit,
+        and again when the data or the configuration change"""
+        x = numpy.arange(500).astype(numpy.float)
+        y = 2.65 * x + 13 + sum_gauss(x, 100., 250., 20.)
+
+        calls = []
+
+        def counting_strip_bg(x_, y_, width, niter):
+            calls.append(1)
+            return bgtheories.strip_bg(x_, y_, width, niter)
+
+        fit = fitmanager.FitManager()
+        fit.setdata(x=x, y=y)
+        fit.loadtheories(fittheories)
+        fit.addbgtheory('Counting strip',
+                        function=counting_strip_bg,
+                        parameters=['StripWidth', 'StripIterations'],
+                        estimate=bgtheories.estimate_strip)
+        fit.settheory('Gaussians')
+        fit.setbackground('Counting strip')
+        fit.estimate()
+        params, sigmas, infodict = fit.runfit()
+        self.assertGreater(infodict['niter'], 1)
+        self.assertEqual(len(calls), 1)
+
+        # same x array and parameters: cached background
+        background = fit.fitfunction(fit.xdata, params[0], params[1], 0., 250., 20.)
+        self.assertEqual(len(calls), 1)
+        # new x array
+        fit.fitfunction(x.copy(), *params)
+        self.assertEqual(len(calls), 2)
+
+        fit.setdata(x=x, y=y + 1)
+        fit.estimate()
+        fit.runfit()
+        self.assertEqual(len(calls), 3)
+        self.assertTrue(numpy.allclose(
+            fit.fitfunction(fit.xdata, params[0], params[1], 0., 250., 20.),
+            background + 1))
+
+    def testBackgroundCacheHits(self):
+        """Test that the background is always computed through the cache,
+        and that the cache is hit during a fit with a strip background"""
+        x = numpy.arange(500).astype(numpy.float)
+        y = 2.65 * x + 13 + sum_gauss(x, 100., 250., 20.)
+
+        fit = fitmanager.FitManager()
+        fit.setdata(x=x, y=y)
+        fit.loadtheories(fittheories)
+        fit.settheory('Gaussians')
+
+        background_calls = []
+        function_calls = []
+        _background = fit._background
+
+        def counting_background(x_, bg_pars):
+            background_calls.append(1)
+            return _background(x_, bg_pars)
+
+        fit._background = counting_background
+
+        def counting(bgfun):
+            def counting_bgfun(x_, y_, *pars):
+                # number of calls to _background when the function is called
+                function_calls.append(len(background_calls))
+                return bgfun(x_, y_, *pars)
+            return counting_bgfun
+
+        for name in ('Strip', 'Linear'):
+            fit.addbgtheory('Counting ' + name,
+                            function=counting(fit.bgtheories[name].function),
+                            parameters=fit.bgtheories[name].parameters,
+                            estimate=fit.bgtheories[name].estimate)
+            fit.setbackground('Counting ' + name)
+            fit.estimate()
+            del background_calls[:]
+            del function_calls[:]
+            fit.runfit()
+
+            # each computation of the background went through _background
+            self.assertTrue(function_calls)
+            self.assertEqual(len(set(function_calls)), len(function_calls))
+            self.assertEqual(min(function_calls), 1)
+            if name == 'Strip':
+                self.assertEqual(len(function_calls), 1)
+                self.assertGreater(len(background_calls), 1)
+
+
 def quadratic(x, a, b, c):
     return a * x**2 + b * x + c
 
@@ -244,6 +244,46 @@ class Test_functions(unittest.TestCase):
                         1)
 
 
+    def testJacobians(self):
+        """Compare the analytic jacobians with numerical derivatives
+        with respect to each parameter"""
+        x = numpy.linspace(-10, 30, 401)
+        parameters = {
+            "gauss": (5., 10., 3., 2., 1., 4.),
+            "agauss": (50., 10., 3.),
+            "splitgauss": (5., 10., 3., 6.),
+            "apvoigt": (50., 10., 3., 0.3),
+            "pvoigt": (5., 10., 3., 0.3),
+            "splitpvoigt": (5., 10., 3., 6., 0.3),
+            "lorentz": (5., 10., 3.),
+            "alorentz": (50., 10., 3.),
+            "splitlorentz": (5., 10., 3., 6.),
+            "stepdown": (5., 10., 3.),
+            "stepup": (5., 10., 3.),
+            "slit": (5., 10., 6., 2.),
+            "ahypermet": (50., 10., 3., 0.05, 0.5, 0.02, 5., 0.001),
+        }
+        for name, params in parameters.items():
+            function = getattr(functions, "sum_" + name)
+            jacobian = getattr(functions, "sum_%s_jacobian" % name)(x, *params)
+            self.assertEqual(jacobian.shape, (len(params), len(x)))
+            for i in range(len(params)):
+                delta = 1e-6 * max(abs(params[i]), 1.)
+                params_plus = list(params)
+                params_plus[i] += delta
+                params_minus = list(params)
+                params_minus[i] -= delta
+                deriv = (function(x, *params_plus) - function(x, *params_minus)) / (2 * delta)
+                self.assertTrue(
+                    numpy.allclose(jacobian[i], deriv,
+                                   atol=1e-5 * numpy.abs(deriv).max()),
+                    "Wrong derivative of %s for parameter %d" % (name, i))
+
+    def testJacobianWrongParameters(self):
+        with self.assertRaises(IndexError):
+            functions.sum_gauss_jacobian(self.x, 1., 2.)
+
+
 def _numerical_derivative(f, x, params=[], delta_factor=0.0001):
     """Compute the numerical derivative of ``f`` for all values of ``x``.
 
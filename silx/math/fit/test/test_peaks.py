@@ -132,6 +132,36 @@ class Test_peak_search(unittest.TestCase):
                 self.assertLess(abs(found_peak_index - theoretical_peak_index), 25)
 
 
+    def testPeakSearchAlongAxis(self):
+        """Compare peak search on a stack of spectra with 1D peak search"""
+        spectra = numpy.array(
+            [functions.sum_gauss(self.x, *self.h_c_fwhm),
+             functions.sum_lorentz(self.x, *self.h_c_fwhm),
+             numpy.zeros_like(self.x, dtype=numpy.float64),
+             functions.sum_pvoigt(self.x, *self.h_c_fwhm_eta)])
+        # Spectra along first axis
+        data = spectra.T.copy()
+
+        indptr, peak_indices, relevances = peaks.peak_search_along_axis(
+            data, fwhm=100, axis=0)
+
+        self.assertEqual(len(indptr), len(spectra) + 1)
+        self.assertEqual(indptr[-1], len(peak_indices))
+        self.assertEqual(len(relevances), len(peak_indices))
+        # No peak in the spectrum with only zeros
+        self.assertEqual(indptr[2], indptr[3])
+        for i, y in enumerate(spectra):
+            if not numpy.any(y):
+                continue
+            expected = peaks.peak_search(y, fwhm=100, relevance_info=True)
+            start, stop = indptr[i], indptr[i + 1]
+            self.assertEqual(stop - start, len(expected))
+            for index, relevance, (expected_index, expected_relevance) in zip(
+                    peak_indices[start:stop], relevances[start:stop], expected):
+                self.assertEqual(index, expected_index)
+                self.assertAlmostEqual(relevance, expected_relevance)
+
+
 test_cases = (Test_peak_search,)
 
 def suite():
@@ -25,7 +25,9 @@
 """This module provides marching cubes implementation.
 
 It provides a :class:`MarchingCubes` class allowing to build an isosurface
-from data provided as a 3D data set or slice by slice.
+from data provided as a 3D data set or slice by slice, and a
+:func:`marching_cubes` function processing a 3D data set by slabs
+in parallel.
 """
 
 __authors__ = ["T. Vincent"]
@@ -33,9 +35,14 @@ __license__ = "MIT"
 __date__ = "16/08/2017"
 
 
+from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
+
 import numpy
 cimport numpy as cnumpy
 cimport cython
+from libc.string cimport memcpy
+from libcpp.vector cimport vector as std_vector
 
 cimport silx.math.mc as mc
 
@@ -159,7 +166,8 @@ cdef class MarchingCubes:
         height = data.shape[1]
         width = data.shape[2]
 
-        self.c_mc.process(&c_data[0], depth, height, width)
+        with nogil:
+            self.c_mc.process(&c_data[0], depth, height, width)
 
     def process_slice(self, slice0, slice1):
         """Process a new slice to build the isosurface.
@@ -186,7 +194,8 @@ cdef class MarchingCubes:
         assert slice1.shape[0] == self.c_mc.height
         assert slice1.shape[1] == self.c_mc.width
 
-        self.c_mc.process_slice(&c_slice0[0], &c_slice1[0])
+        with nogil:
+            self.c_mc.process_slice(&c_slice0[0], &c_slice1[0])
 
     def finish_process(self):
         """Clear internal cache after processing slice by slice."""
@@ -230,17 +239,336 @@ cdef class MarchingCubes:
 
         Order is dim0, dim1, dim2 (i.e., z, y, x if dim0 is depth).
         """
-        return numpy.array(self.c_mc.vertices).reshape(-1, 3)
+        return _float_vector_to_array(self.c_mc.vertices).reshape(-1, 3)
 
     def get_normals(self):
         """Normals currently computed (ndarray of dim NbVertices x 3)
 
         Order is dim0, dim1, dim2 (i.e., z, y, x if dim0 is depth).
         """
-        return numpy.array(self.c_mc.normals).reshape(-1, 3)
+        return _float_vector_to_array(self.c_mc.normals).reshape(-1, 3)
 
     def get_indices(self):
         """Triangle indices currently computed (ndarray of dim NbTriangles x 3)
         """
-        return numpy.array(self.c_mc.indices,
-                           dtype=numpy.uint32).reshape(-1, 3)
+        cdef unsigned int[::1] c_indices
+        cdef size_t size = self.c_mc.indices.size()
+        indices = numpy.empty((size,), dtype=numpy.uint32)
+        if size > 0:
+            c_indices = indices
+            memcpy(&c_indices[0], self.c_mc.indices.data(),
+                   size * sizeof(unsigned int))
+        return indices.reshape(-1, 3)
+
+
+cdef _float_vector_to_array(std_vector[float] & vector):
+    """Returns a copy of a vector of float as a numpy.ndarray"""
+    cdef float[::1] c_array
+    cdef size_t size = vector.size()
+    array = numpy.empty((size,), dtype=numpy.float32)
+    if size > 0:
+        c_array = array
+        memcpy(&c_array[0], vector.data(), size * sizeof(float))
+    return array
+
+
+def _last_slice_in_plane_vertices(slice0, slice1, isolevel, sampling):
+    """Returns the indices of the vertices lying in the plane of slice1
+    among the vertices added by ``MarchingCubes.process_slice(slice0, slice1)``.
+
+    Those are the vertices of the edges along dim 1 and dim 2
+    of slice1, in the same order as they are added when slice1 is
+    the first slice of an isosurface.
+
+    :param numpy.ndarray slice0: Previous slice
+    :param numpy.ndarray slice1: Last slice
+    :param numpy.float32 isolevel: The iso-level
+    :param sampling: Sampling along each dimension (depth, height, width)
+    :return: (Number of vertices added by the slice, indices of the vertices
+        lying in the plane of slice1 among them)
+    """
+    with numpy.errstate(invalid='ignore'):  # NaN are above isolevel
+        below0 = slice0[::sampling[1], ::sampling[2]] <= isolevel
+        below1 = slice1[::sampling[1], ::sampling[2]] <= isolevel
+    height, width = slice1.shape
+
+    # Edges crossing the isosurface, in the order of processing:
+    # dim 2 (width), dim 1 (height) and dim 0 (depth) for each point
+    crossings = numpy.zeros(below1.shape + (3,), dtype=numpy.bool_)
+    # Last column/row of samples has no edge along width/height
+    nb_cols = len(range(0, width - sampling[2], sampling[2]))
+    nb_rows = len(range(0, height - sampling[1], sampling[1]))
+    crossings[:, :nb_cols, 0] = numpy.logical_xor(
+        below1[:, :nb_cols], below1[:, 1:nb_cols + 1])
+    crossings[:nb_rows, :, 1] = numpy.logical_xor(
+        below1[:nb_rows], below1[1:nb_rows + 1])
+    crossings[:, :, 2] = numpy.logical_xor(below0, below1)
+
+    edge_directions = numpy.nonzero(crossings.ravel())[0] % 3
+    return len(edge_directions), numpy.nonzero(edge_directions != 2)[0]
+
+
+def _process_slab(data, start, stop, isolevel, invert_normals, sampling,
+                  last, region=None):
+    """Compute the isosurface of the slices [start, stop] of data.
+
+    :param region: None to process whole slices, or
+        (row start, row stop, column start, column stop) of the part of the
+        slices to process. If the region is empty, nothing is processed.
+    :return: (vertices, normals, indices, indices of the vertices in the
+        plane of the last slice or None if last is True)
+    """
+    if region is None:
+        origin = 0, 0
+        slab = data[start:stop + 1]
+    elif region[0] >= region[1]:  # Empty region: no isosurface
+        vertices = numpy.zeros((0, 3), dtype=numpy.float32)
+        indices = numpy.zeros((0, 3), dtype=numpy.uint32)
+        border = None if last else numpy.zeros((0,), dtype=numpy.int64)
+        return vertices, vertices.copy(), indices, border
+    else:
+        origin = region[0], region[2]
+        slab = data[start:stop + 1, region[0]:region[1], region[2]:region[3]]
+
+    slab = numpy.ascontiguousarray(slab, dtype='=f4')
+    if not slab.flags.writeable:  # e.g., read-only memory-mapped file
+        slab = slab.copy()
+    mc = MarchingCubes(slab,
+                       isolevel=isolevel,
+                       invert_normals=invert_normals,
+                       sampling=sampling)
+    vertices = mc.get_vertices()
+    vertices += (start,) + origin
+
+    if last:
+        border = None
+    else:
+        nb_vertices, border = _last_slice_in_plane_vertices(
+            slab[stop - start - sampling[0]],
+            slab[stop - start],
+            numpy.float32(isolevel),
+            sampling)
+        border += len(vertices) - nb_vertices
+
+    return vertices, mc.get_normals(), mc.get_indices(), border
+
+
+def _block_reduce_2d(function, plane, block_size):
+    """Reduce a 2D array by blocks of block_size cells, i.e.,
+    (block_size + 1) samples, with a shared sample between adjacent blocks.
+    """
+    for axis in (0, 1):
+        size = plane.shape[axis]
+        starts = numpy.arange(0, max(size - 1, 1), block_size)
+        reduced = function.reduceat(plane, starts, axis=axis)
+        if len(starts) > 1:  # Include first sample of the next block
+            head = (slice(None),) * axis + (slice(0, -1),)
+            reduced[head] = function(reduced[head],
+                                     numpy.take(plane, starts[1:], axis=axis))
+        plane = reduced
+    return plane
+
+
+class BlockMinMax(object):
+    """Minimum and maximum of a 3D scalar field by blocks of cubes.
+
+    Blocks share their border samples so that each cube of the marching
+    cubes, and each of its edges, is fully contained in a block.
+    A block can only contain a part of the isosurface at a given level
+    if its minimum is lower or equal and its maximum greater than the level.
+
+    This allows :func:`marching_cubes` to only process the blocks crossed
+    by an isosurface, and to compute the isosurfaces at different levels
+    of the same dataset faster.
+
+    :param data: 3D scalar field, any object supporting ``shape`` and
+        slicing along the first dimension.
+    :param int block_size: Number of cubes (i.e., samples - 1) of the
+        blocks along each dimension
+    """
+
+    def __init__(self, data, block_size=8):
+        assert len(data.shape) == 3
+        self._shape = tuple(data.shape)
+        self._block_size = max(1, int(block_size))
+
+        block_size = self._block_size
+        starts = range(0, max(self._shape[0] - 1, 1), block_size)
+        minima, maxima = [], []
+        for start in starts:
+            stop = min(start + block_size, self._shape[0] - 1)
+            block = numpy.asarray(data[start:stop + 1])
+            # numpy.min and max propagate NaN: such blocks are always active
+            minima.append(_block_reduce_2d(
+                numpy.minimum, numpy.min(block, axis=0), block_size))
+            maxima.append(_block_reduce_2d(
+                numpy.maximum, numpy.max(block, axis=0), block_size))
+        self._minima = numpy.array(minima)
+        self._maxima = numpy.array(maxima)
+
+    @property
+    def shape(self):
+        """Shape of the indexed dataset"""
+        return self._shape
+
+    @property
+    def block_size(self):
+        """Number of cubes of the blocks along each dimension"""
+        return self._block_size
+
+    @property
+    def minima(self):
+        """Minimum of each block (numpy.ndarray of dim 3)"""
+        return self._minima
+
+    @property
+    def maxima(self):
+        """Maximum of each block (numpy.ndarray of dim 3)"""
+        return self._maxima
+
+    def get_active_blocks(self, isolevel):
+        """Returns the mask of the blocks crossed by the isosurface at level
+
+        :param float isolevel: The iso-level
+        :rtype: numpy.ndarray of bool of dim 3
+        """
+        isolevel = numpy.float32(isolevel)
+        with numpy.errstate(invalid='ignore'):
+            return numpy.logical_not(numpy.logical_or(
+                self._minima > isolevel, self._maxima <= isolevel))
+
+    def get_region(self, isolevel, block_start, block_stop):
+        """Returns the region of the slices crossed by the isosurface
+        in a range of layers of blocks.
+
+        The region includes one more sample after the last active block
+        when available, so that normals are computed as for the whole
+        dataset.
+
+        :param float isolevel: The iso-level
+        :param int block_start: First layer of blocks along dim 0
+        :param int block_stop: Last layer of blocks (excluded)
+        :return: (row start, row stop, column start, column stop),
+            with start >= stop if no block is active.
+        """
+        active = numpy.any(
+            self.get_active_blocks(isolevel)[block_start:block_stop], axis=0)
+        rows = numpy.nonzero(numpy.any(active, axis=1))[0]
+        if len(rows) == 0:
+            return 0, 0, 0, 0
+        columns = numpy.nonzero(numpy.any(active, axis=0))[0]
+        size = self._block_size
+        return (int(rows[0]) * size,
+                min((int(rows[-1]) + 1) * size + 2, self._shape[1]),
+                int(columns[0]) * size,
+                min((int(columns[-1]) + 1) * size + 2, self._shape[2]))
+
+
+def marching_cubes(data, isolevel, invert_normals=True, sampling=(1, 1, 1),
+                   max_workers=None, slab_depth=32, block_min_max=None):
+    """Compute the isosurface of a 3D scalar field by slabs along dim 0.
+
+    The slabs are read and processed in parallel by a pool of threads.
+    Vertices on the borders of the slabs are shared by adjacent slabs, and
+    the result is the same as the one of :class:`MarchingCubes`.
+
+    As only the slabs being processed are loaded in memory, data can be
+    a large dataset stored in a file, e.g., a :class:`numpy.memmap` or
+    a :class:`h5py.Dataset`.
+
+    :param data: 3D scalar field, any object supporting ``shape`` and
+        slicing along the first dimension.
+    :param float isolevel: The value for which to generate the isosurface
+    :param bool invert_normals:
+        True (default) for normals oriented in direction of gradient descent
+    :param sampling: Sampling along each dimension (depth, height, width)
+    :param int max_workers: Number of threads processing slabs.
+        Default: the number of CPUs
+    :param int slab_depth: Number of cube layers (i.e., depth - 1) of
+        each slab
+    :param BlockMinMax block_min_max:
+        Min/max index of data used to only read and process the blocks
+        crossed by the isosurface. In this case, slab_depth is rounded
+        to a multiple of the block size and sampling must be (1, 1, 1).
+    :return: (vertices, normals, indices) as for :class:`MarchingCubes`
+    :rtype: List[numpy.ndarray]
+    """
+    assert len(data.shape) == 3
+    if max_workers is None:
+        max_workers = multiprocessing.cpu_count()
+    sampling = tuple(int(step) for step in sampling)
+    slab_depth = max(1, int(slab_depth))
+
+    if block_min_max is not None:
+        if block_min_max.shape != tuple(data.shape):
+            raise ValueError("block_min_max does not match data shape")
+        if sampling != (1, 1, 1):
+            raise ValueError("block_min_max requires a sampling of (1, 1, 1)")
+        block_size = block_min_max.block_size
+        # Slabs made of whole layers of blocks
+        slab_depth = max(1, slab_depth // block_size) * block_size
+
+    # Slices of the slabs, with a shared slice between adjacent slabs
+    nb_layers = (data.shape[0] - 1) // sampling[0]
+    slab_limits = [(start * sampling[0],
+                    min(start + slab_depth, nb_layers) * sampling[0])
+                   for start in range(0, nb_layers, slab_depth)]
+
+    if not slab_limits:
+        vertices, normals, indices = MarchingCubes(
+            numpy.array(data[:], dtype='=f4', order='C'),
+            isolevel=isolevel,
+            invert_normals=invert_normals,
+            sampling=sampling)
+        return vertices, normals, indices
+
+    def process(index):
+        start, stop = slab_limits[index]
+        if block_min_max is None:
+            region = None
+        else:
+            region = block_min_max.get_region(
+                isolevel, start // block_size, -(-stop // block_size))
+        return _process_slab(data, start, stop, isolevel, invert_normals,
+                             sampling, index == len(slab_limits) - 1, region)
+
+    if max_workers <= 1 or len(slab_limits) == 1:
+        results = map(process, range(len(slab_limits)))
+        executor = None
+    else:
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        results = executor.map(process, range(len(slab_limits)))
+
+    all_vertices, all_normals, all_indices = [], [], []
+    nb_vertices = 0
+    previous_border = None
+    try:
+        for vertices, normals, indices, border in results:
+            if previous_border is not None:
+                # Use vertices of the previous slab in the shared slice:
+                # their normals are computed from both slices around them
+                nb_shared = len(previous_border)
+                vertex_indices = numpy.empty(len(vertices), dtype=numpy.uint32)
+                vertex_indices[:nb_shared] = previous_border
+                vertex_indices[nb_shared:] = numpy.arange(
+                    nb_vertices, nb_vertices + len(vertices) - nb_shared)
+                indices = vertex_indices[indices]
+                vertices = vertices[nb_shared:]
+                normals = normals[nb_shared:]
+                if border is not None:
+                    border = vertex_indices[border]
+            elif border is not None:
+                border = border.astype(numpy.uint32)
+
+            all_vertices.append(vertices)
+            all_normals.append(normals)
+            all_indices.append(indices)
+            nb_vertices += len(vertices)
+            previous_border = border
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    return (numpy.concatenate(all_vertices),
+            numpy.concatenate(all_normals),
+            numpy.concatenate(all_indices))
@@ -26,7 +26,7 @@
 from libcpp.vector cimport vector as std_vector
 from libcpp cimport bool
 
-cdef extern from "mc.hpp":
+cdef extern from "mc.hpp" nogil:
     cdef cppclass MarchingCubes[FloatIn, FloatOut]:
         MarchingCubes(FloatIn level) except +
         void process(FloatIn * data,
@@ -29,11 +29,13 @@ __authors__ = ["T. Vincent"]
 __license__ = "MIT"
 __date__ = "17/01/2018"
 
+import os.path
 import unittest
 
 import numpy
 
 from silx.utils.testutils import ParametricTestCase
+from silx.test.utils import temp_dir
 
 from silx.math import marchingcubes
 
@@ -173,6 +175,96 @@ class TestMarchingCubes(ParametricTestCase):
                                     result.get_indices(),
                                     atol=0., rtol=0.)
 
+    def test_slabs(self):
+        """Test processing by slabs, comparing to reference without slabs"""
+        z, y, x = numpy.mgrid[0:21, 0:13, 0:17].astype(numpy.float32)
+        data = numpy.sqrt((z - 10)**2 + (y - 6)**2 + (x - 8)**2)
+        data += numpy.random.random(data.shape).astype(numpy.float32)
+        isolevel = 5.
+
+        for sampling in ((1, 1, 1), (2, 1, 3), (3, 2, 1)):
+            ref_vertices, ref_normals, ref_indices = \
+                marchingcubes.MarchingCubes(data, isolevel, sampling=sampling)
+            for slab_depth in (1, 2, 3, 20):
+                for max_workers in (1, 3):
+                    with self.subTest(sampling=sampling,
+                                      slab_depth=slab_depth,
+                                      max_workers=max_workers):
+                        vertices, normals, indices = marchingcubes.marching_cubes(
+                            data, isolevel, sampling=sampling,
+                            max_workers=max_workers, slab_depth=slab_depth)
+                        self.assertAllClose(vertices, ref_vertices)
+                        self.assertAllClose(normals, ref_normals,
+                                            atol=0., rtol=0.)
+                        self.assertTrue(numpy.array_equal(indices, ref_indices))
+
+    def test_slabs_memmap(self):
+        """Test processing a memory-mapped volume by slabs"""
+        data = numpy.zeros((10, 10, 10), dtype=numpy.float32)
+        data[2:8, 2:8, 2:8] = 1.
+        ref_vertices, ref_normals, ref_indices = marchingcubes.MarchingCubes(
+            data, 0.5)
+
+        with temp_dir() as tmp:
+            filename = os.path.join(tmp, "volume.raw")
+            memmap = numpy.memmap(filename, dtype=numpy.float32, mode='w+',
+                                  shape=data.shape)
+            memmap[:] = data
+            memmap.flush()
+
+            volume = numpy.memmap(filename, dtype=numpy.float32, mode='r',
+                                  shape=data.shape)
+            vertices, normals, indices = marchingcubes.marching_cubes(
+                volume, 0.5, max_workers=2, slab_depth=3)
+            del memmap, volume
+
+        self.assertAllClose(vertices, ref_vertices)
+        self.assertAllClose(normals, ref_normals)
+        self.assertTrue(numpy.array_equal(indices, ref_indices))
+
+    def test_block_min_max(self):
+        """Test the min/max index by blocks and its use by marching_cubes"""
+        z, y, x = numpy.mgrid[0:21, 0:13, 0:17].astype(numpy.float32)
+        data = numpy.sqrt((z - 15)**2 + (y - 4)**2 + (x - 10)**2)
+        data_with_nan = numpy.array(data, copy=True)
+        data_with_nan[20, 12, 16] = numpy.nan
+
+        for block_size in (1, 4, 8, 30):
+            index = marchingcubes.BlockMinMax(data_with_nan,
+                                              block_size=block_size)
+            self.assertEqual(index.shape, data.shape)
+            self.assertEqual(index.block_size, block_size)
+
+            # Compare with blocks of (block_size + 1) samples
+            for block in numpy.ndindex(*index.minima.shape):
+                selection = tuple(slice(i * block_size, (i + 1) * block_size + 1)
+                                  for i in block)
+                self.assertTrue(numpy.allclose(
+                    index.minima[block], numpy.min(data_with_nan[selection]),
+                    equal_nan=True))
+                self.assertTrue(numpy.allclose(
+                    index.maxima[block], numpy.max(data_with_nan[selection]),
+                    equal_nan=True))
+            # Blocks with NaN are always active
+            self.assertTrue(index.get_active_blocks(100.)[-1, -1, -1])
+
+            index = marchingcubes.BlockMinMax(data, block_size=block_size)
+            for isolevel in (2., 7.5, 40.):
+                with self.subTest(block_size=block_size, isolevel=isolevel):
+                    ref_vertices, ref_normals, ref_indices = \
+                        marchingcubes.MarchingCubes(data, isolevel)
+                    vertices, normals, indices = marchingcubes.marching_cubes(
+                        data, isolevel, max_workers=2, slab_depth=8,
+                        block_min_max=index)
+                    self.assertAllClose(vertices, ref_vertices)
+                    self.assertAllClose(normals, ref_normals,
+                                        atol=0., rtol=0.)
+                    self.assertTrue(numpy.array_equal(indices, ref_indices))
+
+        with self.assertRaises(ValueError):
+            marchingcubes.marching_cubes(
+                data[1:], 7.5, block_min_max=index)
+
 
 test_cases = (TestMarchingCubes,)
 